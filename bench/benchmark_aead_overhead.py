@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+AEAD framing overhead benchmark.
+
+For every AEAD token core.aead._instantiate_aead can build here, measures the
+per-packet cost of core.aead framing on top of the raw AEAD primitive:
+
+- raw:          cipher.encrypt / cipher.decrypt with a fixed nonce and header
+- legacy:       the previous framing (CONFIG lookup + int() per packet, full
+                header pack/unpack, fresh nonce bytes per packet)
+- encrypt/decrypt:           current Sender.encrypt / Receiver.decrypt
+- encrypt_into/decrypt_into: current zero-copy variants on preallocated buffers
+- encrypt_many: Sender.encrypt_many over --batch packets per call (native
+                batch entry point for Ascon when the extension provides it)
+
+Overhead columns are the framed time minus the raw primitive time.
+
+Usage:
+    python bench/benchmark_aead_overhead.py [--packets 20000] [--sizes 64,256,1024] [--batch 16]
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.aead import (
+    HEADER_LEN,
+    HEADER_STRUCT,
+    TAG_LEN,
+    AeadIds,
+    Receiver,
+    Sender,
+    _SUPPORTED_AEAD_TOKENS,
+    _build_nonce,
+    _instantiate_aead,
+)
+from core.config import CONFIG
+
+
+def _legacy_encrypt(sender: Sender, plaintext: bytes) -> bytes:
+    """Framing as Sender.encrypt did it before header/threshold caching."""
+
+    try:
+        threshold = int(CONFIG.get("REKEY_SEQ_THRESHOLD", 1 << 63))
+    except Exception:
+        threshold = 1 << 63
+    if sender._seq >= threshold:
+        raise RuntimeError("threshold")
+    header = sender.pack_header(sender._seq)
+    iv = _build_nonce(sender.epoch, sender._seq, sender._nonce_len)
+    ciphertext = sender._cipher.encrypt(iv, plaintext, header)
+    sender._seq += 1
+    return header + ciphertext
+
+
+def _legacy_decrypt(receiver: Receiver, wire: bytes) -> bytes:
+    """Framing as Receiver.decrypt did it before the fixed-prefix check."""
+
+    header = wire[:HEADER_LEN]
+    version, kem_id, kem_param, sig_id, sig_param, session_id, seq, epoch = struct.unpack(HEADER_STRUCT, header)
+    ids = receiver.ids
+    if version != receiver.version:
+        raise RuntimeError("version")
+    if (kem_id, kem_param, sig_id, sig_param) != (ids.kem_id, ids.kem_param, ids.sig_id, ids.sig_param):
+        raise RuntimeError("ids")
+    if session_id != receiver.session_id or epoch != receiver.epoch:
+        raise RuntimeError("session")
+    receiver._check_replay(seq)
+    iv = _build_nonce(epoch, seq, receiver._nonce_len)
+    return receiver._cipher.decrypt(iv, wire[HEADER_LEN:], header)
+
+
+def _per_packet_ns(fn: Callable[[int], object], packets: int) -> float:
+    start = time.perf_counter_ns()
+    for i in range(packets):
+        fn(i)
+    return (time.perf_counter_ns() - start) / packets
+
+
+def bench_token(token: str, size: int, packets: int, batch: int = 16) -> Dict[str, float]:
+    key = os.urandom(32)
+    ids = AeadIds(1, 1, 1, 1)
+    session_id = os.urandom(8)
+    version = CONFIG["WIRE_VERSION"]
+    window = max(int(CONFIG.get("REPLAY_WINDOW", 1024)), 64)
+    plaintext = os.urandom(size)
+
+    def sender() -> Sender:
+        return Sender(version, ids, session_id, 0, key, aead_token=token)
+
+    def receiver() -> Receiver:
+        return Receiver(version, ids, session_id, 0, key, window, aead_token=token)
+
+    cipher, nonce_len = _instantiate_aead(token, key)
+    nonce = bytes(nonce_len)
+    header = bytes(HEADER_LEN)
+    raw_ct = cipher.encrypt(nonce, plaintext, header)
+
+    results: Dict[str, float] = {}
+    results["raw_encrypt"] = _per_packet_ns(lambda _i: cipher.encrypt(nonce, plaintext, header), packets)
+    results["raw_decrypt"] = _per_packet_ns(lambda _i: cipher.decrypt(nonce, raw_ct, header), packets)
+
+    legacy_sender = sender()
+    results["legacy_encrypt"] = _per_packet_ns(lambda _i: _legacy_encrypt(legacy_sender, plaintext), packets)
+    s = sender()
+    results["encrypt"] = _per_packet_ns(lambda _i: s.encrypt(plaintext), packets)
+    s_into = sender()
+    out = bytearray(HEADER_LEN + size + TAG_LEN)
+    results["encrypt_into"] = _per_packet_ns(lambda _i: s_into.encrypt_into(plaintext, out), packets)
+    s_many = sender()
+    chunk = [plaintext] * batch
+    calls = max(packets // batch, 1)
+    results["encrypt_many"] = _per_packet_ns(lambda _i: s_many.encrypt_many(chunk), calls) / batch
+
+    wires_sender = sender()
+    wires: List[bytes] = [wires_sender.encrypt(plaintext) for _ in range(packets)]
+    legacy_receiver = receiver()
+    results["legacy_decrypt"] = _per_packet_ns(lambda i: _legacy_decrypt(legacy_receiver, wires[i]), packets)
+    r = receiver()
+    results["decrypt"] = _per_packet_ns(lambda i: r.decrypt(wires[i]), packets)
+    r_into = receiver()
+    pt_out = bytearray(size)
+    views = [memoryview(w) for w in wires]
+    results["decrypt_into"] = _per_packet_ns(lambda i: r_into.decrypt_into(views[i], pt_out), packets)
+
+    for name in ("legacy_encrypt", "encrypt", "encrypt_into", "encrypt_many"):
+        results[f"{name}_overhead"] = results[name] - results["raw_encrypt"]
+    for name in ("legacy_decrypt", "decrypt", "decrypt_into"):
+        results[f"{name}_overhead"] = results[name] - results["raw_decrypt"]
+    return {k: round(v, 1) for k, v in results.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-packet AEAD framing overhead per token")
+    parser.add_argument("--packets", type=int, default=20000)
+    parser.add_argument("--sizes", default="64,256,1024")
+    parser.add_argument("--batch", type=int, default=16, help="packets per encrypt_many call")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    report = []
+    for token in sorted(_SUPPORTED_AEAD_TOKENS):
+        try:
+            _instantiate_aead(token, os.urandom(32))
+        except Exception as exc:
+            report.append({"token": token, "skipped": str(exc)})
+            continue
+        for size in sizes:
+            report.append({"token": token, "size": size, **bench_token(token, size, args.packets, args.batch)})
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'token':18s} {'size':>5s} | {'enc raw':>8s} {'legacy+':>8s} {'enc+':>8s} {'into+':>8s} {'many+':>8s} | "
+          f"{'dec raw':>8s} {'legacy+':>8s} {'dec+':>8s} {'into+':>8s}   (ns/packet)")
+    for row in report:
+        if "skipped" in row:
+            print(f"{row['token']:18s} skipped: {row['skipped']}")
+            continue
+        print(
+            f"{row['token']:18s} {row['size']:5d} | {row['raw_encrypt']:8.0f} {row['legacy_encrypt_overhead']:8.0f} "
+            f"{row['encrypt_overhead']:8.0f} {row['encrypt_into_overhead']:8.0f} {row['encrypt_many_overhead']:8.0f} | "
+            f"{row['raw_decrypt']:8.0f} "
+            f"{row['legacy_decrypt_overhead']:8.0f} {row['decrypt_overhead']:8.0f} {row['decrypt_into_overhead']:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
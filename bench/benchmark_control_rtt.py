@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Control-channel round-trip benchmark: legacy JSON vs framed/pipelined.
+
+Starts a core.control_tcp ControlTcpServer on loopback (or targets --host/--port)
+and times `status` round trips three ways:
+
+- legacy:    send_control_command, one TCP connection per command
+- framed:    core.control_wire.ControlChannel, one persistent connection
+- pipelined: ControlChannel with --depth requests in flight from threads
+
+Reports p50/p99/max per mode plus the channel's RTT histogram.
+
+Usage:
+    python bench/benchmark_control_rtt.py [--count 2000] [--depth 4] [--codec json] [--host H --port P] [--json]
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.control_tcp import ControlTcpConfig, ControlTcpServer, send_control_command
+from core.control_wire import ControlChannel, available_codecs
+from core.policy_engine import create_control_state
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50_us": round(statistics.median(samples) * 1e6, 1),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6, 1),
+        "max_us": round(samples[-1] * 1e6, 1),
+    }
+
+
+def _timed(fn, count: int) -> List[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        reply = fn()
+        samples.append(time.perf_counter() - start)
+        if not reply.get("ok", reply.get("status") == "ok"):
+            raise RuntimeError(f"control request failed: {reply}")
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Control channel RTT benchmark")
+    parser.add_argument("--count", type=int, default=2000, help="round trips per mode")
+    parser.add_argument("--depth", type=int, default=4, help="requests in flight for the pipelined mode")
+    parser.add_argument("--codec", default="json", choices=("json", "msgpack", "cbor"), help="framed body codec")
+    parser.add_argument("--host", default=None, help="existing control listener (default: start one locally)")
+    parser.add_argument("--port", type=int, default=None, help="port of --host")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    if args.codec not in available_codecs():
+        print(f"codec {args.codec} is not installed", file=sys.stderr)
+        return 2
+
+    server = None
+    host, port = args.host, args.port
+    if host is None:
+        host = "127.0.0.1"
+        with socket.socket() as probe:
+            probe.bind((host, 0))
+            port = probe.getsockname()[1]
+        server = ControlTcpServer(
+            ControlTcpConfig(host, port, (), (), "gcs", "gcs"),
+            create_control_state("gcs", "cs-mlkem768-aesgcm-mldsa65"),
+            quiet=True,
+        )
+        if not server.start():
+            print("could not start the control listener", file=sys.stderr)
+            return 1
+
+    payload = {"cmd": "status"}
+    channel = ControlChannel(host, port, codec=args.codec, timeout=5.0)
+    try:
+        legacy = _timed(lambda: send_control_command(host, port, payload), args.count)
+        channel.request(payload)  # connect outside the timed loop
+        framed = _timed(lambda: channel.request(payload), args.count)
+
+        pipelined: List[float] = []
+        lock = threading.Lock()
+        per_thread = max(1, args.count // max(1, args.depth))
+
+        def worker() -> None:
+            samples = _timed(lambda: channel.request(payload), per_thread)
+            with lock:
+                pipelined.extend(samples)
+
+        threads = [threading.Thread(target=worker) for _ in range(max(1, args.depth))]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pipelined_wall = time.perf_counter() - start
+        stats = channel.stats()
+    finally:
+        channel.close()
+        if server is not None:
+            server.stop()
+
+    results = {
+        "codec": args.codec,
+        "legacy": _summary(legacy),
+        "framed": _summary(framed),
+        "pipelined": dict(_summary(pipelined), requests_per_s=round(len(pipelined) / pipelined_wall, 1)),
+        "channel": stats,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for mode in ("legacy", "framed", "pipelined"):
+            row = results[mode]
+            extra = f"  {row['requests_per_s']:.0f} req/s" if "requests_per_s" in row else ""
+            print(
+                f"{mode:<10} p50 {row['p50_us']:>8.1f} us  p99 {row['p99_us']:>8.1f} us  "
+                f"max {row['max_us']:>9.1f} us  n={row['count']}{extra}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
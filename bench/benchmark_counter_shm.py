@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Counter export cost: JSON status file vs shared-memory segment.
+
+Measures, per update, with a populated core.async_proxy.ProxyCounters:
+
+- status-file: counters.to_dict() + _write_status_file (what --status-file does each second)
+- shm-publish: counters.export_values() + CounterWriter.publish (what --status-shm does at STATUS_SHM_HZ)
+- shm-read:    CounterReader.read() from a separate process while the writer publishes
+
+Usage:
+    python bench/benchmark_counter_shm.py [--count 2000] [--dir /tmp] [--json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.async_proxy import _EXPORT_FIELDS, ProxyCounters, _write_status_file
+from core.counter_shm import CounterReader, CounterWriter
+
+
+def _reader(path: str, seconds: float, conn) -> None:
+    reads = 0
+    seqs = set()
+    with CounterReader(path) as reader:
+        end = time.perf_counter() + seconds
+        start = time.perf_counter()
+        while time.perf_counter() < end:
+            row = reader.read()
+            reads += 1
+            if row is not None:
+                seqs.add(row["seq"])
+        elapsed = time.perf_counter() - start
+    conn.send({"reads": reads, "read_us": round(elapsed / reads * 1e6, 2), "distinct_updates": len(seqs)})
+
+
+def _per_call_us(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return round((time.perf_counter() - start) / count * 1e6, 2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Counter export cost: JSON status file vs shared memory")
+    parser.add_argument("--count", type=int, default=2000, help="updates per case")
+    parser.add_argument("--dir", default=None, help="directory for the status file (default: a temp dir)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    counters = ProxyCounters()
+    for index, name in enumerate(("enc_in", "enc_out", "ptx_in", "ptx_out", "drops")):
+        setattr(counters.datapath, name, 1_000_000 + index)
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        status_path = Path(tmp) / "status.json"
+        results["status_file_us"] = _per_call_us(
+            lambda: _write_status_file(status_path, {"status": "running", "counters": counters.to_dict()}, "bench"),
+            args.count,
+        )
+
+        writer = CounterWriter("pqc-bench-counters", _EXPORT_FIELDS)
+        try:
+            results["shm_publish_us"] = _per_call_us(lambda: writer.publish(counters.export_values()), args.count)
+
+            mp = multiprocessing.get_context("spawn")
+            parent, child = mp.Pipe()
+            proc = mp.Process(target=_reader, args=(str(writer.path), 1.0, child))
+            proc.start()
+            deadline = time.perf_counter() + 3.0
+            while not parent.poll() and time.perf_counter() < deadline:
+                counters.datapath.enc_in += 1
+                writer.publish(counters.export_values())
+                time.sleep(0.01)  # 100 Hz
+            results["shm_read"] = parent.recv()
+            proc.join()
+        finally:
+            writer.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"status file write : {results['status_file_us']:>8.2f} us/update")
+        print(f"shm publish       : {results['shm_publish_us']:>8.2f} us/update")
+        read = results["shm_read"]
+        print(
+            f"shm read          : {read['read_us']:>8.2f} us/read  "
+            f"({read['reads']} reads, {read['distinct_updates']} distinct updates at 100 Hz)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
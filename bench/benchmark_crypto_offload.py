@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Datapath latency during GCS rekeys with and without the crypto offload worker.
+
+A pinger process sends timestamped datagrams at a fixed rate to a datapath
+loop in this process, which AEAD-encrypts each one (core.aead.Sender) and
+returns it; the pinger records the round-trip time. Three phases are run for
+--seconds each:
+
+- idle:        no handshake work
+- rekey-local: back-to-back GCS handshakes (build_server_hello + decap) on a
+               thread in this process, as the proxy does today
+- rekey-offload: the same handshakes through core.crypto_offload.CryptoOffload
+
+The drone's encapsulation runs in a helper process in both rekey phases so
+only the GCS-side work lands in (or leaves) the datapath process. Reports
+p50/p99/max RTT per phase. Requires oqs-python.
+
+Usage:
+    python bench/benchmark_crypto_offload.py [--suite cs-classicmceliece348864-aesgcm-sphincs128f] [--seconds 5] [--rate 1000] [--json]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import selectors
+import socket
+import statistics
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import handshake
+from core.aead import AeadIds, Sender
+from core.config import CONFIG
+from core.crypto_offload import CryptoOffload
+from core.suites import get_suite, header_ids_for_suite
+
+DEFAULT_SUITE = "cs-classicmceliece348864-aesgcm-sphincs128f"
+PAYLOAD = 256
+
+
+def _pinger(addr, rate: float, seconds: float, conn) -> None:
+    """Send `rate` datagrams/s for `seconds`; report RTTs in microseconds."""
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(0.001)
+    interval = 1.0 / rate
+    rtts: List[float] = []
+    seq = 0
+    end = time.perf_counter() + seconds
+    next_send = time.perf_counter()
+    padding = b"\x00" * (PAYLOAD - 12)
+    while time.perf_counter() < end:
+        now = time.perf_counter()
+        if now >= next_send:
+            sock.sendto(struct.pack("!Id", seq, now) + padding, addr)
+            seq += 1
+            next_send += interval
+        try:
+            data = sock.recv(65535)
+        except socket.timeout:
+            continue
+        rtts.append((time.perf_counter() - struct.unpack("!d", data[-8:])[0]) * 1e6)
+    conn.send((seq, rtts))
+    conn.close()
+
+
+def _encapsulator(kem_name: str, conn) -> None:
+    """Drone side of the bench handshake: public key in, ciphertext out."""
+
+    kem = handshake.KeyEncapsulation(kem_name)
+    while True:
+        try:
+            public_key = conn.recv_bytes()
+        except EOFError:
+            return
+        ciphertext, _secret = kem.encap_secret(public_key)
+        conn.send_bytes(ciphertext)
+
+
+def _hello_public_key(wire: bytes) -> bytes:
+    """KEM public key from a ServerHello wire (see core.handshake.build_server_hello)."""
+
+    offset = 1
+    for _ in range(2):  # kem_name, sig_name
+        (size,) = struct.unpack_from("!H", wire, offset)
+        offset += 2 + size
+    offset += 16  # session_id + challenge
+    (size,) = struct.unpack_from("!I", wire, offset)
+    return wire[offset + 4 : offset + 4 + size]
+
+
+def _rekey_loop(suite: dict, signer, offload: Optional[CryptoOffload], stop: threading.Event, conn, out: Dict) -> None:
+    count = 0
+    total_ns = 0
+    while not stop.is_set():
+        start = time.perf_counter_ns()
+        wire, ephemeral = handshake.build_server_hello(suite["suite_id"], signer, offload=offload)
+        conn.send_bytes(_hello_public_key(wire))
+        handshake.server_decapsulate(ephemeral, conn.recv_bytes())
+        total_ns += time.perf_counter_ns() - start
+        count += 1
+    out["rekeys"] = count
+    out["rekey_ms_mean"] = round(total_ns / count / 1e6, 3) if count else 0.0
+
+
+def _run_phase(
+    name: str,
+    suite: dict,
+    signer,
+    offload: Optional[CryptoOffload],
+    rekey: bool,
+    args,
+) -> Dict[str, object]:
+    mp = multiprocessing.get_context("spawn")
+    ids = AeadIds(*header_ids_for_suite(suite))
+    sender = Sender(CONFIG["WIRE_VERSION"], ids, b"benchsid", 0, bytes(32), aead_token="aesgcm")
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.setblocking(False)
+    parent, child = mp.Pipe()
+    pinger = mp.Process(target=_pinger, args=(sock.getsockname(), args.rate, args.seconds, child), daemon=True)
+
+    stop = threading.Event()
+    rekey_stats: Dict[str, object] = {}
+    rekey_thread = None
+    encap_proc = None
+    if rekey:
+        encap_parent, encap_child = mp.Pipe()
+        encap_proc = mp.Process(target=_encapsulator, args=(suite["kem_name"], encap_child), daemon=True)
+        encap_proc.start()
+        rekey_thread = threading.Thread(
+            target=_rekey_loop, args=(suite, signer, offload, stop, encap_parent, rekey_stats), daemon=True
+        )
+        rekey_thread.start()
+
+    pinger.start()
+    selector = selectors.DefaultSelector()
+    selector.register(sock, selectors.EVENT_READ)
+    while pinger.is_alive() and not parent.poll():
+        for _key, _mask in selector.select(0.05):
+            while True:
+                try:
+                    data, addr = sock.recvfrom(65535)
+                except BlockingIOError:
+                    break
+                # Encrypt like the datapath, keep the pinger's timestamp.
+                sock.sendto(sender.encrypt(data) + data[4:12], addr)
+    sent, rtts = parent.recv()
+    pinger.join()
+    stop.set()
+    if rekey_thread is not None:
+        rekey_thread.join()
+    if encap_proc is not None:
+        encap_proc.kill()
+    sock.close()
+
+    rtts.sort()
+    result: Dict[str, object] = {"phase": name, "sent": sent, "received": len(rtts)}
+    if rtts:
+        result.update(
+            {
+                "p50_us": round(statistics.median(rtts), 1),
+                "p99_us": round(rtts[min(len(rtts) - 1, int(len(rtts) * 0.99))], 1),
+                "max_us": round(rtts[-1], 1),
+            }
+        )
+    result.update(rekey_stats)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Datapath latency during rekeys, crypto offload on/off")
+    parser.add_argument("--suite", default=DEFAULT_SUITE, help="suite whose KEM/signature to exercise")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each phase")
+    parser.add_argument("--rate", type=float, default=1000.0, help="datagrams per second")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    if handshake.KeyEncapsulation is None or handshake.Signature is None:
+        print("oqs-python is required for this benchmark", file=sys.stderr)
+        return 2
+    logging.getLogger("pqc").setLevel(logging.WARNING)
+
+    suite = get_suite(args.suite)
+    signer = handshake.Signature(suite["sig_name"])
+    signer.generate_keypair()
+
+    offload = CryptoOffload()
+    offload.start()
+    try:
+        results = [
+            _run_phase("idle", suite, signer, None, False, args),
+            _run_phase("rekey-local", suite, signer, None, True, args),
+            _run_phase("rekey-offload", suite, signer, offload, True, args),
+        ]
+    finally:
+        offload.stop()
+
+    if args.json:
+        print(json.dumps({"suite": suite["suite_id"], "results": results}, indent=2))
+    else:
+        print(f"suite {suite['suite_id']}, {args.rate:.0f} pkt/s, {args.seconds:.1f} s per phase")
+        for row in results:
+            print(
+                f"  {row['phase']:<14} p50 {row.get('p50_us', 0):>9.1f} us  p99 {row.get('p99_us', 0):>9.1f} us"
+                f"  max {row.get('max_us', 0):>9.1f} us  recv {row['received']}/{row['sent']}"
+                + (f"  rekeys {row['rekeys']} ({row['rekey_ms_mean']} ms)" if "rekeys" in row else "")
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+LatencyTracker / TelemetryWindow cost: sorted lists vs streaming sketches.
+
+- record:     LatencyTracker.record with a full window (list.pop(0) before)
+- get_stats:  LatencyTracker.get_stats on a full window (copy + sort before)
+- summarize:  TelemetryWindow.summarize on a full 500-sample window
+- error:      largest relative p50/p95/p99 error of the sketch vs a sort
+
+The "list" rows reimplement the previous list-and-sort tracker inline.
+
+Usage:
+    python bench/benchmark_latency_tracker.py [--samples 10000] [--count 2000] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.metrics_collectors import LatencyTracker
+from sscheduler.telemetry_window import TelemetryWindow
+
+
+class _ListTracker:
+    def __init__(self, max_samples: int) -> None:
+        self.max_samples = max_samples
+        self._samples = []
+
+    def record(self, latency_ms: float) -> None:
+        self._samples.append(latency_ms)
+        if len(self._samples) > self.max_samples:
+            self._samples.pop(0)
+
+    def get_stats(self):
+        ordered = sorted(self._samples)
+        n = len(ordered)
+        return {
+            "p50_ms": ordered[int(n * 0.50)],
+            "p95_ms": ordered[int(n * 0.95)],
+            "p99_ms": ordered[int(n * 0.99)],
+        }
+
+
+def _per_call_us(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return round((time.perf_counter() - start) / count * 1e6, 2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latency percentile cost: sorted lists vs sketches")
+    parser.add_argument("--samples", type=int, default=10000, help="LatencyTracker window size")
+    parser.add_argument("--count", type=int, default=2000, help="calls per case")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    values = [rng.lognormvariate(1.0, 1.0) for _ in range(args.samples * 2)]
+
+    results = {}
+    for name, tracker in (("list", _ListTracker(args.samples)), ("sketch", LatencyTracker(args.samples))):
+        for value in values[: args.samples]:
+            tracker.record(value)
+        stream = iter(values * 4)
+        results[name] = {
+            "record_us": _per_call_us(lambda: tracker.record(next(stream)), args.count),
+            "get_stats_us": _per_call_us(tracker.get_stats, max(1, args.count // 10)),
+        }
+        results[name]["stats"] = tracker.get_stats()
+
+    error = 0.0
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        exact = results["list"]["stats"][key]
+        error = max(error, abs(results["sketch"]["stats"][key] - exact) / exact)
+    results["max_relative_error"] = round(error, 5)
+    for row in (results["list"], results["sketch"]):
+        del row["stats"]
+
+    window = TelemetryWindow(window_s=5.0)
+    now = 1000.0
+    for i in range(TelemetryWindow.MAX_SAMPLES):
+        now += 0.01
+        window.add(now, {"seq": i, "metrics": {"sys": {"cpu_pct": rng.uniform(0, 100), "mem_pct": 50.0}}})
+    results["summarize_us"] = _per_call_us(lambda: window.summarize(now), args.count)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name in ("list", "sketch"):
+            row = results[name]
+            print(f"{name:<7} record {row['record_us']:>8.2f} us   get_stats {row['get_stats_us']:>10.2f} us")
+        print(f"max p50/p95/p99 relative error: {results['max_relative_error']:.4%}")
+        print(f"TelemetryWindow.summarize (500 samples): {results['summarize_us']:.2f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+PowerCollector sample storage: per-sample dicts vs PowerSampleBuffer.
+
+Feeds --seconds of synthetic --rate Hz samples (no sensor needed) into:
+
+- dicts:   a list of sample dicts, finalised by get_energy_stats(list)
+- running: PowerSampleBuffer with running sums (the start_sampling default)
+- vector:  PowerSampleBuffer without running sums (numpy integration)
+
+and reports the append cost, the stored bytes (tracemalloc for the dict list,
+column bytes for the buffers) and the finalize time.
+
+Usage:
+    python bench/benchmark_power_samples.py [--seconds 300] [--rate 1000] [--json]
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.metrics_collectors import HAS_NUMPY, PowerCollector, PowerSampleBuffer
+
+
+def _readings(count: int, rate: float):
+    for k in range(count):
+        current = 0.8 + 0.2 * math.sin(k / 500.0)
+        yield k / rate, 5.1, current, 5.1 * current
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Power sample storage and finalize cost")
+    parser.add_argument("--seconds", type=float, default=300.0, help="simulated sampling duration")
+    parser.add_argument("--rate", type=float, default=1000.0, help="simulated sample rate (Hz)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    count = int(args.seconds * args.rate)
+    collector = PowerCollector.__new__(PowerCollector)  # no sensor probing
+    results = {"samples": count, "numpy": HAS_NUMPY}
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = [
+        {"timestamp": 0.0, "backend": "ina219", "voltage_v": v, "current_a": i, "power_w": p, "mono_time": t}
+        for t, v, i, p in _readings(count, args.rate)
+    ]
+    append_s = time.perf_counter() - start
+    stored, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    collector.get_energy_stats(rows)
+    results["dicts"] = {
+        "append_us": round(append_s / count * 1e6, 3),
+        "mb": round(stored / 1e6, 1),
+        "finalize_ms": round((time.perf_counter() - start) * 1000.0, 2),
+    }
+    del rows
+
+    for name, running in (("running", True), ("vector", False)):
+        buffer = PowerSampleBuffer(initial=int(args.rate * 60), running_sums=running)
+        start = time.perf_counter()
+        for t, v, i, p in _readings(count, args.rate):
+            buffer.append(t, v, i, p)
+        append_s = time.perf_counter() - start
+        start = time.perf_counter()
+        collector.get_energy_stats(buffer)
+        results[name] = {
+            "append_us": round(append_s / count * 1e6, 3),
+            "mb": round(buffer.nbytes / 1e6, 1),
+            "finalize_ms": round((time.perf_counter() - start) * 1000.0, 2),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{count} samples ({args.seconds:.0f} s at {args.rate:.0f} Hz), numpy={HAS_NUMPY}")
+        for name in ("dicts", "running", "vector"):
+            row = results[name]
+            print(
+                f"{name:<8} append {row['append_us']:>7.3f} us  stored {row['mb']:>8.1f} MB  "
+                f"finalize {row['finalize_ms']:>9.2f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Ina219PowerMonitor.capture: CSV rows vs the binary mmap trace (core.power_trace).
+
+Runs the real capture loop against an instant fake I2C bus, so only the
+sample writer and the tick scheduling are measured. For each format it
+reports the achieved sample rate, the per-sample write cost, the timing
+jitter of the recorded timestamps (|interval - 1/rate|, p50/p99/max) and the
+file size.
+
+Usage:
+    python bench/benchmark_power_trace.py [--rate 2000] [--seconds 5] [--dir /tmp] [--json]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import power_monitor, power_trace
+
+
+class _FakeBus:
+    def __init__(self, _bus):
+        pass
+
+    def write_i2c_block_data(self, *_args):
+        pass
+
+    def read_i2c_block_data(self, _address, register, _length):
+        return [0x01, 0x90] if register == 0x01 else [0x4E, 0x20]
+
+
+def _timestamps(path: Path, trace_format: str):
+    if trace_format == "binary":
+        return [row[0] for row in power_trace.iter_records(path)]
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = csv.reader(handle)
+        next(rows)
+        return [int(row[0]) for row in rows]
+
+
+def _jitter_us(stamps, rate: float):
+    period_ns = 1e9 / rate
+    dev = sorted(abs((b - a) - period_ns) / 1000.0 for a, b in zip(stamps, stamps[1:]))
+    if not dev:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "p50": round(dev[len(dev) // 2], 1),
+        "p99": round(dev[min(len(dev) - 1, int(len(dev) * 0.99))], 1),
+        "max": round(dev[-1], 1),
+    }
+
+
+def _write_cost_us(monitor, trace_format: str, out_dir: Path, count: int) -> float:
+    path = out_dir / f"cost_{trace_format}"
+    if trace_format == "binary":
+        writer = power_trace.PowerTraceWriter(path, sample_hz=monitor.sample_hz, sign_factor=1, start_ns=0)
+        start = time.perf_counter()
+        for k in range(count):
+            writer.append(time.time_ns(), 0.4, 5.0, 2.0)
+        elapsed = time.perf_counter() - start
+        writer.close()
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            start = time.perf_counter()
+            for k in range(count):
+                writer.writerow([time.time_ns(), f"{0.4:.6f}", f"{5.0:.6f}", f"{2.0:.6f}", 1])
+                if k % 250 == 0:
+                    handle.flush()
+            elapsed = time.perf_counter() - start
+    return round(elapsed / count * 1e6, 3)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Power capture writer comparison (CSV vs binary trace)")
+    parser.add_argument("--rate", type=int, default=2000, help="requested sample rate (Hz)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="capture duration per format")
+    parser.add_argument("--dir", default=None, help="directory for the traces (default: a temp dir)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    power_monitor.smbus = types.SimpleNamespace(SMBus=_FakeBus)
+    results = {}
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for trace_format in ("csv", "binary"):
+            out_dir = Path(tmp) / trace_format
+            monitor = power_monitor.Ina219PowerMonitor(
+                out_dir, sample_hz=args.rate, sign_mode="positive", trace_format=trace_format
+            )
+            summary = monitor.capture(label="bench", duration_s=args.seconds)
+            trace = Path(summary.csv_path)
+            results[trace_format] = {
+                "achieved_hz": round(summary.sample_rate_hz, 1),
+                "samples": summary.samples,
+                "write_us": _write_cost_us(monitor, trace_format, out_dir, 20000),
+                "jitter_us": _jitter_us(_timestamps(trace, trace_format), args.rate),
+                "bytes_per_sample": round(trace.stat().st_size / max(1, summary.samples), 1),
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"requested {args.rate} Hz for {args.seconds:.1f} s")
+        for name, row in results.items():
+            jitter = row["jitter_us"]
+            print(
+                f"{name:<7} achieved {row['achieved_hz']:>8.1f} Hz  write {row['write_us']:>6.2f} us  "
+                f"jitter p50 {jitter['p50']:>6.1f} p99 {jitter['p99']:>7.1f} max {jitter['max']:>8.1f} us  "
+                f"{row['bytes_per_sample']:.1f} B/sample"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
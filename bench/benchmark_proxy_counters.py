@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Proxy counters microbenchmark (loopback UDP).
+
+Measures forwarded packets/sec for the datapath accounting used by
+core.async_proxy.run_proxy:
+
+- locked:   the previous scheme, where every packet takes counters_lock for
+            ingress, AEAD timing and egress updates.
+- lockfree: ProxyCounters.datapath, written by the forwarding thread only and
+            read through seqlock snapshots.
+
+A separate process blasts UDP datagrams at the forwarder. The forwarder
+receives them, updates counters as the proxy does per packet, and sends them
+on to a sink socket. A reporter thread calls to_dict() at --report-hz, like
+the proxy's status writer. No AEAD work is done, so the difference isolates
+counter overhead.
+
+Usage:
+    python bench/benchmark_proxy_counters.py [--seconds 5] [--payload 64] [--report-hz 1]
+"""
+
+import argparse
+import json
+import multiprocessing
+import selectors
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.async_proxy import ProxyCounters
+
+
+class LockedCounters:
+    """The pre-change accounting pattern: one shared lock around every update."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.ptx_in = 0
+        self.ptx_bytes_in = 0
+        self.enc_out = 0
+        self.enc_bytes_out = 0
+        self.drops = 0
+        self.enc = {"count": 0, "total_ns": 0, "min_ns": None, "max_ns": 0}
+        self._last_packet_mono = None
+        self._rekey_active = False
+        self._rekey_blackout_end_mono = None
+
+    def to_dict(self) -> Dict[str, object]:
+        with self.lock:
+            return {
+                "ptx_in": self.ptx_in,
+                "ptx_bytes_in": self.ptx_bytes_in,
+                "enc_out": self.enc_out,
+                "enc_bytes_out": self.enc_bytes_out,
+                "drops": self.drops,
+                "aead_encrypt": dict(self.enc),
+            }
+
+    def on_ingress(self, size: int) -> None:
+        with self.lock:
+            self.ptx_in += 1
+            self.ptx_bytes_in += size
+            self._last_packet_mono = time.monotonic()
+            if self._rekey_active and self._rekey_blackout_end_mono is None:
+                self._rekey_blackout_end_mono = self._last_packet_mono
+
+    def on_encrypt(self, duration_ns: int) -> None:
+        with self.lock:
+            stats = self.enc
+            stats["count"] += 1
+            stats["total_ns"] += duration_ns
+            if stats["min_ns"] is None or duration_ns < stats["min_ns"]:
+                stats["min_ns"] = duration_ns
+            if duration_ns > stats["max_ns"]:
+                stats["max_ns"] = duration_ns
+
+    def on_egress(self, size: int) -> None:
+        with self.lock:
+            self.enc_out += 1
+            self.enc_bytes_out += size
+            self._last_packet_mono = time.monotonic()
+            if self._rekey_active and self._rekey_blackout_end_mono is None:
+                self._rekey_blackout_end_mono = self._last_packet_mono
+
+    def on_drop(self) -> None:
+        with self.lock:
+            self.drops += 1
+
+
+class LockFreeCounters:
+    """Adapter over ProxyCounters.datapath with the same hooks as LockedCounters."""
+
+    def __init__(self) -> None:
+        self.counters = ProxyCounters()
+        self.lock = threading.Lock()  # only the reporter and rekey fields use it
+
+    def to_dict(self) -> Dict[str, object]:
+        with self.lock:
+            return self.counters.to_dict()
+
+    def on_ingress(self, size: int) -> None:
+        dp = self.counters.datapath
+        dp.seq += 1
+        dp.ptx_in += 1
+        dp.ptx_bytes_in += size
+        dp.touch(self.counters._rekey_token)
+        dp.seq += 1
+
+    def on_encrypt(self, duration_ns: int) -> None:
+        dp = self.counters.datapath
+        dp.seq += 1
+        dp.add_primitive("aead_encrypt", duration_ns, 0, 0)
+        dp.seq += 1
+
+    def on_egress(self, size: int) -> None:
+        dp = self.counters.datapath
+        dp.seq += 1
+        dp.enc_out += 1
+        dp.enc_bytes_out += size
+        dp.touch(self.counters._rekey_token)
+        dp.seq += 1
+
+    def on_drop(self) -> None:
+        dp = self.counters.datapath
+        dp.seq += 1
+        dp.drops += 1
+        dp.seq += 1
+
+
+def _blast(addr, payload_len: int, seconds: float) -> None:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    payload = b"\x55" * payload_len
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for _ in range(256):
+            try:
+                sock.sendto(payload, addr)
+            except OSError:
+                pass
+    sock.close()
+
+
+def run_mode(mode: str, seconds: float, payload_len: int, report_hz: float) -> Dict[str, object]:
+    counters = LockedCounters() if mode == "locked" else LockFreeCounters()
+
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    rx.bind(("127.0.0.1", 0))
+    rx.setblocking(False)
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    tx.setblocking(False)
+    sink_addr = sink.getsockname()
+
+    stop = threading.Event()
+    snapshots = [0]
+
+    def reporter() -> None:
+        interval = 1.0 / max(report_hz, 0.1)
+        while not stop.wait(interval):
+            json.dumps(counters.to_dict())
+            snapshots[0] += 1
+
+    blaster = multiprocessing.Process(target=_blast, args=(rx.getsockname(), payload_len, seconds + 0.5), daemon=True)
+    blaster.start()
+    report_thread = threading.Thread(target=reporter, daemon=True)
+    report_thread.start()
+
+    selector = selectors.DefaultSelector()
+    selector.register(rx, selectors.EVENT_READ)
+    forwarded = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _key, _mask in selector.select(timeout=0.1):
+            try:
+                payload, _addr = rx.recvfrom(16384)
+            except OSError:
+                continue
+            counters.on_ingress(len(payload))
+            t0 = time.perf_counter_ns()
+            wire = payload  # stand-in for AEAD output
+            counters.on_encrypt(time.perf_counter_ns() - t0)
+            try:
+                tx.sendto(wire, sink_addr)
+                counters.on_egress(len(wire))
+                forwarded += 1
+            except OSError:
+                counters.on_drop()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    report_thread.join(timeout=2.0)
+    blaster.join(timeout=5.0)
+    selector.close()
+    for s in (rx, sink, tx):
+        s.close()
+
+    return {
+        "mode": mode,
+        "seconds": round(elapsed, 3),
+        "forwarded": forwarded,
+        "pps": round(forwarded / elapsed, 1) if elapsed > 0 else 0.0,
+        "snapshots": snapshots[0],
+    }
+
+
+def time_accounting(mode: str, packets: int = 200_000) -> float:
+    """Return ns/packet spent on counter updates alone (no sockets)."""
+
+    counters = LockedCounters() if mode == "locked" else LockFreeCounters()
+    start = time.perf_counter_ns()
+    for _ in range(packets):
+        counters.on_ingress(64)
+        counters.on_encrypt(100)
+        counters.on_egress(80)
+    return (time.perf_counter_ns() - start) / packets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Loopback packets/sec for proxy counter schemes")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--payload", type=int, default=64)
+    parser.add_argument("--report-hz", type=float, default=1.0, help="to_dict() snapshot rate")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for _ in range(args.rounds):
+        for mode in ("locked", "lockfree"):
+            results.append(run_mode(mode, args.seconds, args.payload, args.report_hz))
+
+    if args.json:
+        for mode in ("locked", "lockfree"):
+            results.append({"mode": mode, "accounting_ns_per_pkt": round(time_accounting(mode), 1)})
+        print(json.dumps(results, indent=2))
+        return
+
+    for mode in ("locked", "lockfree"):
+        rates = [r["pps"] for r in results if r["mode"] == mode]
+        best = max(rates) if rates else 0.0
+        cost = min(time_accounting(mode) for _ in range(3))
+        print(
+            f"{mode:9s} best={best:,.0f} pps  accounting={cost:,.0f} ns/pkt  "
+            f"runs={[f'{r:,.0f}' for r in rates]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Anti-replay window benchmark.
+
+Compares the previous big-int mask window with the current ring window in
+core.aead.Receiver at each REPLAY_WINDOW size:
+
+- check:   Receiver._check_replay alone, in-order and with reordering
+           (sequence numbers shuffled within blocks of --reorder)
+- decrypt: Receiver.decrypt end to end (AES-GCM), in order
+
+Results are packets/sec; the big-int window slows down as the window grows,
+the ring window should not.
+
+Usage:
+    python bench/benchmark_replay_window.py [--windows 64,256,1024,4096,8192] [--packets 200000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.aead import AeadIds, Receiver, ReplayError, Sender
+from core.config import CONFIG
+
+
+class _LegacyReceiver(Receiver):
+    """Receiver with the previous arbitrary-precision mask window."""
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._mask = 0
+
+    def _check_replay(self, seq: int) -> None:
+        if seq > self._high:
+            shift = seq - self._high
+            if shift >= self.window:
+                self._mask = 1
+            else:
+                self._mask = (self._mask << shift) | 1
+                self._mask &= (1 << self.window) - 1
+            self._high = seq
+        elif seq > self._high - self.window:
+            bit = 1 << (self._high - seq)
+            if self._mask & bit:
+                raise ReplayError(f"duplicate packet seq={seq}")
+            self._mask |= bit
+        else:
+            raise ReplayError(f"packet too old seq={seq}, high={self._high}, window={self.window}")
+
+
+def _best_pps(make_fn: Callable[[], Callable], items: List, repeats: int) -> int:
+    """Packets/sec over `items`, best of `repeats`, with a fresh Receiver each run."""
+
+    best = float("inf")
+    for _ in range(repeats):
+        fn = make_fn()
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return round(len(items) / best) if best > 0 else 0
+
+
+def _reordered(packets: int, block: int) -> List[int]:
+    rng = random.Random(0)
+    seqs: List[int] = []
+    for base in range(0, packets, block):
+        chunk = list(range(base, min(base + block, packets)))
+        rng.shuffle(chunk)
+        seqs.extend(chunk)
+    return seqs
+
+
+def bench_window(window: int, packets: int, reorder: int, repeats: int) -> Dict[str, object]:
+    key = os.urandom(32)
+    ids = AeadIds(1, 1, 1, 1)
+    session_id = os.urandom(8)
+    version = CONFIG["WIRE_VERSION"]
+
+    in_order = list(range(packets))
+    shuffled = _reordered(packets, reorder)
+    sender = Sender(version, ids, session_id, 0, key)
+    wires = [sender.encrypt(b"\x00" * 64) for _ in range(min(packets, 50000))]
+
+    row: Dict[str, object] = {"window": window}
+    for name, cls in (("legacy", _LegacyReceiver), ("ring", Receiver)):
+        def fresh(cls=cls) -> Receiver:
+            return cls(version, ids, session_id, 0, key, window)
+
+        row[f"{name}_check_inorder_pps"] = _best_pps(lambda: fresh()._check_replay, in_order, repeats)
+        row[f"{name}_check_reorder_pps"] = _best_pps(lambda: fresh()._check_replay, shuffled, repeats)
+        row[f"{name}_decrypt_pps"] = _best_pps(lambda: fresh().decrypt, wires, repeats)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay window packets/sec vs REPLAY_WINDOW")
+    parser.add_argument("--windows", default="64,256,1024,4096,8192")
+    parser.add_argument("--packets", type=int, default=200000)
+    parser.add_argument("--reorder", type=int, default=32, help="shuffle block for the reordered run")
+    parser.add_argument("--repeats", type=int, default=3, help="best-of repeats per measurement")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    windows = [int(x) for x in args.windows.split(",") if x.strip()]
+    results = [bench_window(w, args.packets, args.reorder, args.repeats) for w in windows]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'window':>6s} | {'check in-order':>23s} | {'check reorder':>23s} | {'decrypt':>23s}")
+    print(f"{'':>6s} | {'legacy':>11s} {'ring':>11s} | {'legacy':>11s} {'ring':>11s} | {'legacy':>11s} {'ring':>11s}")
+    for row in results:
+        print(
+            f"{row['window']:6d} | {row['legacy_check_inorder_pps']:11,d} {row['ring_check_inorder_pps']:11,d} | "
+            f"{row['legacy_check_reorder_pps']:11,d} {row['ring_check_reorder_pps']:11,d} | "
+            f"{row['legacy_decrypt_pps']:11,d} {row['ring_decrypt_pps']:11,d}"
+        )
+    print("(packets/sec, best of repeats)")
+
+
+if __name__ == "__main__":
+    main()
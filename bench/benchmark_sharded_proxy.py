@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Sharded proxy datapath scaling benchmark (loopback UDP).
+
+Runs a GCS-role run_proxy with PROXY_WORKERS = 1, 2, 4 (or --workers) and
+measures forwarded packets/sec in both directions:
+
+- decrypt: sender processes, one per sequence lane, blast pre-encrypted wire
+           packets at the encrypted port; an app sink counts plaintexts.
+- encrypt: sender processes, one per app flow (distinct source ports), blast
+           plaintext at the app port; a peer sink counts wire packets.
+
+Rates are taken between the first and last datagram at the sink, so spawn
+and warm-up time is excluded. The PQC handshake is replaced with fixed keys
+inside the proxy process so only the datapath is measured. Scaling needs at
+least workers + senders free cores; on smaller machines the numbers show the
+sharding overhead rather than the speed-up.
+
+Usage:
+    python bench/benchmark_sharded_proxy.py [--workers 1,2,4] [--packets 200000] [--payload 256]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.aead import AeadIds, Sender
+from core.config import CONFIG
+from core.suites import SUITES, get_suite, header_ids_for_suite
+
+K_D2G = bytes(range(32))
+K_G2D = bytes(range(32, 64))
+SESSION_ID = b"benchsid"
+
+
+def _suite() -> dict:
+    suite_id = next(sid for sid in SUITES if get_suite(sid).get("aead_token") == "aesgcm")
+    return get_suite(suite_id)
+
+
+def _proxy_cfg(base_port: int, workers: int) -> dict:
+    cfg = dict(CONFIG)
+    cfg.update(
+        {
+            "DRONE_HOST": "127.0.0.1",
+            "GCS_HOST": "127.0.0.1",
+            "UDP_DRONE_RX": base_port,
+            "UDP_GCS_RX": base_port + 1,
+            "GCS_PLAINTEXT_HOST": "127.0.0.1",
+            "GCS_PLAINTEXT_TX": base_port + 2,
+            "GCS_PLAINTEXT_RX": base_port + 3,
+            "ENABLE_TCP_CONTROL": False,
+            "ENABLE_PACKET_TYPE": False,
+            "STRICT_UDP_PEER_MATCH": False,
+            "PROXY_WORKERS": workers,
+        }
+    )
+    return cfg
+
+
+def _run_proxy(cfg: dict) -> None:
+    import core.async_proxy as async_proxy
+
+    logging.getLogger("pqc").setLevel(logging.WARNING)
+    suite = _suite()
+    peer = ("127.0.0.1", cfg["UDP_DRONE_RX"])
+
+    def fixed_handshake(role, suite, *args, **kwargs):
+        event = kwargs.get("ready_event")
+        if event is not None:
+            event.set()
+        return (K_D2G, K_G2D, b"", b"", SESSION_ID, suite["kem_name"], suite["sig_name"], peer, {})
+
+    async_proxy._perform_handshake = fixed_handshake
+    try:
+        async_proxy.run_proxy(
+            role="gcs", suite=suite, cfg=cfg, gcs_sig_secret=object(), stop_after_seconds=600, quiet=True
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def _blast(packets: List[bytes], addr) -> None:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+    for packet in packets:
+        while True:
+            try:
+                sock.sendto(packet, addr)
+                break
+            except BlockingIOError:
+                time.sleep(0)
+    sock.close()
+
+
+def _lane_wires(lane: int, count: int, payload: bytes) -> List[bytes]:
+    ids = AeadIds(*header_ids_for_suite(_suite()))
+    sender = Sender(CONFIG["WIRE_VERSION"], ids, SESSION_ID, 0, K_D2G, aead_token="aesgcm", lane=lane)
+    return [sender.encrypt(payload) for _ in range(count)]
+
+
+def _sink_rate(sink: socket.socket, expected: int, idle_s: float = 1.0) -> Dict[str, object]:
+    sink.settimeout(idle_s)
+    received = 0
+    first = last = None
+    try:
+        while received < expected:
+            sink.recv(65535)
+            last = time.perf_counter()
+            if first is None:
+                first = last
+            received += 1
+    except socket.timeout:
+        pass
+    elapsed = (last - first) if first is not None and last is not None else 0.0
+    return {
+        "received": received,
+        "sent": expected,
+        "pps": round(received / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def _wait_ready(cfg: dict, probe: socket.socket, sink: socket.socket, timeout: float = 30.0) -> None:
+    """Poke the encrypt path until the proxy forwards, then let workers bind.
+
+    Probes are sent from the app sink so the proxy's dynamic app address
+    points back at it for the decrypt run.
+    """
+
+    sink.settimeout(0.2)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        probe.sendto(b"probe", ("127.0.0.1", cfg["GCS_PLAINTEXT_TX"]))
+        try:
+            sink.recv(65535)
+            break
+        except socket.timeout:
+            continue
+    else:
+        raise RuntimeError("proxy did not come up")
+    # Workers bind after the proxy process; give the spawn a moment.
+    time.sleep(1.0 + 0.5 * cfg["PROXY_WORKERS"])
+    sink.settimeout(0.2)
+    try:
+        while True:
+            sink.recv(65535)
+    except socket.timeout:
+        pass
+
+
+def run_workers(workers: int, packets: int, payload_len: int, senders: int, base_port: int) -> Dict[str, object]:
+    cfg = _proxy_cfg(base_port, workers)
+    mp = multiprocessing.get_context("spawn")
+    payload = os.urandom(payload_len)
+
+    peer_sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    peer_sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+    peer_sink.bind(("127.0.0.1", cfg["UDP_DRONE_RX"]))
+    app_sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    app_sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+    app_sink.bind(("127.0.0.1", cfg["GCS_PLAINTEXT_RX"]))
+
+    proxy = mp.Process(target=_run_proxy, args=(cfg,), daemon=False)
+    proxy.start()
+    result: Dict[str, object] = {"workers": workers}
+    try:
+        _wait_ready(cfg, app_sink, peer_sink)
+        per_sender = packets // senders
+
+        # Decrypt direction first: the encrypt run below moves the proxy's
+        # dynamic app address to the sender sockets.
+        lanes = [_lane_wires(lane, per_sender, payload) for lane in range(senders)]
+        procs = [
+            mp.Process(target=_blast, args=(wires, ("127.0.0.1", cfg["UDP_GCS_RX"])), daemon=True)
+            for wires in lanes
+        ]
+        for p in procs:
+            p.start()
+        result["decrypt"] = _sink_rate(app_sink, per_sender * senders)
+        for p in procs:
+            p.join(timeout=5.0)
+
+        flows = [[payload] * per_sender for _ in range(senders)]
+        procs = [
+            mp.Process(target=_blast, args=(flow, ("127.0.0.1", cfg["GCS_PLAINTEXT_TX"])), daemon=True)
+            for flow in flows
+        ]
+        for p in procs:
+            p.start()
+        result["encrypt"] = _sink_rate(peer_sink, per_sender * senders)
+        for p in procs:
+            p.join(timeout=5.0)
+    finally:
+        if proxy.is_alive():
+            os.kill(proxy.pid, signal.SIGINT)
+        proxy.join(timeout=10.0)
+        if proxy.is_alive():
+            proxy.terminate()
+        peer_sink.close()
+        app_sink.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded proxy datapath packets/sec vs PROXY_WORKERS")
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--packets", type=int, default=200000, help="packets per direction per run")
+    parser.add_argument("--payload", type=int, default=256)
+    parser.add_argument("--senders", type=int, default=4, help="sender processes (lanes / app flows)")
+    parser.add_argument("--base-port", type=int, default=47100)
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for index, workers in enumerate(int(x) for x in args.workers.split(",") if x.strip()):
+        results.append(
+            run_workers(workers, args.packets, args.payload, args.senders, args.base_port + 10 * index)
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"cpus={os.cpu_count()} payload={args.payload} senders={args.senders}")
+    base = {d: (results[0][d]["pps"] or 1.0) for d in ("decrypt", "encrypt")} if results else {}
+    for row in results:
+        cells = []
+        for direction in ("decrypt", "encrypt"):
+            stats = row[direction]
+            cells.append(
+                f"{direction} {stats['pps']:>10,.0f} pps (x{stats['pps'] / base[direction]:.2f}, "
+                f"{stats['received']}/{stats['sent']})"
+            )
+        print(f"workers={row['workers']}  " + "  ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Proxy startup latency benchmark with `-X importtime` breakdowns.
+
+Every suite switch launches a fresh `core.run_proxy`, so everything imported
+before the handshake is paid on each switch. For each case below this runs
+--runs fresh interpreters under `python -X importtime` and reports the median
+wall time of the imports plus the modules with the largest cumulative and
+self import times from the median run:
+
+- cli:       `import core.run_proxy` (argument parsing, config, suites)
+- selectors: cli + `core.async_proxy`, the default engine's pre-handshake imports
+- asyncio:   cli + `core.asyncio_proxy`
+
+Modules that are meant to load only on demand (mDNS, the TCP control server,
+the crypto offload worker) are checked too; finding one in a case is a
+regression. A first, discarded run per case warms the bytecode cache and
+PYTHONDONTWRITEBYTECODE is cleared for the children, as on a deployed host.
+
+Regression gate: --save-baseline FILE records each case's fastest run (the
+figure least disturbed by host noise); --baseline FILE fails (exit 1) when a
+case's fastest run exceeds the recorded one by more than --tolerance
+(fraction), or when a deferred module was imported.
+
+Usage:
+    python bench/benchmark_startup.py [--runs 11] [--top 12] [--baseline FILE] [--tolerance 0.25] [--save-baseline FILE] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_CASES = {
+    "cli": "import core.run_proxy",
+    "selectors": "import core.run_proxy, core.async_proxy",
+    "asyncio": "import core.run_proxy, core.asyncio_proxy",
+}
+
+# Imported on demand only; see core.config (mDNS), core.async_proxy
+# (_start_control_server, _start_crypto_offload).
+_DEFERRED = ("core.mdns", "zeroconf", "core.control_tcp", "core.crypto_offload", "multiprocessing")
+
+
+def _run_case(code: str) -> Tuple[float, List[Tuple[str, int, int]], List[str]]:
+    """One fresh interpreter: (wall ms, [(module, self_us, cumulative_us)], deferred modules seen)."""
+
+    wrapper = (
+        "import sys, time; t = time.perf_counter(); "
+        f"{code}; "
+        "elapsed = (time.perf_counter() - t) * 1000.0; "
+        f"print(elapsed, ','.join(m for m in {_DEFERRED!r} if m in sys.modules))"
+    )
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", wrapper],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, _, seen = out.stdout.strip().splitlines()[-1].partition(" ")
+    modules = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return float(elapsed), modules, [m for m in seen.split(",") if m]
+
+
+def _measure(code: str, runs: int, top: int) -> Dict[str, object]:
+    _run_case(code)  # warm the bytecode cache
+    samples = [_run_case(code) for _ in range(runs)]
+    samples.sort(key=lambda sample: sample[0])
+    wall = [sample[0] for sample in samples]
+    _elapsed, modules, _seen = samples[len(samples) // 2]
+    deferred = sorted({name for sample in samples for name in sample[2]})
+    return {
+        "median_ms": round(statistics.median(wall), 2),
+        "min_ms": round(wall[0], 2),
+        "top_cumulative": [
+            {"module": name, "ms": round(cum / 1000.0, 2)}
+            for name, _self, cum in sorted(modules, key=lambda m: m[2], reverse=True)[:top]
+        ],
+        "top_self": [
+            {"module": name, "ms": round(own / 1000.0, 2)}
+            for name, own, _cum in sorted(modules, key=lambda m: m[1], reverse=True)[:top]
+        ],
+        "deferred_imported": deferred,
+    }
+
+
+def _check(results: Dict[str, Dict[str, object]], baseline: Dict[str, object], tolerance: float) -> List[str]:
+    failures = []
+    for case, row in results.items():
+        if row["deferred_imported"]:
+            failures.append(f"{case}: imported deferred modules {', '.join(row['deferred_imported'])}")
+        recorded = baseline.get(case, {}).get("min_ms") if isinstance(baseline.get(case), dict) else None
+        if recorded and row["min_ms"] > recorded * (1.0 + tolerance):
+            failures.append(
+                f"{case}: {row['min_ms']:.2f} ms exceeds baseline {recorded:.2f} ms by more than {tolerance:.0%}"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Proxy startup import-time benchmark")
+    parser.add_argument("--runs", type=int, default=11, help="fresh-process runs per case")
+    parser.add_argument("--top", type=int, default=12, help="modules listed per breakdown")
+    parser.add_argument("--baseline", type=Path, help="fail if slower than this saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (fraction)")
+    parser.add_argument("--save-baseline", type=Path, help="write each case's fastest run to this file")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = {case: _measure(code, max(1, args.runs), args.top) for case, code in _CASES.items()}
+
+    failures: List[str] = [
+        f"{case}: imported deferred modules {', '.join(row['deferred_imported'])}"
+        for case, row in results.items()
+        if row["deferred_imported"]
+    ]
+    if args.baseline:
+        failures = _check(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    if args.save_baseline:
+        args.save_baseline.write_text(
+            json.dumps({case: {"min_ms": row["min_ms"]} for case, row in results.items()}, indent=2) + "\n",
+            encoding="utf-8",
+        )
+
+    if args.json:
+        print(json.dumps({"results": results, "failures": failures}, indent=2))
+    else:
+        for case, row in results.items():
+            print(f"{case}: median {row['median_ms']:.2f} ms  min {row['min_ms']:.2f} ms")
+            for entry in row["top_cumulative"]:
+                print(f"    {entry['ms']:>8.2f} ms  {entry['module']}")
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
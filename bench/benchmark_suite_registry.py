@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Suite registry startup and lookup benchmark.
+
+Measures, in fresh interpreter processes (median of --runs):
+
+- import:      `import core.suites` (no registry build)
+- first-build: import plus the first get_suite(), which builds the registry
+- run_proxy:   `import core.run_proxy`, the proxy CLI's startup imports
+
+and in this process:
+
+- get_suite:   canonical id and legacy alias lookups (ns/op)
+- by-level / by-kem: indexed queries vs a linear scan of list_suites()
+
+Usage:
+    python bench/benchmark_suite_registry.py [--runs 15] [--lookups 200000] [--json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_SNIPPETS = {
+    "import": "import core.suites",
+    "first-build": "import core.suites as s; s.get_suite(s.DEFAULT_SUITE_ID)",
+    "run_proxy": "import core.run_proxy",
+}
+
+
+def _startup_ms(snippet: str, runs: int) -> Dict[str, float]:
+    """Median/min wall time of `snippet` in a fresh interpreter, minus bare startup."""
+
+    def timed(code: str) -> float:
+        wrapper = (
+            "import time; t = time.perf_counter(); "
+            f"{code}; "
+            "print((time.perf_counter() - t) * 1000.0)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", wrapper], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        return float(out.stdout.strip().splitlines()[-1])
+
+    samples = [timed(snippet) for _ in range(runs)]
+    return {"median_ms": round(statistics.median(samples), 2), "min_ms": round(min(samples), 2)}
+
+
+def _per_op_ns(fn, count: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(count):
+        fn()
+    return round((time.perf_counter_ns() - start) / count, 1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Suite registry startup and lookup benchmark")
+    parser.add_argument("--runs", type=int, default=15, help="fresh-process runs per startup case")
+    parser.add_argument("--lookups", type=int, default=200000, help="lookups per in-process case")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results: Dict[str, object] = {
+        "startup": {name: _startup_ms(code, args.runs) for name, code in _SNIPPETS.items()}
+    }
+
+    from core import suites
+
+    canonical = suites.DEFAULT_SUITE_ID
+    alias = "cs-kyber768-aesgcm-dilithium3"
+    suites.get_suite(canonical)
+    scan_count = max(1, args.lookups // 100)
+    results["lookup_ns"] = {
+        "get_suite": _per_op_ns(lambda: suites.get_suite(canonical), args.lookups),
+        "get_suite_alias": _per_op_ns(lambda: suites.get_suite(alias), args.lookups),
+        "by_level_indexed": _per_op_ns(lambda: suites.list_suites_for_level("L3"), scan_count),
+        "by_level_scan": _per_op_ns(
+            lambda: [s for s in suites.list_suites().values() if s["nist_level"] == "L3"], scan_count
+        ),
+        "by_kem_indexed": _per_op_ns(lambda: suites.suites_for_kem("ML-KEM-768"), scan_count),
+        "by_kem_scan": _per_op_ns(
+            lambda: [s for s in suites.list_suites().values() if s["kem_name"] == "ML-KEM-768"], scan_count
+        ),
+    }
+    results["suites"] = len(suites.list_suites())
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{results['suites']} suites")
+        for name, row in results["startup"].items():
+            print(f"  startup {name:<12} median {row['median_ms']:>8.2f} ms  min {row['min_ms']:>8.2f} ms")
+        for name, value in results["lookup_ns"].items():
+            print(f"  {name:<20} {value:>10.1f} ns/op")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -532,6 +532,7 @@ class GcsBenchmarkServer:
             self.proxy.stop()
         if self.mavproxy_proc:
             self.mavproxy_proc.stop()
+        self.metrics.close()
 
 # =============================================================================
 # Drone Benchmark Controller
@@ -788,6 +789,7 @@ class DroneBenchmarkController:
         self.echo_server.stop()
         if self.mavproxy_proc:
             self.mavproxy_proc.stop()
+        self.metrics.close()
         
         # Tell GCS to shutdown
         send_gcs_command("shutdown")
@@ -902,6 +904,7 @@ def main():
         
         def signal_handler(sig, frame):
             log("Interrupted - saving partial results")
+            controller.metrics.close()
             controller.save_results()
             sys.exit(1)
         
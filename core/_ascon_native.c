@@ -270,9 +270,142 @@ done:
     return result;
 }
 
+/*
+ * Batch encryption. Every (nonce, aad, plaintext) buffer and every output
+ * bytes object is acquired up front with the GIL held; the Ascon calls for
+ * the whole batch then run with the GIL released.
+ */
+
+struct batch_job {
+    Py_buffer nonce;
+    Py_buffer aad;
+    Py_buffer text;
+    PyObject *out;
+    int rc;
+};
+
+static void release_batch(struct batch_job *jobs, Py_ssize_t count) {
+    Py_ssize_t i;
+    for (i = 0; i < count; ++i) {
+        if (jobs[i].nonce.buf != NULL) PyBuffer_Release(&jobs[i].nonce);
+        if (jobs[i].aad.buf != NULL) PyBuffer_Release(&jobs[i].aad);
+        if (jobs[i].text.buf != NULL) PyBuffer_Release(&jobs[i].text);
+        Py_XDECREF(jobs[i].out);
+    }
+    PyMem_Free(jobs);
+}
+
+static int acquire_item(PyObject *item, struct batch_job *job) {
+    if (!PyTuple_Check(item) || PyTuple_GET_SIZE(item) != 3) {
+        PyErr_SetString(PyExc_TypeError, "batch items must be (nonce, aad, plaintext) tuples");
+        return -1;
+    }
+    if (PyObject_GetBuffer(PyTuple_GET_ITEM(item, 0), &job->nonce, PyBUF_SIMPLE) != 0) {
+        return -1;
+    }
+    if (PyObject_GetBuffer(PyTuple_GET_ITEM(item, 1), &job->aad, PyBUF_SIMPLE) != 0) {
+        return -1;
+    }
+    if (PyObject_GetBuffer(PyTuple_GET_ITEM(item, 2), &job->text, PyBUF_SIMPLE) != 0) {
+        return -1;
+    }
+    if (ensure_min_length(&job->nonce, ASCON_NONCE_BYTES, "nonce") != 0) {
+        return -1;
+    }
+
+    if (job->text.len > PY_SSIZE_T_MAX - ASCON_TAG_BYTES) {
+        PyErr_SetString(PyExc_OverflowError, "ciphertext length exceeds platform limits");
+        return -1;
+    }
+    job->out = PyBytes_FromStringAndSize(NULL, job->text.len + ASCON_TAG_BYTES);
+    return job->out == NULL ? -1 : 0;
+}
+
+static PyObject *native_encrypt_many(PyObject *self, PyObject *args) {
+    (void)self;
+    Py_buffer key = {0};
+    PyObject *items = NULL;
+    const char *variant_name = NULL;
+    Py_ssize_t variant_len = 0;
+    PyObject *seq = NULL;
+    struct batch_job *jobs = NULL;
+    Py_ssize_t count = 0;
+    Py_ssize_t acquired = 0;
+    Py_ssize_t i;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*Os#", &key, &items, &variant_name, &variant_len)) {
+        return NULL;
+    }
+
+    if (ensure_exact_length(&key, ASCON_KEY_BYTES, "key") != 0) {
+        goto done;
+    }
+
+    const struct ascon_variant *variant = resolve_variant(variant_name, variant_len);
+    if (variant == NULL) {
+        PyErr_SetString(PyExc_ValueError, "unknown Ascon variant");
+        goto done;
+    }
+
+    seq = PySequence_Fast(items, "items must be a sequence of (nonce, aad, plaintext) tuples");
+    if (seq == NULL) {
+        goto done;
+    }
+    count = PySequence_Fast_GET_SIZE(seq);
+    jobs = PyMem_Calloc(count > 0 ? (size_t)count : 1, sizeof(struct batch_job));
+    if (jobs == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    for (acquired = 0; acquired < count; ++acquired) {
+        if (acquire_item(PySequence_Fast_GET_ITEM(seq, acquired), &jobs[acquired]) != 0) {
+            acquired += 1; /* release whatever this item managed to acquire */
+            goto done;
+        }
+    }
+
+    const uint8_t *key_ptr = (const uint8_t *)key.buf;
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 0; i < count; ++i) {
+        struct batch_job *job = &jobs[i];
+        uint8_t *out_bytes = (uint8_t *)PyBytes_AS_STRING(job->out);
+        const uint8_t *text_ptr = (const uint8_t *)job->text.buf;
+        job->rc = variant->encrypt_fn(out_bytes + job->text.len, out_bytes, text_ptr,
+                                      (uint64_t)job->text.len, (const uint8_t *)job->aad.buf,
+                                      (uint64_t)job->aad.len, (const uint8_t *)job->nonce.buf,
+                                      key_ptr);
+    }
+    Py_END_ALLOW_THREADS
+
+    result = PyList_New(count);
+    if (result == NULL) {
+        goto done;
+    }
+    for (i = 0; i < count; ++i) {
+        if (jobs[i].rc != 0) {
+            Py_CLEAR(result);
+            PyErr_SetString(PyExc_RuntimeError, "Ascon encryption failed");
+            goto done;
+        }
+        PyList_SET_ITEM(result, i, jobs[i].out);
+        jobs[i].out = NULL;
+    }
+
+done:
+    if (jobs != NULL) {
+        release_batch(jobs, acquired);
+    }
+    Py_XDECREF(seq);
+    if (key.buf != NULL) PyBuffer_Release(&key);
+    return result;
+}
+
 static PyMethodDef AsconMethods[] = {
     {"encrypt", native_encrypt, METH_VARARGS, "Encrypt using the native Ascon backend."},
     {"decrypt", native_decrypt, METH_VARARGS, "Decrypt using the native Ascon backend."},
+    {"encrypt_many", native_encrypt_many, METH_VARARGS,
+     "Encrypt a list of (nonce, aad, plaintext) tuples without holding the GIL."},
     {NULL, NULL, 0, NULL},
 };
 
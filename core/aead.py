@@ -7,7 +7,7 @@ deterministic 96-bit counter IVs, sliding replay window, and epoch support for r
 
 import struct
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 try:
@@ -60,6 +60,45 @@ HEADER_LEN = struct.calcsize(HEADER_STRUCT)
 # IV is still logically 12 bytes (1 epoch + 11 seq bytes) but is NO LONGER transmitted on wire.
 # Wire format: header(22) || ciphertext+tag
 IV_LEN = 0  # length of IV bytes present on wire (0 after optimization)
+# Authentication tag length appended by every supported AEAD.
+TAG_LEN = 16
+# Sequence bytes inside the nonce: epoch(1) || 0x000000 || seq(8, big-endian).
+# Header seq is a u64, so the 11-byte nonce counter always has 3 leading zeros.
+_NONCE_SEQ = struct.Struct("!Q")
+_NONCE_SEQ_OFFSET = 4
+_HEADER = struct.Struct(HEADER_STRUCT)
+# Header layout: constant prefix (version, kem/sig ids, session_id) || seq || epoch.
+# Only seq changes per packet, so Sender/Receiver precompute the rest.
+_PREFIX_LEN = 13
+_SEQ = struct.Struct("!Q")
+_EPOCH_OFFSET = HEADER_LEN - 1
+_PREFIX_SEQ_EPOCH = struct.Struct(f"!{_PREFIX_LEN}sQB")
+# Sharded datapaths give every worker its own slice of the sequence space:
+# the most significant byte of seq is the sending worker's lane.
+SEQ_LANE_SHIFT = 56
+SEQ_LANE_OFFSET = _PREFIX_LEN  # wire offset of the lane byte
+SESSION_ID_OFFSET = _PREFIX_LEN - 8  # wire offset of the 8-byte session_id
+MAX_SEQ_LANES = 256
+
+
+def _rekey_seq_threshold() -> int:
+    """Sequence number at which senders refuse to encrypt and demand a rekey."""
+
+    # Default threshold is 2^63 if not configured; this gives operators time to rekey.
+    try:
+        return int(CONFIG.get("REKEY_SEQ_THRESHOLD", 1 << 63))
+    except Exception:
+        return 1 << 63
+
+
+def _lane_seq_limit(lane: int) -> int:
+    """First sequence number a sender on `lane` may not use."""
+
+    return (lane << SEQ_LANE_SHIFT) + min(_rekey_seq_threshold(), 1 << SEQ_LANE_SHIFT)
+
+
+def _header_prefix(version: int, ids: "AeadIds", session_id: bytes) -> bytes:
+    return struct.pack("!BBBBB8s", version, ids.kem_id, ids.kem_param, ids.sig_id, ids.sig_param, session_id)
 
 
 
@@ -92,36 +131,13 @@ class _AsconAdapter:
             "Ascon-AEAD128": "Ascon-128",
             "Ascon-AEAD128a": "Ascon-128a",
         }.get(self._algo_str, "Ascon-128")
-        variant_name = self._algo_str
 
+        self._native = None
+        self._native_many = False
         if _ascon_native_module is not None and hasattr(_ascon_native_module, "encrypt") and hasattr(_ascon_native_module, "decrypt"):
-            def _native_encrypt(
-                key_bytes: bytes,
-                nonce_bytes: bytes,
-                aad_bytes: bytes,
-                plaintext_bytes: bytes,
-                algo: str = variant_name,
-            ) -> bytes:
-                return _ascon_native_module.encrypt(
-                    key_bytes, nonce_bytes, aad_bytes, plaintext_bytes, algo
-                )
-
-            def _native_decrypt(
-                key_bytes: bytes,
-                nonce_bytes: bytes,
-                aad_bytes: bytes,
-                ciphertext_bytes: bytes,
-                algo: str = variant_name,
-            ) -> bytes:
-                result = _ascon_native_module.decrypt(
-                    key_bytes, nonce_bytes, aad_bytes, ciphertext_bytes, algo
-                )
-                if result is None:
-                    raise InvalidTag("Ascon authentication failed")
-                return result
-
-            self._enc = _native_encrypt
-            self._dec = _native_decrypt
+            # Native calls are made directly from encrypt/decrypt; no closure hop.
+            self._native = _ascon_native_module
+            self._native_many = hasattr(_ascon_native_module, "encrypt_many")
         elif _pyascon_module is not None:
             # pyascon uses legacy variant names ("Ascon-128a"), not NIST names
             fallback_name = self._fallback_variant
@@ -132,7 +148,9 @@ class _AsconAdapter:
                 plaintext_bytes: bytes,
                 algo: str = fallback_name,
             ) -> bytes:
-                return _pyascon_module.ascon_encrypt(key_bytes, nonce_bytes, aad_bytes, plaintext_bytes, algo)
+                return _pyascon_module.ascon_encrypt(
+                    key_bytes, bytes(nonce_bytes), bytes(aad_bytes), bytes(plaintext_bytes), algo
+                )
 
             def _py_decrypt(
                 key_bytes: bytes,
@@ -141,7 +159,9 @@ class _AsconAdapter:
                 ciphertext_bytes: bytes,
                 algo: str = fallback_name,
             ) -> bytes:
-                result = _pyascon_module.ascon_decrypt(key_bytes, nonce_bytes, aad_bytes, ciphertext_bytes, algo)
+                result = _pyascon_module.ascon_decrypt(
+                    key_bytes, bytes(nonce_bytes), bytes(aad_bytes), bytes(ciphertext_bytes), algo
+                )
                 if result is None:
                     raise InvalidTag("Ascon authentication failed")
                 return result
@@ -151,21 +171,33 @@ class _AsconAdapter:
         else:
             raise ImportError("No Ascon backend available (native module missing and pyascon not importable)")
 
+    # Nonces are built at the full 16-byte Ascon length by Sender/Receiver
+    # (see _instantiate_aead), so they are passed through unchanged.
+
     def encrypt(self, nonce: bytes, plaintext: bytes, aad: bytes) -> bytes:
-        if len(nonce) < 16:
-            nonce = nonce + b"\x00" * (16 - len(nonce))
-        # Do NOT pass algo explicitly — closures capture the correct variant
-        # name at init time (NIST name for native, legacy name for pyascon).
-        return self._enc(self._key, nonce[:16], aad, plaintext)
+        if self._native is not None:
+            return self._native.encrypt(self._key, nonce, aad, plaintext, self._algo_str)
+        return self._enc(self._key, nonce, aad, plaintext)
 
     def decrypt(self, nonce: bytes, ciphertext: bytes, aad: bytes) -> bytes:
-        if len(nonce) < 16:
-            nonce = nonce + b"\x00" * (16 - len(nonce))
-        pt = self._dec(self._key, nonce[:16], aad, ciphertext)
+        if self._native is not None:
+            pt = self._native.decrypt(self._key, nonce, aad, ciphertext, self._algo_str)
+        else:
+            pt = self._dec(self._key, nonce, aad, ciphertext)
         if pt is None:
             raise InvalidTag("Ascon authentication failed")
         return pt
 
+    def encrypt_many(self, items: Sequence[Tuple[bytes, bytes, bytes]]) -> List[bytes]:
+        """Encrypt a batch of (nonce, aad, plaintext) tuples in one call.
+
+        With the native backend the whole batch runs in C with the GIL
+        released; otherwise each item goes through `encrypt`.
+        """
+        if self._native_many:
+            return self._native.encrypt_many(self._key, items, self._algo_str)
+        return [self.encrypt(nonce, plaintext, aad) for nonce, aad, plaintext in items]
+
 
 def _instantiate_aead(token: str, key: bytes) -> Tuple[object, int]:
     """Return AEAD primitive and required nonce length for the suite token."""
@@ -190,6 +222,16 @@ def _instantiate_aead(token: str, key: bytes) -> Tuple[object, int]:
     raise AeadError(f"unsupported AEAD token: {token}")
 
 
+def _new_nonce_buffer(epoch: int, nonce_len: int) -> bytearray:
+    """Allocate a reusable nonce buffer laid out like `_build_nonce`."""
+
+    if nonce_len < 12:
+        raise ValueError("nonce length must be >= 12 bytes")
+    nonce = bytearray(nonce_len)
+    nonce[0] = epoch & 0xFF
+    return nonce
+
+
 def _build_nonce(epoch: int, seq: int, nonce_len: int) -> bytes:
     base = bytes([epoch & 0xFF]) + seq.to_bytes(11, "big")
     if nonce_len == 12:
@@ -222,6 +264,7 @@ class Sender:
     key_send: bytes
     aead_token: str = "aesgcm"
     _seq: int = 0
+    lane: int = 0  # sequence lane (sharded datapath worker index)
 
     def __post_init__(self):
         if not isinstance(self.version, int) or self.version != CONFIG["WIRE_VERSION"]:
@@ -242,8 +285,21 @@ class Sender:
         if not isinstance(self._seq, int) or self._seq < 0:
             raise ValueError("_seq must be non-negative int")
 
+        if not isinstance(self.lane, int) or not (0 <= self.lane < MAX_SEQ_LANES):
+            raise ValueError(f"lane must be int in range 0-{MAX_SEQ_LANES - 1}")
+        self._seq_base = self.lane << SEQ_LANE_SHIFT
+        if self._seq < self._seq_base:
+            self._seq += self._seq_base
+
         self._aead_token = _canonicalize_aead_token(self.aead_token)
         self._cipher, self._nonce_len = _instantiate_aead(self._aead_token, self.key_send)
+        # One nonce buffer per session; only the seq bytes change per packet.
+        self._nonce = _new_nonce_buffer(self.epoch, self._nonce_len)
+        self._encrypt_into_fn = getattr(self._cipher, "encrypt_into", None)
+        # Header template: constant prefix and epoch are filled once, seq per packet.
+        self._header = bytearray(_header_prefix(self.version, self.ids, self.session_id) + bytes(9))
+        self._header[_EPOCH_OFFSET] = self.epoch
+        self._seq_limit = _lane_seq_limit(self.lane)
 
     @property
     def seq(self):
@@ -267,6 +323,17 @@ class Sender:
             self.epoch
         )
 
+    def _next_header(self) -> bytearray:
+        """Stamp the current seq into the header template and nonce buffer."""
+
+        # Proactive rekey threshold to avoid IV exhaustion (cached at build/rekey).
+        seq = self._seq
+        if seq >= self._seq_limit:
+            raise SequenceOverflow("approaching IV exhaustion; trigger rekey")
+        _SEQ.pack_into(self._header, _PREFIX_LEN, seq)
+        _NONCE_SEQ.pack_into(self._nonce, _NONCE_SEQ_OFFSET, seq)
+        return self._header
+
     def encrypt(self, plaintext: bytes) -> bytes:
         """Encrypt plaintext returning: header || ciphertext + tag.
 
@@ -275,23 +342,11 @@ class Sender:
         """
         if not isinstance(plaintext, bytes):
             raise TypeError("plaintext must be bytes")
-        
-        # Proactive rekey threshold to avoid IV exhaustion.
-        # Default threshold is 2^63 if not configured; this gives operators time to rekey.
-        try:
-            threshold = int(CONFIG.get("REKEY_SEQ_THRESHOLD", 1 << 63))
-        except Exception:
-            threshold = 1 << 63
-        if self._seq >= threshold:
-            raise SequenceOverflow("approaching IV exhaustion; trigger rekey")
-        
-        # Pack header with current sequence
-        header = self.pack_header(self._seq)
 
-        iv = _build_nonce(self.epoch, self._seq, self._nonce_len)
+        header = bytes(self._next_header())
 
         try:
-            ciphertext = self._cipher.encrypt(iv, plaintext, header)
+            ciphertext = self._cipher.encrypt(self._nonce, plaintext, header)
         except Exception as e:
             raise AeadError(f"AEAD encryption failed: {e}")
         
@@ -301,6 +356,75 @@ class Sender:
         # Return optimized wire format: header || ciphertext+tag (IV omitted)
         return header + ciphertext
 
+    def encrypt_many(self, plaintexts: Sequence[bytes]) -> List[bytes]:
+        """Encrypt a batch of plaintexts, returning one wire packet per entry.
+
+        Sequence numbers are assigned in order and only committed once the
+        whole batch has been encrypted, so on any exception the sender state
+        is unchanged and the caller may retry per packet. Backends with an
+        `encrypt_many` (native Ascon) process the batch in a single call.
+        """
+        count = len(plaintexts)
+        seq = self._seq
+        if seq + count > self._seq_limit:
+            raise SequenceOverflow("approaching IV exhaustion; trigger rekey")
+
+        header = self._header
+        nonce = self._nonce
+        headers: List[bytes] = []
+        items = []
+        for i, plaintext in enumerate(plaintexts):
+            _SEQ.pack_into(header, _PREFIX_LEN, seq + i)
+            _NONCE_SEQ.pack_into(nonce, _NONCE_SEQ_OFFSET, seq + i)
+            hdr = bytes(header)
+            headers.append(hdr)
+            items.append((bytes(nonce), hdr, plaintext))
+
+        encrypt_many = getattr(self._cipher, "encrypt_many", None)
+        try:
+            if encrypt_many is not None:
+                ciphertexts = encrypt_many(items)
+            else:
+                encrypt = self._cipher.encrypt
+                ciphertexts = [encrypt(n, pt, hdr) for n, hdr, pt in items]
+        except Exception as e:
+            raise AeadError(f"AEAD encryption failed: {e}")
+
+        self._seq = seq + count
+        return [hdr + ct for hdr, ct in zip(headers, ciphertexts)]
+
+    def encrypt_into(self, plaintext, out, offset: int = 0) -> int:
+        """Encrypt `plaintext` straight into the writable buffer `out`.
+
+        Writes header || ciphertext + tag at `out[offset:]` and returns the
+        number of bytes written (HEADER_LEN + len(plaintext) + TAG_LEN).
+        `plaintext` may be any bytes-like object, including a memoryview into
+        a receive buffer. The header is packed in place; the ciphertext is
+        written in place when the backend supports it, otherwise the backend's
+        output is copied once.
+        """
+        view = out if isinstance(out, memoryview) else memoryview(out)
+        pt_len = len(plaintext)
+        total = HEADER_LEN + pt_len + TAG_LEN
+        if offset < 0 or len(view) - offset < total:
+            raise ValueError(f"out buffer too small: need {total} bytes at offset {offset}")
+
+        view[offset:offset + HEADER_LEN] = self._next_header()
+        header = view[offset:offset + HEADER_LEN]
+        body = view[offset + HEADER_LEN:offset + total]
+        nonce = self._nonce
+
+        try:
+            if self._encrypt_into_fn is not None:
+                self._encrypt_into_fn(nonce, plaintext, header, body)
+            else:
+                body[:] = self._cipher.encrypt(nonce, plaintext, header)
+        except Exception as e:
+            raise AeadError(f"AEAD encryption failed: {e}")
+
+        self._seq += 1
+        return total
+
     def bump_epoch(self) -> None:
         """Increase epoch and reset sequence.
 
@@ -310,7 +434,10 @@ class Sender:
         if self.epoch == 255:
             raise AeadError("epoch wrap forbidden without rekey; perform handshake to rotate keys")
         self.epoch += 1
-        self._seq = 0
+        self._seq = self._seq_base
+        self._nonce[0] = self.epoch & 0xFF
+        self._header[_EPOCH_OFFSET] = self.epoch
+        self._seq_limit = _lane_seq_limit(self.lane)
 
 
 @dataclass
@@ -324,7 +451,6 @@ class Receiver:
     strict_mode: bool = False  # True = raise exceptions, False = return None
     aead_token: str = "aesgcm"
     _high: int = -1
-    _mask: int = 0
 
     def __post_init__(self):
         if not isinstance(self.version, int) or self.version != CONFIG["WIRE_VERSION"]:
@@ -347,62 +473,83 @@ class Receiver:
         
         if not isinstance(self._high, int):
             raise TypeError("_high must be int")
-        
-        if not isinstance(self._mask, int) or self._mask < 0:
-            raise ValueError("_mask must be non-negative int")
 
         self._aead_token = _canonicalize_aead_token(self.aead_token)
         self._cipher, self._nonce_len = _instantiate_aead(self._aead_token, self.key_recv)
         self._last_error: Optional[str] = None
+        self._nonce = _new_nonce_buffer(self.epoch, self._nonce_len)
+        self._decrypt_into_fn = getattr(self._cipher, "decrypt_into", None)
+        # Expected version/IDs/session bytes; checked with one comparison per packet.
+        self._prefix = _header_prefix(self.version, self.ids, self.session_id)
+        # Replay window: one byte per sequence number in a power-of-two ring
+        # indexed by seq & _slot_mask, 1 = seen (RFC 6479 style).
+        ring_size = 1 << (self.window - 1).bit_length()
+        self._slot_mask = ring_size - 1
+        self._ring = bytearray(ring_size)
+        self._ring_zeros = memoryview(bytes(ring_size))
+        # Replay state (high, ring) of sequence lanes other than 0, by lane.
+        self._lanes: Dict[int, Tuple[int, bytearray]] = {}
 
     def _check_replay(self, seq: int) -> None:
-        """Check if sequence number should be accepted (anti-replay)."""
-        if seq > self._high:
-            # Future packet - shift window forward
-            shift = seq - self._high
-            if shift >= self.window:
-                # Window completely shifts: reset mask to only include the newest packet
-                # Mask bit 0 corresponds to the current highest sequence number
-                self._mask = 1
-            else:
-                # Partial shift
-                self._mask = (self._mask << shift) | 1
-                # Mask to window size to prevent overflow
-                self._mask &= (1 << self.window) - 1
+        """Check if sequence number should be accepted (anti-replay).
+
+        Slots between the previous and the new highest sequence number are
+        cleared as the window advances, so an update costs the same whatever
+        the window size and never allocates.
+        """
+        high = self._high
+        if seq > high:
+            # Future packet - advance the window
+            ring = self._ring
+            slot_mask = self._slot_mask
+            shift = seq - high
+            if shift > 1:
+                # Skipped slots still hold marks from one ring length ago
+                if shift > slot_mask:
+                    ring[:] = self._ring_zeros
+                else:
+                    start = (high + 1) & slot_mask
+                    end = seq & slot_mask
+                    if start < end:
+                        ring[start:end] = self._ring_zeros[:end - start]
+                    else:
+                        ring[start:] = self._ring_zeros[start:]
+                        ring[:end] = self._ring_zeros[:end]
+            ring[seq & slot_mask] = 1
             self._high = seq
-        elif seq > self._high - self.window:
+        elif seq > high - self.window:
             # Within window - check if already seen
-            offset = self._high - seq
-            bit_pos = offset
-            if self._mask & (1 << bit_pos):
+            slot = seq & self._slot_mask
+            if self._ring[slot]:
                 raise ReplayError(f"duplicate packet seq={seq}")
             # Mark as seen
-            self._mask |= (1 << bit_pos)
+            self._ring[slot] = 1
         else:
             # Too old - outside window
             raise ReplayError(f"packet too old seq={seq}, high={self._high}, window={self.window}")
 
-    def decrypt(self, wire: bytes) -> Optional[bytes]:
-        """Validate header, perform anti-replay, reconstruct IV, decrypt.
+    def _accept_wire(self, wire) -> Optional[int]:
+        """Validate the header of `wire` (bytes or memoryview) and the replay window.
 
-        Returns plaintext bytes or None (silent mode) on failure.
+        Returns the packet sequence number, or None (silent mode) on failure.
         """
-        if not isinstance(wire, bytes):
-            raise ValueError("wire must be bytes")
-        
-        if len(wire) < HEADER_LEN:
-            raise ValueError("wire too short for header")
-        
-        # Extract header
-        header = wire[:HEADER_LEN]
-        
-        # Unpack and validate header
+        prefix, seq, epoch = _PREFIX_SEQ_EPOCH.unpack_from(wire)
+        if prefix == self._prefix and epoch == self.epoch:
+            return self._accept_seq(seq)
+        # Slow path: unpack every field to classify the mismatch.
         try:
-            fields = struct.unpack(HEADER_STRUCT, header)
-            version, kem_id, kem_param, sig_id, sig_param, session_id, seq, epoch = fields
+            fields = _HEADER.unpack_from(wire)
         except struct.error as e:
             raise ValueError(f"header unpack failed: {e}")
-        
+        return self._accept_header(fields)
+
+    def _accept_header(self, fields: Tuple, check_replay: bool = True) -> Optional[int]:
+        """Validate unpacked header fields and (with `check_replay`) the replay window.
+
+        Returns the packet sequence number, or None (silent mode) on failure.
+        """
+        version, kem_id, kem_param, sig_id, sig_param, session_id, seq, epoch = fields
+
         # Validate header fields
         if version != self.version:
             self._last_error = "header"
@@ -423,23 +570,61 @@ class Receiver:
         if epoch != self.epoch:
             self._last_error = "session"
             return None  # Wrong epoch - always fail silently for rekeying
-        
-        # Check replay protection
+
+        return self._accept_seq(seq) if check_replay else seq
+
+    def _check_lane_replay(self, seq: int) -> None:
+        """Run `_check_replay` against the window of the lane `seq` belongs to."""
+        lane = seq >> SEQ_LANE_SHIFT
+        lane0 = (self._high, self._ring)
+        state = self._lanes.get(lane)
+        if state is None:
+            state = (-1, bytearray(len(self._ring)))
+        self._high, self._ring = state
         try:
             self._check_replay(seq)
+        finally:
+            self._lanes[lane] = (self._high, self._ring)
+            self._high, self._ring = lane0
+
+    def _accept_seq(self, seq: int) -> Optional[int]:
+        # Check replay protection (one window per sequence lane)
+        try:
+            if seq >> SEQ_LANE_SHIFT:
+                self._check_lane_replay(seq)
+            else:
+                self._check_replay(seq)
         except ReplayError:
             self._last_error = "replay"
             if self.strict_mode:
                 raise
             return None
+        return seq
+
+    def decrypt(self, wire: bytes) -> Optional[bytes]:
+        """Validate header, perform anti-replay, reconstruct IV, decrypt.
+
+        Returns plaintext bytes or None (silent mode) on failure.
+        """
+        if not isinstance(wire, bytes):
+            raise ValueError("wire must be bytes")
+        
+        if len(wire) < HEADER_LEN:
+            raise ValueError("wire too short for header")
+        
+        seq = self._accept_wire(wire)
+        if seq is None:
+            return None
+        header = wire[:HEADER_LEN]
         
         # Reconstruct deterministic IV instead of reading from wire
-        iv = _build_nonce(epoch, seq, self._nonce_len)
+        nonce = self._nonce
+        _NONCE_SEQ.pack_into(nonce, _NONCE_SEQ_OFFSET, seq)
         ciphertext = wire[HEADER_LEN:]
         
         # Decrypt with header as AAD
         try:
-            plaintext = self._cipher.decrypt(iv, ciphertext, header)
+            plaintext = self._cipher.decrypt(nonce, ciphertext, header)
         except InvalidTag:
             self._last_error = "auth"
             if self.strict_mode:
@@ -450,10 +635,71 @@ class Receiver:
         self._last_error = None
         return plaintext
 
+    def decrypt_into(self, wire, out) -> Optional[int]:
+        """Decrypt a wire packet held in any bytes-like object into `out`.
+
+        `wire` may be a memoryview over a receive buffer; header and
+        ciphertext are read in place. On success the plaintext occupies
+        `out[:n]` and n is returned; `out` must be writable. Failures behave
+        like `decrypt` (None in silent mode, exceptions in strict mode), except
+        that a wire too short to carry the tag is a header failure, not "auth".
+        """
+        view = wire if isinstance(wire, memoryview) else memoryview(wire)
+        if len(view) < HEADER_LEN:
+            raise ValueError("wire too short for header")
+        if len(view) < HEADER_LEN + TAG_LEN:
+            return self._reject_truncated(view)
+        pt_len = len(view) - HEADER_LEN - TAG_LEN
+        out_view = out if isinstance(out, memoryview) else memoryview(out)
+        if len(out_view) < pt_len:
+            raise ValueError(f"out buffer must hold {pt_len} bytes")
+
+        seq = self._accept_wire(view)
+        if seq is None:
+            return None
+
+        nonce = self._nonce
+        _NONCE_SEQ.pack_into(nonce, _NONCE_SEQ_OFFSET, seq)
+        header = view[:HEADER_LEN]
+        body = view[HEADER_LEN:]
+
+        try:
+            if self._decrypt_into_fn is not None:
+                self._decrypt_into_fn(nonce, body, header, out_view[:pt_len])
+            else:
+                out_view[:pt_len] = self._cipher.decrypt(nonce, body, header)
+        except InvalidTag:
+            self._last_error = "auth"
+            if self.strict_mode:
+                raise AeadAuthError("AEAD authentication failed")
+            return None
+        except Exception as e:
+            raise AeadError(f"AEAD decryption failed: {e}")
+        self._last_error = None
+        return pt_len
+
+    def _reject_truncated(self, wire) -> None:
+        """Reject a wire with a header but no room for the tag as a format error.
+
+        The header is still checked first so session/epoch mismatches are
+        reported as such; the replay window is left untouched.
+        """
+        try:
+            fields = _HEADER.unpack_from(wire)
+        except struct.error as e:
+            raise ValueError(f"header unpack failed: {e}")
+        if self._accept_header(fields, check_replay=False) is None:
+            return None
+        self._last_error = "header"
+        if self.strict_mode:
+            raise HeaderMismatch("wire too short for AEAD tag")
+        return None
+
     def reset_replay(self) -> None:
         """Clear replay protection state."""
         self._high = -1
-        self._mask = 0
+        self._ring[:] = self._ring_zeros
+        self._lanes.clear()
 
     def bump_epoch(self) -> None:
         """Increase epoch and reset replay state.
@@ -464,6 +710,7 @@ class Receiver:
         if self.epoch == 255:
             raise AeadError("epoch wrap forbidden without rekey; perform handshake to rotate keys")
         self.epoch += 1
+        self._nonce[0] = self.epoch & 0xFF
         self.reset_replay()
 
     def last_error_reason(self) -> Optional[str]:
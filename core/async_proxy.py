@@ -8,12 +8,13 @@ Responsibilities:
 
 Note: This module uses the low-level `selectors` stdlib facility—not `asyncio`—to
 remain dependency-light and fully deterministic for test harnesses. The filename
-is retained for backward compatibility; a future refactor may rename it to
-`selector_proxy.py` and/or introduce an asyncio variant.
+is retained for backward compatibility; the asyncio engine lives in
+`core.asyncio_proxy` (PROXY_ENGINE = "asyncio").
 """
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import queue
@@ -25,18 +26,19 @@ import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from core.config import CONFIG
-from core.suites import SUITES, get_suite, header_ids_for_suite, list_suites
+from core.suites import get_suite, header_ids_for_suite, list_suites
 try:
     # Optional helper (if you implemented it)
     from core.suites import header_ids_from_names  # type: ignore
 except Exception:
     header_ids_from_names = None  # type: ignore
 
-from core.handshake import client_drone_handshake, server_gcs_handshake
-from core.exceptions import HandshakeVerifyError, HandshakeError, HandshakeFormatError, AeadError
+from core.handshake import client_drone_handshake
+from core.handshake_server import serve_gcs_handshake
+from core.exceptions import AeadError
 from core.logging_utils import get_logger
 
 from core.aead import (
@@ -47,7 +49,7 @@ from core.aead import (
     ReplayError,
     Sender,
 )
-from core.aead import HEADER_STRUCT as AEAD_HEADER_STRUCT, HEADER_LEN as AEAD_HEADER_LEN
+from core.aead import HEADER_STRUCT as AEAD_HEADER_STRUCT, HEADER_LEN as AEAD_HEADER_LEN, TAG_LEN as AEAD_TAG_LEN
 from core.exceptions import ConfigError, SequenceOverflow
 
 from core.policy_engine import (
@@ -60,60 +62,219 @@ from core.policy_engine import (
     record_rekey_result,
     request_prepare,
     set_coordinator_role,
+    take_resume_nonces,
 )
 
-from core.control_tcp import start_control_server_if_enabled
+from core.kem_pool import KemKeypairPool
+from core.resumption import ResumptionState
+from core.session_switch import SessionSwitch
+from core.udp_batch import BatchSocket, batch_bucket
+
+if TYPE_CHECKING:  # imported lazily at runtime; only needed when enabled
+    from core.control_tcp import ControlTcpServer
+    from core.crypto_offload import CryptoOffload
 
 logger = get_logger("pqc")
 
 
+_DATAPATH_FIELDS = (
+    "ptx_out",        # plaintext packets sent out to app
+    "ptx_in",         # plaintext packets received from app
+    "enc_out",        # encrypted packets sent to peer
+    "enc_in",         # encrypted packets received from peer
+    "ptx_bytes_out",  # plaintext bytes sent out to app
+    "ptx_bytes_in",   # plaintext bytes received from app
+    "enc_bytes_out",  # encrypted bytes sent to peer
+    "enc_bytes_in",   # encrypted bytes received from peer
+    "drops",          # total drops
+    # Granular drop reasons
+    "drop_replay",
+    "drop_auth",
+    "drop_header",
+    "drop_session_epoch",
+    "drop_other",
+    "drop_src_addr",
+)
+
+# Counters published to the --status-shm segment (core.counter_shm).
+_EXPORT_FIELDS = _DATAPATH_FIELDS + ("rekeys_ok", "rekeys_fail", "rekeys_resumed")
+
+_PRIMITIVE_KEYS = ("aead_encrypt", "aead_decrypt_ok", "aead_decrypt_fail")
+_SNAPSHOT_RETRIES = 1000
+
+
+class DatapathCounters:
+    """Packet counters written only by the datapath (selector) thread.
+
+    The owning thread updates fields without any lock. Each group of related
+    updates is bracketed by two ``seq`` increments, so ``seq`` is odd while a
+    write is in flight; ``snapshot()`` retries until it copies the fields under
+    an even, unchanged ``seq`` and therefore never sees half of a packet.
+    """
+
+    __slots__ = _DATAPATH_FIELDS + (
+        "seq",
+        "last_packet_mono",
+        "primitives",
+        "batches",
+    )
+
+    def __init__(self) -> None:
+        for name in _DATAPATH_FIELDS:
+            setattr(self, name, 0)
+        self.seq = 0
+        self.last_packet_mono: Optional[float] = None
+        # name -> [count, total_ns, min_ns, max_ns, total_in_bytes, total_out_bytes]
+        self.primitives: Dict[str, list] = {key: [0, 0, 0, 0, 0, 0] for key in _PRIMITIVE_KEYS}
+        self.batches: Dict[str, Dict[str, object]] = {}
+
+    def touch(self) -> None:
+        """Mark packet activity."""
+
+        self.last_packet_mono = time.monotonic()
+
+    def add_primitive(self, key: str, duration_ns: int, in_bytes: int, out_bytes: int) -> None:
+        stats = self.primitives[key]
+        stats[0] += 1
+        stats[1] += duration_ns
+        if duration_ns < stats[2] or stats[2] == 0:
+            stats[2] = duration_ns
+        if duration_ns > stats[3]:
+            stats[3] = duration_ns
+        stats[4] += in_bytes
+        stats[5] += out_bytes
+
+    def add_batch(self, source: str, size: int) -> None:
+        stats = self.batches.get(source)
+        if stats is None:
+            stats = {"wakeups": 0, "packets": 0, "max": 0, "hist": {}}
+            self.batches[source] = stats
+        stats["wakeups"] += 1
+        stats["packets"] += size
+        if size > stats["max"]:
+            stats["max"] = size
+        bucket = batch_bucket(size)
+        stats["hist"][bucket] = stats["hist"].get(bucket, 0) + 1
+
+    def snapshot_fields(self) -> Tuple[int, ...]:
+        """Consistent copy of just the packet counters, in _DATAPATH_FIELDS order."""
+
+        for _ in range(_SNAPSHOT_RETRIES):
+            start = self.seq
+            if start & 1:
+                time.sleep(0)
+                continue
+            values = tuple(getattr(self, name) for name in _DATAPATH_FIELDS)
+            if self.seq == start:
+                return values
+        return tuple(getattr(self, name) for name in _DATAPATH_FIELDS)
+
+    def snapshot(self) -> Tuple[Dict[str, int], Dict[str, list], Dict[str, Dict[str, object]]]:
+        """Return a consistent copy of (fields, primitives, batches) from any thread."""
+
+        for _ in range(_SNAPSHOT_RETRIES):
+            start = self.seq
+            if start & 1:
+                time.sleep(0)
+                continue
+            try:
+                fields = {name: getattr(self, name) for name in _DATAPATH_FIELDS}
+                primitives = {key: list(stats) for key, stats in self.primitives.items()}
+                batches = {
+                    source: dict(stats, hist=dict(stats["hist"]))
+                    for source, stats in self.batches.items()
+                }
+            except RuntimeError:
+                # A batch source was added mid-copy; try again.
+                continue
+            if self.seq == start:
+                return fields, primitives, batches
+        # Writer is stuck mid-update (should not happen); return a best-effort copy.
+        fields = {name: getattr(self, name) for name in _DATAPATH_FIELDS}
+        primitives = {key: list(stats) for key, stats in self.primitives.items()}
+        return fields, primitives, {}
+
+
 class ProxyCounters:
-    """Simple counters for proxy statistics."""
+    """Simple counters for proxy statistics.
+
+    Per-packet counters live in ``datapath`` and are written lock-free by the
+    selector thread. Rekey/control fields stay on this object and are guarded
+    by the proxy's ``counters_lock``.
+    """
 
     def __init__(self) -> None:
-        self.ptx_out = 0      # plaintext packets sent out to app
-        self.ptx_in = 0       # plaintext packets received from app
-        self.enc_out = 0      # encrypted packets sent to peer
-        self.enc_in = 0       # encrypted packets received from peer
-        self.ptx_bytes_out = 0  # plaintext bytes sent out to app
-        self.ptx_bytes_in = 0   # plaintext bytes received from app
-        self.enc_bytes_out = 0  # encrypted bytes sent to peer
-        self.enc_bytes_in = 0   # encrypted bytes received from peer
-        self.drops = 0        # total drops
-        # Granular drop reasons
-        self.drop_replay = 0
-        self.drop_auth = 0
-        self.drop_header = 0
-        self.drop_session_epoch = 0
-        self.drop_other = 0
-        self.drop_src_addr = 0
+        self.datapath = DatapathCounters()
         self.rekeys_ok = 0
         self.rekeys_fail = 0
+        self.rekeys_resumed = 0
         self.last_rekey_ms = 0
         self.last_rekey_suite: Optional[str] = None
         self.rekey_interval_ms = 0.0
         self.rekey_duration_ms = 0.0
-        self.rekey_blackout_duration_ms = 0.0
         self.rekey_trigger_reason: Optional[str] = None
         self._last_rekey_start_mono: Optional[float] = None
         self._last_rekey_end_mono: Optional[float] = None
-        self._last_packet_mono: Optional[float] = None
         self._rekey_active = False
-        self._rekey_blackout_start_mono: Optional[float] = None
-        self._rekey_blackout_end_mono: Optional[float] = None
+        # The datapath's SessionSwitch, source of the cut-over metrics.
+        self.session: Optional[SessionSwitch] = None
         self.handshake_metrics: Dict[str, object] = {}
-        self._primitive_templates = {
-            "count": 0,
-            "total_ns": 0,
-            "min_ns": None,
-            "max_ns": 0,
-            "total_in_bytes": 0,
-            "total_out_bytes": 0,
+        # Per-wake-up batch sizes, only reported when PROXY_BATCH_SIZE > 1.
+        self.batch_limit = 0
+        self.batch_mmsg = False
+        # Latest counter payloads from sharded datapath workers, by worker index.
+        self.shards: Dict[int, Dict[str, object]] = {}
+        # GCS KEM keypair pool (core.kem_pool), reported when enabled.
+        self.kem_pool = None
+        # GCS handshake crypto worker (core.crypto_offload), reported when enabled.
+        self.crypto_offload = None
+
+    @property
+    def primitive_metrics(self) -> Dict[str, Dict[str, object]]:
+        _fields, primitives, _batches = self.datapath.snapshot()
+        return self._primitive_dicts(primitives)
+
+    @staticmethod
+    def _primitive_dicts(primitives: Dict[str, list]) -> Dict[str, Dict[str, object]]:
+        return {
+            key: {
+                "count": stats[0],
+                "total_ns": stats[1],
+                "min_ns": stats[2],
+                "max_ns": stats[3],
+                "total_in_bytes": stats[4],
+                "total_out_bytes": stats[5],
+            }
+            for key, stats in primitives.items()
         }
-        self.primitive_metrics: Dict[str, Dict[str, object]] = {
-            "aead_encrypt": dict(self._primitive_templates),
-            "aead_decrypt_ok": dict(self._primitive_templates),
-            "aead_decrypt_fail": dict(self._primitive_templates),
+
+    def rekey_switch_metrics(self) -> Dict[str, object]:
+        """Cut-over metrics of the latest rekey, merged across shard workers.
+
+        The blackout is the worst inbound delivery gap across the switch of
+        any datapath that has delivered a packet under the new session (None
+        until one has); everything is zero before the first rekey.
+        """
+
+        if self.session is None or self.session.generation == 0:
+            return {
+                "rekey_blackout_duration_ms": 0.0,
+                "rekey_prev_session_rx": 0,
+                "rekey_switch_ms": 0.0,
+                "rekey_switch_reason": "",
+            }
+        main = self.session.stats()
+        switches = [main]
+        for shard in self.shards.values():
+            switch = shard.get("switch")
+            if switch and switch.get("generation") == main["generation"]:
+                switches.append(switch)
+        blackouts = [switch["blackout_ms"] for switch in switches if switch["blackout_ms"] is not None]
+        return {
+            "rekey_blackout_duration_ms": max(blackouts) if blackouts else None,
+            "rekey_prev_session_rx": sum(int(switch["prev_rx"]) for switch in switches),
+            "rekey_switch_ms": main["switch_ms"],
+            "rekey_switch_reason": main["switch_reason"] or "",
         }
 
     @staticmethod
@@ -126,7 +287,7 @@ class ProxyCounters:
             return 0.0
         return round(ns / 1_000_000.0, 6)
 
-    def _part_b_metrics(self) -> Dict[str, object]:
+    def _part_b_metrics(self, primitive_metrics: Dict[str, Dict[str, object]]) -> Dict[str, object]:
         handshake = self.handshake_metrics
         if not isinstance(handshake, dict) or not handshake:
             return {}
@@ -169,7 +330,7 @@ class ProxyCounters:
         summary["shared_secret_size_bytes"] = int(kem.get("shared_secret_bytes", 0) or 0)
 
         def _avg_ns_for(key: str) -> float:
-            stats = self.primitive_metrics.get(key)
+            stats = primitive_metrics.get(key)
             if not isinstance(stats, dict):
                 return 0.0
             count = int(stats.get("count", 0) or 0)
@@ -198,48 +359,83 @@ class ProxyCounters:
 
         return summary
 
+    def export_values(self) -> List[int]:
+        """Values for core.counter_shm, in _EXPORT_FIELDS order (shards merged)."""
+
+        values = list(self.datapath.snapshot_fields())
+        for shard in list(self.shards.values()):
+            shard_fields = shard["fields"]
+            for index, name in enumerate(_DATAPATH_FIELDS):
+                values[index] += int(shard_fields.get(name, 0))
+        values.extend((self.rekeys_ok, self.rekeys_fail, self.rekeys_resumed))
+        return values
+
     def to_dict(self) -> Dict[str, object]:
-        def _serialize(stats: Dict[str, object]) -> Dict[str, object]:
-            return {
-                "count": int(stats.get("count", 0) or 0),
-                "total_ns": int(stats.get("total_ns", 0) or 0),
-                "min_ns": int(stats.get("min_ns") or 0),
-                "max_ns": int(stats.get("max_ns", 0) or 0),
-                "total_in_bytes": int(stats.get("total_in_bytes", 0) or 0),
-                "total_out_bytes": int(stats.get("total_out_bytes", 0) or 0),
-            }
+        fields, primitives, batches = self.datapath.snapshot()
+        per_worker = None
+        if self.shards:
+            per_worker = {0: {name: fields[name] for name in _WORKER_SUMMARY_FIELDS}}
+            for index, shard in sorted(self.shards.items()):
+                per_worker[index] = {name: shard["fields"][name] for name in _WORKER_SUMMARY_FIELDS}
+                _merge_snapshot(fields, primitives, batches, shard)
+        primitive_metrics = self._primitive_dicts(primitives)
 
         result = {
-            "ptx_out": self.ptx_out,
-            "ptx_in": self.ptx_in,
-            "enc_out": self.enc_out,
-            "enc_in": self.enc_in,
-            "ptx_bytes_out": self.ptx_bytes_out,
-            "ptx_bytes_in": self.ptx_bytes_in,
-            "enc_bytes_out": self.enc_bytes_out,
-            "enc_bytes_in": self.enc_bytes_in,
-            "bytes_out": self.enc_bytes_out,
-            "bytes_in": self.enc_bytes_in,
-            "drops": self.drops,
-            "drop_replay": self.drop_replay,
-            "drop_auth": self.drop_auth,
-            "drop_header": self.drop_header,
-            "drop_session_epoch": self.drop_session_epoch,
-            "drop_other": self.drop_other,
-            "drop_src_addr": self.drop_src_addr,
+            "ptx_out": fields["ptx_out"],
+            "ptx_in": fields["ptx_in"],
+            "enc_out": fields["enc_out"],
+            "enc_in": fields["enc_in"],
+            "ptx_bytes_out": fields["ptx_bytes_out"],
+            "ptx_bytes_in": fields["ptx_bytes_in"],
+            "enc_bytes_out": fields["enc_bytes_out"],
+            "enc_bytes_in": fields["enc_bytes_in"],
+            "bytes_out": fields["enc_bytes_out"],
+            "bytes_in": fields["enc_bytes_in"],
+            "drops": fields["drops"],
+            "drop_replay": fields["drop_replay"],
+            "drop_auth": fields["drop_auth"],
+            "drop_header": fields["drop_header"],
+            "drop_session_epoch": fields["drop_session_epoch"],
+            "drop_other": fields["drop_other"],
+            "drop_src_addr": fields["drop_src_addr"],
             "rekeys_ok": self.rekeys_ok,
             "rekeys_fail": self.rekeys_fail,
+            "rekeys_resumed": self.rekeys_resumed,
             "last_rekey_ms": self.last_rekey_ms,
             "last_rekey_suite": self.last_rekey_suite or "",
             "rekey_interval_ms": self.rekey_interval_ms,
             "rekey_duration_ms": self.rekey_duration_ms,
-            "rekey_blackout_duration_ms": self.rekey_blackout_duration_ms,
             "rekey_trigger_reason": self.rekey_trigger_reason or "",
             "handshake_metrics": self.handshake_metrics,
-            "primitive_metrics": {name: _serialize(stats) for name, stats in self.primitive_metrics.items()},
+            "primitive_metrics": primitive_metrics,
         }
+        result.update(self.rekey_switch_metrics())
+
+        if self.batch_limit > 1:
+            result["batch_metrics"] = {
+                "limit": self.batch_limit,
+                "mmsg": self.batch_mmsg,
+                "sources": {
+                    name: {
+                        "wakeups": int(stats["wakeups"]),
+                        "packets": int(stats["packets"]),
+                        "max": int(stats["max"]),
+                        "avg": round(stats["packets"] / stats["wakeups"], 3) if stats["wakeups"] else 0.0,
+                        "hist": stats["hist"],
+                    }
+                    for name, stats in batches.items()
+                },
+            }
+
+        if per_worker is not None:
+            result["worker_metrics"] = {"count": len(per_worker), "per_worker": per_worker}
 
-        part_b = self._part_b_metrics()
+        if self.kem_pool is not None:
+            result["kem_pool"] = self.kem_pool.stats()
+        if self.crypto_offload is not None:
+            result["crypto_offload"] = self.crypto_offload.stats()
+
+        part_b = self._part_b_metrics(primitive_metrics)
         if part_b:
             result["part_b_metrics"] = part_b
             for key, value in part_b.items():
@@ -247,27 +443,68 @@ class ProxyCounters:
 
         return result
 
-    def _update_primitive(self, key: str, duration_ns: int, in_bytes: int, out_bytes: int) -> None:
-        stats = self.primitive_metrics.setdefault(key, dict(self._primitive_templates))
-        stats["count"] = int(stats.get("count", 0) or 0) + 1
-        stats["total_ns"] = int(stats.get("total_ns", 0) or 0) + max(0, int(duration_ns))
-        current_min = stats.get("min_ns")
-        if current_min in (None, 0) or (isinstance(current_min, int) and duration_ns < current_min):
-            stats["min_ns"] = max(0, int(duration_ns))
-        current_max = stats.get("max_ns", 0) or 0
-        if duration_ns > current_max:
-            stats["max_ns"] = max(0, int(duration_ns))
-        stats["total_in_bytes"] = int(stats.get("total_in_bytes", 0) or 0) + max(0, int(in_bytes))
-        stats["total_out_bytes"] = int(stats.get("total_out_bytes", 0) or 0) + max(0, int(out_bytes))
+    # The record_* helpers below write the datapath shard and must only be
+    # called from the datapath thread.
 
     def record_encrypt(self, duration_ns: int, plaintext_bytes: int, ciphertext_bytes: int) -> None:
-        self._update_primitive("aead_encrypt", duration_ns, plaintext_bytes, ciphertext_bytes)
+        self.datapath.add_primitive("aead_encrypt", duration_ns, plaintext_bytes, ciphertext_bytes)
 
     def record_decrypt_ok(self, duration_ns: int, ciphertext_bytes: int, plaintext_bytes: int) -> None:
-        self._update_primitive("aead_decrypt_ok", duration_ns, ciphertext_bytes, plaintext_bytes)
+        self.datapath.add_primitive("aead_decrypt_ok", duration_ns, ciphertext_bytes, plaintext_bytes)
 
     def record_decrypt_fail(self, duration_ns: int, ciphertext_bytes: int) -> None:
-        self._update_primitive("aead_decrypt_fail", duration_ns, ciphertext_bytes, 0)
+        self.datapath.add_primitive("aead_decrypt_fail", duration_ns, ciphertext_bytes, 0)
+
+    def record_batch(self, source: str, size: int) -> None:
+        """Record how many datagrams one selector wake-up drained from `source`."""
+
+        if size <= 0:
+            return
+        datapath = self.datapath
+        datapath.seq += 1
+        datapath.add_batch(source, size)
+        datapath.seq += 1
+
+
+_WORKER_SUMMARY_FIELDS = ("ptx_in", "enc_out", "enc_in", "ptx_out", "drops")
+
+
+def _merge_snapshot(
+    fields: Dict[str, int],
+    primitives: Dict[str, list],
+    batches: Dict[str, Dict[str, object]],
+    shard: Dict[str, object],
+) -> None:
+    """Add one worker's counter payload into a datapath snapshot, in place."""
+
+    for name, value in shard["fields"].items():
+        fields[name] = fields.get(name, 0) + value
+    for key, stats in shard["primitives"].items():
+        mine = primitives.setdefault(key, [0, 0, 0, 0, 0, 0])
+        if stats[0]:
+            mine[2] = stats[2] if mine[0] == 0 else min(mine[2], stats[2])
+        mine[0] += stats[0]
+        mine[1] += stats[1]
+        mine[3] = max(mine[3], stats[3])
+        mine[4] += stats[4]
+        mine[5] += stats[5]
+    for source, stats in shard["batches"].items():
+        mine = batches.setdefault(source, {"wakeups": 0, "packets": 0, "max": 0, "hist": {}})
+        mine["wakeups"] += stats["wakeups"]
+        mine["packets"] += stats["packets"]
+        mine["max"] = max(mine["max"], stats["max"])
+        for bucket, count in stats["hist"].items():
+            mine["hist"][bucket] = mine["hist"].get(bucket, 0) + count
+
+
+def _datapath_field(name: str) -> property:
+    return property(lambda self: getattr(self.datapath, name), doc=f"Read-only view of datapath.{name}.")
+
+
+# Backwards-compatible read access to datapath fields (counters.enc_in, ...).
+for _name in _DATAPATH_FIELDS:
+    setattr(ProxyCounters, _name, _datapath_field(_name))
+del _name
 
 
 def _dscp_to_tos(dscp: Optional[int]) -> Optional[int]:
@@ -318,42 +555,6 @@ def _parse_header_fields(
     return ("auth_fail_or_replay", seq)
 
 
-class _TokenBucket:
-    """Per-IP rate limiter using token bucket algorithm."""
-    def __init__(self, capacity: int, refill_per_sec: float) -> None:
-        self.capacity = max(1, capacity)
-        self.refill = max(0.01, float(refill_per_sec))
-        self.tokens: Dict[str, float] = {}      # ip -> tokens
-        self.last: Dict[str, float] = {}        # ip -> last timestamp
-        # Track last-seen to allow TTL-based pruning of state for long-running servers
-        self._seen_ts: Dict[str, float] = {}
-
-    def allow(self, ip: str) -> bool:
-        """Check if request from IP should be allowed."""
-        now = time.monotonic()
-        t = self.tokens.get(ip, self.capacity)
-        last = self.last.get(ip, now)
-        # refill
-        t = min(self.capacity, t + (now - last) * self.refill)
-        self.last[ip] = now
-        self._seen_ts[ip] = now
-        if t >= 1.0:
-            t -= 1.0
-            self.tokens[ip] = t
-            return True
-        self.tokens[ip] = t
-        return False
-
-    def prune(self, idle_seconds: float) -> None:
-        """Remove entries not seen within idle_seconds to prevent unbounded growth."""
-        cutoff = time.monotonic() - float(idle_seconds)
-        for ip in list(self._seen_ts.keys()):
-            if self._seen_ts.get(ip, 0) < cutoff:
-                self._seen_ts.pop(ip, None)
-                self.tokens.pop(ip, None)
-                self.last.pop(ip, None)
-
-
 def _validate_config(cfg: dict) -> None:
     """Validate required configuration keys are present."""
     required_keys = [
@@ -378,6 +579,8 @@ def _perform_handshake(
     *,
     accept_deadline_s: Optional[float] = None,
     io_timeout_s: Optional[float] = None,
+    kem_pool: Optional[KemKeypairPool] = None,
+    offload: Optional[CryptoOffload] = None,
 ) -> Tuple[
     bytes,
     bytes,
@@ -393,6 +596,8 @@ def _perform_handshake(
 
     accept_deadline_s limits how long the GCS waits for an inbound TCP connect.
     io_timeout_s controls per-socket I/O timeouts for handshake reads/writes.
+    kem_pool (GCS only) supplies pre-generated ephemeral KEM keypairs.
+    offload (GCS only) runs KEM keygen/decap and signing in its worker process.
 
     Backward compatibility: stop_after_seconds is treated as accept_deadline_s
     when accept_deadline_s is not explicitly provided.
@@ -418,143 +623,39 @@ def _perform_handshake(
         if gcs_sig_secret is None:
             raise ConfigError("GCS signature secret not provided")
 
-        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server_sock.bind(("0.0.0.0", cfg["TCP_HANDSHAKE_PORT"]))
-        server_sock.listen(32)
-
-        if ready_event:
-            ready_event.set()
-
-        timeout = accept_deadline_s if accept_deadline_s is not None else 30.0
-        deadline: Optional[float] = None
-        if accept_deadline_s is not None:
-            deadline = time.monotonic() + accept_deadline_s
-
-        gate = _TokenBucket(
-            cfg.get("HANDSHAKE_RL_BURST", 5),
-            cfg.get("HANDSHAKE_RL_REFILL_PER_SEC", 1),
+        result, ip = serve_gcs_handshake(
+            cfg,
+            suite,
+            gcs_sig_secret,
+            io_timeout=io_timeout,
+            accept_deadline_s=accept_deadline_s,
+            ready_event=ready_event,
+            kem_pool=kem_pool,
+            offload=offload,
+        )
+        # Support either 5-tuple or 7-tuple
+        metrics_payload: Dict[str, object] = {}
+        if len(result) >= 7:
+            k_d2g, k_g2d, nseed_d2g, nseed_g2d, session_id, kem_name, sig_name = result[:7]
+            if len(result) >= 8 and isinstance(result[7], dict):
+                metrics_payload = result[7]
+        else:
+            k_d2g, k_g2d, nseed_d2g, nseed_g2d, session_id = result
+            kem_name = sig_name = None
+        if not metrics_payload:
+            metrics_payload = {}
+        peer_addr = (ip, cfg["UDP_DRONE_RX"])
+        return (
+            k_d2g,
+            k_g2d,
+            nseed_d2g,
+            nseed_g2d,
+            session_id,
+            kem_name,
+            sig_name,
+            peer_addr,
+            metrics_payload,
         )
-        prune_interval = max(5.0, float(cfg.get("HANDSHAKE_RL_PRUNE_INTERVAL_S", 60.0)))
-        prune_idle_s = max(prune_interval, float(cfg.get("HANDSHAKE_RL_IDLE_TTL_S", 600.0)))
-        next_prune = time.monotonic() + prune_interval
-
-        try:
-            try:
-                while True:
-                    if deadline is not None:
-                        remaining = deadline - time.monotonic()
-                        if remaining <= 0:
-                            raise socket.timeout
-                        server_sock.settimeout(max(0.01, remaining))
-                    else:
-                        server_sock.settimeout(timeout)
-
-                    now_monotonic = time.monotonic()
-                    if now_monotonic >= next_prune:
-                        gate.prune(prune_idle_s)
-                        next_prune = now_monotonic + prune_interval
-
-                    try:
-                        conn, addr = server_sock.accept()
-                    except socket.timeout:
-                        # If an explicit accept deadline is configured, treat expiry as a
-                        # legacy-style config/runtime error (keeps older harnesses stable).
-                        # Otherwise, continue waiting indefinitely for the initial drone connect.
-                        if accept_deadline_s is not None:
-                            raise ConfigError("No drone connection received within timeout")
-                        continue
-                    try:
-                        ip, _port = addr
-                        allowed_ips = {str(cfg["DRONE_HOST"])}
-                        allowlist = cfg.get("DRONE_HOST_ALLOWLIST", []) or []
-                        if isinstance(allowlist, (list, tuple, set)):
-                            for entry in allowlist:
-                                allowed_ips.add(str(entry))
-                        else:
-                            allowed_ips.add(str(allowlist))
-                        strict_ip = bool(cfg.get("STRICT_HANDSHAKE_IP", True))
-                        if strict_ip:
-                            if ip not in allowed_ips:
-                                logger.warning(
-                                    "Rejected handshake from unauthorized IP",
-                                    extra={"role": role, "expected": sorted(allowed_ips), "received": ip},
-                                )
-                                conn.close()
-                                continue
-                        else:
-                            # Accept connection but log and record received IP for diagnostics
-                            if ip not in allowed_ips:
-                                logger.warning(
-                                    "Handshake IP allowlist disabled; accepting connection from unexpected IP",
-                                    extra={"role": role, "expected": sorted(allowed_ips), "received": ip},
-                                )
-
-                        if not gate.allow(ip):
-                            try:
-                                conn.settimeout(0.2)
-                                conn.sendall(b"\x00")
-                            except OSError:
-                                pass
-                            finally:
-                                conn.close()
-                            logger.warning(
-                                "Handshake rate-limit drop",
-                                extra={"role": role, "ip": ip},
-                            )
-                            continue
-
-                        try:
-                            result = server_gcs_handshake(conn, suite, gcs_sig_secret, timeout=io_timeout)
-                        except HandshakeVerifyError:
-                            logger.warning(
-                                "Rejected drone handshake with failed authentication",
-                                extra={"role": role, "expected": cfg["DRONE_HOST"], "received": ip},
-                            )
-                            continue
-                        except (HandshakeError, HandshakeFormatError, OSError, socket.timeout, ConnectionResetError) as exc:
-                            logger.warning(
-                                "Handshake failed (non-auth): %s",
-                                exc,
-                                extra={"role": role, "ip": ip},
-                            )
-                            try:
-                                conn.close()
-                            except OSError:
-                                pass
-                            continue
-                        # Support either 5-tuple or 7-tuple
-                        metrics_payload: Dict[str, object] = {}
-                        if len(result) >= 7:
-                            k_d2g, k_g2d, nseed_d2g, nseed_g2d, session_id, kem_name, sig_name = result[:7]
-                            if len(result) >= 8 and isinstance(result[7], dict):
-                                metrics_payload = result[7]
-                        else:
-                            k_d2g, k_g2d, nseed_d2g, nseed_g2d, session_id = result
-                            kem_name = sig_name = None
-                        if not metrics_payload:
-                            metrics_payload = {}
-                        peer_addr = (ip, cfg["UDP_DRONE_RX"])
-                        return (
-                            k_d2g,
-                            k_g2d,
-                            nseed_d2g,
-                            nseed_g2d,
-                            session_id,
-                            kem_name,
-                            sig_name,
-                            peer_addr,
-                            metrics_payload,
-                        )
-                    finally:
-                        try:
-                            conn.close()
-                        except OSError:
-                            pass
-            finally:
-                pass
-        finally:
-            server_sock.close()
 
     elif role == "drone":
         if gcs_sig_public is None:
@@ -598,13 +699,30 @@ def _perform_handshake(
 
 
 @contextmanager
-def _setup_sockets(role: str, cfg: dict, *, encrypted_peer: Optional[Tuple[str, int]] = None):
-    """Setup and cleanup all UDP sockets for the proxy."""
+def _setup_sockets(
+    role: str,
+    cfg: dict,
+    *,
+    encrypted_peer: Optional[Tuple[str, int]] = None,
+    reuseport: bool = False,
+):
+    """Setup and cleanup all UDP sockets for the proxy.
+
+    With `reuseport`, the bound sockets set SO_REUSEPORT so sharded datapath
+    workers (core.sharded_proxy) can bind the same ports.
+    """
+
+    def _udp_socket() -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if reuseport:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        return sock
+
     sockets = {}
     try:
         if role == "drone":
             # Encrypted socket - receive from GCS
-            enc_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            enc_sock = _udp_socket()
             enc_sock.bind(("0.0.0.0", cfg["UDP_DRONE_RX"]))
             enc_sock.setblocking(False)
             tos = _dscp_to_tos(cfg.get("ENCRYPTED_DSCP"))
@@ -616,7 +734,7 @@ def _setup_sockets(role: str, cfg: dict, *, encrypted_peer: Optional[Tuple[str,
             sockets["encrypted"] = enc_sock
 
             # Plaintext ingress - receive from local app
-            ptx_in_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            ptx_in_sock = _udp_socket()
             ptx_in_sock.bind((cfg["DRONE_PLAINTEXT_HOST"], cfg["DRONE_PLAINTEXT_TX"]))
             ptx_in_sock.setblocking(False)
             sockets["plaintext_in"] = ptx_in_sock
@@ -630,7 +748,7 @@ def _setup_sockets(role: str, cfg: dict, *, encrypted_peer: Optional[Tuple[str,
 
         elif role == "gcs":
             # Encrypted socket - receive from Drone
-            enc_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            enc_sock = _udp_socket()
             enc_sock.bind(("0.0.0.0", cfg["UDP_GCS_RX"]))
             enc_sock.setblocking(False)
             tos = _dscp_to_tos(cfg.get("ENCRYPTED_DSCP"))
@@ -642,7 +760,7 @@ def _setup_sockets(role: str, cfg: dict, *, encrypted_peer: Optional[Tuple[str,
             sockets["encrypted"] = enc_sock
 
             # Plaintext ingress - receive from local app
-            ptx_in_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            ptx_in_sock = _udp_socket()
             ptx_in_sock.bind((cfg["GCS_PLAINTEXT_HOST"], cfg["GCS_PLAINTEXT_TX"]))
             ptx_in_sock.setblocking(False)
             sockets["plaintext_in"] = ptx_in_sock
@@ -684,13 +802,15 @@ def _build_sender_receiver(
     k_d2g: bytes,
     k_g2d: bytes,
     cfg: dict,
+    *,
+    lane: int = 0,
 ):
     aead_token = cfg.get("SUITE_AEAD_TOKEN")
     if aead_token is None:
         raise ValueError("SUITE_AEAD_TOKEN missing from proxy config context")
 
     if role == "drone":
-        sender = Sender(CONFIG["WIRE_VERSION"], ids, session_id, 0, k_d2g, aead_token=aead_token)
+        sender = Sender(CONFIG["WIRE_VERSION"], ids, session_id, 0, k_d2g, aead_token=aead_token, lane=lane)
         receiver = Receiver(
             CONFIG["WIRE_VERSION"],
             ids,
@@ -701,7 +821,7 @@ def _build_sender_receiver(
             aead_token=aead_token,
         )
     else:
-        sender = Sender(CONFIG["WIRE_VERSION"], ids, session_id, 0, k_g2d, aead_token=aead_token)
+        sender = Sender(CONFIG["WIRE_VERSION"], ids, session_id, 0, k_g2d, aead_token=aead_token, lane=lane)
         receiver = Receiver(
             CONFIG["WIRE_VERSION"],
             ids,
@@ -714,6 +834,153 @@ def _build_sender_receiver(
     return sender, receiver
 
 
+def _start_crypto_offload(role: str, cfg: dict) -> Optional[CryptoOffload]:
+    """Start the GCS handshake crypto worker when HANDSHAKE_CRYPTO_OFFLOAD is set."""
+
+    if role != "gcs" or not cfg.get("HANDSHAKE_CRYPTO_OFFLOAD", False):
+        return None
+    from core.crypto_offload import CryptoOffload
+
+    offload = CryptoOffload()
+    try:
+        offload.start()
+    except Exception as exc:
+        logger.warning("Crypto offload unavailable; handshakes run in-process", extra={"error": str(exc)})
+        return None
+    return offload
+
+
+def _start_kem_pool(
+    role: str,
+    cfg: dict,
+    suite: dict,
+    offload: Optional[CryptoOffload] = None,
+) -> Optional[KemKeypairPool]:
+    """Start the GCS KEM keypair pool when KEM_POOL_DEPTH > 0 and oqs is available.
+
+    With `offload`, pooled keypairs are generated and held in its worker.
+    """
+
+    depth = int(cfg.get("KEM_POOL_DEPTH", 0) or 0)
+    if role != "gcs" or depth <= 0:
+        return None
+    from core import handshake as _handshake
+
+    if offload is not None:
+        kem_factory = offload.kem
+    elif _handshake.KeyEncapsulation is None:
+        return None
+    else:
+        kem_factory = _handshake.KeyEncapsulation
+    pool = KemKeypairPool(
+        kem_factory,
+        depth=depth,
+        ttl_s=float(cfg.get("KEM_POOL_TTL_S", 300.0)),
+    )
+    _prewarm_suites(pool, [suite.get("suite_id")] + list(cfg.get("KEM_POOL_PREFILL_SUITES") or []))
+    pool.start()
+    return pool
+
+
+def _start_resumption(
+    cfg: dict,
+    control_state: ControlState,
+    suite_id: str,
+    session_id: bytes,
+    k_d2g: bytes,
+    k_g2d: bytes,
+) -> Optional[ResumptionState]:
+    """Enable resumed same-suite rekeys when REKEY_RESUME_MAX > 0."""
+
+    resume_max = int(cfg.get("REKEY_RESUME_MAX", 0) or 0)
+    if resume_max <= 0:
+        return None
+    resumption = ResumptionState(resume_max)
+    resumption.install(suite_id, session_id, k_d2g, k_g2d)
+    control_state.can_resume = resumption.can_resume
+    return resumption
+
+
+def _resumed_handshake(
+    resumption: ResumptionState,
+    suite: dict,
+    nonces: Tuple[bytes, bytes],
+    peer_addr: Tuple[str, int],
+) -> tuple:
+    """Derive the next session from the current one; `_perform_handshake` result shape."""
+
+    k_d2g, k_g2d, session_id, metrics = resumption.derive(suite["suite_id"], *nonces)
+    return (k_d2g, k_g2d, b"", b"", session_id, suite["kem_name"], suite["sig_name"], peer_addr, metrics)
+
+
+def _request_seq_exhaustion_rekey(
+    role: str, control_state: ControlState, suite_id: Optional[str], error: str, *, worker: int = 0
+) -> None:
+    """Request a control-plane rekey after a sender ran out of sequence space.
+
+    Shared by both engines and the sharded workers' lane exhaustion events.
+    """
+
+    logger.warning(
+        "Sequence space exhausted; requesting rekey",
+        extra={
+            "role": role,
+            "worker": worker,
+            "error": error,
+        },
+    )
+    if not suite_id:
+        return
+    try:
+        rid = request_prepare(control_state, suite_id)
+    except RuntimeError:
+        logger.debug(
+            "Rekey already in progress after sequence exhaustion",
+            extra={"role": role},
+        )
+    else:
+        logger.info(
+            "Triggered control-plane rekey due to sequence exhaustion",
+            extra={"role": role, "suite": suite_id, "rid": rid},
+        )
+
+
+def _prewarm_suites(pool: KemKeypairPool, suite_ids: List[str]) -> None:
+    """Queue keypair generation for the KEMs of `suite_ids` (unknown ids are skipped)."""
+
+    kem_names = []
+    for suite_id in suite_ids:
+        if not suite_id:
+            continue
+        try:
+            kem_names.append(get_suite(suite_id)["kem_name"])
+        except (KeyError, ValueError, NotImplementedError):
+            logger.debug("Skipping unknown suite for KEM pool", extra={"suite_id": suite_id})
+    pool.prefill(kem_names)
+
+
+def _start_control_server(role: str, cfg: dict, control_state: ControlState, *, quiet: bool) -> Optional[ControlTcpServer]:
+    """Start the TCP control server when ENABLE_TCP_CONTROL is set.
+
+    core.control_tcp is imported here rather than at module level so proxies
+    run without the flag (standalone runs, benchmarks, tests) skip the import.
+    sdrone and sgcs start one long-lived proxy with ENABLE_TCP_CONTROL=1 and
+    switch suites through this server, so they pay for the import once.
+    """
+
+    if not cfg.get("ENABLE_TCP_CONTROL", False):
+        return None
+    from core.control_tcp import start_control_server_if_enabled
+
+    return start_control_server_if_enabled(
+        role=role,
+        cfg=cfg,
+        control_state=control_state,
+        quiet=quiet,
+        enabled=True,
+    )
+
+
 def _launch_manual_console(control_state: ControlState, *, quiet: bool) -> Tuple[threading.Event, Tuple[threading.Thread, ...]]:
     suites_catalog = sorted(list_suites().keys())
     stop_event = threading.Event()
@@ -791,6 +1058,81 @@ def _launch_manual_console(control_state: ControlState, *, quiet: bool) -> Tuple
     return stop_event, (status_thread, operator_thread)
 
 
+def _write_status_file(status_path: Path, payload: Dict[str, object], role: str) -> None:
+    """Atomically replace `status_path` with `payload` as JSON (best effort)."""
+
+    attempts = 2
+    status_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = status_path.with_suffix(status_path.suffix + ".tmp")
+    data = json.dumps(payload)
+    for attempt in range(attempts):
+        try:
+            tmp_path.write_text(data, encoding="utf-8")
+            tmp_path.replace(status_path)
+            return
+        except PermissionError:
+            # Common on Windows when antivirus/indexer holds the file briefly.
+            if attempt + 1 < attempts:
+                time.sleep(0.05)
+                continue
+            logger.warning(
+                "Failed to write status file due to PermissionError",
+                extra={"role": role, "path": str(status_path)},
+            )
+            return
+        except Exception as exc:
+            logger.warning(
+                "Failed to write status file",
+                extra={"role": role, "error": str(exc), "path": str(status_path)},
+            )
+            return
+
+
+def _start_counter_export(
+    counters: ProxyCounters, status_shm: Optional[str], cfg: dict, role: str
+) -> Optional[Callable[[], None]]:
+    """Publish counters to a core.counter_shm segment at STATUS_SHM_HZ.
+
+    Runs on its own daemon thread, reading the datapath counters through
+    their seqlock, so the datapath itself does no extra work. Returns a
+    function that stops the thread and removes the segment, or None when
+    `status_shm` is unset or the segment cannot be created.
+    """
+
+    if not status_shm:
+        return None
+    from core.counter_shm import CounterWriter
+
+    try:
+        writer = CounterWriter(status_shm, _EXPORT_FIELDS)
+    except OSError as exc:
+        logger.warning("Counter export unavailable", extra={"role": role, "path": status_shm, "error": str(exc)})
+        return None
+    interval = 1.0 / float(cfg.get("STATUS_SHM_HZ", 100.0))
+    stop = threading.Event()
+
+    def publisher() -> None:
+        while True:
+            try:
+                writer.publish(counters.export_values())
+            except Exception:
+                logger.debug("counter export failed", extra={"role": role})
+            if stop.wait(interval):
+                break
+
+    thread = threading.Thread(target=publisher, daemon=True, name="pqc-counter-export")
+    thread.start()
+    logger.info("Counter export started", extra={"role": role, "path": str(writer.path)})
+
+    def stop_export() -> None:
+        stop.set()
+        thread.join(timeout=1.0)
+        writer.publish(counters.export_values())
+        writer.close()
+
+    return stop_export
+
+
 def run_proxy(
     *,
     role: str,
@@ -805,12 +1147,16 @@ def run_proxy(
     status_file: Optional[str] = None,
     load_gcs_secret: Optional[Callable[[Dict[str, object]], object]] = None,
     load_gcs_public: Optional[Callable[[Dict[str, object]], bytes]] = None,
+    on_status: Optional[Callable[[Dict[str, object]], None]] = None,
+    status_shm: Optional[str] = None,
 ) -> Dict[str, object]:
     """
     Start a blocking proxy process for `role` in {"drone","gcs"}.
 
     Performs the TCP handshake, bridges plaintext/encrypted UDP, and processes
     in-band control messages for rekey negotiation. Returns counters on clean exit.
+    on_status is called with every status payload (as written to status_file).
+    status_shm names a core.counter_shm segment for high-rate counter reads.
     """
     if role not in {"drone", "gcs"}:
         raise ValueError(f"Invalid role: {role}")
@@ -829,50 +1175,40 @@ def run_proxy(
         status_path = Path(status_file).expanduser()
 
     def write_status(payload: Dict[str, object]) -> None:
+        if on_status is not None:
+            on_status(payload)
         if status_path is None:
             return
-        import time as _time
-        attempts = 2
-        status_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = status_path.with_suffix(status_path.suffix + ".tmp")
-        data = json.dumps(payload)
-        for attempt in range(attempts):
-            try:
-                tmp_path.write_text(data, encoding="utf-8")
-                tmp_path.replace(status_path)
-                return
-            except PermissionError:
-                # Common on Windows when antivirus/indexer holds the file briefly.
-                if attempt + 1 < attempts:
-                    _time.sleep(0.05)
-                    continue
-                logger.warning(
-                    "Failed to write status file due to PermissionError",
-                    extra={"role": role, "path": str(status_path)},
-                )
-                return
-            except Exception as exc:
-                logger.warning(
-                    "Failed to write status file",
-                    extra={"role": role, "error": str(exc), "path": str(status_path)},
-                )
-                return
+        _write_status_file(status_path, payload, role)
 
     if role == "drone" and gcs_sig_public is None:
         if load_gcs_public is None:
             raise ConfigError("GCS signature public key not provided (provide peer key or loader)")
         gcs_sig_public = load_gcs_public(suite)
 
-    handshake_result = _perform_handshake(
-        role,
-        suite,
-        gcs_sig_secret,
-        gcs_sig_public,
-        cfg,
-        accept_deadline_s=stop_after_seconds,
-        io_timeout_s=cfg.get("REKEY_HANDSHAKE_TIMEOUT", 20.0),
-        ready_event=ready_event,
-    )
+    offload = _start_crypto_offload(role, cfg)
+    counters.crypto_offload = offload
+    kem_pool = _start_kem_pool(role, cfg, suite, offload)
+    counters.kem_pool = kem_pool
+    try:
+        handshake_result = _perform_handshake(
+            role,
+            suite,
+            gcs_sig_secret,
+            gcs_sig_public,
+            cfg,
+            accept_deadline_s=stop_after_seconds,
+            io_timeout_s=cfg.get("REKEY_HANDSHAKE_TIMEOUT", 20.0),
+            ready_event=ready_event,
+            kem_pool=kem_pool,
+            offload=offload,
+        )
+    except BaseException:
+        if kem_pool is not None:
+            kem_pool.stop()
+        if offload is not None:
+            offload.stop()
+        raise
 
     if len(handshake_result) >= 9:
         (
@@ -902,7 +1238,7 @@ def run_proxy(
     suite_id = suite.get("suite_id")
     if not suite_id:
         try:
-            suite_id = next((sid for sid, s in SUITES.items() if dict(s) == suite), "unknown")
+            suite_id = next((sid for sid, s in list_suites().items() if s == suite), "unknown")
         except Exception:
             suite_id = "unknown"
 
@@ -965,9 +1301,13 @@ def run_proxy(
         status_thread.start()
     except Exception:
         status_thread = None
+    stop_counter_export = _start_counter_export(counters, status_shm, cfg, role)
 
     aead_ids = _compute_aead_ids(suite, kem_name, sig_name)
     sender, receiver = _build_sender_receiver(role, aead_ids, session_id, k_d2g, k_g2d, cfg)
+    session = SessionSwitch(sender, receiver)
+    counters.session = session
+    rekey_grace_s = float(cfg.get("REKEY_GRACE_S", 3.0))
 
     control_state = create_control_state(role, suite_id)
     coordinator_role = coordinator_role_from_config(cfg)
@@ -980,14 +1320,16 @@ def run_proxy(
             set_coordinator_role(control_state, coordinator_role)
         except Exception:
             pass
+    if kem_pool is not None:
+        control_state.prewarm = functools.partial(_prewarm_suites, kem_pool)
+    resumption = _start_resumption(cfg, control_state, suite_id, session_id, k_d2g, k_g2d)
     context_lock = threading.RLock()
     active_context: Dict[str, object] = {
         "suite": suite_id,
         "suite_dict": suite,
         "session_id": session_id,
         "aead_ids": aead_ids,
-        "sender": sender,
-        "receiver": receiver,
+        "session": session,
         "peer_addr": peer_addr,
         "peer_match_strict": bool(cfg.get("STRICT_UDP_PEER_MATCH", True)),
     }
@@ -997,6 +1339,20 @@ def run_proxy(
     # BUG-13 fix: track rekey threads at run_proxy scope for cleanup on shutdown
     _rekey_threads: list[threading.Thread] = []
 
+    # Sharded datapath: PROXY_WORKERS - 1 extra processes share our ports via
+    # SO_REUSEPORT, each on its own sequence lane; this process is lane 0.
+    workers = int(cfg.get("PROXY_WORKERS", 1) or 1)
+    shard_pool = None
+    if workers > 1:
+        from core.sharded_proxy import ShardContext, ShardPool, sharding_available
+
+        if not sharding_available():
+            logger.warning(
+                "PROXY_WORKERS > 1 requires Linux SO_REUSEPORT; running a single datapath",
+                extra={"role": role, "workers": workers},
+            )
+            workers = 1
+
     if manual_control and is_coordinator(role=role, coordinator_role=coordinator_role) and not cfg.get("ENABLE_PACKET_TYPE"):
         logger.warning("ENABLE_PACKET_TYPE is disabled; control-plane packets may not be processed correctly.")
 
@@ -1008,14 +1364,7 @@ def run_proxy(
     # Optional TCP control server (legacy JSON protocol) for external schedulers.
     # Enables commands like {"cmd":"rekey","suite":"cs-..."}.
     # Only the coordinator role accepts 'rekey' (non-coordinator returns coordinator_only).
-    tcp_control_enabled = bool(cfg.get("ENABLE_TCP_CONTROL", False))
-    control_server = start_control_server_if_enabled(
-        role=role,
-        cfg=cfg,
-        control_state=control_state,
-        quiet=quiet,
-        enabled=tcp_control_enabled,
-    )
+    control_server = _start_control_server(role, cfg, control_state, quiet=quiet)
 
     def _launch_rekey(target_suite_id: str, rid: str, trigger_reason: Optional[str] = None) -> None:
         with rekey_guard:
@@ -1026,8 +1375,6 @@ def run_proxy(
         with counters_lock:
             now_mono = time.monotonic()
             counters._rekey_active = True
-            counters._rekey_blackout_start_mono = now_mono
-            counters._rekey_blackout_end_mono = None
             counters._last_rekey_start_mono = now_mono
             if counters._last_rekey_end_mono is not None:
                 counters.rekey_interval_ms = (now_mono - counters._last_rekey_end_mono) * 1000.0
@@ -1045,15 +1392,6 @@ def run_proxy(
                 counters._last_rekey_end_mono = end_mono
                 if counters._last_rekey_start_mono is not None:
                     counters.rekey_duration_ms = (end_mono - counters._last_rekey_start_mono) * 1000.0
-                if counters._rekey_blackout_start_mono is not None:
-                    if counters._rekey_blackout_end_mono is not None:
-                        counters.rekey_blackout_duration_ms = (
-                            counters._rekey_blackout_end_mono - counters._rekey_blackout_start_mono
-                        ) * 1000.0
-                    else:
-                        counters.rekey_blackout_duration_ms = (
-                            end_mono - counters._rekey_blackout_start_mono
-                        ) * 1000.0
                 counters._rekey_active = False
 
         def worker() -> None:
@@ -1170,15 +1508,24 @@ def run_proxy(
                 public_key = new_public if new_public is not None else gcs_sig_public
                 if role == "drone" and public_key is None:
                     raise ConfigError("GCS public key not available for rekey")
-                rk_result = _perform_handshake(
-                    role,
-                    new_suite,
-                    base_secret,
-                    public_key,
-                    cfg,
-                    accept_deadline_s=float(timeout),
-                    io_timeout_s=float(timeout),
-                )
+                resume_nonces = take_resume_nonces(control_state, rid)
+                resumed = resume_nonces is not None and resumption is not None
+                if resumed:
+                    with context_lock:
+                        current_peer = active_context["peer_addr"]
+                    rk_result = _resumed_handshake(resumption, new_suite, resume_nonces, current_peer)
+                else:
+                    rk_result = _perform_handshake(
+                        role,
+                        new_suite,
+                        base_secret,
+                        public_key,
+                        cfg,
+                        accept_deadline_s=float(timeout),
+                        io_timeout_s=float(timeout),
+                        kem_pool=kem_pool,
+                        offload=offload,
+                    )
                 if len(rk_result) >= 9:
                     (
                         new_k_d2g,
@@ -1211,12 +1558,28 @@ def run_proxy(
                 new_sender, new_receiver = _build_sender_receiver(
                     role, new_ids, new_session_id, new_k_d2g, new_k_g2d, cfg
                 )
+                if shard_pool is not None:
+                    # Every worker builds its lane's Sender/Receiver first; the
+                    # commit below is then a single message per worker.
+                    shard_pool.stage(
+                        ShardContext(
+                            new_ids,
+                            new_session_id,
+                            new_k_d2g,
+                            new_k_g2d,
+                            cfg["SUITE_AEAD_TOKEN"],
+                            new_peer_addr,
+                            bool(cfg.get("STRICT_UDP_PEER_MATCH", True)),
+                        ),
+                        timeout=float(timeout),
+                    )
 
                 with context_lock:
+                    # Receive on both sessions from here; switch the send side
+                    # once the peer confirms (see core.session_switch).
+                    active_context["session"].install(new_sender, new_receiver, rekey_grace_s, rid)
                     active_context.update(
                         {
-                            "sender": new_sender,
-                            "receiver": new_receiver,
                             "session_id": new_session_id,
                             "aead_ids": new_ids,
                             "suite": new_suite["suite_id"],
@@ -1225,9 +1588,17 @@ def run_proxy(
                         }
                     )
                     sockets["encrypted_peer"] = new_peer_addr
+                if shard_pool is not None:
+                    shard_pool.commit(rekey_grace_s, rid)
+                if resumption is not None:
+                    resumption.install(
+                        new_suite["suite_id"], new_session_id, new_k_d2g, new_k_g2d, resumed=resumed
+                    )
 
                 with counters_lock:
                     counters.rekeys_ok += 1
+                    if resumed:
+                        counters.rekeys_resumed += 1
                     counters.last_rekey_ms = int(time.time() * 1000)
                     counters.last_rekey_suite = new_suite["suite_id"]
                     counters.handshake_metrics = dict(new_handshake_metrics) if new_handshake_metrics else {}
@@ -1283,7 +1654,7 @@ def run_proxy(
         _rk_thread.start()
         _rekey_threads.append(_rk_thread)
 
-    with _setup_sockets(role, cfg, encrypted_peer=peer_addr) as sockets:
+    with _setup_sockets(role, cfg, encrypted_peer=peer_addr, reuseport=workers > 1) as sockets:
         selector = selectors.DefaultSelector()
         selector.register(sockets["encrypted"], selectors.EVENT_READ, data="encrypted")
         selector.register(sockets["plaintext_in"], selectors.EVENT_READ, data="plaintext_in")
@@ -1293,34 +1664,401 @@ def run_proxy(
         # to support MAVProxy's ephemeral ports (when using --out).
         app_peer_addr = sockets["plaintext_peer"]
 
+        # Packet counters are owned by this (selector) thread: everything that
+        # runs from the loop below writes `dp` without taking counters_lock.
+        dp = counters.datapath
+
         def send_control(payload: dict) -> None:
             body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
             frame = b"\x02" + body
             with context_lock:
-                current_sender = active_context["sender"]
+                current_sender = active_context["session"].current_sender()
                 encrypted_peer = sockets["encrypted_peer"]  # BUG-18 fix
             try:
                 wire = current_sender.encrypt(frame)
             except Exception as exc:
-                with counters_lock:
-                    counters.drops += 1
-                    counters.drop_other += 1
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_other += 1
+                dp.seq += 1
                 logger.warning("Failed to encrypt control payload", extra={"role": role, "error": str(exc)})
                 return
             try:
                 sockets["encrypted"].sendto(wire, encrypted_peer)
-                with counters_lock:
-                    counters.enc_out += 1
-                    counters.enc_bytes_out += len(wire)
-                    counters._last_packet_mono = time.monotonic()
-                    if counters._rekey_active and counters._rekey_blackout_end_mono is None:
-                        counters._rekey_blackout_end_mono = counters._last_packet_mono
+                dp.seq += 1
+                dp.enc_out += 1
+                dp.enc_bytes_out += len(wire)
+                dp.touch()
+                dp.seq += 1
             except socket.error as exc:
-                with counters_lock:
-                    counters.drops += 1
-                    counters.drop_other += 1
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_other += 1
+                dp.seq += 1
                 logger.warning("Failed to send control payload", extra={"role": role, "error": str(exc)})
 
+        packet_type = bool(cfg.get("ENABLE_PACKET_TYPE"))
+
+        def _rekey_on_seq_exhaustion(error: str, worker: int = 0) -> None:
+            with context_lock:
+                current_suite = active_context.get("suite")
+            _request_seq_exhaustion_rekey(role, control_state, current_suite, error, worker=worker)
+
+        def _encrypt_for_peer(payload_len: int, payload_out, out: Optional[memoryview] = None):
+            """Account and encrypt one app datagram; None means it was dropped.
+
+            `payload_out` is the framed payload (packet-type byte included when
+            enabled). With `out`, the wire packet is written into that buffer
+            and a memoryview over it is returned; otherwise new bytes are.
+            """
+
+            dp.seq += 1
+            dp.ptx_in += 1
+            dp.ptx_bytes_in += payload_len
+            dp.touch()
+            dp.seq += 1
+
+            with context_lock:
+                current_sender = active_context["session"].current_sender()
+            encrypt_start_ns = time.perf_counter_ns()
+            try:
+                if out is None:
+                    wire = current_sender.encrypt(payload_out)
+                else:
+                    wire = out[:current_sender.encrypt_into(payload_out, out)]
+            except SequenceOverflow as exc:
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_other += 1
+                dp.seq += 1
+                _rekey_on_seq_exhaustion(str(exc))
+                return None
+            except Exception as exc:
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_other += 1
+                dp.seq += 1
+                logger.warning(
+                    "Encrypt failed",
+                    extra={
+                        "role": role,
+                        "error": str(exc),
+                        "payload_len": len(payload_out),
+                    },
+                )
+                return None
+            encrypt_elapsed_ns = time.perf_counter_ns() - encrypt_start_ns
+            dp.seq += 1
+            dp.add_primitive("aead_encrypt", encrypt_elapsed_ns, len(payload_out), len(wire))
+            dp.seq += 1
+            return wire
+
+        def _encrypt_batch_for_peer(frames: List[Tuple[int, bytes]]) -> List[bytes]:
+            """Encrypt (payload_len, payload_out) frames with one Sender.encrypt_many call.
+
+            Falls back to `_encrypt_for_peer` per frame when the batch cannot be
+            encrypted as a whole (sequence exhaustion, backend error), so drop
+            accounting and the rekey trigger behave exactly as unbatched.
+            """
+
+            with context_lock:
+                current_sender = active_context["session"].current_sender()
+            encrypt_start_ns = time.perf_counter_ns()
+            try:
+                wires = current_sender.encrypt_many([frame for _len, frame in frames])
+            except Exception:
+                fallback = []
+                for payload_len, frame in frames:
+                    wire = _encrypt_for_peer(payload_len, frame)
+                    if wire is not None:
+                        fallback.append(wire)
+                return fallback
+            per_packet_ns = (time.perf_counter_ns() - encrypt_start_ns) // len(frames)
+
+            dp.seq += 1
+            dp.ptx_in += len(frames)
+            for (payload_len, frame), wire in zip(frames, wires):
+                dp.ptx_bytes_in += payload_len
+                dp.add_primitive("aead_encrypt", per_packet_ns, len(frame), len(wire))
+            dp.touch()
+            dp.seq += 1
+            return wires
+
+        def _process_control_frame(body) -> None:
+            """Act on one decrypted in-band control message (payload after 0x02)."""
+
+            try:
+                control_json = json.loads(bytes(body).decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_other += 1
+                dp.seq += 1
+                return
+            result = handle_control(control_json, role, control_state)
+            for note in result.notes:
+                if note.startswith("prepare_fail"):
+                    with counters_lock:
+                        counters.rekeys_fail += 1
+            if result.peer_rekeyed:
+                with context_lock:
+                    active_context["session"].confirm(result.peer_rekeyed)
+                if shard_pool is not None:
+                    shard_pool.confirm(result.peer_rekeyed)
+            for payload in result.send:
+                control_state.outbox.put(payload)
+            if result.start_handshake:
+                suite_next, rid = result.start_handshake
+                _launch_rekey(suite_next, rid, trigger_reason=control_json.get("type"))
+
+        def _decrypt_from_peer(wire, addr: Tuple[str, int], out: Optional[memoryview] = None):
+            """Authenticate and route one encrypted datagram from the peer.
+
+            Returns the bytes to deliver to the local app, or None when the
+            datagram was dropped or consumed by the control plane. With `out`,
+            `wire` may be a view over the receive buffer and the plaintext is
+            decrypted into `out`; the result is then a memoryview into it.
+            """
+
+            with context_lock:
+                current_session = active_context["session"]
+                current_receiver = current_session.receiver_for(wire)
+                expected_peer = active_context.get("peer_addr")
+                strict_match = bool(active_context.get("peer_match_strict", True))
+
+            src_ip, src_port = addr[0], addr[1]
+            if expected_peer is not None:
+                exp_ip, exp_port = expected_peer  # type: ignore[misc]
+                mismatch = False
+                if strict_match:
+                    mismatch = src_ip != exp_ip or src_port != exp_port
+                else:
+                    mismatch = src_ip != exp_ip
+                if mismatch:
+                    dp.seq += 1
+                    dp.drops += 1
+                    dp.drop_src_addr += 1
+                    dp.seq += 1
+                    logger.debug(
+                        "Dropped encrypted packet from unauthorized source",
+                        extra={"role": role, "expected": expected_peer, "received": addr},
+                    )
+                    return None
+
+            dp.seq += 1
+            dp.enc_in += 1
+            dp.enc_bytes_in += len(wire)
+            dp.touch()
+            dp.seq += 1
+
+            cipher_len = len(wire)
+            decrypt_start_ns = time.perf_counter_ns()
+            try:
+                if out is None:
+                    plaintext = current_receiver.decrypt(wire)
+                else:
+                    pt_len = current_receiver.decrypt_into(wire, out)
+                    plaintext = None if pt_len is None else out[:pt_len]
+            except ReplayError:
+                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_replay += 1
+                dp.add_primitive("aead_decrypt_fail", decrypt_elapsed_ns, cipher_len, 0)
+                dp.seq += 1
+                return None
+            except HeaderMismatch:
+                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_header += 1
+                dp.add_primitive("aead_decrypt_fail", decrypt_elapsed_ns, cipher_len, 0)
+                dp.seq += 1
+                return None
+            except AeadAuthError:
+                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_auth += 1
+                dp.add_primitive("aead_decrypt_fail", decrypt_elapsed_ns, cipher_len, 0)
+                dp.seq += 1
+                return None
+            except AeadError as exc:
+                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
+                dp.seq += 1
+                dp.drops += 1
+                reason, _seq = _parse_header_fields(
+                    CONFIG["WIRE_VERSION"], current_receiver.ids, current_receiver.session_id, wire
+                )
+                if reason in (
+                    "version_mismatch",
+                    "crypto_id_mismatch",
+                    "header_too_short",
+                    "header_unpack_error",
+                ):
+                    dp.drop_header += 1
+                elif reason == "session_mismatch":
+                    dp.drop_session_epoch += 1
+                else:
+                    dp.drop_auth += 1
+                dp.add_primitive("aead_decrypt_fail", decrypt_elapsed_ns, cipher_len, 0)
+                dp.seq += 1
+                logger.warning(
+                    "Decrypt failed (classified)",
+                    extra={
+                        "role": role,
+                        "reason": reason,
+                        "wire_len": len(wire),
+                        "error": str(exc),
+                    },
+                )
+                return None
+            except Exception as exc:
+                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_other += 1
+                dp.add_primitive("aead_decrypt_fail", decrypt_elapsed_ns, cipher_len, 0)
+                dp.seq += 1
+                logger.warning(
+                    "Decrypt failed (other)",
+                    extra={"role": role, "error": str(exc), "wire_len": len(wire)},
+                )
+                return None
+
+            decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
+            if plaintext is None:
+                dp.seq += 1
+                dp.drops += 1
+                last_reason = current_receiver.last_error_reason()
+                # Bug #7 fix: Proper error classification without redundancy
+                if last_reason == "auth":
+                    dp.drop_auth += 1
+                elif last_reason == "header":
+                    dp.drop_header += 1
+                elif last_reason == "replay":
+                    dp.drop_replay += 1
+                elif last_reason == "session":
+                    dp.drop_session_epoch += 1
+                elif last_reason is None or last_reason == "unknown":
+                    # Only parse header if receiver didn't classify it
+                    reason, _seq = _parse_header_fields(
+                        CONFIG["WIRE_VERSION"],
+                        current_receiver.ids,
+                        current_receiver.session_id,
+                        wire,
+                    )
+                    if reason in (
+                        "version_mismatch",
+                        "crypto_id_mismatch",
+                        "header_too_short",
+                        "header_unpack_error",
+                    ):
+                        dp.drop_header += 1
+                    elif reason == "session_mismatch":
+                        dp.drop_session_epoch += 1
+                    elif reason == "auth_fail_or_replay":
+                        dp.drop_auth += 1
+                    else:
+                        dp.drop_other += 1
+                else:
+                    # Unrecognized last_reason value
+                    dp.drop_other += 1
+                dp.add_primitive("aead_decrypt_fail", decrypt_elapsed_ns, cipher_len, 0)
+                dp.seq += 1
+                return None
+
+            with context_lock:
+                current_session.delivered(current_receiver)
+            plaintext_len = len(plaintext)
+            dp.seq += 1
+            dp.add_primitive("aead_decrypt_ok", decrypt_elapsed_ns, cipher_len, plaintext_len)
+
+            dp.seq += 1
+            # Control-plane handling: only interpret leading 0x02 as control
+            # when ENABLE_PACKET_TYPE is enabled. When disabled, payloads must
+            # be transparent and delivered unchanged to the application.
+            if packet_type and plaintext and plaintext[0] == 0x02:
+                _process_control_frame(plaintext[1:])
+                return None
+
+            if packet_type and plaintext:
+                ptype = plaintext[0]
+                if ptype == 0x01:
+                    return plaintext[1:]
+                dp.seq += 1
+                dp.drops += 1
+                dp.drop_other += 1
+                dp.seq += 1
+                return None
+            return plaintext
+
+        # Optional batched datapath: drain up to PROXY_BATCH_SIZE datagrams per
+        # wake-up and hand the results back to the kernel in one batch.
+        batch_size = int(cfg.get("PROXY_BATCH_SIZE", 1) or 1)
+        batch_io: Dict[str, BatchSocket] = {}
+        if batch_size > 1:
+            use_mmsg = bool(cfg.get("PROXY_BATCH_MMSG", True))
+            batch_io["plaintext_in"] = BatchSocket(
+                sockets["plaintext_in"], max_batch=batch_size, bufsize=16384, use_mmsg=use_mmsg
+            )
+            batch_io["encrypted"] = BatchSocket(
+                sockets["encrypted"], max_batch=batch_size, bufsize=65535, use_mmsg=use_mmsg
+            )
+            if sockets["plaintext_out"] is sockets["plaintext_in"]:
+                batch_io["plaintext_out"] = batch_io["plaintext_in"]
+            else:
+                batch_io["plaintext_out"] = BatchSocket(
+                    sockets["plaintext_out"], max_batch=batch_size, bufsize=16384, use_mmsg=use_mmsg
+                )
+            with counters_lock:
+                counters.batch_limit = batch_size
+                counters.batch_mmsg = batch_io["encrypted"].uses_mmsg
+            logger.info(
+                "Batched UDP datapath enabled",
+                extra={"role": role, "batch_size": batch_size, "mmsg": batch_io["encrypted"].uses_mmsg},
+            )
+
+        # Per-packet path receives straight into reusable buffers and hands
+        # memoryviews to encrypt_into/decrypt_into, so a datagram is only
+        # copied where the AEAD backend needs it. Byte 0 of the plaintext
+        # receive buffer is reserved for the packet-type prefix.
+        zero_copy = bool(cfg.get("PROXY_ZERO_COPY", True)) and not batch_io
+        if zero_copy:
+            ptx_rx_view = memoryview(bytearray(1 + 16384))
+            ptx_rx_payload = ptx_rx_view[1:]
+            enc_tx_view = memoryview(bytearray(1 + 16384 + AEAD_HEADER_LEN + AEAD_TAG_LEN))
+            enc_rx_view = memoryview(bytearray(65535))
+            ptx_tx_view = memoryview(bytearray(65535))
+
+        if workers > 1:
+            shard_pool = ShardPool(
+                role,
+                cfg,
+                ShardContext(
+                    aead_ids,
+                    session_id,
+                    k_d2g,
+                    k_g2d,
+                    cfg["SUITE_AEAD_TOKEN"],
+                    peer_addr,
+                    bool(cfg.get("STRICT_UDP_PEER_MATCH", True)),
+                ),
+                workers=workers,
+                app_peer_addr=app_peer_addr,
+            )
+            try:
+                shard_pool.start(sockets["encrypted"])
+            except Exception as exc:
+                logger.warning(
+                    "Sharded datapath failed to start; running a single datapath",
+                    extra={"role": role, "workers": workers, "error": str(exc)},
+                )
+                shard_pool = None
+            else:
+                for conn in shard_pool.connections:
+                    selector.register(conn, selectors.EVENT_READ, data="shard")
+
         try:
             while True:
                 if stop_after_seconds is not None and (time.time() - start_time) >= stop_after_seconds:
@@ -1338,289 +2076,177 @@ def run_proxy(
                     sock = key.fileobj
                     data_type = key.data
 
-                    if data_type == "plaintext_in":
+                    if data_type == "shard":
+                        for event, value in shard_pool.receive(sock):
+                            if event == "stats":
+                                index, payload = value
+                                with counters_lock:
+                                    counters.shards[index] = payload
+                            elif event == "control":
+                                _process_control_frame(value)
+                            elif event == "app_peer":
+                                app_peer_addr = value
+                            elif event == "seq_exhausted":
+                                _rekey_on_seq_exhaustion(f"lane {value} sequence space exhausted", worker=value)
+                        continue
+
+                    if batch_io:
                         try:
-                            payload, addr = sock.recvfrom(16384)
-                            if not payload:
+                            batch = batch_io[data_type].recv_batch()
+                        except socket.error:
+                            continue
+                        truncated = batch_io[data_type].take_truncated()
+                        if truncated:
+                            dp.seq += 1
+                            dp.drops += truncated
+                            dp.drop_other += truncated
+                            dp.seq += 1
+                        if not batch:
+                            continue
+                        counters.record_batch(data_type, len(batch))
+
+                        if data_type == "plaintext_in":
+                            frames = []
+                            for payload, addr in batch:
+                                if not payload:
+                                    continue
+                                if addr != app_peer_addr:
+                                    app_peer_addr = addr
+                                    if shard_pool is not None:
+                                        shard_pool.set_app_peer(addr)
+                                frames.append((len(payload), (b"\x01" + payload) if packet_type else payload))
+                            if not frames:
+                                continue
+                            wires = _encrypt_batch_for_peer(frames)
+                            if not wires:
                                 continue
-                            
-                            # Update dynamic peer address to reply to the correct source
-                            app_peer_addr = addr
-
-                            with counters_lock:
-                                counters.ptx_in += 1
-                                counters.ptx_bytes_in += len(payload)
-                                counters._last_packet_mono = time.monotonic()
-                                if counters._rekey_active and counters._rekey_blackout_end_mono is None:
-                                    counters._rekey_blackout_end_mono = counters._last_packet_mono
-
-                            payload_out = (b"\x01" + payload) if cfg.get("ENABLE_PACKET_TYPE") else payload
                             with context_lock:
-                                current_sender = active_context["sender"]
-                            encrypt_start_ns = time.perf_counter_ns()
-                            try:
-                                wire = current_sender.encrypt(payload_out)
-                            except SequenceOverflow as exc:
-                                with counters_lock:
-                                    counters.drops += 1
-                                    counters.drop_other += 1
-                                logger.warning(
-                                    "Sequence space exhausted; requesting rekey",
-                                    extra={
-                                        "role": role,
-                                        "error": str(exc),
-                                    },
-                                )
-                                with context_lock:
-                                    current_suite = active_context.get("suite")
-                                if current_suite:
-                                    try:
-                                        rid = request_prepare(control_state, current_suite)
-                                    except RuntimeError:
-                                        logger.debug(
-                                            "Rekey already in progress after sequence exhaustion",
-                                            extra={"role": role},
-                                        )
-                                    else:
-                                        logger.info(
-                                            "Triggered control-plane rekey due to sequence exhaustion",
-                                            extra={"role": role, "suite": current_suite, "rid": rid},
-                                        )
+                                encrypted_peer = sockets["encrypted_peer"]
+                            sent, sent_bytes = batch_io["encrypted"].send_batch(
+                                [(wire, encrypted_peer) for wire in wires]
+                            )
+                            dp.seq += 1
+                            dp.enc_out += sent
+                            dp.enc_bytes_out += sent_bytes
+                            failed = len(wires) - sent
+                            dp.drops += failed
+                            dp.drop_other += failed
+                            if sent:
+                                dp.touch()
+                            dp.seq += 1
+                        elif data_type == "encrypted":
+                            outgoing = []
+                            for wire, addr in batch:
+                                if not wire:
+                                    continue
+                                out_bytes = _decrypt_from_peer(wire, addr)
+                                if out_bytes is not None:
+                                    outgoing.append(out_bytes)
+                            if not outgoing:
                                 continue
-                            except Exception as exc:
-                                encrypt_elapsed_ns = time.perf_counter_ns() - encrypt_start_ns
-                                with counters_lock:
-                                    counters.drops += 1
-                                    counters.drop_other += 1
-                                logger.warning(
-                                    "Encrypt failed",
-                                    extra={
-                                        "role": role,
-                                        "error": str(exc),
-                                        "payload_len": len(payload_out),
-                                    },
+                            sent, sent_bytes = batch_io["plaintext_out"].send_batch(
+                                [(out_bytes, app_peer_addr) for out_bytes in outgoing]
+                            )
+                            dp.seq += 1
+                            dp.ptx_out += sent
+                            dp.ptx_bytes_out += sent_bytes
+                            failed = len(outgoing) - sent
+                            dp.drops += failed
+                            dp.drop_other += failed
+                            if sent:
+                                dp.touch()
+                            dp.seq += 1
+                        continue
+
+                    if data_type == "plaintext_in":
+                        try:
+                            if zero_copy:
+                                nbytes, addr = sock.recvfrom_into(ptx_rx_payload)
+                                if not nbytes:
+                                    continue
+                                if addr != app_peer_addr:
+                                    app_peer_addr = addr
+                                    if shard_pool is not None:
+                                        shard_pool.set_app_peer(addr)
+                                if packet_type:
+                                    ptx_rx_view[0] = 0x01
+                                    frame = ptx_rx_view[:nbytes + 1]
+                                else:
+                                    frame = ptx_rx_payload[:nbytes]
+                                wire = _encrypt_for_peer(nbytes, frame, enc_tx_view)
+                            else:
+                                payload, addr = sock.recvfrom(16384)
+                                if not payload:
+                                    continue
+
+                                # Update dynamic peer address to reply to the correct source
+                                if addr != app_peer_addr:
+                                    app_peer_addr = addr
+                                    if shard_pool is not None:
+                                        shard_pool.set_app_peer(addr)
+
+                                wire = _encrypt_for_peer(
+                                    len(payload), (b"\x01" + payload) if packet_type else payload
                                 )
+                            if wire is None:
                                 continue
-                            encrypt_elapsed_ns = time.perf_counter_ns() - encrypt_start_ns
-                            ciphertext_len = len(wire)
-                            plaintext_len = len(payload_out)
-                            with counters_lock:
-                                counters.record_encrypt(encrypt_elapsed_ns, plaintext_len, ciphertext_len)
 
                             try:
                                 with context_lock:
                                     encrypted_peer = sockets["encrypted_peer"]  # BUG-18 fix
                                 sockets["encrypted"].sendto(wire, encrypted_peer)
-                                with counters_lock:
-                                    counters.enc_out += 1
-                                    counters.enc_bytes_out += len(wire)
-                                    counters._last_packet_mono = time.monotonic()
-                                    if counters._rekey_active and counters._rekey_blackout_end_mono is None:
-                                        counters._rekey_blackout_end_mono = counters._last_packet_mono
+                                dp.seq += 1
+                                dp.enc_out += 1
+                                dp.enc_bytes_out += len(wire)
+                                dp.touch()
+                                dp.seq += 1
                             except socket.error:
-                                with counters_lock:
-                                    counters.drops += 1
+                                dp.seq += 1
+                                dp.drops += 1
+                                dp.drop_other += 1
+                                dp.seq += 1
                         except socket.error:
                             continue
 
                     elif data_type == "encrypted":
                         try:
-                            wire, addr = sock.recvfrom(65535)
-                            if not wire:
-                                continue
-
-                            with context_lock:
-                                current_receiver = active_context["receiver"]
-                                expected_peer = active_context.get("peer_addr")
-                                strict_match = bool(active_context.get("peer_match_strict", True))
-
-                            src_ip, src_port = addr
-                            if expected_peer is not None:
-                                exp_ip, exp_port = expected_peer  # type: ignore[misc]
-                                mismatch = False
-                                if strict_match:
-                                    mismatch = src_ip != exp_ip or src_port != exp_port
-                                else:
-                                    mismatch = src_ip != exp_ip
-                                if mismatch:
-                                    with counters_lock:
-                                        counters.drops += 1
-                                        counters.drop_src_addr += 1
-                                    logger.debug(
-                                        "Dropped encrypted packet from unauthorized source",
-                                        extra={"role": role, "expected": expected_peer, "received": addr},
-                                    )
+                            if zero_copy:
+                                nbytes, addr = sock.recvfrom_into(enc_rx_view)
+                                if not nbytes:
                                     continue
-
-                            with counters_lock:
-                                counters.enc_in += 1
-                                counters.enc_bytes_in += len(wire)
-                                counters._last_packet_mono = time.monotonic()
-                                if counters._rekey_active and counters._rekey_blackout_end_mono is None:
-                                    counters._rekey_blackout_end_mono = counters._last_packet_mono
-
-                            cipher_len = len(wire)
-                            decrypt_start_ns = time.perf_counter_ns()
-                            try:
-                                plaintext = current_receiver.decrypt(wire)
-                            except ReplayError:
-                                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
-                                with counters_lock:
-                                    counters.drops += 1
-                                    counters.drop_replay += 1
-                                    counters.record_decrypt_fail(decrypt_elapsed_ns, cipher_len)
-                                continue
-                            except HeaderMismatch:
-                                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
-                                with counters_lock:
-                                    counters.drops += 1
-                                    counters.drop_header += 1
-                                    counters.record_decrypt_fail(decrypt_elapsed_ns, cipher_len)
-                                continue
-                            except AeadAuthError:
-                                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
-                                with counters_lock:
-                                    counters.drops += 1
-                                    counters.drop_auth += 1
-                                    counters.record_decrypt_fail(decrypt_elapsed_ns, cipher_len)
-                                continue
-                            except AeadError as exc:
-                                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
-                                with counters_lock:
-                                    counters.drops += 1
-                                    reason, _seq = _parse_header_fields(
-                                        CONFIG["WIRE_VERSION"], current_receiver.ids, current_receiver.session_id, wire
-                                    )
-                                    if reason in (
-                                        "version_mismatch",
-                                        "crypto_id_mismatch",
-                                        "header_too_short",
-                                        "header_unpack_error",
-                                    ):
-                                        counters.drop_header += 1
-                                    elif reason == "session_mismatch":
-                                        counters.drop_session_epoch += 1
-                                    else:
-                                        counters.drop_auth += 1
-                                    counters.record_decrypt_fail(decrypt_elapsed_ns, cipher_len)
-                                logger.warning(
-                                    "Decrypt failed (classified)",
-                                    extra={
-                                        "role": role,
-                                        "reason": reason,
-                                        "wire_len": len(wire),
-                                        "error": str(exc),
-                                    },
-                                )
-                                continue
-                            except Exception as exc:
-                                decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
-                                with counters_lock:
-                                    counters.drops += 1
-                                    counters.drop_other += 1
-                                    counters.record_decrypt_fail(decrypt_elapsed_ns, cipher_len)
-                                logger.warning(
-                                    "Decrypt failed (other)",
-                                    extra={"role": role, "error": str(exc), "wire_len": len(wire)},
-                                )
-                                continue
-
-                            decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
-                            if plaintext is None:
-                                with counters_lock:
-                                    counters.drops += 1
-                                    last_reason = current_receiver.last_error_reason()
-                                    # Bug #7 fix: Proper error classification without redundancy
-                                    if last_reason == "auth":
-                                        counters.drop_auth += 1
-                                    elif last_reason == "header":
-                                        counters.drop_header += 1
-                                    elif last_reason == "replay":
-                                        counters.drop_replay += 1
-                                    elif last_reason == "session":
-                                        counters.drop_session_epoch += 1
-                                    elif last_reason is None or last_reason == "unknown":
-                                        # Only parse header if receiver didn't classify it
-                                        reason, _seq = _parse_header_fields(
-                                            CONFIG["WIRE_VERSION"],
-                                            current_receiver.ids,
-                                            current_receiver.session_id,
-                                            wire,
-                                        )
-                                        if reason in (
-                                            "version_mismatch",
-                                            "crypto_id_mismatch",
-                                            "header_too_short",
-                                            "header_unpack_error",
-                                        ):
-                                            counters.drop_header += 1
-                                        elif reason == "session_mismatch":
-                                            counters.drop_session_epoch += 1
-                                        elif reason == "auth_fail_or_replay":
-                                            counters.drop_auth += 1
-                                        else:
-                                            counters.drop_other += 1
-                                    else:
-                                        # Unrecognized last_reason value
-                                        counters.drop_other += 1
-                                    counters.record_decrypt_fail(decrypt_elapsed_ns, cipher_len)
-                                continue
-
-                            plaintext_len = len(plaintext)
-                            with counters_lock:
-                                counters.record_decrypt_ok(decrypt_elapsed_ns, cipher_len, plaintext_len)
-
-                            # Control-plane handling: only interpret leading 0x02 as control
-                            # when ENABLE_PACKET_TYPE is enabled. When disabled, payloads must
-                            # be transparent and delivered unchanged to the application.
-                            if cfg.get("ENABLE_PACKET_TYPE") and plaintext and plaintext[0] == 0x02:
-                                try:
-                                    control_json = json.loads(plaintext[1:].decode("utf-8"))
-                                except (UnicodeDecodeError, json.JSONDecodeError):
-                                    with counters_lock:
-                                        counters.drops += 1
-                                        counters.drop_other += 1
+                                out_bytes = _decrypt_from_peer(enc_rx_view[:nbytes], addr, ptx_tx_view)
+                            else:
+                                wire, addr = sock.recvfrom(65535)
+                                if not wire:
                                     continue
-                                result = handle_control(control_json, role, control_state)
-                                for note in result.notes:
-                                    if note.startswith("prepare_fail"):
-                                        with counters_lock:
-                                            counters.rekeys_fail += 1
-                                for payload in result.send:
-                                    control_state.outbox.put(payload)
-                                if result.start_handshake:
-                                    suite_next, rid = result.start_handshake
-                                    _launch_rekey(suite_next, rid, trigger_reason=control_json.get("type"))
+                                out_bytes = _decrypt_from_peer(wire, addr)
+                            if out_bytes is None:
                                 continue
 
-                            if cfg.get("ENABLE_PACKET_TYPE") and plaintext:
-                                ptype = plaintext[0]
-                                if ptype == 0x01:
-                                    out_bytes = plaintext[1:]
-                                else:
-                                    with counters_lock:
-                                        counters.drops += 1
-                                        counters.drop_other += 1
-                                    continue
-                            else:
-                                out_bytes = plaintext
-
                             sockets["plaintext_out"].sendto(out_bytes, app_peer_addr)
-                            with counters_lock:
-                                counters.ptx_out += 1
-                                counters.ptx_bytes_out += len(out_bytes)
-                                counters._last_packet_mono = time.monotonic()
-                                if counters._rekey_active and counters._rekey_blackout_end_mono is None:
-                                    counters._rekey_blackout_end_mono = counters._last_packet_mono
+                            dp.seq += 1
+                            dp.ptx_out += 1
+                            dp.ptx_bytes_out += len(out_bytes)
+                            dp.touch()
+                            dp.seq += 1
                         except socket.error:
-                            with counters_lock:
-                                counters.drops += 1
-                                counters.drop_other += 1
+                            dp.seq += 1
+                            dp.drops += 1
+                            dp.drop_other += 1
+                            dp.seq += 1
                             continue
         except KeyboardInterrupt:
             pass
         finally:
             selector.close()
+            if shard_pool is not None:
+                final_shards = shard_pool.stop()
+                with counters_lock:
+                    counters.shards.update(final_shards)
+            if kem_pool is not None:
+                kem_pool.stop()
+            if offload is not None:
+                offload.stop()
             if manual_stop:
                 manual_stop.set()
                 for thread in manual_threads:
@@ -1660,5 +2286,7 @@ def run_proxy(
                 status_thread.join(timeout=1.0)
             except Exception:
                 pass
+        if stop_counter_export is not None:
+            stop_counter_export()
 
         return counters.to_dict()
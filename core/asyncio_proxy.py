@@ -0,0 +1,862 @@
+"""
+asyncio proxy engine (PROXY_ENGINE = "asyncio").
+
+Same wire format, handshake, rekey, control plane (`handle_control`) and
+ProxyCounters as the selectors engine in `core.async_proxy`, driven by one
+event loop instead of a select() loop plus helper threads:
+
+- the encrypted and plaintext UDP sockets are `DatagramProtocol` endpoints,
+  so packets are handled as soon as the loop wakes for them;
+- rekeys are tasks; only the blocking parts (key loading, the PQC handshake)
+  run on a small executor, and the new Sender/Receiver are swapped in on the
+  loop thread, so the datapath needs no locks;
+- the status file and the control outbox are served by periodic tasks.
+
+`serve_proxy` can be awaited next to other coroutines (e.g. a scheduler) in
+an application's own loop. `run_proxy_asyncio` is the blocking drop-in for
+`core.async_proxy.run_proxy`; it runs on uvloop when installed and
+PROXY_UVLOOP is set. The sharded (PROXY_WORKERS) and batched
+(PROXY_BATCH_SIZE) datapaths are selectors-engine features.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import json
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from core.aead import AeadAuthError, HeaderMismatch, ReplayError
+from core.async_proxy import (
+    ProxyCounters,
+    _build_sender_receiver,
+    _compute_aead_ids,
+    _launch_manual_console,
+    _parse_header_fields,
+    _perform_handshake,
+    _prewarm_suites,
+    _request_seq_exhaustion_rekey,
+    _resumed_handshake,
+    _setup_sockets,
+    _start_control_server,
+    _start_counter_export,
+    _start_crypto_offload,
+    _start_kem_pool,
+    _start_resumption,
+    _validate_config,
+    _write_status_file,
+)
+from core.config import CONFIG
+from core.exceptions import AeadError, ConfigError, SequenceOverflow
+from core.logging_utils import get_logger
+from core.policy_engine import (
+    coordinator_role_from_config,
+    create_control_state,
+    handle_control,
+    is_coordinator,
+    record_rekey_result,
+    set_coordinator_role,
+    take_resume_nonces,
+)
+from core.session_switch import SessionSwitch
+from core.suites import get_suite, list_suites
+
+logger = get_logger("pqc")
+
+_STATUS_INTERVAL_S = 1.0
+_OUTBOX_POLL_S = 0.05
+_REKEY_DRAIN_TIMEOUT_S = 2.0
+
+# Receiver.last_error_reason() -> drop counter
+_RECEIVER_DROP_FIELDS = {
+    "auth": "drop_auth",
+    "header": "drop_header",
+    "replay": "drop_replay",
+    "session": "drop_session_epoch",
+}
+
+# _parse_header_fields() reason -> drop counter
+_HEADER_DROP_FIELDS = {
+    "version_mismatch": "drop_header",
+    "crypto_id_mismatch": "drop_header",
+    "header_too_short": "drop_header",
+    "header_unpack_error": "drop_header",
+    "session_mismatch": "drop_session_epoch",
+    "auth_fail_or_replay": "drop_auth",
+}
+
+
+class _RekeyRejected(Exception):
+    """Rekey refused before the handshake; the message names the reason."""
+
+
+class _DatagramEndpoint(asyncio.DatagramProtocol):
+    def __init__(self, on_datagram: Callable[[bytes, Tuple[str, int]], None], role: str) -> None:
+        self._on_datagram = on_datagram
+        self._role = role
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self._on_datagram(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("UDP endpoint error", extra={"role": self._role, "error": str(exc)})
+
+
+def _unpack_handshake(result: tuple) -> tuple:
+    """Normalise _perform_handshake results to 9 fields (metrics last)."""
+
+    if len(result) >= 9:
+        return tuple(result[:9])
+    return tuple(result) + ({},)
+
+
+def _session_display(session_id: bytes, cfg: dict) -> str:
+    if cfg.get("LOG_SESSION_ID", False):
+        return session_id.hex()
+    return hashlib.sha256(session_id).hexdigest()[:8] + "..."
+
+
+class _AsyncioProxy:
+    """One proxy instance; every method runs on the event loop thread."""
+
+    def __init__(
+        self,
+        *,
+        role: str,
+        suite: dict,
+        cfg: dict,
+        gcs_sig_secret: Optional[object],
+        gcs_sig_public: Optional[bytes],
+        quiet: bool,
+        status_file: Optional[str],
+        load_gcs_secret: Optional[Callable[[Dict[str, object]], object]],
+        load_gcs_public: Optional[Callable[[Dict[str, object]], bytes]],
+        on_status: Optional[Callable[[Dict[str, object]], None]] = None,
+        status_shm: Optional[str] = None,
+    ) -> None:
+        self.role = role
+        self.suite = suite
+        self.cfg = cfg
+        self.gcs_sig_secret = gcs_sig_secret
+        self.gcs_sig_public = gcs_sig_public
+        self.quiet = quiet
+        self.status_path = Path(status_file).expanduser() if status_file else None
+        self.load_gcs_secret = load_gcs_secret
+        self.load_gcs_public = load_gcs_public
+        self.on_status = on_status
+        self.status_shm = status_shm
+
+        self.counters = ProxyCounters()
+        self.dp = self.counters.datapath
+        self.packet_type = bool(cfg.get("ENABLE_PACKET_TYPE"))
+        self.context: Dict[str, object] = {}
+        self.control_state = None
+        self.app_peer_addr: Optional[Tuple[str, int]] = None
+        self.encrypted_peer: Optional[Tuple[str, int]] = None
+        self.enc_transport: Optional[asyncio.DatagramTransport] = None
+        self.ptx_out_transport: Optional[asyncio.DatagramTransport] = None
+        self.kem_pool = None
+        self.offload = None
+        self.resumption = None
+        self.active_rekeys: Set[str] = set()
+        self.rekey_tasks: Set[asyncio.Task] = set()
+        # Handshakes block for up to REKEY_HANDSHAKE_TIMEOUT; keep them off the
+        # loop's default executor so status writes never queue behind one.
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pqc-proxy")
+
+    # -- helpers -----------------------------------------------------------
+
+    async def _blocking(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def _write_status(self, payload: Dict[str, object]) -> None:
+        if self.on_status is not None:
+            self.on_status(payload)
+        if self.status_path is None:
+            return
+        try:
+            await self._blocking(_write_status_file, self.status_path, payload, self.role)
+        except Exception:
+            logger.debug("status writer failed", extra={"role": self.role})
+
+    def _count_drop(self, field: str = "drop_other") -> None:
+        dp = self.dp
+        dp.seq += 1
+        dp.drops += 1
+        setattr(dp, field, getattr(dp, field) + 1)
+        dp.seq += 1
+
+    # -- datapath ----------------------------------------------------------
+
+    def _send_wire(self, wire: bytes) -> None:
+        dp = self.dp
+        try:
+            self.enc_transport.sendto(wire, self.encrypted_peer)
+        except Exception:
+            self._count_drop()
+            return
+        dp.seq += 1
+        dp.enc_out += 1
+        dp.enc_bytes_out += len(wire)
+        dp.touch()
+        dp.seq += 1
+
+    def on_plaintext(self, payload: bytes, addr: Tuple[str, int]) -> None:
+        if not payload:
+            return
+        # Reply to whichever port the app (e.g. MAVProxy --out) last used.
+        if addr != self.app_peer_addr:
+            self.app_peer_addr = addr
+
+        dp = self.dp
+        dp.seq += 1
+        dp.ptx_in += 1
+        dp.ptx_bytes_in += len(payload)
+        dp.touch()
+        dp.seq += 1
+
+        frame = (b"\x01" + payload) if self.packet_type else payload
+        encrypt_start_ns = time.perf_counter_ns()
+        try:
+            wire = self.context["session"].current_sender().encrypt(frame)
+        except SequenceOverflow as exc:
+            self._count_drop()
+            _request_seq_exhaustion_rekey(self.role, self.control_state, self.context.get("suite"), str(exc))
+            return
+        except Exception as exc:
+            self._count_drop()
+            logger.warning(
+                "Encrypt failed",
+                extra={"role": self.role, "error": str(exc), "payload_len": len(frame)},
+            )
+            return
+        encrypt_elapsed_ns = time.perf_counter_ns() - encrypt_start_ns
+        dp.seq += 1
+        dp.add_primitive("aead_encrypt", encrypt_elapsed_ns, len(frame), len(wire))
+        dp.seq += 1
+        self._send_wire(wire)
+
+    def _receiver_drop_field(self, receiver, wire: bytes) -> str:
+        last_reason = receiver.last_error_reason()
+        if last_reason in _RECEIVER_DROP_FIELDS:
+            return _RECEIVER_DROP_FIELDS[last_reason]
+        if last_reason is None or last_reason == "unknown":
+            reason, _seq = _parse_header_fields(CONFIG["WIRE_VERSION"], receiver.ids, receiver.session_id, wire)
+            return _HEADER_DROP_FIELDS.get(reason, "drop_other")
+        return "drop_other"
+
+    def on_encrypted(self, wire: bytes, addr: Tuple[str, int]) -> None:
+        if not wire:
+            return
+        dp = self.dp
+        context = self.context
+        session = context["session"]
+        receiver = session.receiver_for(wire)
+        expected_peer = context.get("peer_addr")
+        if expected_peer is not None:
+            if context.get("peer_match_strict", True):
+                mismatch = addr[0] != expected_peer[0] or addr[1] != expected_peer[1]
+            else:
+                mismatch = addr[0] != expected_peer[0]
+            if mismatch:
+                self._count_drop("drop_src_addr")
+                logger.debug(
+                    "Dropped encrypted packet from unauthorized source",
+                    extra={"role": self.role, "expected": expected_peer, "received": addr},
+                )
+                return
+
+        dp.seq += 1
+        dp.enc_in += 1
+        dp.enc_bytes_in += len(wire)
+        dp.touch()
+        dp.seq += 1
+
+        drop_field: Optional[str] = None
+        decrypt_start_ns = time.perf_counter_ns()
+        try:
+            plaintext = receiver.decrypt(wire)
+            if plaintext is None:
+                drop_field = self._receiver_drop_field(receiver, wire)
+        except ReplayError:
+            drop_field = "drop_replay"
+        except HeaderMismatch:
+            drop_field = "drop_header"
+        except AeadAuthError:
+            drop_field = "drop_auth"
+        except AeadError as exc:
+            reason, _seq = _parse_header_fields(CONFIG["WIRE_VERSION"], receiver.ids, receiver.session_id, wire)
+            drop_field = _HEADER_DROP_FIELDS.get(reason, "drop_auth")
+            logger.warning(
+                "Decrypt failed (classified)",
+                extra={"role": self.role, "reason": reason, "wire_len": len(wire), "error": str(exc)},
+            )
+        except Exception as exc:
+            drop_field = "drop_other"
+            logger.warning(
+                "Decrypt failed (other)",
+                extra={"role": self.role, "error": str(exc), "wire_len": len(wire)},
+            )
+        decrypt_elapsed_ns = time.perf_counter_ns() - decrypt_start_ns
+
+        if drop_field is not None:
+            dp.seq += 1
+            dp.drops += 1
+            setattr(dp, drop_field, getattr(dp, drop_field) + 1)
+            dp.add_primitive("aead_decrypt_fail", decrypt_elapsed_ns, len(wire), 0)
+            dp.seq += 1
+            return
+
+        session.delivered(receiver)
+        dp.seq += 1
+        dp.add_primitive("aead_decrypt_ok", decrypt_elapsed_ns, len(wire), len(plaintext))
+        dp.seq += 1
+
+        if self.packet_type and plaintext:
+            ptype = plaintext[0]
+            if ptype == 0x02:
+                self._process_control_frame(plaintext[1:])
+                return
+            if ptype != 0x01:
+                self._count_drop()
+                return
+            plaintext = plaintext[1:]
+
+        try:
+            self.ptx_out_transport.sendto(plaintext, self.app_peer_addr)
+        except Exception:
+            self._count_drop()
+            return
+        dp.seq += 1
+        dp.ptx_out += 1
+        dp.ptx_bytes_out += len(plaintext)
+        dp.touch()
+        dp.seq += 1
+
+    # -- control plane -----------------------------------------------------
+
+    def send_control(self, payload: dict) -> None:
+        body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        try:
+            wire = self.context["session"].current_sender().encrypt(b"\x02" + body)
+        except Exception as exc:
+            self._count_drop()
+            logger.warning("Failed to encrypt control payload", extra={"role": self.role, "error": str(exc)})
+            return
+        self._send_wire(wire)
+
+    def _process_control_frame(self, body: bytes) -> None:
+        try:
+            control_json = json.loads(bytes(body).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            self._count_drop()
+            return
+        result = handle_control(control_json, self.role, self.control_state)
+        for note in result.notes:
+            if note.startswith("prepare_fail"):
+                self.counters.rekeys_fail += 1
+        if result.peer_rekeyed:
+            self.context["session"].confirm(result.peer_rekeyed)
+        for payload in result.send:
+            self.control_state.outbox.put(payload)
+        if result.start_handshake:
+            suite_next, rid = result.start_handshake
+            self._launch_rekey(suite_next, rid, trigger_reason=control_json.get("type"))
+
+    async def _outbox_loop(self) -> None:
+        # The outbox is a thread-safe queue also fed by the TCP control server
+        # and the manual console threads, so it is polled rather than awaited.
+        while True:
+            while True:
+                try:
+                    payload = self.control_state.outbox.get_nowait()
+                except queue.Empty:
+                    break
+                self.send_control(payload)
+            await asyncio.sleep(_OUTBOX_POLL_S)
+
+    async def _status_loop(self) -> None:
+        while True:
+            await self._write_status(
+                {
+                    "status": "running",
+                    "suite": self.suite_id,
+                    "counters": self.counters.to_dict(),
+                    "ts_ns": time.time_ns(),
+                }
+            )
+            await asyncio.sleep(_STATUS_INTERVAL_S)
+
+    # -- rekey -------------------------------------------------------------
+
+    def _launch_rekey(self, target_suite_id: str, rid: str, trigger_reason: Optional[str] = None) -> None:
+        if rid in self.active_rekeys:
+            return
+        self.active_rekeys.add(rid)
+
+        counters = self.counters
+        now_mono = time.monotonic()
+        counters._rekey_active = True
+        counters._last_rekey_start_mono = now_mono
+        if counters._last_rekey_end_mono is not None:
+            counters.rekey_interval_ms = (now_mono - counters._last_rekey_end_mono) * 1000.0
+        if trigger_reason:
+            counters.rekey_trigger_reason = trigger_reason
+
+        logger.info(
+            "Control rekey negotiation started",
+            extra={"role": self.role, "suite_id": target_suite_id, "rid": rid},
+        )
+        task = asyncio.ensure_future(self._rekey(target_suite_id, rid))
+        self.rekey_tasks.add(task)
+        task.add_done_callback(self.rekey_tasks.discard)
+
+    def _finalize_rekey(self) -> None:
+        counters = self.counters
+        end_mono = time.monotonic()
+        counters._last_rekey_end_mono = end_mono
+        if counters._last_rekey_start_mono is not None:
+            counters.rekey_duration_ms = (end_mono - counters._last_rekey_start_mono) * 1000.0
+        counters._rekey_active = False
+
+    async def _load_rekey_keys(self, new_suite: dict) -> Tuple[Optional[object], Optional[bytes]]:
+        new_secret = None
+        new_public: Optional[bytes] = None
+        if self.role == "gcs" and self.load_gcs_secret is not None:
+            try:
+                new_secret = await self._blocking(self.load_gcs_secret, new_suite)
+            except FileNotFoundError as exc:
+                raise _RekeyRejected("missing signing secret") from exc
+            except Exception as exc:
+                raise _RekeyRejected("signing secret load failed") from exc
+        if self.role == "drone" and self.load_gcs_public is not None:
+            try:
+                new_public = await self._blocking(self.load_gcs_public, new_suite)
+            except FileNotFoundError as exc:
+                raise _RekeyRejected("missing signing public key") from exc
+            except Exception as exc:
+                raise _RekeyRejected("signing public key load failed") from exc
+        return new_secret, new_public
+
+    def _fail_rekey(self, target_suite_id: str, rid: str, message: str, exc: BaseException) -> None:
+        self.counters.rekeys_fail += 1
+        self._finalize_rekey()
+        record_rekey_result(self.control_state, rid, self.context["suite"], success=False)
+        logger.warning(
+            message,
+            extra={"role": self.role, "suite_id": target_suite_id, "rid": rid, "error": str(exc)},
+        )
+
+    async def _rekey(self, target_suite_id: str, rid: str) -> None:
+        role = self.role
+        cfg = self.cfg
+        prev_token: Optional[str] = cfg.get("SUITE_AEAD_TOKEN")
+        try:
+            try:
+                new_suite = get_suite(target_suite_id)
+            except (ValueError, KeyError) as exc:
+                raise _RekeyRejected("unknown suite") from exc
+            new_secret, new_public = await self._load_rekey_keys(new_suite)
+
+            timeout = float(cfg.get("REKEY_HANDSHAKE_TIMEOUT", 20.0))
+            base_secret = new_secret if (role == "gcs" and new_secret is not None) else self.gcs_sig_secret
+            public_key = new_public if new_public is not None else self.gcs_sig_public
+            if role == "drone" and public_key is None:
+                raise ConfigError("GCS public key not available for rekey")
+            resume_nonces = take_resume_nonces(self.control_state, rid)
+            resumed = resume_nonces is not None and self.resumption is not None
+            if resumed:
+                rk_result = _resumed_handshake(
+                    self.resumption, new_suite, resume_nonces, self.context["peer_addr"]
+                )
+            else:
+                rk_result = await self._blocking(
+                    _perform_handshake,
+                    role,
+                    new_suite,
+                    base_secret,
+                    public_key,
+                    cfg,
+                    accept_deadline_s=timeout,
+                    io_timeout_s=timeout,
+                    kem_pool=self.kem_pool,
+                    offload=self.offload,
+                )
+            (
+                new_k_d2g,
+                new_k_g2d,
+                _nd1,
+                _nd2,
+                new_session_id,
+                new_kem_name,
+                new_sig_name,
+                new_peer_addr,
+                new_handshake_metrics,
+            ) = _unpack_handshake(rk_result)
+            cfg["SUITE_AEAD_TOKEN"] = new_suite.get("aead_token", "aesgcm")
+            new_ids = _compute_aead_ids(new_suite, new_kem_name, new_sig_name)
+            new_sender, new_receiver = _build_sender_receiver(
+                role, new_ids, new_session_id, new_k_d2g, new_k_g2d, cfg
+            )
+        except _RekeyRejected as exc:
+            self._fail_rekey(target_suite_id, rid, f"Control rekey rejected: {exc}", exc.__cause__ or exc)
+            return
+        except Exception as exc:
+            if prev_token is not None:
+                cfg["SUITE_AEAD_TOKEN"] = prev_token
+            self._fail_rekey(target_suite_id, rid, "Control rekey failed", exc)
+            return
+        finally:
+            self.active_rekeys.discard(rid)
+
+        # Updated on the loop thread: no packet sees a half-updated context.
+        # Receive on both sessions from here; the send side switches once the
+        # peer confirms (see core.session_switch).
+        self.context["session"].install(new_sender, new_receiver, float(cfg.get("REKEY_GRACE_S", 3.0)), rid)
+        self.context.update(
+            {
+                "session_id": new_session_id,
+                "aead_ids": new_ids,
+                "suite": new_suite["suite_id"],
+                "suite_dict": new_suite,
+                "peer_addr": new_peer_addr,
+            }
+        )
+        self.encrypted_peer = new_peer_addr
+        if self.resumption is not None:
+            self.resumption.install(new_suite["suite_id"], new_session_id, new_k_d2g, new_k_g2d, resumed=resumed)
+
+        counters = self.counters
+        counters.rekeys_ok += 1
+        if resumed:
+            counters.rekeys_resumed += 1
+        counters.last_rekey_ms = int(time.time() * 1000)
+        counters.last_rekey_suite = new_suite["suite_id"]
+        counters.handshake_metrics = dict(new_handshake_metrics) if new_handshake_metrics else {}
+        self._finalize_rekey()
+        if role == "drone" and new_public is not None:
+            self.gcs_sig_public = new_public
+        record_rekey_result(self.control_state, rid, new_suite["suite_id"], success=True)
+
+        status_payload = {
+            "status": "rekey_ok",
+            "new_suite": new_suite["suite_id"],
+            "session_id": _session_display(new_session_id, cfg),
+        }
+        if new_handshake_metrics:
+            status_payload["handshake_metrics"] = dict(new_handshake_metrics)
+        logger.info(
+            "Control rekey successful",
+            extra={
+                "role": role,
+                "suite_id": new_suite["suite_id"],
+                "rid": rid,
+                "session_id": _session_display(new_session_id, cfg),
+            },
+        )
+        await self._write_status(status_payload)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def run(
+        self,
+        *,
+        stop_after_seconds: Optional[float],
+        manual_control: bool,
+        ready_event: Optional[threading.Event],
+        stop_event: Optional[asyncio.Event],
+    ) -> Dict[str, object]:
+        role = self.role
+        cfg = self.cfg
+        suite = self.suite
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+
+        if role == "drone" and self.gcs_sig_public is None:
+            if self.load_gcs_public is None:
+                raise ConfigError("GCS signature public key not provided (provide peer key or loader)")
+            self.gcs_sig_public = self.load_gcs_public(suite)
+
+        self.offload = _start_crypto_offload(role, cfg)
+        self.counters.crypto_offload = self.offload
+        self.kem_pool = _start_kem_pool(role, cfg, suite, self.offload)
+        self.counters.kem_pool = self.kem_pool
+        handshake = asyncio.ensure_future(
+            self._blocking(
+                _perform_handshake,
+                role,
+                suite,
+                self.gcs_sig_secret,
+                self.gcs_sig_public,
+                cfg,
+                accept_deadline_s=stop_after_seconds,
+                io_timeout_s=cfg.get("REKEY_HANDSHAKE_TIMEOUT", 20.0),
+                ready_event=ready_event,
+                kem_pool=self.kem_pool,
+                offload=self.offload,
+            )
+        )
+        if stop_event is not None:
+            # A GCS may wait indefinitely for the drone; stopping must not.
+            stopper = asyncio.ensure_future(stop_event.wait())
+            await asyncio.wait({handshake, stopper}, return_when=asyncio.FIRST_COMPLETED)
+            stopper.cancel()
+            if not handshake.done():
+                handshake.cancel()
+                return self.counters.to_dict()
+        (
+            k_d2g,
+            k_g2d,
+            _nseed_d2g,
+            _nseed_g2d,
+            session_id,
+            kem_name,
+            sig_name,
+            peer_addr,
+            handshake_metrics,
+        ) = _unpack_handshake(await handshake)
+
+        suite_id = suite.get("suite_id")
+        if not suite_id:
+            suite_id = next((sid for sid, s in list_suites().items() if s == suite), "unknown")
+        self.suite_id = suite_id
+
+        status_payload = {
+            "status": "handshake_ok",
+            "suite": suite_id,
+            "session_id": _session_display(session_id, cfg),
+        }
+        if handshake_metrics:
+            status_payload["handshake_metrics"] = handshake_metrics
+        await self._write_status(status_payload)
+        self.counters.handshake_metrics = dict(handshake_metrics) if handshake_metrics else {}
+        logger.info(
+            "PQC handshake completed successfully",
+            extra={
+                "suite_id": suite_id,
+                "peer_role": ("drone" if role == "gcs" else "gcs"),
+                "session_id": _session_display(session_id, cfg),
+            },
+        )
+
+        aead_ids = _compute_aead_ids(suite, kem_name, sig_name)
+        sender, receiver = _build_sender_receiver(role, aead_ids, session_id, k_d2g, k_g2d, cfg)
+        session = SessionSwitch(sender, receiver)
+        self.counters.session = session
+
+        self.control_state = control_state = create_control_state(role, suite_id)
+        coordinator_role = coordinator_role_from_config(cfg)
+        try:
+            set_coordinator_role(control_state, coordinator_role)
+        except Exception:
+            # Fail closed to legacy behaviour (GCS-coordinated) if coordinator setup fails.
+            coordinator_role = "gcs"
+            try:
+                set_coordinator_role(control_state, coordinator_role)
+            except Exception:
+                pass
+        if self.kem_pool is not None:
+            control_state.prewarm = functools.partial(_prewarm_suites, self.kem_pool)
+        self.resumption = _start_resumption(cfg, control_state, suite_id, session_id, k_d2g, k_g2d)
+        self.context = {
+            "suite": suite_id,
+            "suite_dict": suite,
+            "session_id": session_id,
+            "aead_ids": aead_ids,
+            "session": session,
+            "peer_addr": peer_addr,
+            "peer_match_strict": bool(cfg.get("STRICT_UDP_PEER_MATCH", True)),
+        }
+
+        coordinator = is_coordinator(role=role, coordinator_role=coordinator_role)
+        if manual_control and coordinator and not cfg.get("ENABLE_PACKET_TYPE"):
+            logger.warning("ENABLE_PACKET_TYPE is disabled; control-plane packets may not be processed correctly.")
+        manual_stop: Optional[threading.Event] = None
+        manual_threads: Tuple[threading.Thread, ...] = ()
+        if manual_control and coordinator:
+            manual_stop, manual_threads = _launch_manual_console(control_state, quiet=self.quiet)
+        control_server = _start_control_server(role, cfg, control_state, quiet=self.quiet)
+
+        transports = []
+        tasks = []
+        stop_counter_export: Optional[Callable[[], None]] = None
+        with _setup_sockets(role, cfg, encrypted_peer=peer_addr) as sockets:
+            self.encrypted_peer = sockets["encrypted_peer"]
+            self.app_peer_addr = sockets["plaintext_peer"]
+            try:
+                self.enc_transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _DatagramEndpoint(self.on_encrypted, role), sock=sockets["encrypted"]
+                )
+                transports.append(self.enc_transport)
+                ptx_in_transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _DatagramEndpoint(self.on_plaintext, role), sock=sockets["plaintext_in"]
+                )
+                transports.append(ptx_in_transport)
+                if sockets["plaintext_out"] is sockets["plaintext_in"]:
+                    self.ptx_out_transport = ptx_in_transport
+                else:
+                    # Send-only socket: its endpoint never sees datagrams.
+                    self.ptx_out_transport, _ = await loop.create_datagram_endpoint(
+                        lambda: _DatagramEndpoint(lambda _data, _addr: None, role), sock=sockets["plaintext_out"]
+                    )
+                    transports.append(self.ptx_out_transport)
+
+                tasks.append(asyncio.ensure_future(self._status_loop()))
+                tasks.append(asyncio.ensure_future(self._outbox_loop()))
+                stop_counter_export = _start_counter_export(self.counters, self.status_shm, cfg, role)
+
+                stop_wait = stop_event.wait() if stop_event is not None else loop.create_future()
+                timeout = None
+                if stop_after_seconds is not None:
+                    timeout = max(0.0, stop_after_seconds - (time.time() - start_time))
+                try:
+                    await asyncio.wait_for(stop_wait, timeout)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                if stop_counter_export is not None:
+                    stop_counter_export()
+                for transport in transports:
+                    transport.close()
+                if manual_stop:
+                    manual_stop.set()
+                    for thread in manual_threads:
+                        thread.join(timeout=0.5)
+                if control_server is not None:
+                    try:
+                        control_server.stop()
+                    except Exception:
+                        pass
+                # Let an in-flight rekey finish (or time out) before teardown.
+                if self.rekey_tasks:
+                    await asyncio.wait(list(self.rekey_tasks), timeout=_REKEY_DRAIN_TIMEOUT_S)
+
+        await self._write_status(
+            {
+                "status": "stopped",
+                "suite": suite_id,
+                "counters": self.counters.to_dict(),
+                "ts_ns": time.time_ns(),
+            }
+        )
+        return self.counters.to_dict()
+
+
+async def serve_proxy(
+    *,
+    role: str,
+    suite: dict,
+    cfg: dict,
+    gcs_sig_secret: Optional[object] = None,
+    gcs_sig_public: Optional[bytes] = None,
+    stop_after_seconds: Optional[float] = None,
+    manual_control: bool = False,
+    quiet: bool = False,
+    ready_event: Optional[threading.Event] = None,
+    status_file: Optional[str] = None,
+    load_gcs_secret: Optional[Callable[[Dict[str, object]], object]] = None,
+    load_gcs_public: Optional[Callable[[Dict[str, object]], bytes]] = None,
+    on_status: Optional[Callable[[Dict[str, object]], None]] = None,
+    status_shm: Optional[str] = None,
+    stop_event: Optional[asyncio.Event] = None,
+) -> Dict[str, object]:
+    """
+    Run the proxy for `role` in {"drone","gcs"} on the running event loop.
+
+    Arguments match `core.async_proxy.run_proxy`; setting `stop_event` (or
+    cancelling the task) stops it. Returns counters on clean exit.
+    """
+    if role not in {"drone", "gcs"}:
+        raise ValueError(f"Invalid role: {role}")
+
+    _validate_config(cfg)
+
+    cfg = dict(cfg)
+    cfg["SUITE_AEAD_TOKEN"] = suite.get("aead_token", "aesgcm")
+    if int(cfg.get("PROXY_WORKERS", 1) or 1) > 1 or int(cfg.get("PROXY_BATCH_SIZE", 1) or 1) > 1:
+        logger.warning(
+            "PROXY_WORKERS/PROXY_BATCH_SIZE are ignored by the asyncio engine",
+            extra={"role": role},
+        )
+
+    proxy = _AsyncioProxy(
+        role=role,
+        suite=suite,
+        cfg=cfg,
+        gcs_sig_secret=gcs_sig_secret,
+        gcs_sig_public=gcs_sig_public,
+        quiet=quiet,
+        status_file=status_file,
+        load_gcs_secret=load_gcs_secret,
+        load_gcs_public=load_gcs_public,
+        on_status=on_status,
+        status_shm=status_shm,
+    )
+    try:
+        return await proxy.run(
+            stop_after_seconds=stop_after_seconds,
+            manual_control=manual_control,
+            ready_event=ready_event,
+            stop_event=stop_event,
+        )
+    finally:
+        # A rekey handshake still blocked in a worker thread is abandoned,
+        # as the selectors engine abandons its daemon rekey threads.
+        proxy.executor.shutdown(wait=False, cancel_futures=True)
+        if proxy.kem_pool is not None:
+            proxy.kem_pool.stop()
+        if proxy.offload is not None:
+            proxy.offload.stop()
+
+
+def new_event_loop(cfg: dict) -> asyncio.AbstractEventLoop:
+    """Return a uvloop loop when PROXY_UVLOOP is set and uvloop is installed."""
+
+    if cfg.get("PROXY_UVLOOP", True):
+        try:
+            import uvloop  # type: ignore
+        except ImportError:
+            logger.debug("uvloop not installed; using the default asyncio loop")
+        else:
+            return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def run_proxy_asyncio(**kwargs) -> Dict[str, object]:
+    """Blocking entry point with the `core.async_proxy.run_proxy` signature.
+
+    SIGINT stops the proxy cleanly (counters are still returned), as
+    KeyboardInterrupt does for the selectors engine.
+    """
+
+    loop = new_event_loop(kwargs.get("cfg") or {})
+    try:
+        asyncio.set_event_loop(loop)
+        stop_event = kwargs.setdefault("stop_event", asyncio.Event())
+        try:
+            loop.add_signal_handler(signal.SIGINT, stop_event.set)
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Windows loops and non-main threads: KeyboardInterrupt propagates.
+            pass
+        return loop.run_until_complete(serve_proxy(**kwargs))
+    finally:
+        try:
+            loop.remove_signal_handler(signal.SIGINT)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
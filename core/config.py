@@ -28,7 +28,14 @@ _GCS_HOST_TAILSCALE = os.getenv("GCS_HOST_TAILSCALE", "100.106.181.122")
 # When ENABLE_MDNS=1, resolve drone.local/gcs.local on the LAN via mDNS
 # instead of using static IPs.  Falls back to the env/hardcoded IPs if
 # mDNS resolution fails or the zeroconf library is not installed.
-if os.getenv("ENABLE_MDNS", "").strip() in ("1", "true", "yes"):
+# Resolved hosts are exported to the environment (with PQC_MDNS_RESOLVED=1)
+# so child processes — e.g. the long-lived core.run_proxy that sdrone and
+# sgcs start once — inherit them instead of importing zeroconf and resolving
+# again.
+if (
+    os.getenv("ENABLE_MDNS", "").strip() in ("1", "true", "yes")
+    and os.getenv("PQC_MDNS_RESOLVED", "") != "1"
+):
     try:
         from core.mdns import resolve_drone, resolve_gcs
         _mdns_drone = resolve_drone(timeout=2.0, fallback=_DRONE_HOST_LAN)
@@ -37,6 +44,9 @@ if os.getenv("ENABLE_MDNS", "").strip() in ("1", "true", "yes"):
             _DRONE_HOST_LAN = _mdns_drone
         if _mdns_gcs:
             _GCS_HOST_LAN = _mdns_gcs
+        os.environ["DRONE_HOST_LAN"] = _DRONE_HOST_LAN
+        os.environ["GCS_HOST_LAN"] = _GCS_HOST_LAN
+        os.environ["PQC_MDNS_RESOLVED"] = "1"
     except Exception:
         pass  # mDNS unavailable — use static IPs
 
@@ -87,6 +97,49 @@ CONFIG = {
     "WIRE_VERSION": 1,      # header version byte (frozen)
     # Allow slower suites to finish the rekey handshake without timing out
     "REKEY_HANDSHAKE_TIMEOUT": 45.0,
+    # Make-before-break rekey: seconds the previous session's receiver keeps
+    # accepting in-flight packets after a rekey. The send side switches when
+    # the peer confirms, or after half of this at the latest.
+    "REKEY_GRACE_S": 3.0,
+    # Same-suite rekeys derive the next keys from a resumption secret of the
+    # current session instead of running a full handshake (core.resumption).
+    # At most this many in a row before a full handshake. Off by default:
+    # resumed rekeys add no fresh KEM exchange (no new forward secrecy) and
+    # change what the rekey/handshake benchmarks measure. Opt in by setting a
+    # limit on both proxies, e.g. REKEY_RESUME_MAX=8 in the environment.
+    "REKEY_RESUME_MAX": 0,
+
+    # Datapath batching: drain up to N datagrams per selector wake-up on each
+    # UDP socket, encrypt/decrypt them, and send them back out as one batch.
+    # 1 keeps the legacy one-recvfrom-per-wake-up loop.
+    "PROXY_BATCH_SIZE": 1,
+    # Use recvmmsg/sendmmsg through libc when available (Linux). When False or
+    # unavailable, batches are drained with a non-blocking recvfrom loop.
+    "PROXY_BATCH_MMSG": True,
+    # Per-packet datapath receives into preallocated buffers and uses
+    # Sender.encrypt_into / Receiver.decrypt_into on memoryviews.
+    "PROXY_ZERO_COPY": True,
+    # Datapath processes (Linux only). Values > 1 start PROXY_WORKERS - 1 extra
+    # worker processes that share the encrypted/plaintext ports through
+    # SO_REUSEPORT, each sending on its own sequence lane (core/sharded_proxy.py).
+    # Both proxies must run a build that understands sequence lanes.
+    "PROXY_WORKERS": 1,
+    # Datapath engine: "selectors" (core/async_proxy.py) or "asyncio"
+    # (core/asyncio_proxy.py, DatagramProtocol endpoints on one event loop).
+    "PROXY_ENGINE": "selectors",
+    # Run the asyncio engine on uvloop when it is installed.
+    "PROXY_UVLOOP": True,
+    # GCS KEM keypair pool (core/kem_pool.py): pre-generated single-use
+    # ephemeral keypairs per KEM for the current suite, the suites below and
+    # those named by the "prewarm" control command. 0 disables the pool.
+    "KEM_POOL_DEPTH": 1,
+    # Unused pooled keypairs are discarded after this many seconds.
+    "KEM_POOL_TTL_S": 300.0,
+    "KEM_POOL_PREFILL_SUITES": [],
+    # Drone signature cache (core/sig_cache.py): at start-up the proxy loads
+    # the GCS public key and verifier for its suite and for these suites
+    # only; others are cached on their first rekey.
+    "SIG_PREWARM_SUITES": [],
 
     # --- Bare scheduler defaults (scheduler/bare/*) ---
     # Dwell time per suite before automatic rotation (seconds).
@@ -102,6 +155,27 @@ CONFIG = {
     # Model: token bucket; BURST tokens max, refilling at REFILL_PER_SEC tokens/sec.
     "HANDSHAKE_RL_BURST": 5,
     "HANDSHAKE_RL_REFILL_PER_SEC": 1,
+    # GCS handshake server (core/handshake_server.py): connections handled at
+    # once, and worker threads for the ServerHello (keygen/sign) and decap work.
+    "HANDSHAKE_MAX_INFLIGHT": 16,
+    "HANDSHAKE_WORKERS": 2,
+    # Run the GCS handshake's KEM keygen/decap and signing in a separate
+    # worker process (core/crypto_offload.py) instead of proxy threads.
+    "HANDSHAKE_CRYPTO_OFFLOAD": False,
+    # Publish rate of the proxy's shared-memory counters (--status-shm,
+    # core/counter_shm.py), in updates per second.
+    "STATUS_SHM_HZ": 100.0,
+    # Drone power sampling for the metrics aggregator: run it in a separate
+    # process (core/power_sampler.py) that writes a shared-memory ring,
+    # optionally pinned to a CPU (-1: no pinning) and with a raised priority
+    # (1..99: SCHED_FIFO, negative: nice level, 0: unchanged).
+    "POWER_SAMPLER_PROCESS": False,
+    "POWER_SAMPLER_CPU": -1,
+    "POWER_SAMPLER_PRIORITY": 0,
+    # Metrics aggregator: append each suite to an append-only journal
+    # (core/metrics_journal.py) while it runs instead of holding raw samples
+    # in memory until finalize.
+    "METRICS_STREAMING": False,
 
     # Mark encrypted UDP with DSCP EF (46) to prioritize on WMM-enabled APs.
     # Set to None to disable. Implementation multiplies by 4 to form TOS.
@@ -184,6 +258,13 @@ CONFIG = {
     # Bind to 0.0.0.0 by default to accept local + remote commands.
     "GCS_CONTROL_HOST": "0.0.0.0",
     "GCS_CONTROL_PORT": 48080,
+    # Scheduler control clients (core/control_wire.py): keep one framed,
+    # pipelined connection per peer instead of a TCP connect per command, and
+    # the body encoding to use ("json", or "msgpack"/"cbor" when installed).
+    # Servers accept both framed and legacy newline-JSON connections; set
+    # CONTROL_FRAMED False only when talking to a peer without framing support.
+    "CONTROL_FRAMED": True,
+    "CONTROL_CODEC": "json",
     # Telemetry port for GCS -> Drone feedback channel (UDP)
     "GCS_TELEMETRY_PORT": 52080,
     # Encrypted-plane control channel used by certain schedulers to route
@@ -443,6 +524,26 @@ _REQUIRED_KEYS = {
 _ENV_OPTIONAL_TYPES = {
     "ENABLE_TCP_CONTROL": bool,
     "CONTROL_COORDINATOR_ROLE": str,
+    "PROXY_BATCH_SIZE": int,
+    "PROXY_BATCH_MMSG": bool,
+    "PROXY_ZERO_COPY": bool,
+    "PROXY_WORKERS": int,
+    "PROXY_ENGINE": str,
+    "PROXY_UVLOOP": bool,
+    "KEM_POOL_DEPTH": int,
+    "KEM_POOL_TTL_S": float,
+    "REKEY_GRACE_S": float,
+    "REKEY_RESUME_MAX": int,
+    "HANDSHAKE_MAX_INFLIGHT": int,
+    "HANDSHAKE_WORKERS": int,
+    "HANDSHAKE_CRYPTO_OFFLOAD": bool,
+    "CONTROL_FRAMED": bool,
+    "CONTROL_CODEC": str,
+    "STATUS_SHM_HZ": float,
+    "POWER_SAMPLER_PROCESS": bool,
+    "POWER_SAMPLER_CPU": int,
+    "POWER_SAMPLER_PRIORITY": int,
+    "METRICS_STREAMING": bool,
 }
 
 # Keys that can be overridden by environment variables
@@ -472,6 +573,26 @@ _ENV_OVERRIDABLE = {
     "LOG_SESSION_ID",
     "DRONE_PSK",
     "ASCON_STRICT_KEY_SIZE",
+    "PROXY_BATCH_SIZE",
+    "PROXY_BATCH_MMSG",
+    "PROXY_ZERO_COPY",
+    "PROXY_WORKERS",
+    "PROXY_ENGINE",
+    "PROXY_UVLOOP",
+    "KEM_POOL_DEPTH",
+    "KEM_POOL_TTL_S",
+    "REKEY_GRACE_S",
+    "REKEY_RESUME_MAX",
+    "HANDSHAKE_MAX_INFLIGHT",
+    "HANDSHAKE_WORKERS",
+    "HANDSHAKE_CRYPTO_OFFLOAD",
+    "CONTROL_FRAMED",
+    "CONTROL_CODEC",
+    "STATUS_SHM_HZ",
+    "POWER_SAMPLER_PROCESS",
+    "POWER_SAMPLER_CPU",
+    "POWER_SAMPLER_PRIORITY",
+    "METRICS_STREAMING",
 }
 
 
@@ -561,6 +682,82 @@ def validate_config(cfg: Dict[str, Any]) -> None:
         if not isinstance(cfg["ENABLE_TCP_CONTROL"], bool):
             raise ConfigError("CONFIG[ENABLE_TCP_CONTROL] must be bool")
 
+    if "PROXY_BATCH_SIZE" in cfg:
+        batch = cfg["PROXY_BATCH_SIZE"]
+        if not isinstance(batch, int) or isinstance(batch, bool) or not (1 <= batch <= 1024):
+            raise ConfigError("CONFIG[PROXY_BATCH_SIZE] must be int in range 1..1024")
+
+    if "PROXY_WORKERS" in cfg:
+        workers = cfg["PROXY_WORKERS"]
+        if not isinstance(workers, int) or isinstance(workers, bool) or not (1 <= workers <= 64):
+            raise ConfigError("CONFIG[PROXY_WORKERS] must be int in range 1..64")
+
+    if "PROXY_ENGINE" in cfg:
+        if cfg["PROXY_ENGINE"] not in {"selectors", "asyncio"}:
+            raise ConfigError("CONFIG[PROXY_ENGINE] must be 'selectors' or 'asyncio'")
+
+    if "KEM_POOL_DEPTH" in cfg:
+        depth = cfg["KEM_POOL_DEPTH"]
+        if not isinstance(depth, int) or isinstance(depth, bool) or not (0 <= depth <= 8):
+            raise ConfigError("CONFIG[KEM_POOL_DEPTH] must be int in range 0..8")
+
+    if "SIG_PREWARM_SUITES" in cfg:
+        prewarm = cfg["SIG_PREWARM_SUITES"]
+        if not isinstance(prewarm, (list, tuple)) or not all(isinstance(s, str) for s in prewarm):
+            raise ConfigError("CONFIG[SIG_PREWARM_SUITES] must be a list of suite ids")
+
+    if "KEM_POOL_TTL_S" in cfg:
+        ttl = cfg["KEM_POOL_TTL_S"]
+        if not isinstance(ttl, (int, float)) or isinstance(ttl, bool) or ttl <= 0:
+            raise ConfigError("CONFIG[KEM_POOL_TTL_S] must be a positive number")
+
+    if "REKEY_GRACE_S" in cfg:
+        grace = cfg["REKEY_GRACE_S"]
+        if not isinstance(grace, (int, float)) or isinstance(grace, bool) or not (0 < grace <= 60):
+            raise ConfigError("CONFIG[REKEY_GRACE_S] must be a number in range (0, 60]")
+
+    if "REKEY_RESUME_MAX" in cfg:
+        resume_max = cfg["REKEY_RESUME_MAX"]
+        if not isinstance(resume_max, int) or isinstance(resume_max, bool) or not (0 <= resume_max <= 1024):
+            raise ConfigError("CONFIG[REKEY_RESUME_MAX] must be int in range 0..1024")
+
+    if "HANDSHAKE_MAX_INFLIGHT" in cfg:
+        inflight = cfg["HANDSHAKE_MAX_INFLIGHT"]
+        if not isinstance(inflight, int) or isinstance(inflight, bool) or not (1 <= inflight <= 1024):
+            raise ConfigError("CONFIG[HANDSHAKE_MAX_INFLIGHT] must be int in range 1..1024")
+
+    if "HANDSHAKE_WORKERS" in cfg:
+        hs_workers = cfg["HANDSHAKE_WORKERS"]
+        if not isinstance(hs_workers, int) or isinstance(hs_workers, bool) or not (1 <= hs_workers <= 64):
+            raise ConfigError("CONFIG[HANDSHAKE_WORKERS] must be int in range 1..64")
+
+    if "STATUS_SHM_HZ" in cfg:
+        shm_hz = cfg["STATUS_SHM_HZ"]
+        if not isinstance(shm_hz, (int, float)) or isinstance(shm_hz, bool) or not (1.0 <= shm_hz <= 1000.0):
+            raise ConfigError("CONFIG[STATUS_SHM_HZ] must be a number in range 1..1000")
+
+    if "POWER_SAMPLER_PROCESS" in cfg and not isinstance(cfg["POWER_SAMPLER_PROCESS"], bool):
+        raise ConfigError("CONFIG[POWER_SAMPLER_PROCESS] must be bool")
+
+    if "POWER_SAMPLER_CPU" in cfg:
+        sampler_cpu = cfg["POWER_SAMPLER_CPU"]
+        if not isinstance(sampler_cpu, int) or isinstance(sampler_cpu, bool) or sampler_cpu < -1:
+            raise ConfigError("CONFIG[POWER_SAMPLER_CPU] must be int >= -1")
+
+    if "POWER_SAMPLER_PRIORITY" in cfg:
+        sampler_prio = cfg["POWER_SAMPLER_PRIORITY"]
+        if not isinstance(sampler_prio, int) or isinstance(sampler_prio, bool) or not (-20 <= sampler_prio <= 99):
+            raise ConfigError("CONFIG[POWER_SAMPLER_PRIORITY] must be int in range -20..99")
+
+    if "METRICS_STREAMING" in cfg and not isinstance(cfg["METRICS_STREAMING"], bool):
+        raise ConfigError("CONFIG[METRICS_STREAMING] must be bool")
+
+    if "CONTROL_FRAMED" in cfg and not isinstance(cfg["CONTROL_FRAMED"], bool):
+        raise ConfigError("CONFIG[CONTROL_FRAMED] must be bool")
+
+    if "CONTROL_CODEC" in cfg and cfg["CONTROL_CODEC"] not in {"json", "msgpack", "cbor"}:
+        raise ConfigError("CONFIG[CONTROL_CODEC] must be one of: json, msgpack, cbor")
+
     coord = cfg.get("CONTROL_COORDINATOR_ROLE", "gcs")
     if coord is not None:
         if not isinstance(coord, str):
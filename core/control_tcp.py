@@ -7,6 +7,16 @@ controllers/schedulers that speak the legacy TCP JSON protocol:
 
 into the core in-band control plane (policy_engine.request_prepare).
 
+  {"cmd": "prewarm", "suites": ["cs-...", ...]}
+
+tells the GCS proxy which suites are likely next so its KEM keypair pool can
+generate their keypairs before the rekey (core.kem_pool).
+
+`send_control_command` is the matching one-shot client, used by the
+schedulers to switch suites on a long-lived local proxy instead of restarting
+it. Connections that start with a core.control_wire frame are served as a
+persistent, pipelined framed channel instead (see control_wire.ControlChannel).
+
 Security model:
 - The listener is expected to bind on a trusted interface.
 - Commands are accepted only from an allow-list of peer IPs.
@@ -23,6 +33,7 @@ import threading
 from dataclasses import dataclass
 from typing import Callable, Iterable, Optional
 
+from core import control_wire
 from core.logging_utils import get_logger
 from core.policy_engine import ControlState, coordinator_role_from_config, is_coordinator, request_prepare
 from core.suites import get_suite
@@ -42,7 +53,11 @@ class ControlTcpConfig:
 
 
 class ControlTcpServer:
-    """A small threaded TCP server that reads newline-delimited JSON."""
+    """A small threaded TCP server for newline-delimited JSON or framed requests.
+
+    The first byte of a connection selects the protocol: core.control_wire
+    frames (persistent, pipelined) or legacy JSON lines.
+    """
 
     def __init__(
         self,
@@ -133,21 +148,25 @@ class ControlTcpServer:
                     _send_json(conn, {"ok": False, "error": "unauthorized"})
                     return
 
-                # Read line-by-line using raw socket recv to avoid buffering issues
-                buf = b""
-                while True:
-                    if self._stop.is_set():
-                        return
-                    try:
-                        chunk = conn.recv(4096)
-                    except socket.timeout:
-                        continue
-                    if not chunk:
-                        # EOF reached
-                        return
-                    buf += chunk
-                    while b"\n" in buf:
-                        line_bytes, buf = buf.split(b"\n", 1)
+                first = self._recv(conn)
+                if not first:
+                    return
+                if first[0] == control_wire.MAGIC:
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    control_wire.serve_framed(
+                        conn,
+                        first,
+                        lambda msg: self._dispatch(msg, peer_ip),
+                        bad_message={"ok": False, "error": "bad_message"},
+                        should_stop=self._stop.is_set,
+                    )
+                    return
+
+                # Legacy newline-delimited JSON.
+                lines = control_wire.LineDecoder()
+                chunk = first
+                while chunk:
+                    for line_bytes in lines.feed(chunk):
                         line = line_bytes.decode("utf-8", errors="replace").strip()
                         if not line:
                             continue
@@ -159,15 +178,8 @@ class ControlTcpServer:
                         if not isinstance(msg, dict):
                             _send_json(conn, {"ok": False, "error": "bad_message"})
                             continue
-                        try:
-                            resp = self._handle_message(msg, peer_ip)
-                        except Exception as exc:
-                            _logger.warning(
-                                "TCP control _handle_message exception",
-                                extra={"role": self._cfg.role, "peer": peer_ip, "error": str(exc), "cmd": msg.get("cmd")},
-                            )
-                            resp = {"ok": False, "error": f"internal_error:{type(exc).__name__}"}
-                        _send_json(conn, resp)
+                        _send_json(conn, self._dispatch(msg, peer_ip))
+                    chunk = self._recv(conn)
         except (OSError, ValueError, json.JSONDecodeError) as exc:
             _logger.debug(
                 "TCP control client loop socket/parse error",
@@ -181,6 +193,26 @@ class ControlTcpServer:
             )
             return
 
+    def _recv(self, conn: socket.socket) -> bytes:
+        """Next chunk from `conn`; b"" on EOF or when the server is stopping."""
+
+        while not self._stop.is_set():
+            try:
+                return conn.recv(65536)
+            except socket.timeout:
+                continue
+        return b""
+
+    def _dispatch(self, msg: dict, peer_ip: str) -> dict:
+        try:
+            return self._handle_message(msg, peer_ip)
+        except Exception as exc:
+            _logger.warning(
+                "TCP control _handle_message exception",
+                extra={"role": self._cfg.role, "peer": peer_ip, "error": str(exc), "cmd": msg.get("cmd")},
+            )
+            return {"ok": False, "error": f"internal_error:{type(exc).__name__}"}
+
     def _handle_message(self, msg: dict, peer_ip: str) -> dict:
         cmd = msg.get("cmd")
         if not isinstance(cmd, str):
@@ -213,7 +245,7 @@ class ControlTcpServer:
 
         if cmd_lower == "rekey":
             if not _is_allowed_rekey_peer(
-                peer_ip,
+                peer_ip=peer_ip,
                 rekey_allowed_peers=self._cfg.rekey_allowed_peers,
                 server_role=self._cfg.role,
             ):
@@ -244,6 +276,22 @@ class ControlTcpServer:
                 )
                 return {"ok": False, "error": f"rekey_failed:{type(exc).__name__}"}
 
+        if cmd_lower == "prewarm":
+            suites = msg.get("suites")
+            if not isinstance(suites, list) or not all(isinstance(s, str) and s.strip() for s in suites):
+                return {"ok": False, "error": "missing_suites"}
+            prewarm = self._state.prewarm
+            if prewarm is None:
+                return {"ok": False, "error": "prewarm_unavailable"}
+            suite_ids = []
+            for suite in suites:
+                try:
+                    suite_ids.append(get_suite(suite)["suite_id"])
+                except Exception:
+                    return {"ok": False, "error": "invalid_suite", "suite": suite}
+            prewarm(suite_ids)
+            return {"ok": True, "suites": suite_ids}
+
         return {"ok": False, "error": "unknown_cmd"}
 
 
@@ -258,6 +306,33 @@ def _send_json(conn: socket.socket, payload: dict) -> None:
         pass
 
 
+def send_control_command(host: str, port: int, payload: dict, *, timeout: float = 5.0) -> dict:
+    """Send one JSON command to a control listener and return its reply.
+
+    Connection and decode failures are reported in the server's own error
+    shape ({"ok": false, "error": ...}) so callers handle a single format.
+    """
+
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as conn:
+            conn.sendall((json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8"))
+            buf = b""
+            while b"\n" not in buf:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    break
+                buf += chunk
+    except OSError as exc:
+        return {"ok": False, "error": f"connect_failed:{type(exc).__name__}"}
+    try:
+        reply = json.loads(buf.split(b"\n", 1)[0].decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return {"ok": False, "error": "bad_reply"}
+    if not isinstance(reply, dict):
+        return {"ok": False, "error": "bad_reply"}
+    return reply
+
+
 def _is_allowed_peer(peer_ip: str, allowed_peers: Iterable[str]) -> bool:
     for allowed in allowed_peers:
         if peer_ip == allowed:
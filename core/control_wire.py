@@ -0,0 +1,394 @@
+"""
+Framed, pipelined wire format for the TCP control channels.
+
+The control listeners (core.control_tcp inside the proxy, the scheduler's
+sscheduler.sgcs ControlServer) historically spoke newline-delimited JSON with
+one TCP connection per command on the scheduler side. This module adds a
+binary framing that keeps one connection open and lets a client have several
+requests in flight:
+
+    magic (1) | codec (1) | request id (u32) | body length (u32) | body
+
+- The magic byte (0xC5) can never start a JSON text, so a server tells a
+  framed connection from a legacy newline-JSON one by its first byte and
+  keeps serving both.
+- The body is a dict encoded with the frame's codec: JSON, or msgpack/CBOR
+  when those packages are installed. Replies reuse the request's codec and
+  request id, so replies may be matched out of order.
+- `FrameDecoder` and `LineDecoder` parse incrementally over one bytearray
+  (no `buf += chunk` / `split` copies on every read).
+
+`ControlChannel` is the client: a persistent connection with a reader thread
+that matches replies to request ids, reconnecting on the next request after
+a failure, and a per-command round-trip histogram (`stats()`).
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:  # optional codecs
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    msgpack = None  # type: ignore
+
+try:
+    import cbor2  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    cbor2 = None  # type: ignore
+
+from core.logging_utils import get_logger
+
+logger = get_logger("pqc")
+
+MAGIC = 0xC5
+HEADER = struct.Struct("!BBII")
+MAX_BODY = 1 << 20
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+CODEC_CBOR = 2
+_CODEC_NAMES = {"json": CODEC_JSON, "msgpack": CODEC_MSGPACK, "cbor": CODEC_CBOR}
+
+
+class FrameError(ValueError):
+    """Malformed frame; the connection cannot be resynchronised."""
+
+
+def available_codecs() -> Tuple[str, ...]:
+    names = ["json"]
+    if msgpack is not None:
+        names.append("msgpack")
+    if cbor2 is not None:
+        names.append("cbor")
+    return tuple(names)
+
+
+def codec_id(name: str) -> int:
+    """Codec id for `name`; unknown or uninstalled codecs raise ValueError."""
+
+    if name not in available_codecs():
+        raise ValueError(f"control codec {name!r} unavailable (installed: {', '.join(available_codecs())})")
+    return _CODEC_NAMES[name]
+
+
+def encode_body(codec: int, payload: dict) -> bytes:
+    if codec == CODEC_JSON:
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    if codec == CODEC_MSGPACK and msgpack is not None:
+        return msgpack.packb(payload, use_bin_type=True)
+    if codec == CODEC_CBOR and cbor2 is not None:
+        return cbor2.dumps(payload)
+    raise ValueError(f"unsupported codec {codec}")
+
+
+def decode_body(codec: int, body: bytes) -> object:
+    """Decode a frame body; raises ValueError when it cannot be decoded."""
+
+    try:
+        if codec == CODEC_JSON:
+            return json.loads(body)
+        if codec == CODEC_MSGPACK and msgpack is not None:
+            return msgpack.unpackb(body, raw=False)
+        if codec == CODEC_CBOR and cbor2 is not None:
+            return cbor2.loads(body)
+    except Exception as exc:
+        raise ValueError(f"undecodable body: {exc}") from exc
+    raise ValueError(f"unsupported codec {codec}")
+
+
+def encode_frame(codec: int, request_id: int, payload: dict) -> bytes:
+    body = encode_body(codec, payload)
+    return HEADER.pack(MAGIC, codec, request_id & 0xFFFFFFFF, len(body)) + body
+
+
+class FrameDecoder:
+    """Incremental frame parser: feed() bytes, get back complete frames."""
+
+    def __init__(self, max_body: int = MAX_BODY) -> None:
+        self._buf = bytearray()
+        self._max_body = max_body
+
+    def feed(self, data: bytes) -> List[Tuple[int, int, bytes]]:
+        """Return [(codec, request_id, body)] completed by `data`; FrameError on garbage."""
+
+        buf = self._buf
+        buf += data
+        frames = []
+        offset = 0
+        while len(buf) - offset >= HEADER.size:
+            magic, codec, request_id, length = HEADER.unpack_from(buf, offset)
+            if magic != MAGIC:
+                raise FrameError("bad frame magic")
+            if length > self._max_body:
+                raise FrameError(f"frame body of {length} bytes exceeds {self._max_body}")
+            end = offset + HEADER.size + length
+            if len(buf) < end:
+                break
+            frames.append((codec, request_id, bytes(buf[offset + HEADER.size : end])))
+            offset = end
+        if offset:
+            del buf[:offset]
+        return frames
+
+
+class LineDecoder:
+    """Incremental newline splitter for the legacy JSON protocol."""
+
+    def __init__(self, max_line: int = MAX_BODY) -> None:
+        self._buf = bytearray()
+        self._scanned = 0
+        self._max_line = max_line
+
+    def feed(self, data: bytes) -> List[bytes]:
+        buf = self._buf
+        buf += data
+        lines = []
+        start = 0
+        pos = buf.find(b"\n", self._scanned)
+        while pos != -1:
+            lines.append(bytes(buf[start:pos]))
+            start = pos + 1
+            pos = buf.find(b"\n", start)
+        if start:
+            del buf[:start]
+        self._scanned = len(buf)
+        if self._scanned > self._max_line:
+            raise FrameError(f"line exceeds {self._max_line} bytes")
+        return lines
+
+
+def serve_framed(
+    conn: socket.socket,
+    initial: bytes,
+    handle: Callable[[dict], dict],
+    *,
+    bad_message: dict,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> None:
+    """Serve framed requests on `conn` until EOF, in order, one reply per request.
+
+    `initial` is what the caller already read to detect the framing. Bodies
+    that do not decode to a dict get `bad_message` as their reply. A
+    FrameError propagates; the caller closes the connection. Socket timeouts
+    are treated as idle time, so `conn` should carry one for `should_stop`.
+    """
+
+    decoder = FrameDecoder()
+    data = initial
+    while True:
+        replies = []
+        for codec, request_id, body in decoder.feed(data):
+            try:
+                msg = decode_body(codec, body)
+            except ValueError:
+                codec, msg = CODEC_JSON, None
+            reply = handle(msg) if isinstance(msg, dict) else bad_message
+            try:
+                replies.append(encode_frame(codec, request_id, reply))
+            except (TypeError, ValueError):
+                replies.append(encode_frame(codec, request_id, bad_message))
+        if replies:
+            conn.sendall(b"".join(replies))
+        while True:
+            if should_stop():
+                return
+            try:
+                data = conn.recv(65536)
+                break
+            except socket.timeout:
+                continue
+        if not data:
+            return
+
+
+class RttHistogram:
+    """Round trips in power-of-two microsecond buckets (bucket i: < 2**i us)."""
+
+    BUCKETS = 26  # up to ~33 s
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.total = 0
+        self.max_us = 0.0
+
+    def record(self, seconds: float) -> None:
+        us = seconds * 1e6
+        self.counts[min(self.BUCKETS - 1, max(0, int(us)).bit_length())] += 1
+        self.total += 1
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile_us(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+
+        if not self.total:
+            return 0.0
+        rank = fraction * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(min(1 << index, self.max_us) if index else 1)
+        return self.max_us
+
+    def to_dict(self) -> Dict[str, object]:
+        last = max((i for i, c in enumerate(self.counts) if c), default=-1)
+        return {
+            "count": self.total,
+            "p50_us": self.percentile_us(0.5),
+            "p99_us": self.percentile_us(0.99),
+            "max_us": round(self.max_us, 1),
+            "buckets_le_us": {str(1 << i): self.counts[i] for i in range(last + 1)},
+        }
+
+
+class _Pending:
+    __slots__ = ("event", "reply", "sent")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.reply: Optional[dict] = None
+        self.sent = 0.0
+
+
+def _default_error(error: str) -> dict:
+    return {"ok": False, "error": error}
+
+
+class ControlChannel:
+    """Persistent, pipelined client for a framed control listener.
+
+    request() may be called from several threads at once; each gets its own
+    reply. Failures never raise: they come back as `error_reply(reason)`
+    (core.control_tcp's {"ok": false, "error": ...} shape by default) so
+    callers keep a single reply format.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        codec: str = "json",
+        timeout: float = 5.0,
+        connect_timeout: Optional[float] = None,
+        error_reply: Callable[[str], dict] = _default_error,
+    ) -> None:
+        self.host = host
+        self.port = port
+        try:
+            self._codec = codec_id(codec)
+        except ValueError as exc:
+            logger.warning("Control codec unavailable; using json", extra={"error": str(exc)})
+            self._codec = CODEC_JSON
+        self.timeout = timeout
+        self.connect_timeout = timeout if connect_timeout is None else connect_timeout
+        self._error_reply = error_reply
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, _Pending] = {}
+        self._next_id = 1
+        self._hist: Dict[str, RttHistogram] = {}
+        self.connects = 0
+        self.failures = 0
+
+    def request(self, payload: dict, *, timeout: Optional[float] = None) -> dict:
+        pending, request_id, error = self._send(payload)
+        if pending is None:
+            return self._error_reply(error)
+        if not pending.event.wait(self.timeout if timeout is None else timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+                self.failures += 1
+            return self._error_reply("timeout")
+        reply = pending.reply
+        if reply is None:
+            return self._error_reply("connection_lost")
+        rtt = time.perf_counter() - pending.sent
+        cmd = str(payload.get("cmd", "?"))
+        with self._lock:
+            hist = self._hist.get(cmd)
+            if hist is None:
+                hist = self._hist[cmd] = RttHistogram()
+            hist.record(rtt)
+        return reply
+
+    def _send(self, payload: dict) -> Tuple[Optional[_Pending], int, str]:
+        pending = _Pending()
+        with self._lock:
+            try:
+                sock = self._sock or self._connect()
+                request_id = self._next_id
+                self._next_id = (self._next_id + 1) & 0xFFFFFFFF or 1
+                frame = encode_frame(self._codec, request_id, payload)
+                self._pending[request_id] = pending
+                pending.sent = time.perf_counter()
+                sock.sendall(frame)
+            except (OSError, TypeError, ValueError) as exc:
+                self.failures += 1
+                self._drop_locked()
+                kind = "connect_failed" if isinstance(exc, OSError) else "encode_failed"
+                return None, 0, f"{kind}:{type(exc).__name__}"
+        return pending, request_id, ""
+
+    def _connect(self) -> socket.socket:
+        sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(None)
+        self._sock = sock
+        self.connects += 1
+        threading.Thread(target=self._reader, args=(sock,), daemon=True, name="control-channel").start()
+        return sock
+
+    def _reader(self, sock: socket.socket) -> None:
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                for codec, request_id, body in decoder.feed(data):
+                    try:
+                        reply = decode_body(codec, body)
+                    except ValueError:
+                        reply = None
+                    with self._lock:
+                        pending = self._pending.pop(request_id, None)
+                    if pending is not None:
+                        pending.reply = reply if isinstance(reply, dict) else self._error_reply("bad_reply")
+                        pending.event.set()
+        except (OSError, FrameError):
+            pass
+        with self._lock:
+            if self._sock is sock:
+                self._drop_locked()
+
+    def _drop_locked(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)  # wakes the reader thread
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+        pending, self._pending = self._pending, {}
+        for waiter in pending.values():
+            waiter.event.set()  # reply stays None: connection_lost
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop_locked()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "failures": self.failures,
+                "rtt": {cmd: hist.to_dict() for cmd, hist in sorted(self._hist.items())},
+            }
@@ -0,0 +1,144 @@
+"""
+Shared-memory export of the proxy's packet counters.
+
+The JSON status file (`--status-file`) is rewritten once a second and is too
+slow, and too hard on SD cards, for observers that want `enc_in`/`enc_out`/
+drop counters at 100 Hz or more. With `--status-shm PATH` the proxy also
+publishes its counters into a small fixed-layout file mapped with mmap —
+put it on tmpfs (/dev/shm, the default directory for relative names) so no
+write ever reaches a disk. Readers map it read-only and never block the
+proxy.
+
+Layout (little-endian, 8-byte aligned):
+
+    magic "PQCC" | version u16 | field count u16 | names length u32 | reserved u32
+    seq u64 | ts_ns u64 (time.time_ns of the last publish) | pid u64
+    names (comma-separated ASCII, zero-padded to 8 bytes)
+    values: field count x u64
+
+Values are guarded by a seqlock: the writer bumps `seq` to an odd value,
+writes the values, then bumps it to the next even value; `CounterReader.read`
+retries until it copies the values between two equal, even reads of `seq`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+MAGIC = b"PQCC"
+VERSION = 2
+_HEADER = struct.Struct("<4sHHIIQQQ")
+_SEQ_OFFSET = 16
+_SEQ = struct.Struct("<QQ")  # seq, ts_ns
+_READ_RETRIES = 1000
+
+DEFAULT_DIR = Path("/dev/shm")
+
+
+def resolve_path(path: str) -> Path:
+    """Bare names go under /dev/shm when it exists; paths are used as given."""
+
+    candidate = Path(path).expanduser()
+    if candidate.parent == Path(".") and DEFAULT_DIR.is_dir():
+        return DEFAULT_DIR / candidate.name
+    return candidate
+
+
+class CounterWriter:
+    """Single-writer side: create the segment and publish value rows."""
+
+    def __init__(self, path: str, fields: Sequence[str]) -> None:
+        self.path = resolve_path(path)
+        self.fields = tuple(fields)
+        names = ",".join(self.fields).encode("ascii")
+        names_padded = names + b"\0" * (-len(names) % 8)
+        self._values = struct.Struct(f"<{len(self.fields)}Q")
+        self._values_offset = _HEADER.size + len(names_padded)
+        size = self._values_offset + self._values.size
+        self._seq = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Build the new segment beside the target and rename it into place so a
+        # reader never maps a half-initialised file.
+        tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+        _HEADER.pack_into(self._map, 0, MAGIC, VERSION, len(self.fields), len(names), 0, 0, 0, os.getpid())
+        self._map[_HEADER.size : _HEADER.size + len(names_padded)] = names_padded
+        os.replace(tmp, self.path)
+
+    def publish(self, values: Sequence[int]) -> None:
+        mapped = self._map
+        self._seq += 1
+        _SEQ.pack_into(mapped, _SEQ_OFFSET, self._seq, time.time_ns())
+        self._values.pack_into(mapped, self._values_offset, *values)
+        self._seq += 1
+        struct.pack_into("<Q", mapped, _SEQ_OFFSET, self._seq)
+
+    def close(self, *, unlink: bool = True) -> None:
+        try:
+            self._map.close()
+        except (BufferError, ValueError):
+            pass
+        if unlink:
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+
+class CounterReader:
+    """Read-only view of a segment published by `CounterWriter`."""
+
+    def __init__(self, path: str) -> None:
+        self.path = resolve_path(path)
+        with open(self.path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, names_len, _reserved, _seq, _ts, pid = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a counter segment (magic={magic!r}, version={version})")
+        self.pid = pid
+        self.fields = tuple(
+            bytes(self._map[_HEADER.size : _HEADER.size + names_len]).decode("ascii").split(",")
+        ) if names_len else ()
+        if len(self.fields) != count:
+            self._map.close()
+            raise ValueError(f"{self.path}: field table does not match the field count")
+        self._values = struct.Struct(f"<{count}Q")
+        self._values_offset = _HEADER.size + names_len + (-names_len % 8)
+
+    def read(self) -> Optional[Dict[str, int]]:
+        """Consistent copy of the counters plus `seq`/`ts_ns`; None if the writer never settles."""
+
+        mapped = self._map
+        for attempt in range(_READ_RETRIES):
+            seq, ts_ns = _SEQ.unpack_from(mapped, _SEQ_OFFSET)
+            if not seq & 1:
+                values = self._values.unpack_from(mapped, self._values_offset)
+                if struct.unpack_from("<Q", mapped, _SEQ_OFFSET)[0] == seq:
+                    result = dict(zip(self.fields, values))
+                    result["seq"] = seq
+                    result["ts_ns"] = ts_ns
+                    return result
+            # Mid-publish: let the writer (possibly preempted) finish.
+            time.sleep(0 if attempt < 100 else 0.0001)
+        return None
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "CounterReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,334 @@
+"""
+Run the GCS handshake's KEM and signature primitives in a worker process.
+
+For Classic McEliece, SPHINCS+ and the larger HQC parameter sets, keygen,
+signing and decapsulation take tens to hundreds of milliseconds. In the
+proxy process that work competes with the datapath loop and shows up as
+packet latency jitter during a rekey. With HANDSHAKE_CRYPTO_OFFLOAD enabled,
+`CryptoOffload` runs it in a dedicated spawned process:
+
+- `kem(kem_name)` returns an object with the oqs.KeyEncapsulation methods the
+  handshake uses (generate_keypair / decap_secret / free). The KEM secret key
+  stays in the worker; the proxy only holds an opaque handle.
+- `signer(sig_obj, sig_name)` copies a loaded signing key to the worker once and returns
+  an object with sign(). Later signatures only send the transcript.
+
+The channel is a pipe carrying raw byte frames (opcode + length-prefixed
+fields), never pickles, so the worker only ever runs the five operations
+below on bounded inputs. Calls are serialised: the worker is one process with
+one thread.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.logging_utils import get_logger
+
+logger = get_logger("pqc")
+
+_OP_KEM_KEYGEN = 1  # kem_name -> handle, public_key
+_OP_KEM_DECAP = 2  # handle, ciphertext -> shared_secret (frees the handle)
+_OP_KEM_FREE = 3  # handle -> ()
+_OP_SIG_LOAD = 4  # sig_name, secret_key -> handle
+_OP_SIGN = 5  # handle, message -> signature
+
+_STATUS_OK = 0
+_STATUS_ERROR = 1
+
+# Largest frame either side accepts (McEliece-8192 public keys are ~1.3 MB).
+_MAX_FRAME = 4 << 20
+_START_TIMEOUT_S = 10.0
+_CALL_TIMEOUT_S = 30.0
+
+
+def _pack(code: int, fields: Tuple[bytes, ...]) -> bytes:
+    out = [struct.pack("!BB", code, len(fields))]
+    for field in fields:
+        out.append(struct.pack("!I", len(field)))
+        out.append(field)
+    return b"".join(out)
+
+
+def _unpack(frame: bytes) -> Tuple[int, List[bytes]]:
+    if len(frame) < 2:
+        raise ValueError("short frame")
+    code, count = struct.unpack_from("!BB", frame)
+    offset = 2
+    fields = []
+    for _ in range(count):
+        if offset + 4 > len(frame):
+            raise ValueError("truncated frame")
+        (size,) = struct.unpack_from("!I", frame, offset)
+        offset += 4
+        if offset + size > len(frame):
+            raise ValueError("truncated frame")
+        fields.append(frame[offset : offset + size])
+        offset += size
+    if offset != len(frame):
+        raise ValueError("trailing bytes in frame")
+    return code, fields
+
+
+def _u32(value: bytes) -> int:
+    if len(value) != 4:
+        raise ValueError("bad handle")
+    return struct.unpack("!I", value)[0]
+
+
+def _worker_main(conn) -> None:
+    """Worker loop: one request frame in, one reply frame out."""
+
+    from core.handshake import KeyEncapsulation, Signature
+
+    kems: Dict[int, object] = {}
+    signers: Dict[int, object] = {}
+    next_handle = 1
+
+    def free(obj: object) -> None:
+        free_fn = getattr(obj, "free", None)
+        if callable(free_fn):
+            try:
+                free_fn()
+            except Exception:
+                pass
+
+    conn.send_bytes(_pack(_STATUS_OK, (b"ready",)))
+    try:
+        while True:
+            try:
+                frame = conn.recv_bytes(_MAX_FRAME)
+            except (EOFError, OSError):
+                return
+            try:
+                op, fields = _unpack(frame)
+                if op == _OP_KEM_KEYGEN and len(fields) == 1:
+                    if KeyEncapsulation is None:
+                        raise RuntimeError("oqs-python not available (KeyEncapsulation missing)")
+                    kem_obj = KeyEncapsulation(fields[0].decode("utf-8"))
+                    public_key = kem_obj.generate_keypair()
+                    handle, next_handle = next_handle, next_handle + 1
+                    kems[handle] = kem_obj
+                    reply: Tuple[bytes, ...] = (struct.pack("!I", handle), bytes(public_key))
+                elif op == _OP_KEM_DECAP and len(fields) == 2:
+                    kem_obj = kems.pop(_u32(fields[0]))
+                    try:
+                        reply = (bytes(kem_obj.decap_secret(fields[1])),)
+                    finally:
+                        free(kem_obj)
+                elif op == _OP_KEM_FREE and len(fields) == 1:
+                    kem_obj = kems.pop(_u32(fields[0]), None)
+                    if kem_obj is not None:
+                        free(kem_obj)
+                    reply = ()
+                elif op == _OP_SIG_LOAD and len(fields) == 2:
+                    if Signature is None:
+                        raise RuntimeError("oqs-python not available (Signature missing)")
+                    signer = Signature(fields[0].decode("utf-8"), secret_key=fields[1])
+                    handle, next_handle = next_handle, next_handle + 1
+                    signers[handle] = signer
+                    reply = (struct.pack("!I", handle),)
+                elif op == _OP_SIGN and len(fields) == 2:
+                    reply = (bytes(signers[_u32(fields[0])].sign(fields[1])),)
+                else:
+                    raise ValueError(f"unsupported request {op}/{len(fields)}")
+                conn.send_bytes(_pack(_STATUS_OK, reply))
+            except Exception as exc:
+                message = f"{type(exc).__name__}: {exc}".encode("utf-8", "replace")[:512]
+                conn.send_bytes(_pack(_STATUS_ERROR, (message,)))
+    finally:
+        for obj in list(kems.values()) + list(signers.values()):
+            free(obj)
+
+
+class CryptoOffload:
+    """Parent side of the crypto worker process; thread-safe."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._proc: Optional[multiprocessing.Process] = None
+        self._conn = None
+        # Bumped on every (re)start; handles from an older worker are dead.
+        self.generation = 0
+        self._signers: Dict[int, Tuple[object, int, int]] = {}
+        self._closed = False
+        self._stats = {"calls": 0, "errors": 0, "restarts": 0}
+
+    def start(self) -> None:
+        with self._lock:
+            self._closed = False
+            self._start_locked()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._stop_locked()
+
+    def kem(self, kem_name: str) -> "RemoteKem":
+        """KEM object for `kem_name` whose secret key lives in the worker."""
+
+        return RemoteKem(self, kem_name)
+
+    def signer(self, sig_obj: object, sig_name: str) -> "RemoteSigner":
+        """Signer backed by the worker for an oqs.Signature with a loaded secret key."""
+
+        if not hasattr(sig_obj, "export_secret_key"):
+            raise TypeError("sig_obj must be an oqs.Signature with a loaded secret key")
+        return RemoteSigner(self, sig_obj, sig_name)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            stats: Dict[str, object] = dict(self._stats)
+            stats["alive"] = self._proc is not None and self._proc.is_alive()
+            stats["generation"] = self.generation
+        return stats
+
+    def call(self, op: int, *fields: bytes, generation: Optional[int] = None) -> Tuple[int, List[bytes]]:
+        """Run one request, restarting a dead worker first. Raises RuntimeError on failure.
+
+        Returns (generation, reply) with the generation of the worker that ran
+        the request. Requests that use a handle pass the generation it came
+        from and fail instead of running on a restarted worker.
+        """
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("crypto offload stopped")
+            if self._proc is None or not self._proc.is_alive():
+                if self._proc is not None:
+                    self._stats["restarts"] += 1
+                    logger.warning("Crypto offload worker died; restarting")
+                self._start_locked()
+            if generation is not None and generation != self.generation:
+                raise RuntimeError("crypto offload worker restarted; handle is gone")
+            self._stats["calls"] += 1
+            try:
+                self._conn.send_bytes(_pack(op, fields))
+                if not self._conn.poll(_CALL_TIMEOUT_S):
+                    raise RuntimeError("crypto offload worker timed out")
+                status, reply = _unpack(self._conn.recv_bytes(_MAX_FRAME))
+            except (EOFError, OSError, ValueError, RuntimeError) as exc:
+                # The pipe is out of step with the worker; start over next time.
+                self._stats["errors"] += 1
+                self._stop_locked()
+                raise RuntimeError(f"crypto offload failed: {exc}") from exc
+            if status != _STATUS_OK:
+                self._stats["errors"] += 1
+                detail = reply[0].decode("utf-8", "replace") if reply else "unknown error"
+                raise RuntimeError(f"crypto offload: {detail}")
+            return self.generation, reply
+
+    def _start_locked(self) -> None:
+        if self._proc is not None and self._proc.is_alive():
+            return
+        self._stop_locked()
+        mp = multiprocessing.get_context("spawn")
+        parent, child = mp.Pipe()
+        proc = mp.Process(target=_worker_main, args=(child,), name="pqc-crypto", daemon=True)
+        proc.start()
+        child.close()
+        try:
+            if not parent.poll(_START_TIMEOUT_S):
+                raise RuntimeError("crypto offload worker did not start")
+            parent.recv_bytes(_MAX_FRAME)
+        except Exception:
+            proc.kill()
+            parent.close()
+            raise
+        self._proc, self._conn = proc, parent
+        self.generation += 1
+        self._signers.clear()
+
+    def _stop_locked(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+        if self._proc is not None:
+            self._proc.join(timeout=1.0)
+            if self._proc.is_alive():
+                self._proc.kill()
+                self._proc.join(timeout=1.0)
+            self._proc = None
+
+    def _signer_handle(self, sig_obj: object, sig_name: str) -> Tuple[int, int]:
+        """(generation, handle) for `sig_obj`, loading its secret into the worker once."""
+
+        with self._lock:
+            entry = self._signers.get(id(sig_obj))
+            generation = self.generation
+        if entry is not None and entry[0] is sig_obj and entry[1] == generation:
+            return generation, entry[2]
+        secret = bytes(sig_obj.export_secret_key())
+        generation, (handle,) = self.call(_OP_SIG_LOAD, sig_name.encode("utf-8"), secret)
+        with self._lock:
+            # Keep sig_obj referenced so its id() cannot be reused.
+            self._signers[id(sig_obj)] = (sig_obj, generation, _u32(handle))
+        return generation, _u32(handle)
+
+
+class RemoteKem:
+    """Stand-in for oqs.KeyEncapsulation; the keypair lives in the worker."""
+
+    def __init__(self, offload: CryptoOffload, kem_name: str) -> None:
+        self._offload = offload
+        self.kem_name = kem_name
+        self._handle: Optional[Tuple[int, bytes]] = None
+
+    def generate_keypair(self) -> bytes:
+        generation, (handle, public_key) = self._offload.call(_OP_KEM_KEYGEN, self.kem_name.encode("utf-8"))
+        self._handle = (generation, handle)
+        return public_key
+
+    def decap_secret(self, ciphertext: bytes) -> bytes:
+        held = self._take_handle()
+        if held is None:
+            raise RuntimeError("KEM keypair not available in crypto offload worker")
+        generation, handle = held
+        _generation, (shared_secret,) = self._offload.call(
+            _OP_KEM_DECAP, handle, bytes(ciphertext), generation=generation
+        )
+        return shared_secret
+
+    def free(self) -> None:
+        held = self._take_handle()
+        if held is not None:
+            generation, handle = held
+            try:
+                self._offload.call(_OP_KEM_FREE, handle, generation=generation)
+            except RuntimeError:
+                pass
+
+    def _take_handle(self) -> Optional[Tuple[int, bytes]]:
+        held, self._handle = self._handle, None
+        if held is None or held[0] != self._offload.generation:
+            return None
+        return held
+
+
+class RemoteSigner:
+    """Stand-in for a loaded oqs.Signature; signs in the worker."""
+
+    def __init__(self, offload: CryptoOffload, sig_obj: object, sig_name: str) -> None:
+        self._offload = offload
+        self._sig_obj = sig_obj
+        self.sig_name = sig_name
+
+    def sign(self, message: bytes) -> bytes:
+        for _attempt in range(2):
+            generation, handle = self._offload._signer_handle(self._sig_obj, self.sig_name)
+            try:
+                _generation, (signature,) = self._offload.call(
+                    _OP_SIGN, struct.pack("!I", handle), bytes(message), generation=generation
+                )
+                return signature
+            except RuntimeError:
+                # A restarted worker has lost the key; load it again once.
+                if self._offload.generation == generation:
+                    raise
+        raise RuntimeError("crypto offload signer unavailable")
@@ -26,6 +26,7 @@ except (ImportError, ModuleNotFoundError):
             pass
 
 from core.exceptions import HandshakeError, HandshakeFormatError, HandshakeVerifyError
+from core import sig_cache
 
 logger = get_logger("pqc")
 
@@ -117,8 +118,14 @@ def build_server_hello(
     server_sig_obj,
     *,
     metrics: Optional[Dict[str, object]] = None,
+    kem_pool=None,
+    offload=None,
 ):
-    if KeyEncapsulation is None or Signature is None:
+    """Build the signed ServerHello; `kem_pool` (core.kem_pool) supplies a pre-generated keypair when warm.
+
+    With `offload` (core.crypto_offload.CryptoOffload) keygen and signing run in its worker process.
+    """
+    if offload is None and (KeyEncapsulation is None or Signature is None):
         raise RuntimeError("oqs-python not available (KeyEncapsulation/Signature missing)")
     suite = get_suite(suite_id)
     if not suite:
@@ -130,6 +137,8 @@ def build_server_hello(
         raise ValueError("kem_name/sig_name empty")
     if not hasattr(server_sig_obj, "sign"):
         raise TypeError("server_sig_obj must provide sign()")
+    if offload is not None:
+        server_sig_obj = offload.signer(server_sig_obj, suite["sig_name"])
     session_id = os.urandom(8)
     challenge = os.urandom(8)
     metrics_ref = metrics if metrics is not None else {}
@@ -142,15 +151,30 @@ def build_server_hello(
     sig_metrics = primitives.setdefault("signature", {})
     artifacts = metrics_ref.setdefault("artifacts", {})
 
-    keygen_wall_start = time.time_ns()
-    keygen_perf_start = time.perf_counter_ns()
-    kem_obj = KeyEncapsulation(kem_name.decode("utf-8"))
-    kem_pub = kem_obj.generate_keypair()
-    keygen_perf_end = time.perf_counter_ns()
-    keygen_wall_end = time.time_ns()
-    kem_metrics["keygen_ns"] = keygen_perf_end - keygen_perf_start
-    kem_metrics["keygen_wall_start_ns"] = keygen_wall_start
-    kem_metrics["keygen_wall_end_ns"] = keygen_wall_end
+    pooled = kem_pool.take(suite["kem_name"]) if kem_pool is not None else None
+    if pooled is not None:
+        # Generated ahead of time: report its real keygen cost, flagged as
+        # paid outside the handshake.
+        kem_obj = pooled.kem_obj
+        kem_pub = pooled.public_key
+        kem_metrics["keygen_ns"] = pooled.keygen_ns
+        kem_metrics["keygen_wall_start_ns"] = pooled.keygen_wall_start_ns
+        kem_metrics["keygen_wall_end_ns"] = pooled.keygen_wall_end_ns
+    else:
+        keygen_wall_start = time.time_ns()
+        keygen_perf_start = time.perf_counter_ns()
+        if offload is not None:
+            kem_obj = offload.kem(kem_name.decode("utf-8"))
+        else:
+            kem_obj = KeyEncapsulation(kem_name.decode("utf-8"))
+        kem_pub = kem_obj.generate_keypair()
+        keygen_perf_end = time.perf_counter_ns()
+        keygen_wall_end = time.time_ns()
+        kem_metrics["keygen_ns"] = keygen_perf_end - keygen_perf_start
+        kem_metrics["keygen_wall_start_ns"] = keygen_wall_start
+        kem_metrics["keygen_wall_end_ns"] = keygen_wall_end
+    kem_metrics["keygen_pooled"] = pooled is not None
+    metrics_ref["crypto_offload"] = offload is not None
     kem_metrics["public_key_bytes"] = len(kem_pub)
     # Include negotiated wire version as first byte of transcript to prevent downgrade
     transcript = (
@@ -257,19 +281,19 @@ def parse_and_verify_server_hello(
         artifacts_ref.setdefault("public_key_bytes", len(kem_pub))
     else:
         sig_metrics = None
-    sig = None
     try:
         verify_wall_start = time.time_ns() if sig_metrics is not None else None
         verify_perf_start = time.perf_counter_ns() if sig_metrics is not None else None
-        if Signature is None:
-            raise RuntimeError("oqs-python not available (Signature missing)")
-        sig = Signature(sig_name.decode("utf-8"))
-        if not sig.verify(transcript, signature, server_sig_pub):
+        # Verifier objects are cached per algorithm (core.sig_cache); a miss
+        # records its construction time separately as verifier_setup_ns.
+        if not sig_cache.verifiers.verify(
+            sig_name.decode("utf-8"), transcript, signature, server_sig_pub, metrics=sig_metrics
+        ):
             raise HandshakeVerifyError("bad signature")
         if sig_metrics is not None and verify_perf_start is not None and verify_wall_start is not None:
             verify_perf_end = time.perf_counter_ns()
             verify_wall_end = time.time_ns()
-            sig_metrics["verify_ns"] = verify_perf_end - verify_perf_start
+            sig_metrics["verify_ns"] = verify_perf_end - verify_perf_start - int(sig_metrics.get("verifier_setup_ns", 0) or 0)
             sig_metrics["verify_wall_start_ns"] = verify_wall_start
             sig_metrics["verify_wall_end_ns"] = verify_wall_end
             sig_metrics["signature_bytes"] = len(signature)
@@ -277,12 +301,6 @@ def parse_and_verify_server_hello(
         raise
     except Exception as exc:
         raise HandshakeVerifyError(f"signature verification failed: {exc}") from exc
-    finally:
-        if sig is not None and hasattr(sig, "free"):
-            try:
-                sig.free()
-            except Exception:
-                pass
     return ServerHello(
         version=version,
         kem_name=kem_name,
@@ -431,30 +449,33 @@ def derive_transport_keys(
     else:  # server == GCS
         # GCS perspective: send_to_drone first, receive_from_drone second.
         return key_g2d, key_d2g
-def server_gcs_handshake(conn, suite, gcs_sig_secret, *, timeout: float = 10.0):
-    """Authenticated GCS side handshake.
+@dataclass
+class ServerHandshake:
+    """GCS handshake state between sending the ServerHello and reading the reply."""
 
-    Requires a ready oqs.Signature object (with generated key pair). Fails fast if not.
-    """
-    # OQS compatibility - get Signature class
-    _Signature = None
-    try:
-        from oqs.oqs import Signature as _Signature
-    except (ImportError, ModuleNotFoundError):
-        try:
-            from oqs import Signature as _Signature
-        except (ImportError, ModuleNotFoundError):
-            import oqs
-            _Signature = oqs.Signature
-    import struct
+    hello_wire: bytes
+    ephemeral: ServerEphemeral
+    metrics: Dict[str, object]
+    perf_start_ns: int
 
-    try:
-        conn.settimeout(float(timeout))
-    except Exception:
-        conn.settimeout(10.0)
+    @property
+    def hello_frame(self) -> bytes:
+        return struct.pack("!I", len(self.hello_wire)) + self.hello_wire
 
-    if _Signature is not None and not isinstance(gcs_sig_secret, _Signature):
-        raise ValueError("gcs_sig_secret must be an oqs.Signature object with a loaded keypair")
+    def abort(self) -> None:
+        """Free the ephemeral KEM object of a handshake that will not complete."""
+
+        kem_obj = getattr(self.ephemeral, "kem_obj", None)
+        self.ephemeral.kem_obj = None
+        if kem_obj is not None and hasattr(kem_obj, "free"):
+            try:
+                kem_obj.free()
+            except Exception:
+                pass
+
+
+def server_begin_handshake(suite, gcs_sig_secret, *, kem_pool=None, offload=None) -> ServerHandshake:
+    """Build and sign the ServerHello (keygen + sign); no socket I/O."""
 
     suite_id = suite.get("suite_id") if isinstance(suite, dict) else None
     if not suite_id:
@@ -468,50 +489,28 @@ def server_gcs_handshake(conn, suite, gcs_sig_secret, *, timeout: float = 10.0):
     }
     handshake_wall_start = time.time_ns()
     handshake_perf_start = time.perf_counter_ns()
-    hello_wire, ephemeral = build_server_hello(suite_id, gcs_sig_secret, metrics=handshake_metrics)
+    hello_wire, ephemeral = build_server_hello(
+        suite_id, gcs_sig_secret, metrics=handshake_metrics, kem_pool=kem_pool, offload=offload
+    )
     handshake_metrics["handshake_wall_start_ns"] = handshake_wall_start
     artifacts = handshake_metrics.setdefault("artifacts", {})
     artifacts.setdefault("server_hello_bytes", len(hello_wire))
-    conn.sendall(struct.pack("!I", len(hello_wire)) + hello_wire)
+    return ServerHandshake(hello_wire, ephemeral, handshake_metrics, handshake_perf_start)
 
-    # Receive KEM ciphertext
-    ct_len_bytes = b""
-    while len(ct_len_bytes) < 4:
-        chunk = conn.recv(4 - len(ct_len_bytes))
-        if not chunk:
-            raise ConnectionError("Connection closed reading ciphertext length")
-        ct_len_bytes += chunk
-    ct_len = struct.unpack("!I", ct_len_bytes)[0]
-    kem_ct = b""
-    while len(kem_ct) < ct_len:
-        chunk = conn.recv(ct_len - len(kem_ct))
-        if not chunk:
-            raise ConnectionError("Connection closed reading ciphertext")
-        kem_ct += chunk
+
+def server_complete_handshake(state: ServerHandshake, kem_ct: bytes, tag: bytes, *, peer_ip: str = "unknown"):
+    """Check the drone's tag, decapsulate and derive keys; returns the 8-tuple of server_gcs_handshake."""
+
+    handshake_metrics = state.metrics
+    ephemeral = state.ephemeral
     primitives = handshake_metrics.setdefault("primitives", {})
     kem_metrics = primitives.setdefault("kem", {})
     kem_metrics.setdefault("ciphertext_bytes", len(kem_ct))
+    handshake_metrics.setdefault("artifacts", {})["auth_tag_bytes"] = len(tag)
 
-    tag_len = hashlib.sha256().digest_size
-    tag = b""
-    while len(tag) < tag_len:
-        chunk = conn.recv(tag_len - len(tag))
-        if not chunk:
-            raise ConnectionError("Connection closed reading drone authentication tag")
-        tag += chunk
-    artifacts["auth_tag_bytes"] = len(tag)
-
-    expected_tag = hmac.new(_drone_psk_bytes(), hello_wire, hashlib.sha256).digest()
+    expected_tag = hmac.new(_drone_psk_bytes(), state.hello_wire, hashlib.sha256).digest()
     if not hmac.compare_digest(tag, expected_tag):
-        peer_ip = "unknown"
-        try:
-            peer_info = conn.getpeername()
-            if isinstance(peer_info, tuple) and peer_info:
-                peer_ip = str(peer_info[0])
-            elif isinstance(peer_info, str) and peer_info:
-                peer_ip = peer_info
-        except (OSError, ValueError):
-            peer_ip = "unknown"
+        state.abort()
         logger.warning(
             "Rejected drone handshake with bad authentication tag",
             extra={"role": "gcs", "expected_peer": CONFIG["DRONE_HOST"], "received": peer_ip},
@@ -528,7 +527,7 @@ def server_gcs_handshake(conn, suite, gcs_sig_secret, *, timeout: float = 10.0):
         metrics=handshake_metrics,
     )
     handshake_metrics["handshake_wall_end_ns"] = time.time_ns()
-    handshake_metrics["handshake_total_ns"] = time.perf_counter_ns() - handshake_perf_start
+    handshake_metrics["handshake_total_ns"] = time.perf_counter_ns() - state.perf_start_ns
     _finalize_handshake_metrics(handshake_metrics)
     return (
         key_recv,
@@ -541,6 +540,76 @@ def server_gcs_handshake(conn, suite, gcs_sig_secret, *, timeout: float = 10.0):
         handshake_metrics,
     )
 
+
+def server_gcs_handshake(conn, suite, gcs_sig_secret, *, timeout: float = 10.0, kem_pool=None, offload=None):
+    """Authenticated GCS side handshake.
+
+    Requires a ready oqs.Signature object (with generated key pair). Fails fast if not.
+    `kem_pool` is an optional core.kem_pool.KemKeypairPool for the ephemeral KEM keypair,
+    `offload` an optional core.crypto_offload.CryptoOffload for keygen/sign/decap.
+    The blocking counterpart of core.handshake_server, which drives the same
+    begin/complete steps for many connections at once.
+    """
+    # OQS compatibility - get Signature class
+    _Signature = None
+    try:
+        from oqs.oqs import Signature as _Signature
+    except (ImportError, ModuleNotFoundError):
+        try:
+            from oqs import Signature as _Signature
+        except (ImportError, ModuleNotFoundError):
+            import oqs
+            _Signature = oqs.Signature
+
+    try:
+        conn.settimeout(float(timeout))
+    except Exception:
+        conn.settimeout(10.0)
+
+    if _Signature is not None and not isinstance(gcs_sig_secret, _Signature):
+        raise ValueError("gcs_sig_secret must be an oqs.Signature object with a loaded keypair")
+
+    state = server_begin_handshake(suite, gcs_sig_secret, kem_pool=kem_pool, offload=offload)
+    try:
+        conn.sendall(state.hello_frame)
+
+        # Receive KEM ciphertext
+        ct_len_bytes = b""
+        while len(ct_len_bytes) < 4:
+            chunk = conn.recv(4 - len(ct_len_bytes))
+            if not chunk:
+                raise ConnectionError("Connection closed reading ciphertext length")
+            ct_len_bytes += chunk
+        ct_len = struct.unpack("!I", ct_len_bytes)[0]
+        kem_ct = b""
+        while len(kem_ct) < ct_len:
+            chunk = conn.recv(ct_len - len(kem_ct))
+            if not chunk:
+                raise ConnectionError("Connection closed reading ciphertext")
+            kem_ct += chunk
+
+        tag_len = hashlib.sha256().digest_size
+        tag = b""
+        while len(tag) < tag_len:
+            chunk = conn.recv(tag_len - len(tag))
+            if not chunk:
+                raise ConnectionError("Connection closed reading drone authentication tag")
+            tag += chunk
+    except BaseException:
+        state.abort()
+        raise
+
+    peer_ip = "unknown"
+    try:
+        peer_info = conn.getpeername()
+        if isinstance(peer_info, tuple) and peer_info:
+            peer_ip = str(peer_info[0])
+        elif isinstance(peer_info, str) and peer_info:
+            peer_ip = peer_info
+    except (OSError, ValueError):
+        peer_ip = "unknown"
+    return server_complete_handshake(state, kem_ct, tag, peer_ip=peer_ip)
+
 def client_drone_handshake(client_sock, suite, gcs_sig_public, *, timeout: float = 10.0):
     # Real handshake implementation with MANDATORY signature verification
     import struct
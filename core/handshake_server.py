@@ -0,0 +1,391 @@
+"""
+Event-driven GCS handshake server.
+
+The GCS used to accept one TCP connection at a time and run the whole
+handshake on it with blocking I/O, so a client that connected and then went
+quiet held the port for up to REKEY_HANDSHAKE_TIMEOUT while the real drone
+waited in the backlog. `serve_gcs_handshake` instead multiplexes up to
+HANDSHAKE_MAX_INFLIGHT connections on one selector:
+
+- Each connection has its own deadline (the handshake I/O timeout) and is
+  dropped when it expires.
+- Building the signed ServerHello (KEM keygen + signature) and the final
+  decapsulation run in a bounded pool of HANDSHAKE_WORKERS threads, so the
+  accept loop never blocks on CPU work.
+- The per-IP token bucket (HANDSHAKE_RL_*) and the handshake IP allowlist are
+  checked at accept time, as before.
+
+The first connection to finish a handshake wins. The other connections are
+closed and their ephemeral KEM objects freed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import selectors
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from core.exceptions import ConfigError, HandshakeError, HandshakeFormatError, HandshakeVerifyError
+from core.handshake import ServerHandshake, server_begin_handshake, server_complete_handshake
+from core.logging_utils import get_logger
+
+logger = get_logger("pqc")
+
+_TAG_LEN = hashlib.sha256().digest_size
+# Largest KEM ciphertext we accept (FrodoKEM-1344 is ~21 KiB).
+_MAX_CT_BYTES = 1 << 20
+
+
+class _TokenBucket:
+    """Per-IP rate limiter using token bucket algorithm."""
+    def __init__(self, capacity: int, refill_per_sec: float) -> None:
+        self.capacity = max(1, capacity)
+        self.refill = max(0.01, float(refill_per_sec))
+        self.tokens: Dict[str, float] = {}      # ip -> tokens
+        self.last: Dict[str, float] = {}        # ip -> last timestamp
+        # Track last-seen to allow TTL-based pruning of state for long-running servers
+        self._seen_ts: Dict[str, float] = {}
+
+    def allow(self, ip: str) -> bool:
+        """Check if request from IP should be allowed."""
+        now = time.monotonic()
+        t = self.tokens.get(ip, self.capacity)
+        last = self.last.get(ip, now)
+        # refill
+        t = min(self.capacity, t + (now - last) * self.refill)
+        self.last[ip] = now
+        self._seen_ts[ip] = now
+        if t >= 1.0:
+            t -= 1.0
+            self.tokens[ip] = t
+            return True
+        self.tokens[ip] = t
+        return False
+
+    def prune(self, idle_seconds: float) -> None:
+        """Remove entries not seen within idle_seconds to prevent unbounded growth."""
+        cutoff = time.monotonic() - float(idle_seconds)
+        for ip in list(self._seen_ts.keys()):
+            if self._seen_ts.get(ip, 0) < cutoff:
+                self._seen_ts.pop(ip, None)
+                self.tokens.pop(ip, None)
+                self.last.pop(ip, None)
+
+
+class _Conn:
+    """One in-flight handshake connection."""
+
+    __slots__ = ("sock", "ip", "deadline", "phase", "state", "future", "outbuf", "inbuf")
+
+    def __init__(self, sock: socket.socket, ip: str, deadline: float) -> None:
+        self.sock = sock
+        self.ip = ip
+        self.deadline = deadline
+        # begin -> send -> recv -> complete
+        self.phase = "begin"
+        self.state: Optional[ServerHandshake] = None
+        self.future: Optional[Future] = None
+        self.outbuf = b""
+        self.inbuf = bytearray()
+
+    def reply(self) -> Optional[Tuple[bytes, bytes]]:
+        """Return (kem_ct, tag) once the drone's full reply is buffered."""
+
+        if len(self.inbuf) < 4:
+            return None
+        (ct_len,) = struct.unpack_from("!I", self.inbuf)
+        if ct_len > _MAX_CT_BYTES:
+            raise HandshakeFormatError(f"ciphertext length {ct_len} too large")
+        if len(self.inbuf) < 4 + ct_len + _TAG_LEN:
+            return None
+        body = bytes(self.inbuf[4 : 4 + ct_len + _TAG_LEN])
+        return body[:ct_len], body[ct_len:]
+
+    def close(self) -> None:
+        if self.state is not None:
+            self.state.abort()
+            self.state = None
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def _allowed_ips(cfg: dict) -> set:
+    allowed_ips = {str(cfg["DRONE_HOST"])}
+    allowlist = cfg.get("DRONE_HOST_ALLOWLIST", []) or []
+    if isinstance(allowlist, (list, tuple, set)):
+        for entry in allowlist:
+            allowed_ips.add(str(entry))
+    else:
+        allowed_ips.add(str(allowlist))
+    return allowed_ips
+
+
+def _reject_rate_limited(conn: socket.socket) -> None:
+    try:
+        conn.setblocking(False)
+        conn.send(b"\x00")
+    except OSError:
+        pass
+    finally:
+        conn.close()
+
+
+def serve_gcs_handshake(
+    cfg: dict,
+    suite: dict,
+    gcs_sig_secret: object,
+    *,
+    io_timeout: float,
+    accept_deadline_s: Optional[float] = None,
+    ready_event: Optional[threading.Event] = None,
+    kem_pool: Optional[object] = None,
+    offload: Optional[object] = None,
+) -> Tuple[tuple, str]:
+    """Serve handshakes on TCP_HANDSHAKE_PORT until one succeeds.
+
+    Returns (server_gcs_handshake-style result, drone IP). With
+    accept_deadline_s, raises ConfigError if no handshake has completed by
+    then and none is still in progress.
+    """
+
+    max_inflight = int(cfg.get("HANDSHAKE_MAX_INFLIGHT", 16))
+    workers = int(cfg.get("HANDSHAKE_WORKERS", 2))
+    allowed_ips = _allowed_ips(cfg)
+    strict_ip = bool(cfg.get("STRICT_HANDSHAKE_IP", True))
+    gate = _TokenBucket(
+        cfg.get("HANDSHAKE_RL_BURST", 5),
+        cfg.get("HANDSHAKE_RL_REFILL_PER_SEC", 1),
+    )
+    prune_interval = max(5.0, float(cfg.get("HANDSHAKE_RL_PRUNE_INTERVAL_S", 60.0)))
+    prune_idle_s = max(prune_interval, float(cfg.get("HANDSHAKE_RL_IDLE_TTL_S", 600.0)))
+    next_prune = time.monotonic() + prune_interval
+    deadline = time.monotonic() + accept_deadline_s if accept_deadline_s is not None else None
+
+    server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    selector = selectors.DefaultSelector()
+    # Worker threads wake the selector through this pair when a job finishes.
+    wake_r, wake_w = socket.socketpair()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hs-worker")
+    conns: List[_Conn] = []
+
+    def wake(_future: Future) -> None:
+        try:
+            wake_w.send(b"\x00")
+        except OSError:
+            pass
+
+    def drop(conn: _Conn) -> None:
+        if conn.phase in ("send", "recv"):
+            try:
+                selector.unregister(conn.sock)
+            except (KeyError, ValueError):
+                pass
+        conns.remove(conn)
+        if conn.future is not None and not conn.future.done():
+            # A worker may still be using the state; release it from the
+            # future's callback instead of freeing it under the worker.
+            pending_state, conn.state = conn.state, None
+            conn.future.add_done_callback(lambda f: _release(f, pending_state))
+            conn.future.cancel()
+        conn.close()
+
+    def submit(conn: _Conn, fn, *args, **kwargs) -> None:
+        conn.future = executor.submit(fn, *args, **kwargs)
+        conn.future.add_done_callback(wake)
+
+    try:
+        server_sock.bind(("0.0.0.0", cfg["TCP_HANDSHAKE_PORT"]))
+        server_sock.listen(32)
+        server_sock.setblocking(False)
+        wake_r.setblocking(False)
+        selector.register(server_sock, selectors.EVENT_READ, "accept")
+        selector.register(wake_r, selectors.EVENT_READ, "wake")
+
+        if ready_event:
+            ready_event.set()
+
+        while True:
+            now = time.monotonic()
+            if now >= next_prune:
+                gate.prune(prune_idle_s)
+                next_prune = now + prune_interval
+            # Completed worker jobs: hello ready to send, or handshake finished.
+            for conn in [c for c in conns if c.future is not None and c.future.done()]:
+                future, conn.future = conn.future, None
+                try:
+                    result = future.result()
+                except HandshakeVerifyError:
+                    logger.warning(
+                        "Rejected drone handshake with failed authentication",
+                        extra={"role": "gcs", "expected": cfg["DRONE_HOST"], "received": conn.ip},
+                    )
+                    drop(conn)
+                    continue
+                except Exception as exc:
+                    logger.warning(
+                        "Handshake failed (non-auth): %s",
+                        exc,
+                        extra={"role": "gcs", "ip": conn.ip},
+                    )
+                    drop(conn)
+                    continue
+                if conn.phase == "begin":
+                    conn.state = result
+                    conn.outbuf = result.hello_frame
+                    conn.phase = "send"
+                    selector.register(conn.sock, selectors.EVENT_WRITE, conn)
+                else:
+                    # complete_handshake consumed (and freed) the KEM object.
+                    conn.state = None
+                    conns.remove(conn)
+                    conn.close()
+                    return result, conn.ip
+
+            for conn in [c for c in conns if c.deadline <= now]:
+                logger.warning(
+                    "Handshake connection timed out",
+                    extra={"role": "gcs", "ip": conn.ip, "phase": conn.phase},
+                )
+                drop(conn)
+            if deadline is not None and now >= deadline and not conns:
+                raise ConfigError("No drone connection received within timeout")
+
+            timeouts = [c.deadline for c in conns]
+            if deadline is not None:
+                timeouts.append(deadline)
+            wait = min(timeouts) - time.monotonic() if timeouts else 1.0
+            events = selector.select(max(0.0, min(wait, 1.0)))
+
+            for key, mask in events:
+                if key.data == "wake":
+                    try:
+                        while wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                elif key.data == "accept":
+                    _accept(server_sock, conns, gate, allowed_ips, strict_ip, max_inflight, io_timeout)
+                    for conn in conns:
+                        if conn.phase == "begin" and conn.future is None:
+                            submit(
+                                conn,
+                                server_begin_handshake,
+                                suite,
+                                gcs_sig_secret,
+                                kem_pool=kem_pool,
+                                offload=offload,
+                            )
+                else:
+                    conn = key.data
+                    try:
+                        if mask & selectors.EVENT_WRITE and conn.phase == "send":
+                            sent = conn.sock.send(conn.outbuf)
+                            conn.outbuf = conn.outbuf[sent:]
+                            if not conn.outbuf:
+                                conn.phase = "recv"
+                                selector.modify(conn.sock, selectors.EVENT_READ, conn)
+                        elif mask & selectors.EVENT_READ and conn.phase == "recv":
+                            chunk = conn.sock.recv(65536)
+                            if not chunk:
+                                raise ConnectionError("Connection closed reading drone reply")
+                            conn.inbuf += chunk
+                            reply = conn.reply()
+                            if reply is not None:
+                                selector.unregister(conn.sock)
+                                conn.phase = "complete"
+                                kem_ct, tag = reply
+                                submit(conn, server_complete_handshake, conn.state, kem_ct, tag, peer_ip=conn.ip)
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                    except (HandshakeError, HandshakeFormatError, OSError) as exc:
+                        logger.warning(
+                            "Handshake failed (non-auth): %s",
+                            exc,
+                            extra={"role": "gcs", "ip": conn.ip},
+                        )
+                        drop(conn)
+    finally:
+        for conn in list(conns):
+            drop(conn)
+        executor.shutdown(wait=False, cancel_futures=True)
+        selector.close()
+        for sock in (server_sock, wake_r, wake_w):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+def _release(future: Future, state: Optional[ServerHandshake]) -> None:
+    """Free the KEM object of a dropped connection's job.
+
+    A cancelled completion job never consumed `state`; a finished begin job
+    returns a fresh state nobody will use. server_decapsulate frees the KEM
+    object itself once a completion job has run.
+    """
+
+    if future.cancelled():
+        if state is not None:
+            state.abort()
+        return
+    if future.exception() is not None:
+        return
+    result = future.result()
+    if isinstance(result, ServerHandshake):
+        result.abort()
+
+
+def _accept(
+    server_sock: socket.socket,
+    conns: List[_Conn],
+    gate: _TokenBucket,
+    allowed_ips: set,
+    strict_ip: bool,
+    max_inflight: int,
+    io_timeout: float,
+) -> None:
+    """Accept every pending connection that passes the IP and rate checks."""
+
+    while True:
+        try:
+            sock, addr = server_sock.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as exc:
+            logger.warning("Handshake accept failed: %s", exc, extra={"role": "gcs"})
+            return
+        ip = addr[0]
+        if ip not in allowed_ips:
+            if strict_ip:
+                logger.warning(
+                    "Rejected handshake from unauthorized IP",
+                    extra={"role": "gcs", "expected": sorted(allowed_ips), "received": ip},
+                )
+                sock.close()
+                continue
+            # Accept connection but log and record received IP for diagnostics
+            logger.warning(
+                "Handshake IP allowlist disabled; accepting connection from unexpected IP",
+                extra={"role": "gcs", "expected": sorted(allowed_ips), "received": ip},
+            )
+        if not gate.allow(ip):
+            _reject_rate_limited(sock)
+            logger.warning("Handshake rate-limit drop", extra={"role": "gcs", "ip": ip})
+            continue
+        if len(conns) >= max_inflight:
+            sock.close()
+            logger.warning(
+                "Handshake dropped: too many connections in flight",
+                extra={"role": "gcs", "ip": ip, "inflight": len(conns)},
+            )
+            continue
+        sock.setblocking(False)
+        conns.append(_Conn(sock, ip, time.monotonic() + io_timeout))
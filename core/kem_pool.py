@@ -0,0 +1,199 @@
+"""
+Background pool of ephemeral KEM keypairs for the GCS handshake.
+
+`build_server_hello` needs a fresh KEM keypair for every handshake. For
+Classic McEliece and the larger ML-KEM/HQC parameter sets key generation is
+the bulk of the server's handshake time, and during a rekey it sits inside
+the blackout window. The pool generates keypairs ahead of time on a daemon
+thread so the handshake only has to pop one.
+
+- Keypairs are kept per KEM algorithm (suites sharing a KEM share entries),
+  at most `depth` per algorithm, for at most `ttl_s` seconds.
+- Every keypair is handed out once and removed from the pool when taken;
+  expired ones are dropped unused.
+- Only algorithms named through `prefill` (the current suite and the suites a
+  scheduler expects next) are kept warm, at most `max_kems` of them, least
+  recently hinted first out.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, Optional
+
+from core.logging_utils import get_logger
+
+logger = get_logger("pqc")
+
+
+@dataclass
+class PooledKeypair:
+    kem_name: str
+    kem_obj: object  # oqs.KeyEncapsulation holding the secret key
+    public_key: bytes
+    keygen_ns: int
+    keygen_wall_start_ns: int
+    keygen_wall_end_ns: int
+    expires_mono: float
+
+
+def _free(kem_obj: object) -> None:
+    free = getattr(kem_obj, "free", None)
+    if callable(free):
+        try:
+            free()
+        except Exception:
+            pass
+
+
+class KemKeypairPool:
+    """Thread-safe, single-use pool of pre-generated KEM keypairs."""
+
+    def __init__(
+        self,
+        kem_factory: Callable[[str], object],
+        *,
+        depth: int = 1,
+        ttl_s: float = 300.0,
+        max_kems: int = 8,
+    ) -> None:
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        self._factory = kem_factory
+        self._depth = depth
+        self._ttl_s = float(ttl_s)
+        self._max_kems = max(1, int(max_kems))
+        self._cond = threading.Condition()
+        self._entries: Dict[str, Deque[PooledKeypair]] = {}
+        self._targets: "OrderedDict[str, None]" = OrderedDict()
+        self._failed: Dict[str, float] = {}
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "generated": 0, "errors": 0}
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="kem-pool", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+            entries = [entry for queue in self._entries.values() for entry in queue]
+            self._entries.clear()
+        for entry in entries:
+            _free(entry.kem_obj)
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def prefill(self, kem_names: Iterable[str]) -> None:
+        """Keep these algorithms warm (most recent hint last)."""
+
+        with self._cond:
+            for name in kem_names:
+                if not name:
+                    continue
+                self._targets.pop(name, None)
+                self._targets[name] = None
+                self._failed.pop(name, None)
+            while len(self._targets) > self._max_kems:
+                self._targets.popitem(last=False)
+            self._cond.notify_all()
+
+    def take(self, kem_name: str) -> Optional[PooledKeypair]:
+        """Pop an unexpired keypair for `kem_name`; None on a miss."""
+
+        now = time.monotonic()
+        expired = []
+        taken = None
+        with self._cond:
+            queue = self._entries.get(kem_name)
+            while queue:
+                entry = queue.popleft()
+                if entry.expires_mono > now:
+                    taken = entry
+                    break
+                expired.append(entry)
+            self._stats["expired"] += len(expired)
+            self._stats["hits" if taken is not None else "misses"] += 1
+            # Refill behind the consumer.
+            self._targets.pop(kem_name, None)
+            self._targets[kem_name] = None
+            self._cond.notify_all()
+        for entry in expired:
+            _free(entry.kem_obj)
+        return taken
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            stats: Dict[str, object] = dict(self._stats)
+            stats["ready"] = {name: len(queue) for name, queue in self._entries.items() if queue}
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _next_job(self) -> Optional[str]:
+        """Pick the next algorithm to generate for; caller holds the lock."""
+
+        now = time.monotonic()
+        for name in reversed(self._targets):
+            if self._failed.get(name, 0.0) > now:
+                continue
+            queue = self._entries.setdefault(name, deque())
+            while queue and queue[0].expires_mono <= now:
+                _free(queue.popleft().kem_obj)
+                self._stats["expired"] += 1
+            if len(queue) < self._depth:
+                return name
+        return None
+
+    def _wait_timeout(self) -> Optional[float]:
+        expiries = [queue[0].expires_mono for queue in self._entries.values() if queue]
+        expiries.extend(self._failed.values())
+        if not expiries:
+            return None
+        return max(0.05, min(expiries) - time.monotonic())
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stop:
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._cond.wait(self._wait_timeout())
+                if self._stop:
+                    return
+
+            wall_start = time.time_ns()
+            perf_start = time.perf_counter_ns()
+            try:
+                kem_obj = self._factory(job)
+                public_key = kem_obj.generate_keypair()
+            except Exception as exc:
+                logger.warning("KEM pool keygen failed", extra={"kem_name": job, "error": str(exc)})
+                with self._cond:
+                    self._stats["errors"] += 1
+                    self._failed[job] = time.monotonic() + self._ttl_s
+                continue
+            entry = PooledKeypair(
+                kem_name=job,
+                kem_obj=kem_obj,
+                public_key=public_key,
+                keygen_ns=time.perf_counter_ns() - perf_start,
+                keygen_wall_start_ns=wall_start,
+                keygen_wall_end_ns=time.time_ns(),
+                expires_mono=time.monotonic() + self._ttl_s,
+            )
+            with self._cond:
+                if self._stop:
+                    _free(kem_obj)
+                    return
+                self._entries.setdefault(job, deque()).append(entry)
+                self._stats["generated"] += 1
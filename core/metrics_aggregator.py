@@ -22,10 +22,12 @@ import json
 import socket
 import platform
 import threading
+from dataclasses import fields
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List, Callable
 
+from core.config import CONFIG
 from core.metrics_schema import (
     ComprehensiveSuiteMetrics,
     RunContextMetrics,
@@ -54,6 +56,7 @@ from core.metrics_collectors import (
     PowerCollector,
     NetworkCollector,
 )
+from core.metrics_journal import SuiteJournal, journal_path
 
 # Import MAVLink collector (optional)
 try:
@@ -63,6 +66,30 @@ except ImportError:
     HAS_MAVLINK_COLLECTOR = False
     MavLinkMetricsCollector = None
 
+_SECTIONS = tuple(f.name for f in fields(ComprehensiveSuiteMetrics))
+# Streaming mode: journal a power energy snapshot every N system samples (2 Hz)
+_POWER_JOURNAL_EVERY = 10
+
+
+class _SystemSampleStats:
+    """Running aggregates of the 2 Hz SystemCollector samples for one suite."""
+    
+    def __init__(self):
+        self.count = 0
+        self.cpu_count = 0
+        self.cpu_sum = 0.0
+        self.cpu_peak: Optional[float] = None
+        self.last: Dict[str, Any] = {}
+    
+    def add(self, sample: Dict[str, Any]):
+        self.count += 1
+        self.last = sample
+        cpu = sample.get("cpu_percent")
+        if isinstance(cpu, (int, float)):
+            self.cpu_count += 1
+            self.cpu_sum += cpu
+            self.cpu_peak = cpu if self.cpu_peak is None else max(self.cpu_peak, cpu)
+
 
 class MetricsAggregator:
     """
@@ -72,15 +99,21 @@ class MetricsAggregator:
     collection logic.
     """
     
-    def __init__(self, role: str = "auto", output_dir: str = None):
+    def __init__(self, role: str = "auto", output_dir: str = None, streaming: Optional[bool] = None):
         """
         Initialize the aggregator.
         
         Args:
             role: "gcs", "drone", or "auto" (detect from platform)
             output_dir: Directory for output files
+            streaming: Append each suite to a journal file while it runs
+                       (core/metrics_journal.py) instead of keeping the raw
+                       samples in memory; None uses CONFIG["METRICS_STREAMING"]
         """
         self.role = role if role != "auto" else self._detect_role()
+        if streaming is None:
+            streaming = bool(CONFIG.get("METRICS_STREAMING", False))
+        self.streaming = streaming
         
         # Output directory
         if output_dir:
@@ -116,7 +149,9 @@ class MetricsAggregator:
         self._collecting = False
         self._collect_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._system_samples: List[Dict[str, Any]] = []
+        self._system_samples: List[Dict[str, Any]] = []  # kept only when not streaming
+        self._system_stats = _SystemSampleStats()
+        self._journal: Optional[SuiteJournal] = None
 
         # Proxy counters snapshot (for throughput calculations)
         self._last_proxy_counters: Optional[Dict[str, Any]] = None
@@ -290,12 +325,32 @@ class MetricsAggregator:
         # C. Lifecycle - mark selection time
         m.lifecycle.suite_selected_time = time.monotonic()
         
+        if self.streaming:
+            if self._journal is not None:
+                self._journal.close()  # previous suite was never finalized
+            try:
+                self._journal = SuiteJournal(
+                    journal_path(self.output_dir, self._run_id, suite_id, self.role),
+                    suite_id=suite_id,
+                    run_id=self._run_id,
+                    role=self.role,
+                )
+                self._journal.sections(m, _SECTIONS)
+            except OSError as e:
+                print(f"Failed to open metrics journal: {e}")
+                self._journal = None
+        
         # Start background collection
         self._start_background_collection()
         
         # Start power sampling (drone only)
         if self.role == "drone" and self.power_collector and self.power_collector.backend != "none":
-            self.power_collector.start_sampling(rate_hz=1000.0)
+            self.power_collector.start_sampling(
+                rate_hz=1000.0,
+                isolated=bool(CONFIG.get("POWER_SAMPLER_PROCESS", False)),
+                cpu=int(CONFIG.get("POWER_SAMPLER_CPU", -1)),
+                priority=int(CONFIG.get("POWER_SAMPLER_PRIORITY", 0)),
+            )
         
         # Start MAVLink sniffing
         if self.mavlink_collector:
@@ -356,6 +411,7 @@ class MetricsAggregator:
             
             # Mark lifecycle activation
             self._current_metrics.lifecycle.suite_activated_time = now
+            self._journal_sections("handshake", "lifecycle")
     
     def record_crypto_primitives(self, primitives: Dict[str, Any]):
         """
@@ -445,6 +501,7 @@ class MetricsAggregator:
             cp.total_crypto_time_ms = sum(total_parts)
         else:
             cp.total_crypto_time_ms = None
+        self._journal_sections("crypto_primitives", "handshake")
     
     def record_data_plane_metrics(self, counters: Dict[str, Any]):
         """
@@ -522,6 +579,7 @@ class MetricsAggregator:
         if dec_stats.get("count", 0) > 0:
             dp.aead_decrypt_count = dec_stats["count"]
             dp.aead_decrypt_avg_ns = dec_stats.get("total_ns", 0) // dec_stats["count"]
+        self._journal_sections("data_plane", "rekey")
     
     def record_latency_sample(self, latency_ms: float):
         """Record a latency sample."""
@@ -556,18 +614,26 @@ class MetricsAggregator:
             cp.policy_suite_index = int(policy_suite_index)
         if policy_total_suites is not None:
             cp.policy_total_suites = int(policy_total_suites)
+        self._journal_sections("control_plane")
     
     def record_traffic_start(self):
         """Mark start of data plane traffic."""
         if self._current_metrics:
             if hasattr(self._current_metrics.lifecycle, "suite_traffic_start_time"):
                 self._current_metrics.lifecycle.suite_traffic_start_time = time.monotonic()
+                self._journal_sections("lifecycle")
     
     def record_traffic_end(self):
         """Mark end of data plane traffic."""
         if self._current_metrics:
             if hasattr(self._current_metrics.lifecycle, "suite_traffic_end_time"):
                 self._current_metrics.lifecycle.suite_traffic_end_time = time.monotonic()
+                self._journal_sections("lifecycle")
+    
+    def _journal_sections(self, *names: str):
+        """Append the changed fields of these sections to the suite journal (streaming mode)."""
+        if self._journal is not None and self._current_metrics is not None:
+            self._journal.sections(self._current_metrics, names)
     
     def _start_background_collection(self):
         """Start background system metrics collection."""
@@ -576,13 +642,23 @@ class MetricsAggregator:
         
         self._collecting = True
         self._system_samples = []
+        self._system_stats = _SystemSampleStats()
         self._stop_event.clear()
         
         def collect_loop():
             while not self._stop_event.is_set():
                 sample = self.system_collector.collect()
                 sample["mono_time"] = time.monotonic()
-                self._system_samples.append(sample)
+                self._system_stats.add(sample)
+                journal = self._journal
+                if journal is None:
+                    self._system_samples.append(sample)
+                else:
+                    journal.sample("sys", sample)
+                    power = self.power_collector
+                    if (power and power.sampling
+                            and self._system_stats.count % _POWER_JOURNAL_EVERY == 0):
+                        journal.sample("power", power.get_energy_stats())
                 time.sleep(0.5)  # 2 Hz sampling
         
         self._collect_thread = threading.Thread(target=collect_loop, daemon=True)
@@ -733,21 +809,16 @@ class MetricsAggregator:
             )
         
         # N. System resources
-        if self._system_samples:
-            cpu_samples = [
-                s["cpu_percent"]
-                for s in self._system_samples
-                if isinstance(s.get("cpu_percent"), (int, float))
-            ]
-            
+        system_stats = self._system_stats
+        if system_stats.count:
             sys_m = m.system_drone
             
-            if cpu_samples:
-                sys_m.cpu_usage_avg_percent = sum(cpu_samples) / len(cpu_samples)
-                sys_m.cpu_usage_peak_percent = max(cpu_samples)
+            if system_stats.cpu_count:
+                sys_m.cpu_usage_avg_percent = system_stats.cpu_sum / system_stats.cpu_count
+                sys_m.cpu_usage_peak_percent = system_stats.cpu_peak
             
             # Use last sample for other metrics
-            last = self._system_samples[-1]
+            last = system_stats.last
             sys_m.cpu_freq_mhz = last.get("cpu_freq_mhz")
             sys_m.memory_rss_mb = last.get("memory_rss_mb")
             sys_m.memory_vms_mb = last.get("memory_vms_mb")
@@ -781,6 +852,12 @@ class MetricsAggregator:
             energy_stats = self.power_collector.get_energy_stats(power_samples)
             m.power_energy.power_sensor_type = self.power_collector.backend
             m.power_energy.power_sampling_rate_hz = 1000.0
+            sampler_report = self.power_collector.sampler_report()
+            if sampler_report:
+                # Isolated sampler: report the rate it actually achieved
+                m.power_energy.power_sampling_rate_hz = sampler_report["achieved_hz"]
+                import logging
+                logging.getLogger(__name__).info("power sampler: %s", sampler_report)
             m.power_energy.power_avg_w = energy_stats.get("power_avg_w")
             m.power_energy.power_peak_w = energy_stats.get("power_peak_w")
             m.power_energy.energy_total_j = energy_stats.get("energy_total_j")
@@ -973,8 +1050,8 @@ class MetricsAggregator:
             )
         
         # Q. Observability
-        if self._system_samples:
-            m.observability.log_sample_count = len(self._system_samples)
+        if system_stats.count:
+            m.observability.log_sample_count = system_stats.count
             m.observability.metrics_sampling_rate_hz = 2.0
             m.observability.collection_start_time = m.run_context.run_start_time_mono
             m.observability.collection_end_time = now
@@ -994,7 +1071,7 @@ class MetricsAggregator:
         # R. Validation
         if m.observability.collection_duration_ms is not None:
             m.validation.expected_samples = int(m.observability.collection_duration_ms / 500)  # 2 Hz
-            m.validation.collected_samples = len(self._system_samples)
+            m.validation.collected_samples = system_stats.count
             m.validation.lost_samples = max(0, m.validation.expected_samples - m.validation.collected_samples)
         else:
             m.validation.expected_samples = None
@@ -1071,10 +1148,14 @@ class MetricsAggregator:
         
         # Save to file
         self._save_metrics(m)
+        if self._journal is not None:
+            self._journal.finish(m)
+            self._journal = None
         
         # Clear for next suite
         self._current_metrics = None
         self._system_samples = []
+        self._system_stats = _SystemSampleStats()
         self._last_proxy_counters = None
         self._metric_status = {}
         
@@ -1306,6 +1387,23 @@ class MetricsAggregator:
             print(f"Failed to save suite metrics: {e}")
             return None
 
+    def close(self):
+        """
+        Shut the aggregator down at the end of a run.
+
+        Stops background collection and power sampling, closes an unfinished
+        journal and stops the isolated power sampler process (which otherwise
+        keeps polling the sensor between suites until this process exits).
+        Safe to call more than once; start_suite still works afterwards.
+        """
+        self._stop_background_collection()
+        if self.power_collector:
+            self.power_collector.stop_sampling()
+            self.power_collector.close()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
 
 # =============================================================================
 # MAIN - Test aggregator
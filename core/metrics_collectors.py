@@ -24,11 +24,17 @@ import socket
 import platform
 import subprocess
 import threading
+import logging
+import math
+from array import array
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from core.quantile_sketch import WindowedQuantiles
+
 # Try importing optional dependencies
 try:
     import psutil
@@ -36,6 +42,14 @@ try:
 except ImportError:
     HAS_PSUTIL = False
 
+# numpy vectorises energy integration when running sums are disabled
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
 # smbus2 for direct INA219 register access (fixes adafruit library bug with 9-bit ADC)
 try:
     import smbus2
@@ -379,6 +393,201 @@ class SystemCollector(BaseCollector):
 # POWER COLLECTOR
 # =============================================================================
 
+# Default ring bound: one hour at 1 kHz, 20 bytes a sample (~72 MB).
+POWER_RING_MAX_SAMPLES = 3_600_000
+
+
+def _empty_energy_stats() -> Dict[str, Any]:
+    return {
+        "energy_total_j": None,
+        "power_avg_w": None,
+        "power_peak_w": None,
+        "duration_s": None,
+    }
+
+
+def _energy_stats_from_columns(
+    mono: Iterable[float],
+    voltage: Iterable[float],
+    current: Iterable[float],
+    power: Iterable[float],
+    sample_count: int,
+) -> Dict[str, Any]:
+    """Trapezoidal energy and tail-sample averages; NaN power marks a failed read."""
+    if HAS_NUMPY:
+        p = np.asarray(power, dtype=np.float64)
+        ok = ~np.isnan(p)
+        p = p[ok]
+        if p.size < 2:
+            return _empty_energy_stats()
+        t = np.asarray(mono, dtype=np.float64)[ok]
+        v = np.asarray(voltage, dtype=np.float64)[ok][1:]
+        i = np.asarray(current, dtype=np.float64)[ok][1:]
+        tail = p[1:]
+        return {
+            "energy_total_j": float(np.dot((p[1:] + p[:-1]) * 0.5, np.diff(t))),
+            "power_avg_w": float(tail.mean()),
+            "power_peak_w": float(tail.max()),
+            "power_min_w": float(tail.min()),
+            "voltage_avg_v": float(v.mean()),
+            "current_avg_a": float(i.mean()),
+            "duration_s": float(t[-1] - t[0]),
+            "sample_count": sample_count,
+        }
+
+    sums = _EnergySums()
+    for row in zip(mono, voltage, current, power):
+        sums.add(*row)
+    return sums.stats(sample_count)
+
+
+class _EnergySums:
+    """O(1)-per-sample running form of _energy_stats_from_columns."""
+
+    __slots__ = ("valid", "energy_j", "sum_p", "sum_v", "sum_i", "peak_p", "min_p",
+                 "first_t", "last_t", "last_p")
+
+    def __init__(self):
+        self.valid = 0
+        self.energy_j = 0.0
+        self.sum_p = self.sum_v = self.sum_i = 0.0
+        self.peak_p = -math.inf
+        self.min_p = math.inf
+        self.first_t = self.last_t = self.last_p = 0.0
+
+    def add(self, t: float, v: float, i: float, p: float) -> None:
+        if p != p:  # NaN: failed read
+            return
+        if self.valid:
+            self.energy_j += (p + self.last_p) * 0.5 * (t - self.last_t)
+            self.sum_p += p
+            self.sum_v += v
+            self.sum_i += i
+            if p > self.peak_p:
+                self.peak_p = p
+            if p < self.min_p:
+                self.min_p = p
+        else:
+            self.first_t = t
+        self.valid += 1
+        self.last_t = t
+        self.last_p = p
+
+    def stats(self, sample_count: int) -> Dict[str, Any]:
+        if self.valid < 2:
+            return _empty_energy_stats()
+        n = self.valid - 1
+        return {
+            "energy_total_j": self.energy_j,
+            "power_avg_w": self.sum_p / n,
+            "power_peak_w": self.peak_p,
+            "power_min_w": self.min_p,
+            "voltage_avg_v": self.sum_v / n,
+            "current_avg_a": self.sum_i / n,
+            "duration_s": self.last_t - self.first_t,
+            "sample_count": sample_count,
+        }
+
+
+class PowerSampleBuffer(Sequence):
+    """Column ring of (mono_time, voltage_v, current_a, power_w) power samples.
+
+    Time is stored as float64 and V/I/P as float32: 20 bytes a sample, so an
+    hour at 1 kHz is ~72 MB where per-sample dicts took well over 1 GB. The
+    columns start at `initial` rows and double up to `max_samples`; after that
+    the oldest rows are overwritten. Failed reads store NaN power.
+
+    With `running_sums` (the default) energy and averages are accumulated as
+    samples arrive, so energy_stats() is O(1) and covers every sample even
+    after the ring wraps. Without it energy_stats() integrates the retained
+    rows (vectorised with numpy when available).
+
+    Indexing and iteration yield per-sample dicts, as stop_sampling() used to return.
+    """
+
+    def __init__(self, max_samples: int = POWER_RING_MAX_SAMPLES, initial: int = 65536,
+                 running_sums: bool = True):
+        self.max_samples = max(1, int(max_samples))
+        capacity = min(self.max_samples, max(1, int(initial)))
+        self._mono = array("d", bytes(8 * capacity))
+        self._volt = array("f", bytes(4 * capacity))
+        self._curr = array("f", bytes(4 * capacity))
+        self._power = array("f", bytes(4 * capacity))
+        self._capacity = capacity
+        self.total = 0  # samples ever appended, including overwritten ones
+        self._sums = _EnergySums() if running_sums else None
+
+    @property
+    def nbytes(self) -> int:
+        return self._capacity * 20
+
+    def _grow(self) -> None:
+        extra = min(self._capacity, self.max_samples - self._capacity)
+        self._mono.extend(array("d", bytes(8 * extra)))
+        for column in (self._volt, self._curr, self._power):
+            column.extend(array("f", bytes(4 * extra)))
+        self._capacity += extra
+
+    def append(self, mono_time: float, voltage_v: Optional[float], current_a: Optional[float],
+               power_w: Optional[float]) -> None:
+        if self.total >= self._capacity and self._capacity < self.max_samples:
+            self._grow()
+        v = float(voltage_v or 0.0)
+        i = float(current_a or 0.0)
+        p = float(power_w) if isinstance(power_w, (int, float)) else math.nan
+        pos = self.total % self._capacity
+        self._mono[pos] = mono_time
+        self._volt[pos] = v
+        self._curr[pos] = i
+        self._power[pos] = p
+        self.total += 1
+        if self._sums is not None:
+            self._sums.add(mono_time, v, i, p)
+
+    def __len__(self) -> int:
+        return min(self.total, self._capacity)
+
+    def _start(self) -> int:
+        return self.total % self._capacity if self.total > self._capacity else 0
+
+    def columns(self) -> Tuple[Any, Any, Any, Any]:
+        """Retained (mono, V, I, P) rows, oldest first; numpy arrays when available."""
+        n = len(self)
+        start = self._start()
+        cols = []
+        for column in (self._mono, self._volt, self._curr, self._power):
+            if HAS_NUMPY:
+                view = np.frombuffer(column, dtype=np.float64 if column.typecode == "d" else np.float32)
+                cols.append(np.concatenate((view[start:n], view[:start])) if start else view[:n].copy())
+            else:
+                cols.append(column[start:n] + column[:start])
+        return tuple(cols)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("power sample index out of range")
+        pos = (self._start() + index) % self._capacity
+        power = self._power[pos]
+        return {
+            "mono_time": self._mono[pos],
+            "voltage_v": self._volt[pos],
+            "current_a": self._curr[pos],
+            "power_w": None if power != power else power,
+        }
+
+    def energy_stats(self) -> Dict[str, Any]:
+        if self.total < 2:
+            return _empty_energy_stats()
+        if self._sums is not None:
+            return self._sums.stats(self.total)
+        return _energy_stats_from_columns(*self.columns(), sample_count=len(self))
+
+
 class PowerCollector(BaseCollector):
     """Collects power and energy metrics from hardware sensors."""
     
@@ -389,9 +598,13 @@ class PowerCollector(BaseCollector):
         self._ina_busnum: Optional[int] = None
         self._ina_address: int = 0x40
         self._sampling = False
-        self._samples: List[Dict[str, float]] = []
+        self._samples = PowerSampleBuffer(initial=1)
         self._sample_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # Out-of-process sampler (core.power_sampler), kept across suites
+        self._sampler = None
+        self._sampler_start: Dict[str, Any] = {}
+        self._sampler_report: Dict[str, Any] = {}
         
         # Detect available backend
         if backend == "auto":
@@ -617,28 +830,66 @@ class PowerCollector(BaseCollector):
         
         return result
     
-    def start_sampling(self, rate_hz: float = 100.0):
+    def start_sampling(self, rate_hz: float = 100.0, max_samples: int = POWER_RING_MAX_SAMPLES,
+                       running_sums: bool = True, isolated: bool = False, cpu: int = -1,
+                       priority: int = 0):
         """Start continuous power sampling in background thread.
         
         Uses perf_counter-based tick scheduling (same approach as
         core/power_monitor.py Ina219PowerMonitor) for accurate timing
-        at high sample rates (e.g. 1kHz).
+        at high sample rates (e.g. 1kHz). Samples go into a PowerSampleBuffer
+        holding at most `max_samples` rows (20 bytes each; the default is an
+        hour at 1 kHz, ~72 MB), preallocated for about a minute at `rate_hz`.
+        
+        With `isolated`, sampling runs in a separate process
+        (core.power_sampler, optionally pinned to `cpu` with `priority`) and
+        a thread here only copies its shared-memory ring into the buffer.
+        Falls back to in-process sampling if the sampler cannot start.
         """
         if self._sampling:
             return
         
         self._sampling = True
-        self._samples = []
+        self._samples = PowerSampleBuffer(
+            max_samples=max_samples,
+            initial=int(rate_hz * 60),
+            running_sums=running_sums,
+        )
         self._stop_event.clear()
+        self._sampler_report = {}
         
         interval = 1.0 / rate_hz
+        samples = self._samples
+        
+        if isolated and self._start_sampler(rate_hz, cpu, priority):
+            sampler = self._sampler
+            position = sampler.position()
+            self._sampler_start = sampler.report()
+            
+            def drain_loop():
+                cursor = position
+                while True:
+                    stopping = self._stop_event.wait(0.25)
+                    rows, cursor = sampler.read_since(cursor)
+                    for row in rows:
+                        samples.append(*row)
+                    if stopping:
+                        break
+            
+            self._sample_thread = threading.Thread(target=drain_loop, daemon=True)
+            self._sample_thread.start()
+            return
         
         def sample_loop():
             next_tick = time.perf_counter()
             while not self._stop_event.is_set():
                 sample = self.collect()
-                sample["mono_time"] = time.monotonic()
-                self._samples.append(sample)
+                samples.append(
+                    time.monotonic(),
+                    sample["voltage_v"],
+                    sample["current_a"],
+                    sample["power_w"],
+                )
                 next_tick += interval
                 sleep_for = next_tick - time.perf_counter()
                 if sleep_for > 0:
@@ -647,72 +898,93 @@ class PowerCollector(BaseCollector):
         self._sample_thread = threading.Thread(target=sample_loop, daemon=True)
         self._sample_thread.start()
     
-    def stop_sampling(self) -> List[Dict[str, float]]:
-        """Stop sampling and return collected samples."""
+    def stop_sampling(self) -> "PowerSampleBuffer":
+        """Stop sampling and return collected samples (a sequence of sample dicts)."""
         if not self._sampling:
-            return []
+            return PowerSampleBuffer(initial=1)
         
         self._stop_event.set()
         if self._sample_thread:
             self._sample_thread.join(timeout=1.0)
         
         self._sampling = False
-        samples = self._samples.copy()
-        self._samples = []
+        samples = self._samples
+        self._samples = PowerSampleBuffer(initial=1)
+        if self._sampler_start and self._sampler is not None:
+            self._sampler_report = self._suite_sampler_report(samples)
+            self._sampler_start = {}
         return samples
     
-    def get_energy_stats(self, samples: List[Dict[str, float]] = None) -> Dict[str, float]:
-        """Calculate energy statistics from samples."""
-        if samples is None:
-            samples = self._samples
+    def _start_sampler(self, rate_hz: float, cpu: int, priority: int) -> bool:
+        from core.power_sampler import PowerSampler, PowerSamplerError
         
-        if len(samples) < 2:
-            return {
-                "energy_total_j": None,
-                "power_avg_w": None,
-                "power_peak_w": None,
-                "duration_s": None,
-            }
+        sampler = self._sampler
+        if sampler is not None and sampler.running and (
+            sampler.rate_hz, sampler.cpu, sampler.priority
+        ) == (float(rate_hz), cpu, priority):
+            return True
+        self.close()
+        sampler = PowerSampler(rate_hz=rate_hz, backend=self.backend, cpu=cpu, priority=priority)
+        try:
+            sampler.start()
+        except PowerSamplerError as exc:
+            logging.getLogger(__name__).warning("power sampler process unavailable, sampling in-process: %s", exc)
+            return False
+        self._sampler = sampler
+        return True
+    
+    def _suite_sampler_report(self, samples: "PowerSampleBuffer") -> Dict[str, Any]:
+        start, end = self._sampler_start, self._sampler.report()
+        stats = samples.energy_stats()
+        duration = stats.get("duration_s") or 0.0
+        return {
+            "samples": samples.total,
+            "requested_hz": end.get("requested_hz"),
+            "achieved_hz": round((samples.total - 1) / duration, 2) if duration > 0 else 0.0,
+            "missed_deadlines": end.get("missed_deadlines", 0) - start.get("missed_deadlines", 0),
+            "overruns": end.get("overruns", 0) - start.get("overruns", 0),
+            "max_late_us": end.get("max_late_us"),
+            "cpu": end.get("cpu"),
+            "policy": end.get("policy"),
+            "priority": end.get("priority"),
+        }
+    
+    @property
+    def sampling(self) -> bool:
+        return self._sampling
+    
+    def sampler_report(self) -> Dict[str, Any]:
+        """Achieved rate and missed deadlines of the last isolated sampling run ({} otherwise).
         
-        # Filter out samples with None power_w (e.g., from failed sensor reads)
-        valid_samples = [
-            s for s in samples
-            if isinstance(s.get("power_w"), (int, float))
-        ]
-        if len(valid_samples) < 2:
-            return {
-                "energy_total_j": None,
-                "power_avg_w": None,
-                "power_peak_w": None,
-                "duration_s": None,
-            }
-
-        # Calculate energy using trapezoidal integration
-        energy_j = 0.0
-        powers = []
-        voltages = []
-        currents = []
+        max_late_us covers the sampler process's whole lifetime.
+        """
+        return dict(self._sampler_report)
+    
+    def close(self):
+        """Stop the out-of-process sampler, if one was started."""
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+    
+    def get_energy_stats(self, samples=None) -> Dict[str, float]:
+        """Calculate energy statistics from a PowerSampleBuffer or a list of sample dicts."""
+        if samples is None:
+            samples = self._samples
         
-        for i in range(1, len(valid_samples)):
-            dt = valid_samples[i]["mono_time"] - valid_samples[i-1]["mono_time"]
-            p_avg = (valid_samples[i]["power_w"] + valid_samples[i-1]["power_w"]) / 2.0
-            energy_j += p_avg * dt
-            powers.append(valid_samples[i]["power_w"])
-            voltages.append(valid_samples[i].get("voltage_v", 0.0) or 0.0)
-            currents.append(valid_samples[i].get("current_a", 0.0) or 0.0)
+        if isinstance(samples, PowerSampleBuffer):
+            return samples.energy_stats()
         
-        duration = valid_samples[-1]["mono_time"] - valid_samples[0]["mono_time"]
+        if len(samples) < 2:
+            return _empty_energy_stats()
         
-        return {
-            "energy_total_j": energy_j,
-            "power_avg_w": sum(powers) / len(powers) if powers else 0.0,
-            "power_peak_w": max(powers) if powers else 0.0,
-            "power_min_w": min(powers) if powers else 0.0,
-            "voltage_avg_v": sum(voltages) / len(voltages) if voltages else 0.0,
-            "current_avg_a": sum(currents) / len(currents) if currents else 0.0,
-            "duration_s": duration,
-            "sample_count": len(samples),
-        }
+        # Failed sensor reads (power_w None) become NaN and are skipped
+        return _energy_stats_from_columns(
+            [s.get("mono_time", 0.0) for s in samples],
+            [s.get("voltage_v", 0.0) or 0.0 for s in samples],
+            [s.get("current_a", 0.0) or 0.0 for s in samples],
+            [s["power_w"] if isinstance(s.get("power_w"), (int, float)) else math.nan for s in samples],
+            sample_count=len(samples),
+        )
 
 
 # =============================================================================
@@ -784,58 +1056,58 @@ class NetworkCollector(BaseCollector):
 # =============================================================================
 
 class LatencyTracker:
-    """Tracks packet latency using timestamps."""
+    """Tracks packet latency using timestamps.
+
+    Percentiles come from a streaming sketch (see core.quantile_sketch) over
+    the last `max_samples` samples, so recording is O(1) and `get_stats` does
+    not sort; p50/p95/p99 are within `relative_accuracy` of the exact values.
+    """
     
-    def __init__(self, max_samples: int = 10000):
+    def __init__(self, max_samples: int = 10000, relative_accuracy: float = 0.01):
         self.max_samples = max_samples
-        self._samples: List[float] = []
+        self._window = WindowedQuantiles(max_samples=max_samples, relative_accuracy=relative_accuracy)
         self._lock = threading.Lock()
     
     def record(self, latency_ms: float):
         """Record a latency sample."""
         with self._lock:
-            self._samples.append(latency_ms)
-            if len(self._samples) > self.max_samples:
-                self._samples.pop(0)
+            self._window.append(latency_ms)
     
     def get_stats(self) -> Dict[str, float]:
         """Get latency statistics."""
         with self._lock:
-            samples = self._samples.copy()
-        
-        if not samples:
+            window = self._window
+            n = len(window)
+            if not n:
+                return {
+                    "avg_ms": 0.0,
+                    "p50_ms": 0.0,
+                    "p95_ms": 0.0,
+                    "p99_ms": 0.0,
+                    "max_ms": 0.0,
+                    "min_ms": 0.0,
+                    "count": 0,
+                }
+            
             return {
-                "avg_ms": 0.0,
-                "p50_ms": 0.0,
-                "p95_ms": 0.0,
-                "p99_ms": 0.0,
-                "max_ms": 0.0,
-                "min_ms": 0.0,
-                "count": 0,
+                "avg_ms": window.mean,
+                "p50_ms": window.quantile(0.50),
+                "p95_ms": window.quantile(0.95) if n >= 20 else window.max,
+                "p99_ms": window.quantile(0.99) if n >= 100 else window.max,
+                "max_ms": window.max,
+                "min_ms": window.min,
+                "count": n,
             }
-        
-        samples_sorted = sorted(samples)
-        n = len(samples_sorted)
-        
-        return {
-            "avg_ms": sum(samples) / n,
-            "p50_ms": samples_sorted[int(n * 0.50)],
-            "p95_ms": samples_sorted[int(n * 0.95)] if n >= 20 else samples_sorted[-1],
-            "p99_ms": samples_sorted[int(n * 0.99)] if n >= 100 else samples_sorted[-1],
-            "max_ms": samples_sorted[-1],
-            "min_ms": samples_sorted[0],
-            "count": n,
-        }
 
     def get_samples(self) -> List[float]:
         """Return a copy of raw latency samples."""
         with self._lock:
-            return self._samples.copy()
+            return list(self._window)
     
     def clear(self):
         """Clear all samples."""
         with self._lock:
-            self._samples.clear()
+            self._window.clear()
 
 
 # =============================================================================
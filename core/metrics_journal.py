@@ -0,0 +1,156 @@
+"""
+Append-only per-suite metrics journal.
+
+With streaming persistence (MetricsAggregator(streaming=True) or
+CONFIG["METRICS_STREAMING"]) the aggregator writes each suite to
+`<run_id>_<suite_id>_<role>.journal.jsonl` while it runs instead of holding
+everything until finalize_suite. One compact JSON record per line:
+
+    {"k": "open",  "t": mono, "suite": ..., "run": ..., "role": ..., "v": 1}
+    {"k": "s",     "t": mono, "n": section, "d": {changed fields}}
+    {"k": "sys",   "t": mono, "d": SystemCollector sample}
+    {"k": "power", "t": mono, "d": PowerCollector energy stats so far}
+    {"k": "final", "t": mono, "d": ComprehensiveSuiteMetrics.to_dict()}
+
+Section records only carry the fields that changed since the last record
+for that section (the first one is relative to the schema defaults). Every
+record is flushed as it is written, so a crashed or killed suite keeps
+everything up to its last sample; replay_journal() rebuilds the metrics
+from such a file, and ComprehensiveSuiteMetrics.from_dict accepts the
+result like any saved suite JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from core.metrics_schema import ComprehensiveSuiteMetrics
+
+VERSION = 1
+SUFFIX = ".journal.jsonl"
+
+logger = logging.getLogger(__name__)
+
+
+def journal_path(output_dir: Path, run_id: str, suite_id: str, role: str) -> Path:
+    return Path(output_dir) / f"{run_id}_{suite_id}_{role}{SUFFIX}"
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), default=str)
+
+
+class SuiteJournal:
+    """Writer for one suite's journal; safe to use from several threads."""
+
+    def __init__(self, path: Path, *, suite_id: str, run_id: str, role: str, fsync_interval_s: float = 5.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.records = 0
+        self._lock = threading.Lock()
+        self._fsync_interval_s = fsync_interval_s
+        self._last_fsync = time.monotonic()
+        self._written: Dict[str, Dict[str, Any]] = {
+            name: dict(values) for name, values in ComprehensiveSuiteMetrics().to_dict().items()
+        }
+        self._handle = open(self.path, "a", encoding="utf-8")
+        self._write({"k": "open", "t": time.monotonic(), "suite": suite_id, "run": run_id, "role": role, "v": VERSION})
+
+    @property
+    def closed(self) -> bool:
+        return self._handle is None
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._handle is None:
+                return
+            try:
+                self._handle.write(_dumps(record) + "\n")
+                self._handle.flush()
+                now = time.monotonic()
+                if now - self._last_fsync >= self._fsync_interval_s:
+                    os.fsync(self._handle.fileno())
+                    self._last_fsync = now
+            except OSError as exc:
+                # Never fail the benchmark over the journal; the final JSON is still saved.
+                logger.warning("metrics journal %s disabled: %s", self.path, exc)
+                self._handle.close()
+                self._handle = None
+                return
+            self.records += 1
+
+    def sections(self, metrics: ComprehensiveSuiteMetrics, names: Iterable[str]) -> None:
+        """Record the fields of `names` that changed since they were last written."""
+
+        for name in names:
+            current = asdict(getattr(metrics, name))
+            written = self._written[name]
+            changed = {key: value for key, value in current.items() if written.get(key) != value}
+            if changed:
+                written.update(changed)
+                self._write({"k": "s", "t": time.monotonic(), "n": name, "d": changed})
+
+    def sample(self, kind: str, values: Dict[str, Any]) -> None:
+        self._write({"k": kind, "t": time.monotonic(), "d": values})
+
+    def finish(self, metrics: ComprehensiveSuiteMetrics) -> None:
+        """Write the finalized metrics and close the journal."""
+
+        self._write({"k": "final", "t": time.monotonic(), "d": metrics.to_dict()})
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is None:
+                return
+            try:
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+            except OSError as exc:
+                logger.warning("metrics journal %s: %s", self.path, exc)
+            finally:
+                self._handle.close()
+                self._handle = None
+
+
+def replay_journal(path: Path) -> Dict[str, Any]:
+    """Rebuild a suite from its journal.
+
+    Returns metrics (ComprehensiveSuiteMetrics), system_samples and power
+    (the raw records, oldest first) and complete (False when the suite never
+    reached finalize_suite; metrics then hold the last recorded sections).
+    A torn last line from a crash is ignored.
+    """
+
+    data = ComprehensiveSuiteMetrics().to_dict()
+    system_samples = []
+    power = []
+    final = None
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            kind = record.get("k")
+            if kind == "s":
+                data[record["n"]].update(record["d"])
+            elif kind == "sys":
+                system_samples.append(record["d"])
+            elif kind == "power":
+                power.append(record["d"])
+            elif kind == "final":
+                final = record["d"]
+    return {
+        "metrics": ComprehensiveSuiteMetrics.from_dict(final if final is not None else data),
+        "system_samples": system_samples,
+        "power": power,
+        "complete": final is not None,
+    }
@@ -2,6 +2,11 @@
 In-band control-plane state machine for interactive rekey negotiation.
 
 Implements a two-phase commit protocol carried over packet type 0x02 payloads.
+
+When both sides can resume the current session for the target suite
+(`ControlState.can_resume`), prepare_rekey and prepare_ok each carry a
+`resume_nonce` and commit_rekey carries `"mode": "resume"`; the proxies then
+derive the next keys locally (core.resumption) instead of running a handshake.
 """
 
 from __future__ import annotations
@@ -48,6 +53,14 @@ class ControlState:
         "rekeys_fail": 0,
     })
     seen_rids: deque[str] = field(default_factory=lambda: deque(maxlen=256))
+    # Set by the GCS proxy when its KEM keypair pool is enabled: takes suite IDs
+    # expected next and starts generating their keypairs.
+    prewarm: Optional[Callable[[List[str]], None]] = None
+    # Set by proxies with resumed rekeys enabled: True if a rekey to this
+    # suite may skip the handshake.
+    can_resume: Optional[Callable[[str], bool]] = None
+    # rid -> {"drone": nonce_hex, "gcs": nonce_hex} while a resumed rekey is negotiated.
+    resume_nonces: Dict[str, Dict[str, str]] = field(default_factory=dict)
 
 
 @dataclass
@@ -56,6 +69,9 @@ class ControlResult:
 
     send: List[dict] = field(default_factory=list)
     start_handshake: Optional[Tuple[str, str]] = None  # (suite_id, rid)
+    # rid of a rekey the peer reports as installed (its status "ok"); the
+    # proxy may now send on the new session.
+    peer_rekeyed: Optional[str] = None
     notes: List[str] = field(default_factory=list)
 
 
@@ -121,11 +137,41 @@ def enqueue_json(state: ControlState, payload: dict) -> None:
     state.outbox.put(payload)
 
 
+def _resume_nonce_if_possible(state: ControlState, suite_id: str) -> Optional[str]:
+    """Fresh resumption nonce (hex) if this side can resume into `suite_id`."""
+
+    can_resume = state.can_resume
+    if can_resume is None or not can_resume(suite_id):
+        return None
+    return secrets.token_hex(16)
+
+
+def _valid_nonce(value: object) -> bool:
+    if not isinstance(value, str) or len(value) != 32:
+        return False
+    try:
+        bytes.fromhex(value)
+    except ValueError:
+        return False
+    return True
+
+
+def take_resume_nonces(state: ControlState, rid: str) -> Optional[Tuple[bytes, bytes]]:
+    """Pop (nonce_drone, nonce_gcs) if `rid` was committed as a resumed rekey."""
+
+    with state.lock:
+        nonces = state.resume_nonces.pop(rid, None)
+    if not nonces or not all(_valid_nonce(nonces.get(role)) for role in ("drone", "gcs")):
+        return None
+    return bytes.fromhex(nonces["drone"]), bytes.fromhex(nonces["gcs"])
+
+
 def request_prepare(state: ControlState, suite_id: str) -> str:
     """Queue a prepare_rekey message and transition to NEGOTIATING."""
 
     rid = generate_rid()
     now = _now_ms()
+    nonce = _resume_nonce_if_possible(state, suite_id)
     with state.lock:
         if state.state != "RUNNING":
             raise RuntimeError("control-plane already negotiating")
@@ -133,15 +179,17 @@ def request_prepare(state: ControlState, suite_id: str) -> str:
         state.active_rid = rid
         state.state = "NEGOTIATING"
         state.stats["prepare_sent"] += 1
-    enqueue_json(
-        state,
-        {
-            "type": "prepare_rekey",
-            "suite": suite_id,
-            "rid": rid,
-            "t_ms": now,
-        },
-    )
+        if nonce is not None:
+            state.resume_nonces[rid] = {state.role: nonce}
+    payload = {
+        "type": "prepare_rekey",
+        "suite": suite_id,
+        "rid": rid,
+        "t_ms": now,
+    }
+    if nonce is not None:
+        payload["resume_nonce"] = nonce
+    enqueue_json(state, payload)
     return rid
 
 
@@ -166,6 +214,7 @@ def record_rekey_result(state: ControlState, rid: str, suite_id: str, *, success
         else:
             state.stats["rekeys_fail"] += 1
         state.pending.pop(rid, None)
+        state.resume_nonces.pop(rid, None)
         state.active_rid = None
         state.state = "RUNNING"
     enqueue_json(state, status_payload)
@@ -185,6 +234,7 @@ def handle_control(msg: dict, role: str, state: ControlState) -> ControlResult:
 
     coordinator_role = state.coordinator_role
     is_coordinator = role == coordinator_role
+    peer_role = "drone" if role == "gcs" else "gcs"
 
     if is_coordinator:
         if msg_type == "prepare_ok" and isinstance(rid, str):
@@ -195,17 +245,28 @@ def handle_control(msg: dict, role: str, state: ControlState) -> ControlResult:
                     return result
                 state.state = "SWAPPING"
                 state.seen_rids.append(rid)
-            result.send.append({
+                nonces = state.resume_nonces.get(rid)
+                peer_nonce = msg.get("resume_nonce")
+                if nonces is not None and _valid_nonce(peer_nonce):
+                    nonces[peer_role] = peer_nonce
+                else:
+                    nonces = None
+                    state.resume_nonces.pop(rid, None)
+            commit = {
                 "type": "commit_rekey",
                 "suite": suite,
                 "rid": rid,
                 "t_ms": now,
-            })
+            }
+            if nonces is not None:
+                commit["mode"] = "resume"
+            result.send.append(commit)
             result.start_handshake = (suite, rid)
         elif msg_type == "prepare_fail" and isinstance(rid, str):
             reason = msg.get("reason", "unknown")
             with state.lock:
                 state.pending.pop(rid, None)
+                state.resume_nonces.pop(rid, None)
                 state.active_rid = None
                 state.state = "RUNNING"
                 state.stats["rekeys_fail"] += 1
@@ -214,6 +275,8 @@ def handle_control(msg: dict, role: str, state: ControlState) -> ControlResult:
         elif msg_type == "status":
             with state.lock:
                 state.last_status = msg
+            if msg.get("result") == "ok" and isinstance(rid, str):
+                result.peer_rekeyed = rid
         else:
             result.notes.append(f"ignored:{msg_type}")
         return result
@@ -224,6 +287,8 @@ def handle_control(msg: dict, role: str, state: ControlState) -> ControlResult:
             result.notes.append("invalid_prepare")
             return result
 
+        peer_nonce = msg.get("resume_nonce")
+        nonce = _resume_nonce_if_possible(state, suite) if _valid_nonce(peer_nonce) else None
         with state.lock:
             if rid in state.seen_rids:
                 allow = False
@@ -235,12 +300,17 @@ def handle_control(msg: dict, role: str, state: ControlState) -> ControlResult:
                 state.state = "NEGOTIATING"
                 state.stats["prepare_received"] += 1
                 state.seen_rids.append(rid)
+                if nonce is not None:
+                    state.resume_nonces[rid] = {peer_role: peer_nonce, role: nonce}
         if allow:
-            result.send.append({
+            reply = {
                 "type": "prepare_ok",
                 "rid": rid,
                 "t_ms": now,
-            })
+            }
+            if nonce is not None:
+                reply["resume_nonce"] = nonce
+            result.send.append(reply)
         else:
             result.send.append({
                 "type": "prepare_fail",
@@ -255,10 +325,14 @@ def handle_control(msg: dict, role: str, state: ControlState) -> ControlResult:
                 result.notes.append("unknown_commit_rid")
                 return result
             state.state = "SWAPPING"
+            if msg.get("mode") != "resume":
+                state.resume_nonces.pop(rid, None)
         result.start_handshake = (suite, rid)
     elif msg_type == "status":
         with state.lock:
             state.last_status = msg
+        if msg.get("result") == "ok" and isinstance(rid, str):
+            result.peer_rekeyed = rid
     else:
         result.notes.append(f"ignored:{msg_type}")
 
@@ -29,6 +29,7 @@ except ModuleNotFoundError:  # pragma: no cover - psutil optional on host
     psutil = None  # type: ignore[assignment]
 
 from core.config import CONFIG
+from core.power_trace import SUFFIX as _TRACE_SUFFIX, PowerTraceWriter
 
 
 _DEFAULT_SAMPLE_HZ = int(os.getenv("INA219_SAMPLE_HZ", "1000"))
@@ -36,6 +37,8 @@ _DEFAULT_SHUNT_OHM = float(os.getenv("INA219_SHUNT_OHM", "0.1"))
 _DEFAULT_I2C_BUS = int(os.getenv("INA219_I2C_BUS", "1"))
 _DEFAULT_ADDR = int(os.getenv("INA219_ADDR", "0x40"), 16)
 _DEFAULT_SIGN_MODE = os.getenv("INA219_SIGN_MODE", "auto").lower()
+_DEFAULT_TRACE_FORMAT = os.getenv("INA219_TRACE_FORMAT", "csv").lower()
+_TRACE_FORMATS = ("csv", "binary")
 
 _RPI5_HWMON_PATH_ENV = "RPI5_HWMON_PATH"
 _RPI5_HWMON_NAME_ENV = "RPI5_HWMON_NAME"
@@ -95,9 +98,10 @@ class PowerSummary:
     avg_power_w: float
     energy_j: float
     sample_rate_hz: float
-    csv_path: str
+    csv_path: str  # trace file; a binary core.power_trace file when trace_format is "binary"
     start_ns: int
     end_ns: int
+    trace_format: str = "csv"
 
 
 @dataclass
@@ -151,7 +155,7 @@ def _sanitize_label(label: str) -> str:
 
 
 class Ina219PowerMonitor:
-    """Wraps basic INA219 sampling with CSV logging and summary stats."""
+    """Wraps basic INA219 sampling with CSV (or binary trace) logging and summary stats."""
 
     def __init__(
         self,
@@ -162,11 +166,14 @@ class Ina219PowerMonitor:
         shunt_ohm: float = _DEFAULT_SHUNT_OHM,
         sample_hz: int = _DEFAULT_SAMPLE_HZ,
         sign_mode: str = _DEFAULT_SIGN_MODE,
+        trace_format: str = _DEFAULT_TRACE_FORMAT,
     ) -> None:
         if smbus is None:
             raise PowerMonitorUnavailable("smbus module not available on host")
         if sample_hz <= 0:
             raise PowerMonitorUnavailable("sample_hz must be > 0")
+        if trace_format not in _TRACE_FORMATS:
+            raise ValueError(f"unknown power trace format: {trace_format}")
 
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -177,6 +184,7 @@ class Ina219PowerMonitor:
         self._bus_lock = threading.Lock()
         self._sign_factor = 1
         self._sign_mode = sign_mode
+        self.trace_format = trace_format
 
         try:
             self._bus = smbus.SMBus(i2c_bus)
@@ -215,7 +223,9 @@ class Ina219PowerMonitor:
 
         safe_label = _sanitize_label(label)
         ts = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
-        csv_path = self.output_dir / f"power_{safe_label}_{ts}.csv"
+        binary = self.trace_format == "binary"
+        suffix = _TRACE_SUFFIX if binary else ".csv"
+        csv_path = self.output_dir / f"power_{safe_label}_{ts}{suffix}"
 
         dt = 1.0 / float(self.sample_hz)
         next_tick = time.perf_counter()
@@ -227,10 +237,30 @@ class Ina219PowerMonitor:
         sum_power = 0.0
         samples = 0
 
-        with open(csv_path, "w", newline="", encoding="utf-8") as handle:
+        if binary:
+            trace = PowerTraceWriter(
+                csv_path,
+                sample_hz=self.sample_hz,
+                sign_factor=self._sign_factor,
+                start_ns=start_wall_ns,
+                chunk_records=max(1024, int(self.sample_hz * 10)),
+            )
+            write_sample = trace.append
+            close_trace = trace.close
+        else:
+            handle = open(csv_path, "w", newline="", encoding="utf-8")
             writer = csv.writer(handle)
             writer.writerow(["timestamp_ns", "current_a", "voltage_v", "power_w", "sign_factor"])
+            sign_factor = self._sign_factor
 
+            def write_sample(ts_ns: int, current_a: float, voltage_v: float, power_w: float) -> None:
+                writer.writerow([ts_ns, f"{current_a:.6f}", f"{voltage_v:.6f}", f"{power_w:.6f}", sign_factor])
+                if samples % 250 == 0:
+                    handle.flush()
+
+            close_trace = handle.close
+
+        try:
             while True:
                 elapsed = time.perf_counter() - start_perf
                 if elapsed >= duration_s:
@@ -241,9 +271,7 @@ class Ina219PowerMonitor:
                     raise PowerMonitorUnavailable(f"INA219 read failed: {exc}") from exc
 
                 power_w = current_a * voltage_v
-                writer.writerow([time.time_ns(), f"{current_a:.6f}", f"{voltage_v:.6f}", f"{power_w:.6f}", self._sign_factor])
-                if samples % 250 == 0:
-                    handle.flush()
+                write_sample(time.time_ns(), current_a, voltage_v, power_w)
 
                 sum_current += current_a
                 sum_voltage += voltage_v
@@ -254,6 +282,8 @@ class Ina219PowerMonitor:
                 sleep_for = next_tick - time.perf_counter()
                 if sleep_for > 0:
                     time.sleep(sleep_for)
+        finally:
+            close_trace()
 
         end_perf = time.perf_counter()
         end_wall_ns = time.time_ns()
@@ -276,6 +306,7 @@ class Ina219PowerMonitor:
             csv_path=str(csv_path.resolve()),
             start_ns=start_wall_ns,
             end_ns=end_wall_ns,
+            trace_format=self.trace_format,
         )
 
     def iter_samples(self, duration_s: Optional[float] = None) -> Iterator[PowerSample]:
@@ -910,6 +941,7 @@ def create_power_monitor(
     backend: str = "auto",
     sample_hz: Optional[int] = None,
     sign_mode: Optional[str] = None,
+    trace_format: Optional[str] = None,
     shunt_ohm: Optional[float] = None,
     i2c_bus: Optional[int] = None,
     address: Optional[int] = None,
@@ -941,6 +973,7 @@ def create_power_monitor(
         "shunt_ohm": resolved_shunt,
         "sample_hz": resolved_sample_hz,
         "sign_mode": resolved_sign_mode,
+        "trace_format": (trace_format or _DEFAULT_TRACE_FORMAT).lower(),
     }
     rpi_kwargs = {
         "sample_hz": resolved_sample_hz,
@@ -0,0 +1,408 @@
+"""
+Standalone power sampler process feeding a lock-free shared-memory ring.
+
+PowerCollector and Ina219PowerMonitor sample from Python threads that share
+the GIL with MAVLink sniffing, the scheduler and metrics aggregation, so the
+achieved sample rate sags whenever those are busy. `PowerSampler` instead
+runs the sampling loop in its own interpreter:
+
+    python -m core.power_sampler --ring pqc-power --rate 1000 [--backend auto]
+                                 [--cpu 3] [--priority 50]
+
+optionally pinned to a CPU (`--cpu`) and given a raised priority
+(`--priority`: 1..99 requests SCHED_FIFO, a negative value is a nice level;
+both usually need root or CAP_SYS_NICE, and what was actually applied is
+recorded in the ring header).
+
+The ring is a fixed-size file on tmpfs (bare names go under /dev/shm, as in
+core.counter_shm) with a single writer and any number of readers:
+
+    header (128 bytes): magic "PQSR" | version u16 | sched policy u16 |
+                        record size u32 | cpu i32 | capacity u64 |
+                        sample_hz f64 | pid u64 | priority i64 |
+                        head u64 | missed deadlines u64 | max lateness ns u64 |
+                        first sample mono ns u64 | last sample mono ns u64 | state u64
+    records:            capacity x (mono_s f64, voltage_v f64, current_a f64, power_w f64)
+
+The writer fills slot head % capacity and then publishes the new head, so a
+reader never blocks it; `SampleRingReader.read_since` re-checks the head after
+copying and drops rows the writer lapped in the meantime (counted as
+overruns). Timestamps are time.monotonic(), which is system-wide, so they
+line up with the rest of the drone's monotonic clocks. Failed reads are
+stored with NaN power.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import mmap
+import os
+import signal
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.counter_shm import resolve_path
+
+MAGIC = b"PQSR"
+VERSION = 1
+HEADER_SIZE = 128
+RECORD = struct.Struct("<dddd")
+_STATIC = struct.Struct("<4sHHIiQdQq")
+_STATS = struct.Struct("<QQQQQQ")
+_STATS_OFFSET = _STATIC.size
+_HEAD = struct.Struct("<Q")
+
+STATE_STARTING = 0
+STATE_RUNNING = 1
+STATE_STOPPED = 2
+
+_POLICY_NONE = 0
+_POLICY_NICE = 1
+_POLICY_FIFO = 2
+_POLICY_NAMES = {_POLICY_NONE: "default", _POLICY_NICE: "nice", _POLICY_FIFO: "fifo"}
+
+DEFAULT_RING = "pqc-power-sampler"
+_START_TIMEOUT_S = 10.0
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class PowerSamplerError(RuntimeError):
+    """Raised when the sampler process cannot be started or its ring read."""
+
+
+class SampleRingWriter:
+    """Sampler-process side of the ring (single writer)."""
+
+    def __init__(self, path: str, capacity: int, sample_hz: float, *, cpu: int = -1,
+                 policy: int = _POLICY_NONE, priority: int = 0) -> None:
+        self.path = resolve_path(path)
+        self.capacity = max(2, int(capacity))
+        size = HEADER_SIZE + self.capacity * RECORD.size
+        self.head = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+        _STATIC.pack_into(self._map, 0, MAGIC, VERSION, policy, RECORD.size, cpu, self.capacity,
+                          float(sample_hz), os.getpid(), priority)
+        _STATS.pack_into(self._map, _STATS_OFFSET, 0, 0, 0, 0, 0, STATE_STARTING)
+        os.replace(tmp, self.path)
+
+    def publish(self, mono_s: float, voltage_v: float, current_a: float, power_w: float,
+                missed: int, max_late_ns: int, first_ns: int, last_ns: int) -> None:
+        RECORD.pack_into(self._map, HEADER_SIZE + (self.head % self.capacity) * RECORD.size,
+                         mono_s, voltage_v, current_a, power_w)
+        self.head += 1
+        _STATS.pack_into(self._map, _STATS_OFFSET, self.head, missed, max_late_ns, first_ns, last_ns,
+                         STATE_RUNNING)
+
+    def set_state(self, state: int) -> None:
+        struct.pack_into("<Q", self._map, _STATS_OFFSET + 5 * 8, state)
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except (BufferError, ValueError):
+            pass
+
+
+class SampleRingReader:
+    """Read-only view of a sampler ring; any number of readers may attach."""
+
+    def __init__(self, path: str) -> None:
+        self.path = resolve_path(path)
+        with open(self.path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.policy, record_size, self.cpu, self.capacity,
+         self.sample_hz, self.pid, self.priority) = _STATIC.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._map.close()
+            raise PowerSamplerError(f"{self.path} is not a power sampler ring (magic={magic!r})")
+        self.overruns = 0
+
+    @property
+    def head(self) -> int:
+        return _HEAD.unpack_from(self._map, _STATS_OFFSET)[0]
+
+    @property
+    def state(self) -> int:
+        return _STATS.unpack_from(self._map, _STATS_OFFSET)[5]
+
+    def read_since(self, position: int) -> Tuple[List[Tuple[float, float, float, float]], int]:
+        """Rows appended since `position` (a head value) and the new position."""
+
+        head = self.head
+        start = max(position, head - self.capacity)
+        lost = start - position
+        if head <= start:
+            return [], head
+        first = start % self.capacity
+        last = head % self.capacity
+        base = HEADER_SIZE
+        if first < last:
+            raw = self._map[base + first * RECORD.size : base + last * RECORD.size]
+        else:
+            raw = (self._map[base + first * RECORD.size : base + self.capacity * RECORD.size]
+                   + self._map[base : base + last * RECORD.size])
+        rows = list(RECORD.iter_unpack(raw))
+        # Rows the writer overwrote while we copied are no longer trustworthy.
+        lapped = self.head - self.capacity - start
+        if lapped > 0:
+            rows = rows[lapped:]
+            lost += lapped
+        self.overruns += lost
+        return rows, head
+
+    def stats(self) -> Dict[str, Any]:
+        head, missed, max_late_ns, first_ns, last_ns, state = _STATS.unpack_from(self._map, _STATS_OFFSET)
+        span_s = (last_ns - first_ns) / 1e9 if head > 1 else 0.0
+        return {
+            "samples": head,
+            "requested_hz": self.sample_hz,
+            "achieved_hz": round((head - 1) / span_s, 2) if span_s > 0 else 0.0,
+            "missed_deadlines": missed,
+            "max_late_us": round(max_late_ns / 1000.0, 1),
+            "overruns": self.overruns,
+            "pid": self.pid,
+            "cpu": self.cpu,
+            "policy": _POLICY_NAMES.get(self.policy, str(self.policy)),
+            "priority": self.priority,
+            "running": state == STATE_RUNNING,
+        }
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "SampleRingReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _apply_placement(cpu: int, priority: int) -> Tuple[int, int, int]:
+    """Pin/raise this process as requested; returns what was applied (cpu, policy, priority)."""
+
+    applied_cpu = -1
+    if cpu >= 0 and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {cpu})
+            applied_cpu = cpu
+        except OSError:
+            pass
+    if priority > 0 and hasattr(os, "sched_setscheduler"):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            return applied_cpu, _POLICY_FIFO, priority
+        except OSError:
+            priority = -10  # fall back to the strongest nice level we might get
+    if priority < 0:
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, priority)
+            return applied_cpu, _POLICY_NICE, priority
+        except OSError:
+            pass
+    return applied_cpu, _POLICY_NONE, 0
+
+
+def _make_source(backend: str) -> Callable[[], Tuple[float, float, float]]:
+    """(voltage_v, current_a, power_w) reader; power NaN on a failed read."""
+
+    if backend == "mock":
+        start = time.monotonic()
+
+        def mock() -> Tuple[float, float, float]:
+            current = 0.5 + 0.1 * math.sin((time.monotonic() - start) * 2.0)
+            return 5.0, current, 5.0 * current
+
+        return mock
+
+    from core.metrics_collectors import PowerCollector
+
+    collector = PowerCollector(backend=backend)
+    if collector.backend == "none":
+        raise PowerSamplerError(f"no power backend available (requested {backend})")
+
+    def read() -> Tuple[float, float, float]:
+        sample = collector.collect()
+        power = sample["power_w"]
+        return (
+            float(sample["voltage_v"] or 0.0),
+            float(sample["current_a"] or 0.0),
+            float(power) if isinstance(power, (int, float)) else math.nan,
+        )
+
+    return read
+
+
+def run_sampler(ring: str, *, rate_hz: float, backend: str = "auto", capacity: Optional[int] = None,
+                cpu: int = -1, priority: int = 0, parent_pid: Optional[int] = None) -> int:
+    """Sampling loop of the sampler process; runs until SIGTERM/SIGINT or the parent exits."""
+
+    applied_cpu, policy, applied_priority = _apply_placement(cpu, priority)
+    source = _make_source(backend)
+    writer = SampleRingWriter(ring, capacity or int(rate_hz * 120), rate_hz,
+                              cpu=applied_cpu, policy=policy, priority=applied_priority)
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+
+    period_ns = max(1, int(1e9 / rate_hz))
+    check_every = max(1, int(rate_hz))
+    missed = 0
+    max_late_ns = 0
+    first_ns = 0
+    next_ns = time.monotonic_ns()
+    orphaned = False
+    try:
+        while not stopping:
+            late_ns = time.monotonic_ns() - next_ns
+            if late_ns >= period_ns:
+                # Skip the ticks we slept through instead of bursting to catch up.
+                skipped = late_ns // period_ns
+                missed += skipped
+                next_ns += skipped * period_ns
+            if late_ns > max_late_ns:
+                max_late_ns = late_ns
+            voltage, current, power = source()
+            now_ns = time.monotonic_ns()
+            if not first_ns:
+                first_ns = now_ns
+            writer.publish(now_ns / 1e9, voltage, current, power, missed, max_late_ns, first_ns, now_ns)
+            if parent_pid and writer.head % check_every == 0 and os.getppid() != parent_pid:
+                orphaned = True
+                break
+            next_ns += period_ns
+            sleep_ns = next_ns - time.monotonic_ns()
+            if sleep_ns > 0:
+                time.sleep(sleep_ns / 1e9)
+    finally:
+        writer.set_state(STATE_STOPPED)
+        writer.close()
+        if orphaned:
+            # Nobody is left to read the ring or to run PowerSampler.stop().
+            try:
+                os.unlink(ring)
+            except OSError:
+                pass
+    return 0
+
+
+class PowerSampler:
+    """Parent-side handle: launch the sampler process and read its ring."""
+
+    def __init__(self, ring: str = DEFAULT_RING, *, rate_hz: float = 1000.0, backend: str = "auto",
+                 capacity: Optional[int] = None, cpu: int = -1, priority: int = 0) -> None:
+        self.ring = f"{ring}-{os.getpid()}" if ring == DEFAULT_RING else ring
+        self.rate_hz = float(rate_hz)
+        self.backend = backend
+        self.capacity = capacity
+        self.cpu = cpu
+        self.priority = priority
+        self.reader: Optional[SampleRingReader] = None
+        self._proc: Optional[subprocess.Popen] = None
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self, timeout: float = _START_TIMEOUT_S) -> None:
+        if self.running:
+            return
+        path = resolve_path(self.ring)
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        cmd = [
+            sys.executable, "-m", "core.power_sampler",
+            "--ring", str(path), "--rate", str(self.rate_hz), "--backend", self.backend,
+            "--cpu", str(self.cpu), "--priority", str(self.priority), "--parent-pid", str(os.getpid()),
+        ]
+        if self.capacity:
+            cmd += ["--capacity", str(self.capacity)]
+        self._proc = subprocess.Popen(cmd, cwd=str(ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._proc.poll() is not None:
+                err = self._proc.stderr.read().decode(errors="replace").strip().splitlines()
+                raise PowerSamplerError(f"power sampler exited: {err[-1] if err else self._proc.returncode}")
+            if path.exists():
+                reader = SampleRingReader(str(path))
+                if reader.head > 0:
+                    self.reader = reader
+                    return
+                reader.close()
+            time.sleep(0.01)
+        self.stop()
+        raise PowerSamplerError("power sampler did not start in time")
+
+    def position(self) -> int:
+        """Current ring head; pass it to read_since to get later samples only."""
+        if self.reader is None:
+            raise PowerSamplerError("power sampler not started")
+        return self.reader.head
+
+    def read_since(self, position: int) -> Tuple[List[Tuple[float, float, float, float]], int]:
+        if self.reader is None:
+            raise PowerSamplerError("power sampler not started")
+        return self.reader.read_since(position)
+
+    def report(self) -> Dict[str, Any]:
+        return self.reader.stats() if self.reader is not None else {}
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop the process and remove the ring; returns the final report."""
+        report = self.report()
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                self._proc.terminate()
+                try:
+                    self._proc.wait(timeout=2.0)
+                except subprocess.TimeoutExpired:
+                    self._proc.kill()
+                    self._proc.wait()
+            if self._proc.stderr:
+                self._proc.stderr.close()
+            self._proc = None
+        if self.reader is not None:
+            report = self.reader.stats()
+            self.reader.close()
+            self.reader = None
+        try:
+            resolve_path(self.ring).unlink()
+        except OSError:
+            pass
+        return report
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Power sampler process (shared-memory ring)")
+    parser.add_argument("--ring", default=DEFAULT_RING, help="ring file (bare names go under /dev/shm)")
+    parser.add_argument("--rate", type=float, default=1000.0, help="sample rate (Hz)")
+    parser.add_argument("--backend", default="auto", help="PowerCollector backend, or 'mock'")
+    parser.add_argument("--capacity", type=int, default=None, help="ring slots (default: 120 s of samples)")
+    parser.add_argument("--cpu", type=int, default=-1, help="pin to this CPU (-1: no pinning)")
+    parser.add_argument("--priority", type=int, default=0,
+                        help="1..99: SCHED_FIFO priority; negative: nice level; 0: unchanged")
+    parser.add_argument("--parent-pid", type=int, default=None, help="exit when this parent goes away")
+    args = parser.parse_args(argv)
+    try:
+        return run_sampler(args.ring, rate_hz=args.rate, backend=args.backend, capacity=args.capacity,
+                           cpu=args.cpu, priority=args.priority, parent_pid=args.parent_pid)
+    except PowerSamplerError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
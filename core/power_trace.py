@@ -0,0 +1,210 @@
+"""
+Binary power trace format for high-rate power captures.
+
+`Ina219PowerMonitor.capture` normally writes one formatted CSV row per sample.
+With the binary format (`trace_format="binary"` or INA219_TRACE_FORMAT=binary)
+each sample is a fixed-width little-endian record packed straight into a
+memory-mapped file instead, so the sampling loop does no float formatting
+and no write syscalls.
+
+Layout:
+
+    header (64 bytes): magic "PQPT" | version u16 | sign_factor i16 |
+                       record size u32 | sample_hz f64 | start_ns i64 |
+                       record count u64 | reserved
+    records:           timestamp_ns i64 | current_a f64 | voltage_v f64 | power_w f64
+
+The record count in the header is updated after every record, so a trace can
+be read while it is still being written or after the writer died; the file
+is preallocated in chunks and trimmed to the records on close.
+
+Convert for the analysis scripts (tools/power_utils.load_power_trace also
+reads traces directly):
+
+    python -m core.power_trace to-csv TRACE [-o OUT.csv]
+    python -m core.power_trace to-parquet TRACE [-o OUT.parquet]   # needs pyarrow
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+MAGIC = b"PQPT"
+VERSION = 1
+SUFFIX = ".pqpt"
+HEADER = struct.Struct("<4sHhIdqQ")
+HEADER_SIZE = 64
+RECORD = struct.Struct("<qddd")
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = HEADER.size - _COUNT.size
+CSV_COLUMNS = ("timestamp_ns", "current_a", "voltage_v", "power_w", "sign_factor")
+
+
+class PowerTraceWriter:
+    """Append fixed-width sample records to a memory-mapped trace file."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        sample_hz: float,
+        sign_factor: int,
+        start_ns: int,
+        chunk_records: int = 65536,
+    ) -> None:
+        self.path = Path(path)
+        self.count = 0
+        self._chunk = max(1, int(chunk_records)) * RECORD.size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._size = HEADER_SIZE + self._chunk
+        os.ftruncate(self._fd, self._size)
+        self._map = mmap.mmap(self._fd, self._size)
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, sign_factor, RECORD.size, float(sample_hz), start_ns, 0)
+        self._offset = HEADER_SIZE
+
+    def _grow(self) -> None:
+        self._map.flush()
+        self._map.close()
+        self._size += self._chunk
+        os.ftruncate(self._fd, self._size)
+        self._map = mmap.mmap(self._fd, self._size)
+
+    def append(self, timestamp_ns: int, current_a: float, voltage_v: float, power_w: float) -> None:
+        if self._offset + RECORD.size > self._size:
+            self._grow()
+        RECORD.pack_into(self._map, self._offset, timestamp_ns, current_a, voltage_v, power_w)
+        self._offset += RECORD.size
+        self.count += 1
+        _COUNT.pack_into(self._map, _COUNT_OFFSET, self.count)
+
+    def close(self) -> None:
+        if self._fd < 0:
+            return
+        self._map.flush()
+        self._map.close()
+        os.ftruncate(self._fd, self._offset)
+        os.close(self._fd)
+        self._fd = -1
+
+    def __enter__(self) -> "PowerTraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def is_trace(path: Path) -> bool:
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    with open(path, "rb") as handle:
+        raw = handle.read(HEADER_SIZE)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path}: truncated power trace header")
+    magic, version, sign_factor, record_size, sample_hz, start_ns, count = HEADER.unpack_from(raw)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a power trace (magic={magic!r}, version={version})")
+    records = max(0, (Path(path).stat().st_size - HEADER_SIZE) // RECORD.size)
+    return {
+        "sign_factor": sign_factor,
+        "sample_hz": sample_hz,
+        "start_ns": start_ns,
+        "count": min(count, records),
+    }
+
+
+def iter_records(path: Path) -> Iterator[Tuple[int, float, float, float]]:
+    """(timestamp_ns, current_a, voltage_v, power_w) for each record."""
+
+    count = read_header(path)["count"]
+    with open(path, "rb") as handle:
+        handle.seek(HEADER_SIZE)
+        yield from RECORD.iter_unpack(handle.read(count * RECORD.size))
+
+
+def read_trace(path: Path) -> Tuple[Dict[str, Any], Any]:
+    """Header dict and a numpy structured array of the records (needs numpy)."""
+
+    import numpy as np
+
+    header = read_header(path)
+    dtype = np.dtype(
+        [("timestamp_ns", "<i8"), ("current_a", "<f8"), ("voltage_v", "<f8"), ("power_w", "<f8")]
+    )
+    records = np.fromfile(path, dtype=dtype, count=header["count"], offset=HEADER_SIZE)
+    return header, records
+
+
+def trace_to_csv(path: Path, out: Optional[Path] = None) -> Path:
+    """Write the CSV capture() produces for the same samples."""
+
+    path = Path(path)
+    out = Path(out) if out else path.with_suffix(".csv")
+    sign_factor = read_header(path)["sign_factor"]
+    with open(out, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_COLUMNS)
+        for ts_ns, current_a, voltage_v, power_w in iter_records(path):
+            writer.writerow([ts_ns, f"{current_a:.6f}", f"{voltage_v:.6f}", f"{power_w:.6f}", sign_factor])
+    return out
+
+
+def trace_to_parquet(path: Path, out: Optional[Path] = None) -> Path:
+    """Write the records as Parquet, with the header stored as schema metadata."""
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("pyarrow is required for Parquet conversion") from exc
+
+    path = Path(path)
+    out = Path(out) if out else path.with_suffix(".parquet")
+    header = read_header(path)
+    columns = list(zip(*iter_records(path))) or [[], [], [], []]
+    table = pa.table(
+        {
+            "timestamp_ns": pa.array(columns[0], type=pa.int64()),
+            "current_a": pa.array(columns[1], type=pa.float64()),
+            "voltage_v": pa.array(columns[2], type=pa.float64()),
+            "power_w": pa.array(columns[3], type=pa.float64()),
+        }
+    )
+    table = table.replace_schema_metadata({key: str(value) for key, value in header.items()})
+    pq.write_table(table, out)
+    return out
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert binary power traces")
+    parser.add_argument("command", choices=("to-csv", "to-parquet", "info"))
+    parser.add_argument("trace", type=Path)
+    parser.add_argument("-o", "--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        print(read_header(args.trace))
+        return 0
+    convert = trace_to_csv if args.command == "to-csv" else trace_to_parquet
+    try:
+        print(convert(args.trace, args.output))
+    except (RuntimeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,7 +17,7 @@ import subprocess
 import threading
 import logging
 import atexit
-from typing import Optional, List, Union, IO, Any
+from typing import Optional, List, Sequence, Union, IO, Any
 
 logger = logging.getLogger("pqc.process")
 
@@ -163,7 +163,8 @@ class ManagedProcess:
                  stdout: Union[int, IO, None] = subprocess.DEVNULL,
                  stderr: Union[int, IO, None] = subprocess.STDOUT,
                  stdin: Union[int, IO, None] = subprocess.DEVNULL,
-                 new_console: bool = False):
+                 new_console: bool = False,
+                 pass_fds: Sequence[int] = ()):
         self.cmd = cmd
         self.name = name
         self.cwd = cwd
@@ -172,6 +173,8 @@ class ManagedProcess:
         self.stderr = stderr
         self.stdin = stdin
         self.new_console = new_console
+        # Extra descriptors the child inherits (POSIX only; ignored on Windows).
+        self.pass_fds = tuple(pass_fds)
         
         self.process: Optional[subprocess.Popen] = None
         self._job_handle = None # Windows only
@@ -220,6 +223,8 @@ class ManagedProcess:
                 # Linux Strategy:
                 # 1. preexec_fn with prctl(PDEATHSIG) and setsid
                 kwargs["preexec_fn"] = _linux_preexec
+                if self.pass_fds:
+                    kwargs["pass_fds"] = self.pass_fds
                 self.process = subprocess.Popen(self.cmd, **kwargs)
 
             _register(self)
@@ -0,0 +1,346 @@
+"""
+Streaming quantiles with bounded memory and a fixed relative error.
+
+`QuantileSketch` is a DDSketch-style histogram: a positive value v lands in
+bucket ceil(log_gamma(v)) with gamma = (1 + a) / (1 - a), so every quantile
+it reports is within relative accuracy `a` of a true sample value. Recording
+is one log and one dict update; quantile queries walk the buckets, whose
+number depends on the value range and `a` (about 460 buckets cover 1 µs to
+1 h at 1 %), never on the sample count. Sketches with the same accuracy merge
+by adding bucket counts, and a value can be removed again, which is what the
+sliding windows below rely on.
+
+`WindowedQuantiles` keeps a sketch in step with a window bounded by sample
+count and/or age: evicted values are removed from the sketch, and monotonic
+queues keep the window's min and max exact.
+
+Usage:
+    from core.quantile_sketch import QuantileSketch, WindowedQuantiles
+
+    window = WindowedQuantiles(max_samples=10000)
+    window.append(latency_ms)
+    p99 = window.quantile(0.99)
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+# Values at or below this (including negatives) share a single zero bucket.
+MIN_TRACKED_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """Mergeable log-bucketed histogram of non-negative values."""
+
+    __slots__ = (
+        "relative_accuracy",
+        "max_buckets",
+        "_gamma",
+        "_inv_log_gamma",
+        "_bins",
+        "_sorted_keys",
+        "_floor_key",
+        "zero_count",
+        "count",
+        "sum",
+        "_min",
+        "_max",
+        "_bounds_exact",
+    )
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_buckets < 2:
+            raise ValueError("max_buckets must be at least 2")
+        self.relative_accuracy = float(relative_accuracy)
+        self.max_buckets = int(max_buckets)
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self._sorted_keys: Optional[List[int]] = None  # cache, reset when keys change
+        # Once buckets have been collapsed, keys below this fold into it.
+        self._floor_key: Optional[int] = None
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._bounds_exact = True
+
+    def _key(self, value: float) -> int:
+        key = math.ceil(math.log(value) * self._inv_log_gamma)
+        if self._floor_key is not None and key < self._floor_key:
+            return self._floor_key
+        return key
+
+    def _value(self, key: int) -> float:
+        return 2.0 * self._gamma ** key / (self._gamma + 1.0)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        if value > MIN_TRACKED_VALUE:
+            key = self._key(value)
+            bins = self._bins
+            present = bins.get(key)
+            if present is None:
+                bins[key] = weight
+                self._sorted_keys = None
+                if len(bins) > self.max_buckets:
+                    self._collapse()
+            else:
+                bins[key] = present + weight
+        else:
+            self.zero_count += weight
+        self.count += weight
+        self.sum += value * weight
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def remove(self, value: float, weight: int = 1) -> None:
+        """Undo an earlier `add(value, weight)`; min/max become bucket estimates."""
+
+        if value > MIN_TRACKED_VALUE:
+            key = self._key(value)
+            left = self._bins.get(key, 0) - weight
+            if left > 0:
+                self._bins[key] = left
+            elif self._bins.pop(key, None) is not None:
+                self._sorted_keys = None
+        else:
+            self.zero_count = max(0, self.zero_count - weight)
+        self.count -= weight
+        if self.count <= 0:
+            self.clear()
+            return
+        self.sum -= value * weight
+        self._bounds_exact = False
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other._gamma != self._gamma:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        if not other.count:
+            return
+        bins = self._bins
+        for key, weight in other._bins.items():
+            if self._floor_key is not None and key < self._floor_key:
+                key = self._floor_key
+            bins[key] = bins.get(key, 0) + weight
+        self._sorted_keys = None
+        if len(bins) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        self._bounds_exact = self._bounds_exact and other._bounds_exact
+
+    def copy(self) -> "QuantileSketch":
+        clone = QuantileSketch(self.relative_accuracy, self.max_buckets)
+        clone.merge(self)
+        clone._floor_key = self._floor_key
+        return clone
+
+    def clear(self) -> None:
+        self._bins.clear()
+        self._sorted_keys = None
+        self._floor_key = None
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._bounds_exact = True
+
+    def _collapse(self) -> None:
+        # Fold the lowest buckets together: the low tail loses accuracy first,
+        # which is the end latency and gap percentiles care least about.
+        keys = sorted(self._bins)
+        floor = keys[len(keys) - self.max_buckets]
+        folded = sum(self._bins.pop(key) for key in keys if key < floor)
+        self._bins[floor] += folded
+        self._floor_key = floor
+        self._sorted_keys = None
+
+    def _keys(self) -> List[int]:
+        keys = self._sorted_keys
+        if keys is None:
+            keys = self._sorted_keys = sorted(self._bins)
+        return keys
+
+    @property
+    def min(self) -> float:
+        if not self.count:
+            return 0.0
+        if self._bounds_exact:
+            return self._min
+        return 0.0 if self.zero_count or not self._bins else self._value(min(self._bins))
+
+    @property
+    def max(self) -> float:
+        if not self.count:
+            return 0.0
+        if self._bounds_exact:
+            return self._max
+        return self._value(max(self._bins)) if self._bins else 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def items(self) -> Iterator[Tuple[float, int]]:
+        """(representative value, count) pairs in ascending order."""
+
+        if self.zero_count:
+            yield 0.0, self.zero_count
+        bins = self._bins
+        for key in self._keys():
+            yield self._value(key), bins[key]
+
+    def value_at_rank(self, rank: int) -> float:
+        """Value of the rank-th smallest sample (0-based), within the sketch's accuracy."""
+
+        if not self.count:
+            return 0.0
+        rank = min(max(0, int(rank)), self.count - 1)
+        bins = self._bins
+        keys = self._keys()
+        if rank < self.zero_count:
+            value = 0.0
+        elif rank * 2 < self.count:
+            # Walk whichever end is closer to the rank
+            seen = self.zero_count
+            for key in keys:
+                seen += bins[key]
+                if seen > rank:
+                    break
+            value = self._value(key)
+        else:
+            above = self.count - 1 - rank
+            seen = 0
+            for key in reversed(keys):
+                seen += bins[key]
+                if seen > above:
+                    break
+            value = self._value(key)
+        if self._bounds_exact:
+            return min(max(value, self._min), self._max)
+        return value
+
+    def quantile(self, q: float) -> float:
+        """Sample at index int(q * count) of the sorted samples."""
+
+        return self.value_at_rank(int(q * self.count))
+
+    def median(self) -> float:
+        """Like statistics.median: the two middle samples are averaged for even counts."""
+
+        n = self.count
+        if n % 2:
+            return self.value_at_rank(n // 2)
+        return (self.value_at_rank(n // 2 - 1) + self.value_at_rank(n // 2)) / 2.0 if n else 0.0
+
+
+class WindowedQuantiles:
+    """Samples of a sliding window (by count and/or age) with a sketch kept in step."""
+
+    def __init__(
+        self,
+        max_samples: Optional[int] = None,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ) -> None:
+        self.max_samples = max_samples
+        self.sketch = QuantileSketch(relative_accuracy)
+        self._entries: Deque[Tuple[float, float]] = deque()  # (t, value)
+        # Monotonic queues of (index, value) for the exact window min/max.
+        self._maxq: Deque[Tuple[int, float]] = deque()
+        self._minq: Deque[Tuple[int, float]] = deque()
+        self._pushed = 0
+        self._popped = 0
+
+    def append(self, value: float, t: float = 0.0) -> None:
+        if self.max_samples is not None and len(self._entries) >= self.max_samples:
+            self._evict()
+        index = self._pushed
+        self._pushed += 1
+        self._entries.append((t, value))
+        self.sketch.add(value)
+        maxq = self._maxq
+        while maxq and maxq[-1][1] <= value:
+            maxq.pop()
+        maxq.append((index, value))
+        minq = self._minq
+        while minq and minq[-1][1] >= value:
+            minq.pop()
+        minq.append((index, value))
+
+    def _evict(self) -> None:
+        _t, value = self._entries.popleft()
+        index = self._popped
+        self._popped += 1
+        self.sketch.remove(value)
+        if self._maxq and self._maxq[0][0] == index:
+            self._maxq.popleft()
+        if self._minq and self._minq[0][0] == index:
+            self._minq.popleft()
+
+    def expire(self, cutoff: float) -> None:
+        """Drop samples appended with t < cutoff."""
+
+        entries = self._entries
+        while entries and entries[0][0] < cutoff:
+            self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._maxq.clear()
+        self._minq.clear()
+        self._pushed = self._popped = 0
+        self.sketch.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[float]:
+        return (value for _t, value in self._entries)
+
+    @property
+    def count(self) -> int:
+        return len(self._entries)
+
+    @property
+    def mean(self) -> float:
+        return self.sketch.mean
+
+    @property
+    def min(self) -> float:
+        return self._minq[0][1] if self._minq else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._maxq[0][1] if self._maxq else 0.0
+
+    def _clamp(self, value: float) -> float:
+        if not self._entries:
+            return 0.0
+        return min(max(value, self.min), self.max)
+
+    def value_at_rank(self, rank: int) -> float:
+        return self._clamp(self.sketch.value_at_rank(rank))
+
+    def quantile(self, q: float) -> float:
+        return self._clamp(self.sketch.quantile(q))
+
+    def median(self) -> float:
+        return self._clamp(self.sketch.median())
@@ -0,0 +1,159 @@
+"""
+Readiness channel from a proxy process to the process that launched it.
+
+Schedulers used to sleep a fixed time after starting `core.run_proxy` and
+then poll the status file or the handshake port. Instead, the parent creates
+a pipe, passes the write end to the child (`--ready-fd`), and the child
+reports its progress as newline-delimited JSON the moment it happens:
+
+  {"event": "listening"}                          GCS handshake socket bound
+  {"event": "handshake_ok", "suite": ..., "handshake_metrics": {...}}
+  {"event": "failed", "reason": "..."}
+
+The parent sees end-of-file if the child exits without saying anything.
+POSIX only: `ReadyPipe.supported()` is False elsewhere and callers keep their
+previous wait.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import select
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+
+class ReadySignal(threading.Event):
+    """Child side. Usable as the proxy's `ready_event` (set() means listening)."""
+
+    def __init__(self, fd: int) -> None:
+        super().__init__()
+        self._fd: Optional[int] = fd
+        self._lock = threading.Lock()
+
+    def set(self) -> None:
+        super().set()
+        self.emit("listening")
+
+    def status(self, payload: Dict[str, object]) -> None:
+        """`on_status` hook for run_proxy: forwards the first handshake_ok."""
+
+        if payload.get("status") == "handshake_ok":
+            self.emit(
+                "handshake_ok",
+                suite=payload.get("suite"),
+                handshake_metrics=payload.get("handshake_metrics") or {},
+            )
+
+    def failed(self, reason: str) -> None:
+        self.emit("failed", reason=reason)
+        self.close()
+
+    def emit(self, event: str, **fields: object) -> None:
+        data = (json.dumps({"event": event, **fields}, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is None:
+                return
+            try:
+                os.write(self._fd, data)
+            except OSError:
+                # Parent went away; readiness is best effort.
+                self._close_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+
+class ReadyPipe:
+    """Parent side: create before spawning, pass `child_fd` via pass_fds."""
+
+    def __init__(self) -> None:
+        self._read_fd, self.child_fd = os.pipe()
+        self._buf = b""
+        self._seen: Dict[str, Dict[str, object]] = {}
+        self._eof = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supported() -> bool:
+        return os.name == "posix"
+
+    def child_started(self) -> None:
+        """Close our copy of the write end so EOF means the child is gone."""
+
+        if self.child_fd >= 0:
+            os.close(self.child_fd)
+            self.child_fd = -1
+
+    def wait(
+        self,
+        events: Iterable[str],
+        timeout: float,
+        *,
+        alive: Optional[Callable[[], bool]] = None,
+    ) -> Optional[Dict[str, object]]:
+        """Return the first of `events` (or "failed") the child reports.
+
+        End-of-file is reported as {"event": "failed", "reason": "exited"};
+        None means nothing arrived within `timeout`. Events already read by an
+        earlier wait are returned immediately.
+        """
+
+        wanted = set(events) | {"failed"}
+        deadline = time.monotonic() + timeout
+        while True:
+            # The lock is held for one short select at a time so close() from
+            # another thread is not blocked for the whole wait.
+            with self._lock:
+                for name in ("failed", *sorted(wanted)):
+                    if name in self._seen:
+                        return self._seen[name]
+                if self._eof:
+                    return {"event": "failed", "reason": "exited"}
+                if self._read_fd < 0:
+                    return {"event": "failed", "reason": "closed"}
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                exited = alive is not None and not alive()
+                readable, _, _ = select.select([self._read_fd], [], [], 0.0 if exited else min(remaining, 0.2))
+                if readable:
+                    self._read_locked()
+                elif exited:
+                    self._eof = True
+
+    def close(self) -> None:
+        with self._lock:
+            for fd in (self._read_fd, self.child_fd):
+                if fd >= 0:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+            self._read_fd = self.child_fd = -1
+
+    def _read_locked(self) -> None:
+        chunk = os.read(self._read_fd, 65536)
+        if not chunk:
+            self._eof = True
+            return
+        self._buf += chunk
+        while b"\n" in self._buf:
+            line, self._buf = self._buf.split(b"\n", 1)
+            try:
+                msg = json.loads(line.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            if isinstance(msg, dict) and isinstance(msg.get("event"), str):
+                self._seen.setdefault(msg["event"], msg)
@@ -0,0 +1,114 @@
+"""
+Resumed (abbreviated) rekeys for same-suite key rotation.
+
+A full rekey runs the complete handshake: a PQ signature, a KEM keygen,
+encapsulation and a fresh TCP connection. When a rekey only needs to rotate
+the traffic keys and the suite stays the same, both proxies can instead
+derive the next session from a resumption secret of the current one:
+
+  resumption_secret = HKDF(key_d2g || key_g2d, info=session_id|suite)
+  next keys         = HKDF(resumption_secret, salt=nonce_drone || nonce_gcs)
+
+The two 16-byte nonces are exchanged in the prepare_rekey / prepare_ok
+messages of the in-band control channel (packet type 0x02, encrypted under the
+current session; see core.policy_engine). Every resumed session exports its
+own resumption secret, so secrets chain forward and the old keys cannot be
+recomputed from the new ones.
+
+A resumed rekey adds no fresh KEM entropy. At most REKEY_RESUME_MAX resumed
+rekeys are allowed in a row; after that (or on a suite change) the rekey is a
+full handshake again, which resets the count.
+
+Resumption is opt-in: REKEY_RESUME_MAX defaults to 0 (every rekey is a full
+handshake). Set it to a positive limit on both the drone and the GCS, in
+CONFIG or via the REKEY_RESUME_MAX environment variable, to enable it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+NONCE_BYTES = 16
+
+_SECRET_SALT = b"pq-drone-gcs|resumption|v1"
+
+
+def _hkdf(ikm: bytes, *, salt: bytes, info: bytes, length: int) -> bytes:
+    return HKDF(algorithm=hashes.SHA256(), length=length, salt=salt, info=info).derive(ikm)
+
+
+class ResumptionState:
+    """Resumption secret of the installed session; thread-safe."""
+
+    def __init__(self, max_resumes: int) -> None:
+        self._max = max(0, int(max_resumes))
+        self._lock = threading.Lock()
+        self._secret: Optional[bytes] = None
+        self._suite_id: Optional[str] = None
+        self._chain = 0
+
+    def install(
+        self,
+        suite_id: str,
+        session_id: bytes,
+        key_d2g: bytes,
+        key_g2d: bytes,
+        *,
+        resumed: bool = False,
+    ) -> None:
+        """Export the resumption secret of a newly installed session."""
+
+        secret = _hkdf(
+            key_d2g + key_g2d,
+            salt=_SECRET_SALT,
+            info=b"secret|" + session_id + b"|" + suite_id.encode("utf-8"),
+            length=32,
+        )
+        with self._lock:
+            self._secret = secret
+            self._suite_id = suite_id
+            self._chain = self._chain + 1 if resumed else 0
+
+    def can_resume(self, suite_id: str) -> bool:
+        with self._lock:
+            return self._secret is not None and self._suite_id == suite_id and self._chain < self._max
+
+    def derive(
+        self,
+        suite_id: str,
+        nonce_drone: bytes,
+        nonce_gcs: bytes,
+    ) -> Tuple[bytes, bytes, bytes, Dict[str, object]]:
+        """Return (key_d2g, key_g2d, session_id, metrics) of the resumed session."""
+
+        if len(nonce_drone) != NONCE_BYTES or len(nonce_gcs) != NONCE_BYTES:
+            raise ValueError("resumption nonces must be 16 bytes")
+        wall_start = time.time_ns()
+        perf_start = time.perf_counter_ns()
+        with self._lock:
+            if not (self._secret is not None and self._suite_id == suite_id):
+                raise RuntimeError("no resumption secret for this suite")
+            secret = self._secret
+            chain = self._chain
+        okm = _hkdf(
+            secret,
+            salt=nonce_drone + nonce_gcs,
+            info=b"keys|" + suite_id.encode("utf-8"),
+            length=72,
+        )
+        elapsed_ns = time.perf_counter_ns() - perf_start
+        metrics: Dict[str, object] = {
+            "rekey_mode": "resume",
+            "suite_id": suite_id,
+            "resume_chain": chain + 1,
+            "handshake_wall_start_ns": wall_start,
+            "handshake_wall_end_ns": time.time_ns(),
+            "handshake_total_ns": elapsed_ns,
+            "rekey_ms": elapsed_ns / 1_000_000.0,
+        }
+        return okm[:32], okm[32:64], okm[64:72], metrics
@@ -20,7 +20,9 @@ import threading
 from pathlib import Path
 from typing import Callable, Dict, Optional
 
+from core import sig_cache
 from core.config import CONFIG
+from core.readiness import ReadySignal
 from core.suites import DEFAULT_SUITE_ID, get_suite, build_suite_id
 from core.logging_utils import get_logger, configure_file_logger
 
@@ -235,11 +237,18 @@ def _require_signature_class():
     return Signature
 
 
-def _require_run_proxy():
-    """Import run_proxy only when needed, surfacing helpful guidance on failure."""
+def _require_run_proxy(engine: Optional[str] = None):
+    """Import the proxy runner only when needed, surfacing helpful guidance on failure.
 
+    `engine` is "selectors" or "asyncio"; None uses CONFIG["PROXY_ENGINE"].
+    """
+
+    engine = engine or CONFIG.get("PROXY_ENGINE", "selectors")
     try:
-        from core.async_proxy import run_proxy as _run_proxy  # type: ignore
+        if engine == "asyncio":
+            from core.asyncio_proxy import run_proxy_asyncio as _run_proxy  # type: ignore
+        else:
+            from core.async_proxy import run_proxy as _run_proxy  # type: ignore
     except ModuleNotFoundError as exc:  # pragma: no cover - exercised via CLI
         if exc.name in {"oqs", "oqs.oqs"}:
             print(
@@ -351,12 +360,12 @@ def _build_matrix_public_loader(
     initial_public: Optional[bytes],
     matrix_dir: Optional[Path] = None,
 ) -> Callable[[Dict[str, object]], bytes]:
-    """Return loader that fetches per-suite GCS signing public keys from disk."""
+    """Return loader that fetches per-suite GCS signing public keys from disk.
 
-    lock = threading.Lock()
-    cache: Dict[str, bytes] = {}
-    if suite_id and initial_public is not None:
-        cache[suite_id] = initial_public
+    Reads go through core.sig_cache.public_keys, so a key is only re-read when
+    its file's mtime or size changes. A key given without a file (hex on the
+    command line) is served as-is for the initial suite.
+    """
 
     matrix_public_dir = matrix_dir or Path("secrets/matrix")
 
@@ -365,38 +374,37 @@ def _build_matrix_public_loader(
         if not target_suite_id:
             raise RuntimeError("Suite dictionary missing suite_id")
 
-        with lock:
-            cached = cache.get(target_suite_id)
-            if cached is not None:
-                return cached
+        is_initial = bool(suite_id) and target_suite_id == suite_id
+        if is_initial and default_public_path is None and initial_public is not None:
+            return initial_public
 
         candidates = []
-        if default_public_path and suite_id and target_suite_id == suite_id:
+        if default_public_path and is_initial:
             candidates.append(default_public_path)
         candidates.append(matrix_public_dir / target_suite_id / "gcs_signing.pub")
 
-        seen: Dict[str, None] = {}
         for candidate in candidates:
-            candidate_path = candidate.expanduser()
-            key = str(candidate_path.resolve()) if candidate_path.exists() else str(candidate_path)
-            if key in seen:
-                continue
-            seen[key] = None
-            if not candidate_path.exists():
-                continue
             try:
-                public_bytes = candidate_path.read_bytes()
-            except Exception as exc:
-                raise RuntimeError(f"Failed to read GCS public key {candidate_path}: {exc}") from exc
-            with lock:
-                cache[target_suite_id] = public_bytes
-            return public_bytes
+                return sig_cache.public_keys.read(candidate)
+            except FileNotFoundError:
+                continue
+            except OSError as exc:
+                raise RuntimeError(f"Failed to read GCS public key {candidate}: {exc}") from exc
 
         raise FileNotFoundError(f"No GCS signing public key found for suite {target_suite_id}")
 
     return load_public_for_suite
 
 
+def _readiness_kwargs(args) -> Dict[str, object]:
+    """Proxy-runner hooks that report progress on the --ready-fd channel."""
+
+    ready = getattr(args, "ready_signal", None)
+    if ready is None:
+        return {}
+    return {"ready_event": ready, "on_status": ready.status}
+
+
 def signal_handler(signum, frame):
     """Handle interrupt signals gracefully."""
     print("\nReceived interrupt signal. Shutting down...")
@@ -542,7 +550,7 @@ def gcs_command(args):
     suite_id = suite["suite_id"]
     
     Signature = _require_signature_class()
-    proxy_runner = _require_run_proxy()
+    proxy_runner = _require_run_proxy(getattr(args, "engine", None))
 
     gcs_sig_secret = None
     gcs_sig_public = None
@@ -688,7 +696,9 @@ def gcs_command(args):
             manual_control=getattr(args, "control_manual", False),
             quiet=quiet,
             status_file=status_file,
+            status_shm=getattr(args, "status_shm", None),
             load_gcs_secret=load_secret_for_suite,
+            **_readiness_kwargs(args),
         )
 
         _augment_part_b_metrics(counters)
@@ -713,6 +723,8 @@ def gcs_command(args):
             print("\nGCS proxy stopped by user.")
     except Exception as e:
         print(f"Error: {e}")
+        if getattr(args, "ready_signal", None) is not None:
+            args.ready_signal.failed(f"{type(e).__name__}: {e}")
         sys.exit(1)
 
 
@@ -721,7 +733,7 @@ def drone_command(args):
     suite = _resolve_suite(args, "Drone proxy")
     suite_id = suite["suite_id"]
     
-    proxy_runner = _require_run_proxy()
+    proxy_runner = _require_run_proxy(getattr(args, "engine", None))
 
     # Get GCS public key
     gcs_sig_public = None
@@ -739,7 +751,7 @@ def drone_command(args):
             pub_path = Path(args.peer_pubkey_file)
             if not pub_path.exists():
                 raise FileNotFoundError(f"Public key file not found: {pub_path}")
-            gcs_sig_public = pub_path.read_bytes()
+            gcs_sig_public = sig_cache.public_keys.read(pub_path)
             primary_public_path = pub_path
         elif args.gcs_pub_hex:
             gcs_sig_public = bytes.fromhex(args.gcs_pub_hex)
@@ -747,7 +759,7 @@ def drone_command(args):
             # Try default location
             default_pub = Path("secrets/gcs_signing.pub")
             if default_pub.exists():
-                gcs_sig_public = default_pub.read_bytes()
+                gcs_sig_public = sig_cache.public_keys.read(default_pub)
                 info(f"Using GCS public key from: {default_pub}")
                 primary_public_path = default_pub
             else:
@@ -773,7 +785,25 @@ def drone_command(args):
             default_public_path=primary_public_path,
             initial_public=gcs_sig_public,
         )
-        
+
+        # Load the public keys and verifiers of the active suite and the
+        # configured SIG_PREWARM_SUITES up front; start-up cost stays
+        # independent of the matrix size.
+        prewarm_start = time.perf_counter_ns()
+        sig_cache.verifiers.prewarm([suite["sig_name"]])
+        prewarmed = sig_cache.prewarm_matrix(
+            Path("secrets/matrix"),
+            [suite_id] + [s for s in CONFIG.get("SIG_PREWARM_SUITES") or [] if s != suite_id],
+        )
+        logger.info(
+            "Prewarmed signature verifiers",
+            extra={
+                "suites": prewarmed,
+                "algorithms": sig_cache.verifiers.stats()["algorithms"],
+                "elapsed": _format_duration_ns(time.perf_counter_ns() - prewarm_start),
+            },
+        )
+
         counters = proxy_runner(
             role="drone",
             suite=suite,
@@ -784,7 +814,9 @@ def drone_command(args):
             manual_control=getattr(args, "control_manual", False),
             quiet=quiet,
             status_file=status_file,
+            status_shm=getattr(args, "status_shm", None),
             load_gcs_public=load_public_for_suite,
+            **_readiness_kwargs(args),
         )
         
         _augment_part_b_metrics(counters)
@@ -809,6 +841,8 @@ def drone_command(args):
             print("\nDrone proxy stopped by user.")
     except Exception as e:
         print(f"Error: {e}")
+        if getattr(args, "ready_signal", None) is not None:
+            args.ready_signal.failed(f"{type(e).__name__}: {e}")
         sys.exit(1)
 
 
@@ -852,10 +886,16 @@ def main():
                            help="Suppress informational prints (warnings/errors still shown)")
     gcs_parser.add_argument("--json-out",
                            help="Optional path to write counters JSON on shutdown")
+    gcs_parser.add_argument("--engine", choices=("selectors", "asyncio"),
+                            help="Datapath engine (default: CONFIG PROXY_ENGINE)")
     gcs_parser.add_argument("--control-manual", action="store_true",
                            help="Enable interactive manual in-band rekey control thread")
     gcs_parser.add_argument("--status-file",
                            help="Path to write proxy status JSON updates (handshake/rekey)")
+    gcs_parser.add_argument("--status-shm",
+                           help="Shared-memory counters segment for high-rate reads (see core.counter_shm)")
+    gcs_parser.add_argument("--ready-fd", type=int,
+                           help="Inherited pipe fd for readiness events (see core.readiness)")
     
     # drone subcommand
     drone_parser = subparsers.add_parser('drone', help='Start drone proxy')
@@ -878,6 +918,12 @@ def main():
                               help="Optional path to write counters JSON on shutdown")
     drone_parser.add_argument("--status-file",
                               help="Path to write proxy status JSON updates (handshake/rekey)")
+    drone_parser.add_argument("--status-shm",
+                              help="Shared-memory counters segment for high-rate reads (see core.counter_shm)")
+    drone_parser.add_argument("--ready-fd", type=int,
+                              help="Inherited pipe fd for readiness events (see core.readiness)")
+    drone_parser.add_argument("--engine", choices=("selectors", "asyncio"),
+                              help="Datapath engine (default: CONFIG PROXY_ENGINE)")
     drone_parser.add_argument("--control-manual", action="store_true",
                               help="Enable interactive manual in-band rekey control thread")
     
@@ -900,17 +946,28 @@ def main():
         print(f"Error: CONFIG missing required keys: {', '.join(missing_keys)}")
         sys.exit(1)
     
+    ready_fd = getattr(args, "ready_fd", None)
+    args.ready_signal = ReadySignal(ready_fd) if ready_fd is not None else None
+
     # Route to appropriate command handler
-    if args.command == 'init-identity':
-        init_identity_command(args)
-    elif args.command == 'gcs':
-        if getattr(args, "quiet", False):
-            logger.setLevel(logging.WARNING)
-        gcs_command(args)
-    elif args.command == 'drone':
-        if getattr(args, "quiet", False):
-            logger.setLevel(logging.WARNING)
-        drone_command(args)
+    try:
+        if args.command == 'init-identity':
+            init_identity_command(args)
+        elif args.command == 'gcs':
+            if getattr(args, "quiet", False):
+                logger.setLevel(logging.WARNING)
+            gcs_command(args)
+        elif args.command == 'drone':
+            if getattr(args, "quiet", False):
+                logger.setLevel(logging.WARNING)
+            drone_command(args)
+    except SystemExit as exc:
+        if args.ready_signal is not None and exc.code not in (0, None):
+            args.ready_signal.failed(f"exit:{exc.code}")
+        raise
+    finally:
+        if args.ready_signal is not None:
+            args.ready_signal.close()
 
 
 if __name__ == "__main__":
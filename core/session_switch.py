@@ -0,0 +1,152 @@
+"""
+Make-before-break session cut-over for one proxy datapath.
+
+A rekey used to replace the Sender and Receiver in one step. Packets still in
+flight under the old session were then dropped as drop_session_epoch, and so
+were packets the peer had already sent under the new session before our swap.
+A SessionSwitch splits the cut-over instead:
+
+- ``install`` activates the new Receiver at once and keeps the previous one
+  for a grace period (REKEY_GRACE_S). Each inbound packet goes to whichever
+  Receiver matches the session_id in its header.
+- Outbound traffic stays on the previous Sender until the peer confirms it
+  can decrypt the new session, either by reporting the rekey ``rid`` as done
+  (its control-plane status message) or by sending us a packet that the new
+  Receiver authenticates. If neither arrives within half the grace period,
+  the switch happens anyway, still well inside the peer's own grace period.
+  A second ``install`` before that promotes the pending Sender first.
+
+The switch also measures the cut-over. The blackout is the longest gap
+between delivered inbound packets, from the last delivery before ``install``
+to the first delivery under the new session. The previous Receiver's share of
+deliveries is counted too.
+
+Not thread-safe: the owner serialises all calls. That is context_lock in the
+selectors engine, the event loop in the asyncio engine, and the worker loop
+in sharded workers.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from core.aead import SESSION_ID_OFFSET
+
+_SESSION_ID_END = SESSION_ID_OFFSET + 8
+
+
+class SessionSwitch:
+    """Current Sender/Receiver pair plus the state of an in-progress cut-over."""
+
+    def __init__(self, sender, receiver) -> None:
+        self.sender = sender
+        self.receiver = receiver
+        self.prev_receiver = None
+        self.prev_until = 0.0
+        self.pending_sender = None
+        self.pending_until = 0.0
+        self.pending_rid: Optional[str] = None
+        # Peer confirmations that arrived before our own install.
+        self._early_confirms: Deque[str] = deque(maxlen=8)
+        # Cut-over metrics of the latest install.
+        self.generation = 0
+        self.prev_rx = 0
+        self.blackout_ms: Optional[float] = None
+        self.switch_ms: Optional[float] = None
+        self.switch_reason: Optional[str] = None
+        self._install_mono: Optional[float] = None
+        self._last_rx_mono: Optional[float] = None
+        self._gap_max_s = 0.0
+        self._measuring = False
+
+    def install(self, sender, receiver, grace_s: float, rid: Optional[str] = None) -> None:
+        """Start receiving on `receiver` now; send on `sender` once confirmed."""
+
+        if self.pending_sender is not None:
+            # Back-to-back rekey: the peer keeps only the session we are
+            # replacing as its previous receiver, so that is the oldest one
+            # we may still send on.
+            self._promote("superseded")
+        now = time.monotonic()
+        self.prev_receiver = self.receiver
+        self.prev_until = now + grace_s
+        self.receiver = receiver
+        self.generation += 1
+        self.prev_rx = 0
+        self.blackout_ms = None
+        self.switch_ms = None
+        self.switch_reason = None
+        self._install_mono = now
+        self._gap_max_s = 0.0
+        self._measuring = True
+        self.pending_sender = sender
+        self.pending_until = now + grace_s / 2.0
+        self.pending_rid = rid
+        if rid is not None and rid in self._early_confirms:
+            self._promote("peer_ack")
+
+    def current_sender(self):
+        """Sender for the next outbound packet."""
+
+        if self.pending_sender is not None and time.monotonic() >= self.pending_until:
+            self._promote("timeout")
+        return self.sender
+
+    def receiver_for(self, wire):
+        """Receiver whose session matches the header of `wire`."""
+
+        prev = self.prev_receiver
+        if prev is not None and wire[SESSION_ID_OFFSET:_SESSION_ID_END] == prev.session_id:
+            if time.monotonic() < self.prev_until:
+                return prev
+            self.prev_receiver = None
+            if self._measuring:
+                self._finish_measurement()
+        return self.receiver
+
+    def delivered(self, receiver) -> None:
+        """Record a packet that `receiver` (from `receiver_for`) authenticated."""
+
+        now = time.monotonic()
+        if self._measuring:
+            if self._last_rx_mono is not None and now - self._last_rx_mono > self._gap_max_s:
+                self._gap_max_s = now - self._last_rx_mono
+            if receiver is self.receiver:
+                self._finish_measurement()
+                if self.pending_sender is not None:
+                    # The peer is sending on the new session, so it has the keys.
+                    self._promote("peer_traffic")
+        if receiver is not self.receiver:
+            self.prev_rx += 1
+        self._last_rx_mono = now
+
+    def confirm(self, rid: str) -> None:
+        """Peer reports it installed the session negotiated under `rid`."""
+
+        if self.pending_sender is not None and self.pending_rid in (None, rid):
+            self._promote("peer_ack")
+        elif rid not in self._early_confirms:
+            self._early_confirms.append(rid)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "generation": self.generation,
+            "prev_rx": self.prev_rx,
+            "blackout_ms": self.blackout_ms,
+            "switch_ms": self.switch_ms,
+            "switch_reason": self.switch_reason,
+        }
+
+    def _finish_measurement(self) -> None:
+        self._measuring = False
+        self.blackout_ms = round(self._gap_max_s * 1000.0, 3)
+
+    def _promote(self, reason: str) -> None:
+        self.sender = self.pending_sender
+        self.pending_sender = None
+        self.pending_rid = None
+        if self._install_mono is not None:
+            self.switch_ms = round((time.monotonic() - self._install_mono) * 1000.0, 3)
+        self.switch_reason = reason
@@ -0,0 +1,584 @@
+"""
+Multi-core sharded datapath for the proxy (PROXY_WORKERS > 1).
+
+The proxy process keeps the handshake, the control plane and lane 0 of the
+datapath. Every additional worker is a separate process (the AEAD backends do
+not release the GIL, so threads would not scale) that binds its own
+SO_REUSEPORT encrypted and plaintext sockets on the proxy's ports and forwards
+packets independently.
+
+Sequence lanes
+    Worker i encrypts with ``Sender(lane=i)``: the top byte of its 64-bit
+    sequence number is i, so workers sharing the session key can never reuse
+    a nonce and never coordinate per packet. ``Receiver`` keeps one replay
+    window per lane, so it stays exact whatever mix of lanes it is handed.
+
+Steering
+    A classic BPF program on the encrypted reuseport group selects the
+    receiving socket from the lane byte of the wire header (lane % workers).
+    Each peer lane therefore always lands in the same process, which is what
+    keeps replay protection exact; if the program cannot be attached,
+    ``ShardPool.start`` fails and the proxy runs a single datapath. Plaintext
+    sockets keep the kernel's 4-tuple hash: one app flow stays on one worker
+    and keeps its ordering, and separate flows spread across workers.
+
+Rekeys
+    ``ShardPool.stage`` ships the new keys to every worker, which builds its
+    Sender/Receiver without using them and acknowledges. Only when all
+    workers have acknowledged does ``commit`` install them, so the cut-over is
+    one small message per worker instead of a handshake-sized window. Like
+    lane 0, each worker then receives on both sessions and moves its send
+    side on ``confirm`` (the peer reported the rekey done), on its first
+    packet under the new session, or on timeout (core.session_switch).
+
+Worker loss
+    If a worker dies, its sockets leave the reuseport group: the group
+    shrinks and reorders, so the steering index (or the kernel hash) sends
+    that lane to a process whose replay window never saw it, and captured
+    packets would be accepted again. The pool therefore fails closed: it
+    stops every worker, detaches the steering program and raises
+    ShardWorkerLost, which takes the proxy down. A fresh handshake gives the
+    restarted proxy new keys.
+
+Workers are started with the "spawn" method, so scripts that call run_proxy
+with PROXY_WORKERS > 1 must guard their entry point with
+``if __name__ == "__main__"``. Linux only (SO_REUSEPORT + reuseport BPF).
+"""
+
+from __future__ import annotations
+
+import ctypes
+import multiprocessing
+import selectors
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.aead import SEQ_LANE_OFFSET, AeadIds
+from core.async_proxy import ProxyCounters, _build_sender_receiver, _setup_sockets
+from core.exceptions import SequenceOverflow
+from core.logging_utils import get_logger
+from core.session_switch import SessionSwitch
+
+logger = get_logger("pqc")
+
+SO_ATTACH_REUSEPORT_CBPF = getattr(socket, "SO_ATTACH_REUSEPORT_CBPF", 51)
+SO_DETACH_REUSEPORT_BPF = getattr(socket, "SO_DETACH_REUSEPORT_BPF", 68)
+
+# Classic BPF opcodes used by the steering program.
+_BPF_LD_B_ABS = 0x30   # A = pkt[k] (byte)
+_BPF_ALU_MOD_K = 0x94  # A %= k
+_BPF_RET_A = 0x16      # return A
+
+_STATS_INTERVAL_S = 0.5
+_START_TIMEOUT_S = 20.0
+_STOP_TIMEOUT_S = 3.0
+
+_DROP_FIELDS = {
+    "auth": "drop_auth",
+    "header": "drop_header",
+    "replay": "drop_replay",
+    "session": "drop_session_epoch",
+}
+
+
+class _SockFilter(ctypes.Structure):
+    _fields_ = [
+        ("code", ctypes.c_ushort),
+        ("jt", ctypes.c_ubyte),
+        ("jf", ctypes.c_ubyte),
+        ("k", ctypes.c_uint32),
+    ]
+
+
+class _SockFprog(ctypes.Structure):
+    _fields_ = [
+        ("len", ctypes.c_ushort),
+        ("filter", ctypes.POINTER(_SockFilter)),
+    ]
+
+
+def sharding_available() -> bool:
+    """Return True when this platform can run a sharded datapath."""
+
+    return sys.platform.startswith("linux") and hasattr(socket, "SO_REUSEPORT")
+
+
+def attach_lane_steering(sock: socket.socket, workers: int) -> None:
+    """Steer datagrams of `sock`'s reuseport group by sequence lane.
+
+    Reuseport programs see the UDP payload at offset 0, so the program loads
+    the lane byte of the wire header and returns ``lane % workers`` as the
+    socket index (sockets are indexed in the order they joined the group).
+    Datagrams shorter than the header select index 0, the proxy process.
+    """
+
+    program = (_SockFilter * 3)(
+        _SockFilter(_BPF_LD_B_ABS, 0, 0, SEQ_LANE_OFFSET),
+        _SockFilter(_BPF_ALU_MOD_K, 0, 0, workers),
+        _SockFilter(_BPF_RET_A, 0, 0, 0),
+    )
+    fprog = _SockFprog(len(program), program)
+    sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_REUSEPORT_CBPF, bytes(fprog))
+
+
+def detach_lane_steering(sock: socket.socket) -> None:
+    """Remove the steering program from `sock`'s reuseport group."""
+
+    sock.setsockopt(socket.SOL_SOCKET, SO_DETACH_REUSEPORT_BPF, 0)
+
+
+class ShardWorkerLost(RuntimeError):
+    """A shard worker died; the sharded datapath cannot continue safely."""
+
+
+@dataclass(frozen=True)
+class ShardContext:
+    """Session material a worker needs to build its Sender/Receiver."""
+
+    ids: AeadIds
+    session_id: bytes
+    k_d2g: bytes
+    k_g2d: bytes
+    aead_token: str
+    peer_addr: Tuple[str, int]
+    peer_match_strict: bool = True
+
+
+def _build_lane_crypto(role: str, cfg: dict, context: ShardContext, lane: int):
+    lane_cfg = dict(cfg)
+    lane_cfg["SUITE_AEAD_TOKEN"] = context.aead_token
+    return _build_sender_receiver(
+        role, context.ids, context.session_id, context.k_d2g, context.k_g2d, lane_cfg, lane=lane
+    )
+
+
+def _stats_payload(counters: ProxyCounters, session: SessionSwitch) -> Dict[str, object]:
+    dp = counters.datapath
+    fields, primitives, batches = dp.snapshot()
+    return {
+        "fields": fields,
+        "primitives": primitives,
+        "batches": batches,
+        "last_packet_mono": dp.last_packet_mono,
+        "switch": session.stats(),
+    }
+
+
+def _worker_main(index: int, conn, role: str, cfg: dict, context: ShardContext, app_peer_addr) -> None:
+    """Entry point of worker process `index` (lane `index`)."""
+
+    try:
+        with _setup_sockets(role, cfg, encrypted_peer=context.peer_addr, reuseport=True) as sockets:
+            conn.send(("bound", index))
+            _worker_loop(index, conn, role, cfg, context, sockets, app_peer_addr)
+    except (KeyboardInterrupt, EOFError, BrokenPipeError):
+        pass
+    except Exception as exc:
+        logger.warning("Shard worker failed", extra={"role": role, "worker": index, "error": str(exc)})
+        try:
+            conn.send(("error", index, str(exc)))
+        except Exception:
+            pass
+    finally:
+        conn.close()
+
+
+def _worker_loop(index: int, conn, role: str, cfg: dict, context: ShardContext, sockets, app_peer_addr) -> None:
+    counters = ProxyCounters()
+    dp = counters.datapath
+    session = SessionSwitch(*_build_lane_crypto(role, cfg, context, index))
+    expected_peer = context.peer_addr
+    strict_match = context.peer_match_strict
+    encrypted_peer = sockets["encrypted_peer"]
+    staged: Optional[Tuple[int, object, object, ShardContext]] = None
+    exhausted_reported = False
+    packet_type = bool(cfg.get("ENABLE_PACKET_TYPE"))
+    enc_sock = sockets["encrypted"]
+    ptx_sock = sockets["plaintext_in"]
+    ptx_out = sockets["plaintext_out"]
+
+    selector = selectors.DefaultSelector()
+    selector.register(enc_sock, selectors.EVENT_READ, data="encrypted")
+    selector.register(ptx_sock, selectors.EVENT_READ, data="plaintext_in")
+    selector.register(conn, selectors.EVENT_READ, data="pipe")
+    next_stats = time.monotonic() + _STATS_INTERVAL_S
+    running = True
+    try:
+        while running:
+            for key, _mask in selector.select(timeout=0.1):
+                data_type = key.data
+                if data_type == "pipe":
+                    msg = conn.recv()
+                    kind = msg[0]
+                    if kind == "stage":
+                        _kind, generation, new_context = msg
+                        try:
+                            new_sender, new_receiver = _build_lane_crypto(role, cfg, new_context, index)
+                        except Exception as exc:
+                            conn.send(("stage_failed", index, generation, str(exc)))
+                            continue
+                        staged = (generation, new_sender, new_receiver, new_context)
+                        conn.send(("staged", index, generation))
+                    elif kind == "commit":
+                        _kind, generation, grace_s, rid = msg
+                        if staged is not None and staged[0] == generation:
+                            _gen, new_sender, new_receiver, new_context = staged
+                            session.install(new_sender, new_receiver, grace_s, rid)
+                            exhausted_reported = False
+                            expected_peer = new_context.peer_addr
+                            strict_match = new_context.peer_match_strict
+                            encrypted_peer = new_context.peer_addr
+                            staged = None
+                    elif kind == "confirm":
+                        session.confirm(msg[1])
+                    elif kind == "app_peer":
+                        app_peer_addr = msg[1]
+                    elif kind == "stop":
+                        running = False
+                    continue
+
+                if data_type == "plaintext_in":
+                    try:
+                        payload, addr = ptx_sock.recvfrom(16384)
+                    except socket.error:
+                        continue
+                    if not payload:
+                        continue
+                    if addr != app_peer_addr:
+                        app_peer_addr = addr
+                        conn.send(("app_peer", index, addr))
+                    dp.ptx_in += 1
+                    dp.ptx_bytes_in += len(payload)
+                    dp.touch()
+                    frame = (b"\x01" + payload) if packet_type else payload
+                    start_ns = time.perf_counter_ns()
+                    try:
+                        wire = session.current_sender().encrypt(frame)
+                    except SequenceOverflow:
+                        # Out of lane sequence space: the proxy process owns
+                        # the control plane, so ask it (once) for a rekey.
+                        dp.drops += 1
+                        dp.drop_other += 1
+                        if not exhausted_reported:
+                            conn.send(("seq_exhausted", index))
+                            exhausted_reported = True
+                        continue
+                    except Exception as exc:
+                        dp.drops += 1
+                        dp.drop_other += 1
+                        logger.warning(
+                            "Shard encrypt failed",
+                            extra={"role": role, "worker": index, "error": str(exc)},
+                        )
+                        continue
+                    dp.add_primitive("aead_encrypt", time.perf_counter_ns() - start_ns, len(frame), len(wire))
+                    try:
+                        enc_sock.sendto(wire, encrypted_peer)
+                    except socket.error:
+                        dp.drops += 1
+                        dp.drop_other += 1
+                        continue
+                    dp.enc_out += 1
+                    dp.enc_bytes_out += len(wire)
+                    continue
+
+                try:
+                    wire, addr = enc_sock.recvfrom(65535)
+                except socket.error:
+                    continue
+                if not wire:
+                    continue
+                if expected_peer is not None:
+                    if strict_match:
+                        mismatch = addr[0] != expected_peer[0] or addr[1] != expected_peer[1]
+                    else:
+                        mismatch = addr[0] != expected_peer[0]
+                    if mismatch:
+                        dp.drops += 1
+                        dp.drop_src_addr += 1
+                        continue
+                dp.enc_in += 1
+                dp.enc_bytes_in += len(wire)
+                dp.touch()
+                receiver = session.receiver_for(wire)
+                start_ns = time.perf_counter_ns()
+                try:
+                    plaintext = receiver.decrypt(wire)
+                    reason = receiver.last_error_reason()
+                except ValueError:
+                    plaintext, reason = None, "header"
+                except Exception:
+                    plaintext, reason = None, "other"
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                if plaintext is None:
+                    dp.drops += 1
+                    field = _DROP_FIELDS.get(reason or "", "drop_other")
+                    setattr(dp, field, getattr(dp, field) + 1)
+                    dp.add_primitive("aead_decrypt_fail", elapsed_ns, len(wire), 0)
+                    continue
+                session.delivered(receiver)
+                dp.add_primitive("aead_decrypt_ok", elapsed_ns, len(wire), len(plaintext))
+                if packet_type and plaintext:
+                    ptype = plaintext[0]
+                    if ptype == 0x02:
+                        # Control plane lives in the proxy process.
+                        conn.send(("control", index, plaintext[1:]))
+                        continue
+                    if ptype != 0x01:
+                        dp.drops += 1
+                        dp.drop_other += 1
+                        continue
+                    plaintext = plaintext[1:]
+                try:
+                    ptx_out.sendto(plaintext, app_peer_addr)
+                except socket.error:
+                    dp.drops += 1
+                    dp.drop_other += 1
+                    continue
+                dp.ptx_out += 1
+                dp.ptx_bytes_out += len(plaintext)
+
+            now = time.monotonic()
+            if now >= next_stats:
+                conn.send(("stats", index, _stats_payload(counters, session)))
+                next_stats = now + _STATS_INTERVAL_S
+    finally:
+        selector.close()
+        try:
+            conn.send(("stopped", index, _stats_payload(counters, session)))
+        except Exception:
+            pass
+
+
+class ShardPool:
+    """Worker processes 1..workers-1 of a sharded datapath; the caller is lane 0.
+
+    All methods except `stage`/`commit`/`set_app_peer` must be called from the
+    proxy's selector thread, which owns the receiving end of the pipes.
+    """
+
+    def __init__(
+        self,
+        role: str,
+        cfg: dict,
+        context: ShardContext,
+        *,
+        workers: int,
+        app_peer_addr: Tuple[str, int],
+    ) -> None:
+        if workers < 2:
+            raise ValueError("ShardPool needs at least 2 workers")
+        self.role = role
+        self.cfg = dict(cfg)
+        self.workers = int(workers)
+        self._context = context
+        self._app_peer_addr = app_peer_addr
+        self._procs: Dict[int, multiprocessing.Process] = {}
+        self._conns: Dict[int, object] = {}
+        self._by_conn: Dict[object, int] = {}
+        self._send_locks: Dict[int, threading.Lock] = {}
+        self._generation = 0
+        self._acks: set = set()
+        self._ack_error: Optional[str] = None
+        self._ack_cond = threading.Condition()
+        self._encrypted_sock: Optional[socket.socket] = None
+        self.steering = False
+
+    @property
+    def connections(self) -> List[object]:
+        return list(self._conns.values())
+
+    def start(self, encrypted_sock: socket.socket) -> None:
+        """Spawn the workers one at a time, then attach lane steering.
+
+        Workers are started sequentially so their reuseport sockets join the
+        group (and get socket indexes) in lane order after `encrypted_sock`.
+        Raises (with every worker stopped) if a worker or steering fails.
+        """
+
+        mp = multiprocessing.get_context("spawn")
+        try:
+            for index in range(1, self.workers):
+                parent, child = mp.Pipe()
+                proc = mp.Process(
+                    target=_worker_main,
+                    args=(index, child, self.role, self.cfg, self._context, self._app_peer_addr),
+                    name=f"pqc-shard-{index}",
+                    daemon=True,
+                )
+                proc.start()
+                child.close()
+                self._procs[index] = proc
+                self._conns[index] = parent
+                self._by_conn[parent] = index
+                self._send_locks[index] = threading.Lock()
+                if not parent.poll(_START_TIMEOUT_S):
+                    raise RuntimeError(f"shard worker {index} did not start")
+                msg = parent.recv()
+                if msg[0] != "bound":
+                    raise RuntimeError(f"shard worker {index} failed: {msg[-1]}")
+        except Exception:
+            self.stop()
+            raise
+        self._encrypted_sock = encrypted_sock
+        try:
+            attach_lane_steering(encrypted_sock, self.workers)
+        except OSError as exc:
+            # Without steering the kernel hashes the source address, so a
+            # replay sent from another port (STRICT_UDP_PEER_MATCH off) can
+            # reach a worker whose lane window never saw the original.
+            self.stop()
+            raise RuntimeError(f"reuseport lane steering unavailable: {exc}") from exc
+        self.steering = True
+        logger.info(
+            "Sharded datapath started",
+            extra={"role": self.role, "workers": self.workers, "steering": self.steering},
+        )
+
+    def _send(self, index: int, msg: tuple) -> None:
+        with self._send_locks[index]:
+            self._conns[index].send(msg)
+
+    def receive(self, conn) -> List[Tuple[str, object]]:
+        """Read pending messages from one worker pipe.
+
+        Returns proxy-level events: ("control", body), ("app_peer", addr),
+        ("stats", (index, payload)) and ("seq_exhausted", index). If the
+        worker has gone away, stops the whole pool and raises ShardWorkerLost.
+        """
+
+        index = self._by_conn[conn]
+        events: List[Tuple[str, object]] = []
+        while True:
+            try:
+                if not conn.poll():
+                    break
+                msg = conn.recv()
+            except (EOFError, OSError):
+                self._fail_closed(index)
+            kind = msg[0]
+            if kind in ("stats", "stopped"):
+                events.append(("stats", (index, msg[2])))
+            elif kind == "control":
+                events.append(("control", msg[2]))
+            elif kind == "app_peer":
+                self.set_app_peer(msg[2], exclude=index)
+                events.append(("app_peer", msg[2]))
+            elif kind in ("staged", "stage_failed"):
+                with self._ack_cond:
+                    if msg[2] == self._generation:
+                        if kind == "staged":
+                            self._acks.add(index)
+                        else:
+                            self._ack_error = f"worker {index}: {msg[3]}"
+                        self._ack_cond.notify_all()
+            elif kind == "seq_exhausted":
+                events.append(("seq_exhausted", index))
+            elif kind == "error":
+                logger.warning(
+                    "Shard worker reported error",
+                    extra={"role": self.role, "worker": index, "error": msg[2]},
+                )
+        return events
+
+    def _fail_closed(self, index: int) -> None:
+        proc = self._procs.get(index)
+        exitcode = proc.exitcode if proc is not None else None
+        logger.error(
+            "Shard worker exited; stopping the sharded datapath",
+            extra={"role": self.role, "worker": index, "exitcode": exitcode},
+        )
+        # No graceful drain: the survivors may already be receiving lanes
+        # their replay windows have never seen.
+        for proc in self._procs.values():
+            if proc.is_alive():
+                proc.terminate()
+        self.stop(timeout=1.0)
+        raise ShardWorkerLost(f"shard worker {index} exited (exitcode={exitcode})")
+
+    def stage(self, context: ShardContext, timeout: float) -> None:
+        """Ship new session material to every worker and wait until all built it."""
+
+        with self._ack_cond:
+            self._generation += 1
+            generation = self._generation
+            self._acks = set()
+            self._ack_error = None
+        for index in self._conns:
+            self._send(index, ("stage", generation, context))
+        deadline = time.monotonic() + timeout
+        with self._ack_cond:
+            while len(self._acks) < len(self._conns) and self._ack_error is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError("shard workers did not stage the rekey in time")
+                self._ack_cond.wait(remaining)
+            if self._ack_error is not None:
+                raise RuntimeError(f"shard rekey staging failed ({self._ack_error})")
+        self._context = context
+
+    def commit(self, grace_s: float, rid: Optional[str]) -> None:
+        """Install the session staged by the last `stage` call in every worker."""
+
+        for index in self._conns:
+            self._send(index, ("commit", self._generation, grace_s, rid))
+
+    def confirm(self, rid: str) -> None:
+        """Let every worker send on the new session: the peer installed `rid`."""
+
+        for index in self._conns:
+            self._send(index, ("confirm", rid))
+
+    def set_app_peer(self, addr: Tuple[str, int], exclude: Optional[int] = None) -> None:
+        self._app_peer_addr = addr
+        for index in self._conns:
+            if index != exclude:
+                self._send(index, ("app_peer", addr))
+
+    def stop(self, timeout: float = _STOP_TIMEOUT_S) -> Dict[int, Dict[str, object]]:
+        """Stop all workers, detach steering and return final counter payloads by index."""
+
+        final: Dict[int, Dict[str, object]] = {}
+        if self.steering and self._encrypted_sock is not None:
+            try:
+                detach_lane_steering(self._encrypted_sock)
+            except OSError:
+                pass
+            self.steering = False
+        for index in list(self._conns):
+            try:
+                self._send(index, ("stop",))
+            except Exception:
+                pass
+        deadline = time.monotonic() + timeout
+        for index, conn in list(self._conns.items()):
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0 or not conn.poll(remaining):
+                        break
+                    msg = conn.recv()
+                except (EOFError, OSError):
+                    break
+                if msg[0] in ("stats", "stopped"):
+                    final[index] = msg[2]
+                if msg[0] == "stopped":
+                    break
+        for index, proc in list(self._procs.items()):
+            proc.join(timeout=max(deadline - time.monotonic(), 0.1))
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(timeout=1.0)
+        for conn in self._conns.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._procs.clear()
+        self._conns.clear()
+        self._by_conn.clear()
+        return final
@@ -0,0 +1,168 @@
+"""
+Process-wide cache of signature verifiers and GCS signing public keys.
+
+The drone verifies the GCS signature on every handshake and rekey. Without a
+cache each one constructs (and frees) an oqs.Signature for the suite's
+algorithm, and the rekey loader reads the suite's public key from disk.
+
+- `verifiers` keeps one Signature object per algorithm for the life of the
+  process. Each has its own lock: a verify only uses the public key passed in,
+  but the object is not documented as thread-safe.
+- `public_keys` caches public key bytes per path. An entry is reused as long
+  as the file's (mtime_ns, size) is unchanged, so a rotated key is picked up on
+  the next rekey without restarting the proxy.
+- `prewarm_matrix` fills both from `secrets/matrix/<suite>/gcs_signing.pub` at
+  start-up (the drone proxy passes its suite plus SIG_PREWARM_SUITES), so the
+  verify path does no file reads or object setup for those suites.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from core.logging_utils import get_logger
+from core.suites import get_suite
+
+logger = get_logger("pqc")
+
+
+def _oqs_signature(sig_name: str) -> object:
+    from core import handshake as _handshake
+
+    if _handshake.Signature is None:
+        raise RuntimeError("oqs-python not available (Signature missing)")
+    return _handshake.Signature(sig_name)
+
+
+class VerifierCache:
+    """One long-lived verifier object per signature algorithm."""
+
+    def __init__(self, factory: Callable[[str], object] = _oqs_signature) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[object, threading.Lock]] = {}
+        self._stats = {"hits": 0, "misses": 0}
+
+    def verify(
+        self,
+        sig_name: str,
+        message: bytes,
+        signature: bytes,
+        public_key: bytes,
+        *,
+        metrics: Optional[Dict[str, object]] = None,
+    ) -> bool:
+        """Verify with the cached object; records setup_ns/cached in `metrics`."""
+
+        with self._lock:
+            entry = self._entries.get(sig_name)
+        cached = entry is not None
+        if entry is None:
+            setup_start = time.perf_counter_ns()
+            entry = self._create(sig_name)
+            if metrics is not None:
+                metrics["verifier_setup_ns"] = time.perf_counter_ns() - setup_start
+        with self._lock:
+            self._stats["hits" if cached else "misses"] += 1
+        if metrics is not None:
+            metrics["verifier_cached"] = cached
+        verifier, verifier_lock = entry
+        with verifier_lock:
+            return bool(verifier.verify(message, signature, public_key))
+
+    def prewarm(self, sig_names: Iterable[str]) -> None:
+        for sig_name in sig_names:
+            with self._lock:
+                if sig_name in self._entries:
+                    continue
+            try:
+                self._create(sig_name)
+            except Exception as exc:
+                logger.debug("Verifier prewarm failed", extra={"sig_name": sig_name, "error": str(exc)})
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            stats: Dict[str, object] = dict(self._stats)
+            stats["algorithms"] = sorted(self._entries)
+        return stats
+
+    def _create(self, sig_name: str) -> Tuple[object, threading.Lock]:
+        verifier = self._factory(sig_name)
+        with self._lock:
+            # Another thread may have won the race; keep the first object.
+            entry = self._entries.setdefault(sig_name, (verifier, threading.Lock()))
+        if entry[0] is not verifier:
+            free = getattr(verifier, "free", None)
+            if callable(free):
+                try:
+                    free()
+                except Exception:
+                    pass
+        return entry
+
+
+class PublicKeyCache:
+    """Public key bytes per path, revalidated against the file's mtime and size."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[int, int, bytes]] = {}
+        self._stats = {"hits": 0, "reads": 0}
+
+    def read(self, path: Path) -> bytes:
+        """Return the file's bytes; raises FileNotFoundError like read_bytes()."""
+
+        key = os.fspath(Path(path).expanduser())
+        st = os.stat(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._stats["hits"] += 1
+                return entry[2]
+        data = Path(key).read_bytes()
+        with self._lock:
+            self._entries[key] = (st.st_mtime_ns, st.st_size, data)
+            self._stats["reads"] += 1
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+verifiers = VerifierCache()
+public_keys = PublicKeyCache()
+
+
+def prewarm_matrix(matrix_dir: Path, suite_ids: Optional[Iterable[str]] = None) -> int:
+    """Load public keys and verifiers for suites under `matrix_dir`; returns the count.
+
+    `suite_ids` limits the prewarm to those suites; by default every suite
+    directory with a gcs_signing.pub is loaded.
+    """
+
+    matrix_dir = Path(matrix_dir)
+    if suite_ids is None:
+        try:
+            suite_ids = sorted(p.name for p in matrix_dir.iterdir() if p.is_dir())
+        except OSError:
+            return 0
+    sig_names = set()
+    loaded = 0
+    for suite_id in suite_ids:
+        try:
+            suite = get_suite(suite_id)
+        except (KeyError, ValueError, NotImplementedError):
+            continue
+        try:
+            public_keys.read(matrix_dir / suite["suite_id"] / "gcs_signing.pub")
+        except OSError:
+            continue
+        sig_names.add(suite["sig_name"])
+        loaded += 1
+    verifiers.prewarm(sorted(sig_names))
+    return loaded
@@ -10,15 +10,23 @@ NIST Security Level Reference (per liboqs / FIPS 203/204/205):
 
 Note: ML-DSA-44 is claimed as L2 by liboqs (FIPS 204), but we map it to L1
 for practical pairing with L1 KEMs (ML-KEM-512, etc.).
+
+The suite registry is built on first use, not at import: importing this
+module only defines the static KEM/SIG/AEAD tables. Suites are immutable
+`Suite` records (a read-only dict with precomputed `header_ids` and
+`hkdf_info`), shared rather than copied, and indexed by KEM, signature, AEAD
+and NIST level.
 """
 
 from __future__ import annotations
 
+from functools import lru_cache
 from types import MappingProxyType
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from core.logging_utils import get_logger
 from core.config import CONFIG
 import os
+import threading
 
 _logger = get_logger("pqc")
 
@@ -28,6 +36,7 @@ _logger = get_logger("pqc")
 DEFAULT_SUITE_ID = "cs-mlkem768-aesgcm-mldsa65"
 
 
+@lru_cache(maxsize=1024)
 def _normalize_alias(value: str) -> str:
     """Normalize alias strings for case- and punctuation-insensitive matching."""
 
@@ -349,6 +358,7 @@ _AEAD_REGISTRY = {
 }
 
 
+@lru_cache(maxsize=1)
 def _probe_aead_support() -> Tuple[Tuple[str, ...], Dict[str, str]]:
     """Detect AEAD algorithm support available in the current runtime.
 
@@ -531,26 +541,20 @@ def _compose_suite(kem_key: str, aead_key: str, sig_key: str) -> Dict[str, objec
         "aead_token": aead_entry["token"],
     }
 
+def _ignored_from_env(name: str) -> set:
+    value = os.getenv(name, "").strip()
+    return {item.strip() for item in value.split(",") if item.strip()} if value else set()
+
+
 def _generate_level_consistent_matrix() -> Tuple[Tuple[str, str], ...]:
     """Generate matrix of (kem_key, sig_key) pairs sharing identical NIST level.
 
     This expands prior static matrix to all level-aligned combinations while
     preserving backward compatibility (legacy combos remain valid subset).
+    KEMs listed in SUITES_IGNORE_KEMS (comma-separated registry keys) are
+    left out.
     """
-    # Allow runtime ignore lists for KEMs/AEADs: keep registry entries,
-    # but avoid generating suites that include ignored primitives.
-    _DEFAULT_IGNORED_KEMS = ()
-
-    # Environment overrides (comma-separated keys matching registry keys)
-    ignored_kems_env = os.getenv("SUITES_IGNORE_KEMS", "").strip()
-    ignored_aeads_env = os.getenv("SUITES_IGNORE_AEADS", "").strip()
-
-    ignored_kems = set(_DEFAULT_IGNORED_KEMS)
-    ignored_aeads = set()
-    if ignored_kems_env:
-        ignored_kems.update(k.strip() for k in ignored_kems_env.split(",") if k.strip())
-    if ignored_aeads_env:
-        ignored_aeads.update(a.strip() for a in ignored_aeads_env.split(",") if a.strip())
+    ignored_kems = _ignored_from_env("SUITES_IGNORE_KEMS")
 
     pairs: list[Tuple[str, str]] = []
     for kem_key, kem_entry in _KEM_REGISTRY.items():
@@ -565,10 +569,106 @@ def _generate_level_consistent_matrix() -> Tuple[Tuple[str, str], ...]:
     pairs.sort(key=lambda t: (t[0], t[1]))
     return tuple(pairs)
 
-_SUITE_MATRIX: Tuple[Tuple[str, str], ...] = _generate_level_consistent_matrix()
 
 _AEAD_ORDER: Tuple[str, ...] = ("aesgcm", "chacha20poly1305", "ascon128a")
 
+
+class Suite(dict):
+    """Immutable suite record shared by every lookup.
+
+    A read-only dict (callers that need to modify one take `dict(suite)`)
+    with the wire header IDs and HKDF info bytes precomputed.
+    """
+
+    __slots__ = ("header_ids", "hkdf_info")
+
+    def __init__(self, fields: Dict[str, object]) -> None:
+        dict.__init__(self, fields)
+        self.header_ids: Tuple[int, int, int, int] = (
+            fields["kem_id"],
+            fields["kem_param_id"],
+            fields["sig_id"],
+            fields["sig_param_id"],
+        )
+        self.hkdf_info: bytes = str(fields["suite_id"]).encode("utf-8")
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Suite is immutable; use dict(suite) for a mutable copy")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def copy(self) -> Dict[str, object]:
+        return dict(self)
+
+    def __reduce__(self):
+        return (Suite, (dict(self),))
+
+
+class _SuiteRegistry:
+    """Suites plus their indexes, built once on first use."""
+
+    def __init__(self) -> None:
+        self.suites: MappingProxyType = MappingProxyType({})
+        self.by_kem: Dict[str, Tuple[Suite, ...]] = {}
+        self.by_sig: Dict[str, Tuple[Suite, ...]] = {}
+        self.by_aead: Dict[str, Tuple[Suite, ...]] = {}
+        self.by_level: Dict[str, Tuple[Suite, ...]] = {}
+        # get_suite() inputs (aliases included) -> Suite.
+        self.lookups: Dict[str, Suite] = {}
+
+    def build(self) -> "_SuiteRegistry":
+        ignored_aeads = _ignored_from_env("SUITES_IGNORE_AEADS")
+        suites: Dict[str, Suite] = {}
+        for kem_key, sig_key in _generate_level_consistent_matrix():
+            for aead_key in _AEAD_ORDER:
+                if aead_key in ignored_aeads:
+                    continue
+                suite = Suite(_compose_suite(kem_key, aead_key, sig_key))
+                suites[suite["suite_id"]] = suite
+        suites = _prune_suites_for_runtime(suites)
+
+        indexes: Dict[str, Dict[str, list]] = {"kem": {}, "sig": {}, "aead": {}, "level": {}}
+        for suite in suites.values():
+            indexes["kem"].setdefault(suite["kem_name"], []).append(suite)
+            indexes["sig"].setdefault(suite["sig_name"], []).append(suite)
+            indexes["aead"].setdefault(suite["aead_token"], []).append(suite)
+            indexes["level"].setdefault(suite["nist_level"], []).append(suite)
+        self.suites = MappingProxyType(suites)
+        self.by_kem = {key: tuple(items) for key, items in indexes["kem"].items()}
+        self.by_sig = {key: tuple(items) for key, items in indexes["sig"].items()}
+        self.by_aead = {key: tuple(items) for key, items in indexes["aead"].items()}
+        self.by_level = {key: tuple(items) for key, items in indexes["level"].items()}
+        self.lookups = dict(suites)
+        return self
+
+
+_registry: Optional[_SuiteRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def _get_registry() -> _SuiteRegistry:
+    registry = _registry
+    if registry is None:
+        registry = _build_registry()
+    return registry
+
+
+def _build_registry() -> _SuiteRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = _SuiteRegistry().build()
+        return _registry
+
+
+def __getattr__(name: str):
+    # SUITES is built on first access (PEP 562).
+    if name == "SUITES":
+        return _get_registry().suites
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def valid_nist_levels() -> Tuple[str, ...]:
     """Return distinct NIST security levels present in the registry."""
     levels = {entry["nist_level"] for entry in _KEM_REGISTRY.values()} | {entry["nist_level"] for entry in _SIG_REGISTRY.values()}
@@ -578,15 +678,11 @@ def valid_nist_levels() -> Tuple[str, ...]:
 def list_suites_for_level(level: str) -> Dict[str, Dict]:
     """List suites restricted to a single NIST level.
 
-    Raises ValueError if level is not present. Returns mapping of suite_id->suite dict copy.
+    Raises ValueError if level is not present. Returns mapping of suite_id->suite.
     """
     if level not in {e["nist_level"] for e in _KEM_REGISTRY.values()}:
         raise ValueError(f"unknown NIST level: {level}")
-    result: Dict[str, Dict] = {}
-    for sid, cfg in SUITES.items():
-        if cfg.get("nist_level") == level:
-            result[sid] = dict(cfg)
-    return result
+    return {suite["suite_id"]: suite for suite in _get_registry().by_level.get(level, ())}
 
 def filter_suites_by_levels(levels: Iterable[str]) -> Tuple[str, ...]:
     """Return tuple of suite_ids whose nist_level is in provided iterable.
@@ -598,7 +694,25 @@ def filter_suites_by_levels(levels: Iterable[str]) -> Tuple[str, ...]:
     if not level_set.issubset(known):
         unknown = level_set - known
         raise ValueError(f"unknown NIST levels requested: {sorted(unknown)}")
-    return tuple(sid for sid, cfg in SUITES.items() if cfg.get("nist_level") in level_set)
+    return tuple(sid for sid, cfg in _get_registry().suites.items() if cfg["nist_level"] in level_set)
+
+
+def suites_for_kem(kem: str) -> Tuple[Suite, ...]:
+    """Suites using the KEM `kem` (any alias), in registry order."""
+
+    return _get_registry().by_kem.get(_KEM_REGISTRY[_resolve_kem_key(kem)]["oqs_name"], ())
+
+
+def suites_for_sig(sig: str) -> Tuple[Suite, ...]:
+    """Suites using the signature `sig` (any alias), in registry order."""
+
+    return _get_registry().by_sig.get(_SIG_REGISTRY[_resolve_sig_key(sig)]["oqs_name"], ())
+
+
+def suites_for_aead(aead: str) -> Tuple[Suite, ...]:
+    """Suites using the AEAD `aead` (any alias), in registry order."""
+
+    return _get_registry().by_aead.get(_AEAD_REGISTRY[_resolve_aead_key(aead)]["token"], ())
 
 
 def _canonicalize_suite_id(suite_id: str) -> str:
@@ -626,54 +740,31 @@ def _canonicalize_suite_id(suite_id: str) -> str:
         raise ValueError(f"unknown suite_id: {suite_id}") from exc
 
 
-def _generate_suite_registry() -> MappingProxyType:
-    suites: Dict[str, MappingProxyType] = {}
-    for kem_key, sig_key in _SUITE_MATRIX:
-        if kem_key not in _KEM_REGISTRY:
-            raise ValueError(f"unknown KEM in suite matrix: {kem_key}")
-        if sig_key not in _SIG_REGISTRY:
-            raise ValueError(f"unknown signature in suite matrix: {sig_key}")
-        # Skip suites that use ignored AEAD tokens
-        # Resolve ignored AEADs from environment if provided (see _generate_level_consistent_matrix)
-        ignored_aeads_env = os.getenv("SUITES_IGNORE_AEADS", "").strip()
-        # Ignore list keeps optional AEADs out unless enabled.
-        ignored_aeads: set[str] = set()
-        if ignored_aeads_env:
-            ignored_aeads.update(a.strip() for a in ignored_aeads_env.split(",") if a.strip())
-
-        for aead_key in _AEAD_ORDER:
-            if aead_key in ignored_aeads:
-                continue
-            suite_dict = _compose_suite(kem_key, aead_key, sig_key)
-            suites[suite_dict["suite_id"]] = MappingProxyType(suite_dict)
-    return MappingProxyType(suites)
-
-
-SUITES = _generate_suite_registry()
+def list_suites() -> Dict[str, Suite]:
+    """Return all available suites (a new dict of the shared immutable records)."""
 
+    return dict(_get_registry().suites)
 
-def list_suites() -> Dict[str, Dict]:
-    """Return all available suites as immutable mapping."""
 
-    return {suite_id: dict(config) for suite_id, config in SUITES.items()}
+def get_suite(suite_id: str) -> Suite:
+    """Get suite configuration by ID, resolving legacy aliases and synonyms.
 
+    Returns the shared immutable Suite; use dict(suite) for a mutable copy.
+    """
 
-def get_suite(suite_id: str) -> Dict:
-    """Get suite configuration by ID, resolving legacy aliases and synonyms."""
+    registry = _get_registry()
+    suite = registry.lookups.get(suite_id)
+    if suite is not None:
+        return suite
 
     canonical_id = _canonicalize_suite_id(suite_id)
-
-    if canonical_id not in SUITES:
+    suite = registry.suites.get(canonical_id)
+    if suite is None:
         raise NotImplementedError(f"unknown suite_id: {suite_id}")
-
-    suite = SUITES[canonical_id]
-
-    required_fields = {"kem_name", "sig_name", "aead", "kdf", "nist_level"}
-    missing_fields = required_fields - set(suite.keys())
-    if missing_fields:
-        raise ValueError(f"malformed suite {suite_id}: missing fields {missing_fields}")
-
-    return dict(suite)
+    if isinstance(suite_id, str) and len(registry.lookups) < 4096:
+        # Remember the alias; bounded so arbitrary inputs cannot grow it.
+        registry.lookups[suite_id] = suite
+    return suite
 
 
 def _safe_get_enabled_kem_mechanisms() -> Iterable[str]:
@@ -770,40 +861,31 @@ def enabled_sigs() -> Tuple[str, ...]:
     return tuple(result)
 
 
-def _prune_suites_for_runtime() -> None:
-    """Filter suites by signature availability, preserving registry immutability."""
+def _prune_suites_for_runtime(suites: Dict[str, Suite]) -> Dict[str, Suite]:
+    """Drop suites whose signature algorithm the oqs runtime lacks."""
 
-    global SUITES
     try:
         available = set(enabled_sigs())
     except Exception:
-        return
+        return suites
     if not available:
-        return
-
-    filtered: Dict[str, MappingProxyType] = {}
-    removed: list[str] = []
-    for suite_id, config in SUITES.items():
-        if config.get("sig_name") in available:
-            filtered[suite_id] = config
-        else:
-            removed.append(suite_id)
-
-    if not removed:
-        return
-
-    _logger.warning(
-        "Pruning suites with unsupported signature algorithms",
-        extra={"removed_suites": removed},
-    )
-    from types import MappingProxyType as _MP
-
-    SUITES = _MP(filtered)  # type: ignore[assignment]
+        return suites
+
+    filtered = {sid: suite for sid, suite in suites.items() if suite["sig_name"] in available}
+    removed = [sid for sid in suites if sid not in filtered]
+    if removed:
+        _logger.warning(
+            "Pruning suites with unsupported signature algorithms",
+            extra={"removed_suites": removed},
+        )
+    return filtered
 
 
 def header_ids_for_suite(suite: Dict) -> Tuple[int, int, int, int]:
     """Return embedded header ID bytes for provided suite dict copy."""
 
+    if isinstance(suite, Suite):
+        return suite.header_ids
     try:
         return (
             suite["kem_id"],
@@ -836,6 +918,8 @@ def header_ids_from_names(kem_name: str, sig_name: str) -> Tuple[int, int, int,
 def suite_bytes_for_hkdf(suite: Dict) -> bytes:
     """Generate deterministic bytes from suite for HKDF info parameter."""
 
+    if isinstance(suite, Suite):
+        return suite.hkdf_info
     if "suite_id" in suite:
         return suite["suite_id"].encode("utf-8")
 
@@ -845,6 +929,3 @@ def suite_bytes_for_hkdf(suite: Dict) -> bytes:
         raise ValueError("Suite configuration not found in registry") from exc
 
     return suite_id.encode("utf-8")
-
-
-_prune_suites_for_runtime()
\ No newline at end of file
@@ -0,0 +1,282 @@
+"""
+Batched UDP datagram I/O for the proxy datapath.
+
+Linux exposes recvmmsg(2)/sendmmsg(2), which move many datagrams per syscall.
+CPython's socket module does not wrap them, so this module binds them through
+ctypes when libc provides them. Everywhere else (Windows, macOS, stripped
+libc builds) it falls back to a loop of non-blocking recvfrom/sendto calls
+that stops at the first EAGAIN, which still drains a whole burst per selector
+wake-up.
+
+Sockets handed to BatchSocket must already be non-blocking.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import socket
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+_MSG_DONTWAIT = getattr(socket, "MSG_DONTWAIT", 0x40)
+_MSG_TRUNC = getattr(socket, "MSG_TRUNC", 0x20)
+_SOCKADDR_STORAGE_LEN = 128
+_WOULD_BLOCK = {errno.EAGAIN, errno.EWOULDBLOCK}
+
+_libc = None
+_recvmmsg = None
+_sendmmsg = None
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", _MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _recvmmsg = _libc.recvmmsg
+        _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+        _recvmmsg.restype = ctypes.c_int
+        _sendmmsg = _libc.sendmmsg
+        _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+        _sendmmsg.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _libc = None
+        _recvmmsg = None
+        _sendmmsg = None
+
+
+def mmsg_available() -> bool:
+    """Return True when recvmmsg/sendmmsg can be called through libc."""
+
+    return _recvmmsg is not None and _sendmmsg is not None
+
+
+def _decode_sockaddr(raw: bytes) -> Tuple:
+    family = int.from_bytes(raw[0:2], sys.byteorder)
+    port = int.from_bytes(raw[2:4], "big")
+    if family == socket.AF_INET:
+        return (socket.inet_ntop(socket.AF_INET, raw[4:8]), port)
+    if family == socket.AF_INET6:
+        flowinfo = int.from_bytes(raw[4:8], "big")
+        scope_id = int.from_bytes(raw[24:28], sys.byteorder)
+        return (socket.inet_ntop(socket.AF_INET6, raw[8:24]), port, flowinfo, scope_id)
+    raise OSError(errno.EAFNOSUPPORT, f"unsupported address family {family}")
+
+
+def _encode_sockaddr(family: int, addr: Tuple) -> bytes:
+    host, port = addr[0], int(addr[1])
+    if family == socket.AF_INET:
+        packed = socket.inet_pton(socket.AF_INET, host)
+        return (
+            socket.AF_INET.to_bytes(2, sys.byteorder)
+            + port.to_bytes(2, "big")
+            + packed
+            + b"\x00" * 8
+        )
+    if family == socket.AF_INET6:
+        packed = socket.inet_pton(socket.AF_INET6, host)
+        flowinfo = int(addr[2]) if len(addr) > 2 else 0
+        scope_id = int(addr[3]) if len(addr) > 3 else 0
+        return (
+            socket.AF_INET6.to_bytes(2, sys.byteorder)
+            + port.to_bytes(2, "big")
+            + flowinfo.to_bytes(4, "big")
+            + packed
+            + scope_id.to_bytes(4, sys.byteorder)
+        )
+    raise OSError(errno.EAFNOSUPPORT, f"unsupported address family {family}")
+
+
+class BatchSocket:
+    """Drain and send up to `max_batch` datagrams per call on one UDP socket."""
+
+    def __init__(self, sock: socket.socket, *, max_batch: int, bufsize: int, use_mmsg: bool = True) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.sock = sock
+        self.max_batch = int(max_batch)
+        self.bufsize = int(bufsize)
+        self._family = sock.family
+        self._mmsg = bool(use_mmsg) and mmsg_available() and self._family in (socket.AF_INET, socket.AF_INET6)
+        self._addr_cache: Dict[Tuple, ctypes.Array] = {}
+        # Datagrams larger than bufsize that recvmmsg cut short and we dropped.
+        self._truncated = 0
+        if self._mmsg:
+            n = self.max_batch
+            self._rx_bufs = [ctypes.create_string_buffer(self.bufsize) for _ in range(n)]
+            self._rx_names = [ctypes.create_string_buffer(_SOCKADDR_STORAGE_LEN) for _ in range(n)]
+            self._rx_iov = (_IoVec * n)()
+            self._rx_vec = (_MMsgHdr * n)()
+            for i in range(n):
+                self._rx_iov[i].iov_base = ctypes.cast(self._rx_bufs[i], ctypes.c_void_p)
+                self._rx_iov[i].iov_len = self.bufsize
+                hdr = self._rx_vec[i].msg_hdr
+                hdr.msg_name = ctypes.cast(self._rx_names[i], ctypes.c_void_p)
+                hdr.msg_iov = ctypes.pointer(self._rx_iov[i])
+                hdr.msg_iovlen = 1
+            self._tx_iov = (_IoVec * n)()
+            self._tx_vec = (_MMsgHdr * n)()
+            for i in range(n):
+                hdr = self._tx_vec[i].msg_hdr
+                hdr.msg_iov = ctypes.pointer(self._tx_iov[i])
+                hdr.msg_iovlen = 1
+
+    @property
+    def uses_mmsg(self) -> bool:
+        return self._mmsg
+
+    def take_truncated(self) -> int:
+        """Return and reset the number of oversized datagrams dropped by recv_batch."""
+
+        count = self._truncated
+        self._truncated = 0
+        return count
+
+    def recv_batch(self) -> List[Tuple[bytes, Tuple]]:
+        """Return up to max_batch (payload, addr) pairs; empty when nothing is queued.
+
+        With mmsg, datagrams longer than bufsize are dropped and counted (see
+        `take_truncated`); the recvfrom fallback cannot tell and truncates.
+        """
+
+        if self._mmsg:
+            return self._recv_mmsg()
+        out: List[Tuple[bytes, Tuple]] = []
+        recvfrom = self.sock.recvfrom
+        bufsize = self.bufsize
+        for _ in range(self.max_batch):
+            try:
+                out.append(recvfrom(bufsize))
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                if out:
+                    break
+                raise
+        return out
+
+    def send_batch(self, items: Sequence[Tuple[bytes, Tuple]]) -> Tuple[int, int]:
+        """Send (payload, addr) pairs; return (datagrams, bytes) handed to the kernel.
+
+        Datagrams that hit EAGAIN or a per-datagram error are not retried; the
+        caller accounts for them as drops, exactly as a failed sendto would be.
+        """
+
+        if not items:
+            return 0, 0
+        if self._mmsg:
+            return self._send_mmsg(items)
+        sent = 0
+        sent_bytes = 0
+        sendto = self.sock.sendto
+        for payload, addr in items:
+            try:
+                sendto(payload, addr)
+            except OSError:
+                continue
+            sent += 1
+            sent_bytes += len(payload)
+        return sent, sent_bytes
+
+    def _recv_mmsg(self) -> List[Tuple[bytes, Tuple]]:
+        n = self.max_batch
+        for i in range(n):
+            self._rx_vec[i].msg_hdr.msg_namelen = _SOCKADDR_STORAGE_LEN
+        got = _recvmmsg(self.sock.fileno(), self._rx_vec, n, _MSG_DONTWAIT, None)
+        if got < 0:
+            err = ctypes.get_errno()
+            if err in _WOULD_BLOCK or err == errno.EINTR:
+                return []
+            raise OSError(err, "recvmmsg failed")
+        out: List[Tuple[bytes, Tuple]] = []
+        for i in range(got):
+            entry = self._rx_vec[i]
+            if entry.msg_hdr.msg_flags & _MSG_TRUNC:
+                # Larger than bufsize: never hand a cut-short datagram on.
+                self._truncated += 1
+                continue
+            payload = ctypes.string_at(self._rx_bufs[i], entry.msg_len)
+            name = ctypes.string_at(self._rx_names[i], entry.msg_hdr.msg_namelen)
+            out.append((payload, _decode_sockaddr(name)))
+        return out
+
+    def _sockaddr_for(self, addr: Tuple) -> ctypes.Array:
+        cached = self._addr_cache.get(addr)
+        if cached is None:
+            if len(self._addr_cache) >= 64:
+                self._addr_cache.clear()
+            raw = _encode_sockaddr(self._family, addr)
+            cached = ctypes.create_string_buffer(raw, len(raw))
+            self._addr_cache[addr] = cached
+        return cached
+
+    def _send_mmsg(self, items: Sequence[Tuple[bytes, Tuple]]) -> Tuple[int, int]:
+        sent = 0
+        sent_bytes = 0
+        total = len(items)
+        fd = self.sock.fileno()
+        start = 0
+        while start < total:
+            chunk = items[start:start + self.max_batch]
+            keepalive = []
+            for i, (payload, addr) in enumerate(chunk):
+                data = bytes(payload) if not isinstance(payload, bytes) else payload
+                keepalive.append(data)
+                name = self._sockaddr_for(addr)
+                self._tx_iov[i].iov_base = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p)
+                self._tx_iov[i].iov_len = len(data)
+                hdr = self._tx_vec[i].msg_hdr
+                hdr.msg_name = ctypes.cast(name, ctypes.c_void_p)
+                hdr.msg_namelen = len(name.raw)
+            pending = len(chunk)
+            offset = 0
+            while offset < pending:
+                rc = _sendmmsg(fd, ctypes.byref(self._tx_vec[offset]), pending - offset, 0)
+                if rc < 0:
+                    err = ctypes.get_errno()
+                    if err in _WOULD_BLOCK:
+                        return sent, sent_bytes
+                    # Skip the datagram the kernel rejected and keep going.
+                    offset += 1
+                    continue
+                sent += rc
+                sent_bytes += sum(len(keepalive[j]) for j in range(offset, offset + rc))
+                offset += rc
+            start += len(chunk)
+            del keepalive
+        return sent, sent_bytes
+
+
+def batch_bucket(size: int) -> str:
+    """Power-of-two histogram bucket label for a batch size (1, 2-3, 4-7, ...)."""
+
+    if size <= 1:
+        return "1"
+    low = 1 << (int(size).bit_length() - 1)
+    high = (low << 1) - 1
+    return f"{low}-{high}"
@@ -404,6 +404,8 @@ def main():
         if i < len(suites_to_run):
             time.sleep(BENCHMARK_CONFIG["inter_suite_delay_s"])
     
+    benchmark.aggregator.close()
+    
     # Save comprehensive output
     print("\n" + "=" * 70)
     combined = benchmark.save_comprehensive_output()
@@ -208,6 +208,11 @@ class BenchmarkPolicy:
             return None  # Will complete after current
         return self.suite_list[next_idx]
     
+    def likely_next(self) -> List[str]:
+        """Suites the next NEXT_SUITE can name (KEM pool prewarm hint)."""
+        next_suite = self.get_next_suite()
+        return [next_suite] if next_suite else []
+    
     def start_benchmark(self, start_time_mono: Optional[float] = None) -> str:
         """Initialize benchmark and return first suite."""
         self.start_time_mono = start_time_mono if start_time_mono is not None else time.monotonic()
@@ -17,6 +17,7 @@ from pathlib import Path
 from collections import deque, defaultdict
 from datetime import datetime, timezone
 from core.config import CONFIG
+from core.quantile_sketch import WindowedQuantiles
 
 try:
     import psutil
@@ -33,6 +34,7 @@ SCHEMA_NAME = "uav.pqc.telemetry.v1"
 SCHEMA_VER = 1
 WINDOW_S = 5.0
 BURST_GAP_THRESHOLD_MS = 200.0
+BLACKOUT_THRESHOLD_MS = 1000.0
 MAX_PACKETS_PER_LOOP = 100
 
 class GcsMetricsCollector:
@@ -63,7 +65,9 @@ class GcsMetricsCollector:
         
         # Metrics State (Sliding Window)
         self.arrival_times = deque() # (mono_s, size_bytes)
-        self.gaps = deque()          # (mono_s, gap_ms)
+        self.gaps = WindowedQuantiles()  # gap_ms keyed by arrival mono_s
+        self.burst_marks = deque()   # mono_s of gaps > BURST_GAP_THRESHOLD_MS
+        self.blackout_gaps = deque() # (mono_s, gap_ms) of gaps >= BLACKOUT_THRESHOLD_MS
         self.burst_gaps = 0          # Count of gaps > threshold in window
         
         # MAVLink State
@@ -118,8 +122,13 @@ class GcsMetricsCollector:
         while self.arrival_times and self.arrival_times[0][0] < cutoff:
             self.arrival_times.popleft()
             
-        while self.gaps and self.gaps[0][0] < cutoff:
-            self.gaps.popleft()
+        self.gaps.expire(cutoff)
+
+        while self.burst_marks and self.burst_marks[0] < cutoff:
+            self.burst_marks.popleft()
+
+        while self.blackout_gaps and self.blackout_gaps[0][0] < cutoff:
+            self.blackout_gaps.popleft()
             
         while self.msg_timestamps and self.msg_timestamps[0][0] < cutoff:
             _, msg_id = self.msg_timestamps.popleft()
@@ -211,9 +220,12 @@ class GcsMetricsCollector:
                     if self.arrival_times:
                         last_mono = self.arrival_times[-1][0]
                         gap_ms = (ts_mono - last_mono) * 1000.0
-                        self.gaps.append((ts_mono, gap_ms))
+                        self.gaps.append(gap_ms, ts_mono)
                         if gap_ms > BURST_GAP_THRESHOLD_MS:
+                            self.burst_marks.append(ts_mono)
                             self.burst_gaps += 1
+                        if gap_ms >= BLACKOUT_THRESHOLD_MS:
+                            self.blackout_gaps.append((ts_mono, gap_ms))
                     
                     self.arrival_times.append((ts_mono, size))
                 count += 1
@@ -222,8 +234,8 @@ class GcsMetricsCollector:
         
         with self.lock:
             self._prune_windows(now_mono)
-            # Prune burst gaps count (recalculate from window)
-            self.burst_gaps = sum(1 for _, g in self.gaps if g > BURST_GAP_THRESHOLD_MS)
+            # Burst gaps still inside the window
+            self.burst_gaps = len(self.burst_marks)
 
     def get_snapshot(self):
         now_mono_ns = time.monotonic_ns()
@@ -241,34 +253,28 @@ class GcsMetricsCollector:
             if self.arrival_times:
                 silence_ms = (time.monotonic() - self.arrival_times[-1][0]) * 1000.0
 
-            gap_max_ms = 0.0
-            gap_values = [g for _, g in self.gaps] if self.gaps else []
-            if gap_values:
-                gap_values_sorted = sorted(gap_values)
-                gap_max_ms = gap_values_sorted[-1]
-            else:
-                gap_values_sorted = []
+            # Gap percentiles come from the window's sketch (no per-snapshot sort)
+            gaps = self.gaps
+            gap_max_ms = gaps.max
 
-            def pct(vals, p):
-                if not vals:
+            def pct(p):
+                n = gaps.count
+                if not n:
                     return 0.0
-                k = max(0, min(len(vals) - 1, int(math.ceil((p / 100.0) * len(vals)) - 1)))
-                return float(vals[k])
+                return float(gaps.value_at_rank(int(math.ceil((p / 100.0) * n)) - 1))
 
-            gap_p90_ms = round(pct(gap_values_sorted, 90), 1)
-            gap_p60_ms = round(pct(gap_values_sorted, 60), 1)
+            gap_p90_ms = round(pct(90), 1)
+            gap_p60_ms = round(pct(60), 1)
 
             # Jitter as mean absolute deviation of gaps (if available)
             jitter_ms = 0.0
-            if len(gap_values_sorted) > 1:
-                mean_gap = sum(gap_values_sorted) / len(gap_values_sorted)
-                jitter_ms = sum(abs(g - mean_gap) for g in gap_values_sorted) / len(gap_values_sorted)
+            if gaps.count > 1:
+                mean_gap = gaps.mean
+                jitter_ms = sum(abs(g - mean_gap) * c for g, c in gaps.sketch.items()) / gaps.count
 
             # Blackout calculation: gaps larger than BLACKOUT_THRESHOLD_MS
-            BLACKOUT_THRESHOLD_MS = 1000.0
-            blackout_gaps = [g for g in gap_values_sorted if g >= BLACKOUT_THRESHOLD_MS]
-            blackout_count = len(blackout_gaps)
-            blackout_total_ms = round(sum(blackout_gaps), 1)
+            blackout_count = len(self.blackout_gaps)
+            blackout_total_ms = round(sum(g for _, g in self.blackout_gaps), 1)
 
             # Minimal MAV health
             hb = self.mav_state.get('heartbeat')
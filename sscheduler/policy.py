@@ -341,6 +341,15 @@ class TelemetryAwarePolicyV2:
         """
         self.rekey_timestamps.append(now_mono)
 
+    def likely_next(self, current_suite: str, now_mono: float) -> List[str]:
+        """Suites `evaluate` can move to from `current_suite` (prewarm hint)."""
+        candidates = []
+        for direction in (-1, 1):
+            target = self._find_suite(current_suite, direction, now_mono)
+            if target and target != current_suite and target not in candidates:
+                candidates.append(target)
+        return candidates
+
 
 # =============================================================================
 # SIMPLE POLICIES USED BY MAV SCHEDULER
@@ -40,8 +40,11 @@ from typing import Optional, List, Dict, Any
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.config import CONFIG
+from core.control_tcp import send_control_command
+from core.control_wire import ControlChannel
 from core.suites import get_suite, list_suites
 from core.process import ManagedProcess
+from core.readiness import ReadyPipe
 from sscheduler.policy import (
     TelemetryAwarePolicyV2,
     PolicyAction,
@@ -68,6 +71,8 @@ DRONE_PLAIN_TX = int(CONFIG["DRONE_PLAINTEXT_TX"])
 GCS_CONTROL_HOST = str(CONFIG.get("GCS_HOST"))
 GCS_CONTROL_PORT = int(CONFIG.get("GCS_CONTROL_PORT", 48080))
 GCS_TELEMETRY_PORT = int(CONFIG.get("GCS_TELEMETRY_PORT", 52080))
+# Local control listener of the drone proxy (core.control_tcp), loopback only
+PROXY_CONTROL_PORT = int(CONFIG.get("DRONE_CONTROL_PORT", 48080))
 
 SECRETS_DIR = Path(__file__).parent.parent / "secrets" / "matrix"
 ROOT = Path(__file__).resolve().parents[1]
@@ -78,6 +83,9 @@ LOGS_DIR.mkdir(parents=True, exist_ok=True)
 EVAL_INTERVAL_S = 1.0
 # Cooldown after a suite switch to prevent rapid thrashing
 SWITCH_COOLDOWN_S = 5.0
+# Upper bound for proxy start-up (handshake) and for one in-band suite switch
+PROXY_READY_TIMEOUT_S = 30.0
+SWITCH_TIMEOUT_S = 30.0
 
 _suites_dict = list_suites()
 ALL_SUITES = [{"name": k, **v} for k, v in _suites_dict.items()]
@@ -96,8 +104,26 @@ def log(msg: str):
 # GCS Control Client (TCP JSON-RPC)
 # ---------------------------------------------------------------------------
 
+def _gcs_error(message: str) -> dict:
+    return {"status": "error", "message": message}
+
+
+# One persistent framed connection to the GCS scheduler (core.control_wire);
+# CONTROL_FRAMED=False falls back to a connection per command.
+_GCS_CHANNEL = ControlChannel(
+    GCS_CONTROL_HOST,
+    GCS_CONTROL_PORT,
+    codec=str(CONFIG.get("CONTROL_CODEC", "json")),
+    timeout=30.0,
+    connect_timeout=5.0,
+    error_reply=_gcs_error,
+)
+
+
 def send_gcs_command(cmd: str, **params) -> dict:
     """Send a JSON command to the GCS control server over TCP."""
+    if CONFIG.get("CONTROL_FRAMED", True):
+        return _GCS_CHANNEL.request({"cmd": cmd, **params})
     sock = None
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -113,7 +139,7 @@ def send_gcs_command(cmd: str, **params) -> dict:
             buf += chunk
         return json.loads(buf.decode().strip())
     except Exception as e:
-        return {"status": "error", "message": str(e)}
+        return _gcs_error(str(e))
     finally:
         if sock:
             try:
@@ -137,12 +163,22 @@ def wait_for_gcs(timeout: float = 120.0) -> bool:
 # ---------------------------------------------------------------------------
 
 class DroneProxyManager:
-    """Manages the drone-side PQC proxy subprocess (core.run_proxy drone)."""
+    """Manages the drone-side PQC proxy subprocess (core.run_proxy drone).
+
+    The proxy is started once and coordinates rekeys itself
+    (CONTROL_COORDINATOR_ROLE=drone).  Suite changes go through its local
+    TCP control listener, which runs the in-band rekey on the live tunnel,
+    so the process, its imports and its loaded keys survive every switch.
+    """
 
     def __init__(self):
         self.proc: Optional[ManagedProcess] = None
         self.current_suite: Optional[str] = None
         self._last_log: Optional[Path] = None
+        self._ready: Optional[ReadyPipe] = None
+        # Persistent framed channel to the proxy's control listener; status
+        # polls during a switch reuse it instead of reconnecting each time.
+        self.channel = ControlChannel("127.0.0.1", PROXY_CONTROL_PORT, timeout=5.0)
 
     def start(self, suite_name: str) -> bool:
         if self.proc and self.proc.is_running():
@@ -165,6 +201,17 @@ class DroneProxyManager:
             "--quiet",
             "--status-file", str(LOGS_DIR / "drone_status.json"),
         ]
+        # Rekey keys are looked up under secrets/matrix relative to the cwd.
+        env = dict(os.environ)
+        env.update({
+            "CONTROL_COORDINATOR_ROLE": "drone",
+            "ENABLE_TCP_CONTROL": "1",
+            "DRONE_CONTROL_HOST": "127.0.0.1",
+            "DRONE_CONTROL_PORT": str(PROXY_CONTROL_PORT),
+        })
+        ready = ReadyPipe() if ReadyPipe.supported() else None
+        if ready is not None:
+            cmd += ["--ready-fd", str(ready.child_fd)]
 
         ts = time.strftime("%Y%m%d-%H%M%S")
         log_path = LOGS_DIR / f"proxy_{suite_name}_{ts}.log"
@@ -178,28 +225,99 @@ class DroneProxyManager:
         self.proc = ManagedProcess(
             cmd=cmd,
             name=f"proxy-{suite_name}",
+            cwd=str(ROOT),
+            env=env,
             stdout=fh,
             stderr=subprocess.STDOUT,
+            pass_fds=(ready.child_fd,) if ready is not None else (),
         )
         if not self.proc.start():
+            if ready is not None:
+                ready.close()
             return False
 
         self._last_log = log_path
         self.current_suite = suite_name
 
-        # Wait for proxy startup + handshake
-        time.sleep(3.0)
-        if not self.proc.is_running():
-            log(f"Proxy exited early for {suite_name}")
-            self._dump_log_tail()
+        deadline = time.monotonic() + PROXY_READY_TIMEOUT_S
+        if ready is not None:
+            self._ready = ready
+            ready.child_started()
+            event = ready.wait(("handshake_ok",), PROXY_READY_TIMEOUT_S, alive=self.proc.is_running)
+            if event is None or event["event"] == "failed":
+                reason = event.get("reason") if event else "timeout"
+                log(f"Proxy did not complete the handshake for {suite_name}: {reason}")
+                self._dump_log_tail()
+                self.stop()
+                return False
+
+        # The control listener comes up right after the handshake.
+        while time.monotonic() < deadline:
+            if not self.proc.is_running():
+                log(f"Proxy exited early for {suite_name}")
+                self._dump_log_tail()
+                return False
+            if self._control("status").get("ok"):
+                return True
+            time.sleep(0.1)
+        log("Proxy control listener not reachable – suite switches will restart the proxy")
+        return self.proc.is_running()
+
+    def switch_suite(self, suite_name: str) -> bool:
+        """Rekey the running proxy to `suite_name` without restarting it."""
+        if not self.is_running():
             return False
-        return True
+        before = self._control("status")
+        if not before.get("ok"):
+            return False
+        stats = before.get("stats") or {}
+        ok_before = int(stats.get("rekeys_ok", 0))
+        fail_before = int(stats.get("rekeys_fail", 0))
+
+        resp = self._control("rekey", suite=suite_name)
+        if not resp.get("ok"):
+            log(f"Proxy rekey request rejected: {resp.get('error')}")
+            return False
+        suite_id = resp.get("suite")
+
+        deadline = time.monotonic() + SWITCH_TIMEOUT_S
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            st = self._control("status")
+            if not st.get("ok"):
+                if not self.is_running():
+                    return False
+                continue
+            stats = st.get("stats") or {}
+            if int(stats.get("rekeys_fail", 0)) > fail_before:
+                log(f"Proxy rekey to {suite_name} failed (last_status={st.get('last_status')})")
+                return False
+            if (
+                int(stats.get("rekeys_ok", 0)) > ok_before
+                and st.get("active_rid") is None
+                and st.get("suite") == suite_id
+            ):
+                self.current_suite = suite_name
+                return True
+        log(f"Proxy rekey to {suite_name} timed out after {SWITCH_TIMEOUT_S:.0f}s")
+        return False
+
+    def _control(self, cmd: str, **params) -> dict:
+        if CONFIG.get("CONTROL_FRAMED", True):
+            return self.channel.request({"cmd": cmd, **params})
+        return send_control_command(
+            "127.0.0.1", PROXY_CONTROL_PORT, {"cmd": cmd, **params}, timeout=5.0
+        )
 
     def stop(self):
+        self.channel.close()
         if self.proc:
             self.proc.stop()
             self.proc = None
             self.current_suite = None
+        if self._ready is not None:
+            self._ready.close()
+            self._ready = None
 
     def is_running(self) -> bool:
         return self.proc is not None and self.proc.is_running()
@@ -346,7 +464,8 @@ class MavTunnelScheduler:
     Architecture
     ~~~~~~~~~~~~
     * **MAVProxy** (persistent): bridges FC serial ↔ plaintext UDP ports.
-    * **PQC Proxy** (per-suite): encrypts plaintext UDP ↔ encrypted UDP.
+    * **PQC Proxy** (persistent): encrypts plaintext UDP ↔ encrypted UDP;
+      suites change by in-band rekey on the running tunnel.
     * **LocalMonitor**: battery, thermal, armed state from Pixhawk.
     * **TelemetryReceiver**: GCS link-quality metrics via UDP.
     * **Policy Engine**: deterministic (benchmark) *or* intelligent (flight).
@@ -369,7 +488,8 @@ class MavTunnelScheduler:
     3. Build immutable DecisionInput snapshot
     4. policy.evaluate(inp) → PolicyOutput  (HOLD / UPGRADE / DOWNGRADE /
        REKEY / ROLLBACK)
-    5. Execute: coordinate GCS prepare_rekey → stop proxy → start new suite
+    5. Execute: in-band rekey of the running proxies (process restart only
+       as a fallback)
     """
 
     def __init__(self, args):
@@ -392,6 +512,8 @@ class MavTunnelScheduler:
         self.last_switch_mono: float = 0.0
         self.cooldown_until_mono: float = 0.0
         self.local_epoch: int = 0
+        # Last KEM pool prewarm hint sent to the GCS (None: send on next check)
+        self._prewarm_sent: Optional[List[str]] = None
 
         # --- resolve suites ---
         self.suites_to_run = self._resolve_suites()
@@ -508,36 +630,67 @@ class MavTunnelScheduler:
             log(f"GCS start_proxy failed: {resp}")
             return False
 
-        # Poll until GCS proxy is ready
+        # Poll until GCS proxy is ready (start_proxy normally returns once it listens)
         deadline = time.time() + 20.0
         while time.time() < deadline:
-            time.sleep(0.5)
             st = send_gcs_command("status")
             if st.get("proxy_running"):
                 break
+            time.sleep(0.5)
         else:
             log("GCS proxy did not become ready in time")
             return False
 
-        # Start local proxy (connects to GCS)
+        # Start local proxy (connects to GCS); returns once the handshake is done
         if not self.proxy.start(suite_name):
             log(f"Local proxy start failed for {suite_name}")
             return False
 
-        # Handshake settling
-        time.sleep(1.0)
+        self._mark_active(suite_name)
+        return True
 
+    def _mark_active(self, suite_name: str):
         self.current_suite = suite_name
         self.last_switch_mono = time.monotonic()
         self.cooldown_until_mono = self.last_switch_mono + SWITCH_COOLDOWN_S
         self.local_epoch += 1
         log(f"Suite ACTIVE: {suite_name}  (epoch {self.local_epoch})")
-        return True
+        # The switch may have used the GCS proxy's pooled keypair: hint again.
+        self._prewarm_sent = None
+        self._prewarm_likely_next()
+
+    def _prewarm_likely_next(self):
+        """Ask the GCS proxy to pool KEM keypairs for the suites the policy may pick next.
+
+        Sent after every switch and whenever the policy's hint changes; the GCS
+        forwards it to its proxy as {"cmd": "prewarm"} (core.kem_pool).
+        """
+        if self.bench_policy is not None:
+            hint = self.bench_policy.likely_next()
+        elif self.current_suite:
+            hint = self.intel_policy.likely_next(self.current_suite, time.monotonic())
+        else:
+            hint = []
+        if not hint or hint == self._prewarm_sent:
+            return
+        self._prewarm_sent = hint
+        resp = send_gcs_command("prewarm", suites=hint)
+        if resp.get("status") != "ok":
+            log(f"GCS prewarm of {', '.join(hint)} not applied: {resp.get('message')}")
 
     def _switch_suite(self, target_suite: str) -> bool:
-        """Full suite switch: stop current → coordinate new."""
+        """Suite switch: in-band rekey, or restart both proxies if that fails."""
         log(f"Suite switch: {self.current_suite} → {target_suite}")
 
+        if self.proxy.is_running():
+            t0 = time.monotonic()
+            if self.proxy.switch_suite(target_suite):
+                log(f"In-band switch took {(time.monotonic() - t0) * 1000.0:.0f} ms")
+                send_gcs_command("suite_active", suite=target_suite)
+                self._mark_active(target_suite)
+                return True
+            log("In-band switch failed – restarting proxies")
+
         # 1. Tell GCS to tear down its side
         resp = send_gcs_command("prepare_rekey")
         if resp.get("status") != "ok":
@@ -642,6 +795,8 @@ class MavTunnelScheduler:
                 log("Deterministic benchmark run COMPLETE")
                 break
 
+            self._prewarm_likely_next()
+
             # Health check
             if self.current_suite and not self.proxy.is_running():
                 log("Proxy died – attempting restart on current suite")
@@ -711,6 +866,8 @@ class MavTunnelScheduler:
                 if self._switch_suite(target):
                     policy.record_rekey(time.monotonic())
 
+            self._prewarm_likely_next()
+
             # Health check
             if self.current_suite and not self.proxy.is_running():
                 log("Proxy died – restarting current suite")
@@ -795,8 +952,25 @@ class MavTunnelScheduler:
             send_gcs_command("stop")
         except Exception:
             pass
+        self._write_control_rtt()
+        _GCS_CHANNEL.close()
         log("Cleanup complete")
 
+    def _write_control_rtt(self):
+        """Dump control round-trip histograms (GCS scheduler, local proxy)."""
+        report = {"gcs": _GCS_CHANNEL.stats(), "proxy": self.proxy.channel.stats()}
+        try:
+            with open(LOGS_DIR / "control_rtt.json", "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except OSError:
+            pass
+        for name, stats in report.items():
+            for cmd, hist in stats["rtt"].items():
+                log(
+                    f"Control RTT {name}/{cmd}: n={hist['count']} "
+                    f"p50<={hist['p50_us']:.0f}us p99<={hist['p99_us']:.0f}us max={hist['max_us']:.0f}us"
+                )
+
 
 # ===========================================================================
 # CLI
@@ -36,8 +36,10 @@ _SCHEDULER = None
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.config import CONFIG
+from core.counter_shm import CounterReader
 from core.suites import get_suite, list_suites
 from core.process import ManagedProcess
+from core.readiness import ReadyPipe
 from core.clock_sync import ClockSync
 from sscheduler.benchmark_policy import BenchmarkPolicy, BenchmarkAction, get_suite_count
 
@@ -69,6 +71,9 @@ GCS_TELEMETRY_PORT = int(CONFIG.get("GCS_TELEMETRY_PORT", 52080))
 DRONE_PLAIN_RX_PORT = int(CONFIG.get("DRONE_PLAINTEXT_RX", 47004))
 DRONE_PLAIN_TX_PORT = int(CONFIG.get("DRONE_PLAINTEXT_TX", 47003))
 
+# Shared-memory counters of the drone proxy (core.counter_shm, tmpfs-backed)
+DRONE_COUNTERS_SHM = "pqc-drone-bench-counters"
+
 SECRETS_DIR = Path(__file__).parent.parent / "secrets" / "matrix"
 ROOT = Path(__file__).resolve().parents[1]
 # Note: LOGS_DIR is now set dynamically in BenchmarkScheduler.__init__
@@ -155,6 +160,14 @@ def send_gcs_command(cmd: str, **params) -> dict:
             except Exception:
                 pass
 
+def _read_proxy_counters() -> Optional[Dict[str, int]]:
+    """Current drone proxy counters from its shared-memory segment, if published."""
+    try:
+        with CounterReader(DRONE_COUNTERS_SHM) as reader:
+            return reader.read()
+    except (OSError, ValueError):
+        return None
+
 def wait_for_gcs(timeout: float = 30.0) -> bool:
     """Wait for GCS control server to be ready."""
     start = time.time()
@@ -177,6 +190,7 @@ class DroneProxyManager:
         self.current_suite = None
         self.last_log_path = None
         self._log_handle = None  # BUG-06 fix: track log file handle
+        self._ready: Optional[ReadyPipe] = None
     
     def start(self, suite_name: str) -> bool:
         """Start drone proxy with given suite."""
@@ -200,8 +214,12 @@ class DroneProxyManager:
             "--suite", suite_name,
             "--peer-pubkey-file", str(peer_pubkey),
             "--quiet",
-            "--status-file", str(LOGS_DIR / "drone_status.json")
+            "--status-file", str(LOGS_DIR / "drone_status.json"),
+            "--status-shm", DRONE_COUNTERS_SHM,
         ]
+        ready = ReadyPipe() if ReadyPipe.supported() else None
+        if ready is not None:
+            cmd += ["--ready-fd", str(ready.child_fd)]
 
         timestamp = time.strftime("%Y%m%d-%H%M%S")
         log_path = LOGS_DIR / f"drone_{suite_name}_{timestamp}.log"
@@ -227,18 +245,41 @@ class DroneProxyManager:
             name=f"proxy-{suite_name}",
             stdout=self._log_handle,
             stderr=subprocess.STDOUT,
-            env=env
+            env=env,
+            pass_fds=(ready.child_fd,) if ready is not None else (),
         )
         
         if self.managed_proc.start():
             self.last_log_path = log_path
             self.current_suite = suite_name
+            if ready is not None:
+                # Progress arrives on the readiness pipe; see wait_handshake().
+                self._ready = ready
+                ready.child_started()
+                return True
             time.sleep(1.0)  # Short wait for process to start
             if not self.managed_proc.is_running():
                 log(f"Proxy exited early", "ERROR")
                 return False
             return True
+        if ready is not None:
+            ready.close()
         return False
+
+    def wait_handshake(self, timeout: float = 45.0) -> Dict[str, Any]:
+        """Wait for the handshake; same result shape as read_handshake_status()."""
+        if self._ready is None or self.managed_proc is None:
+            return read_handshake_status(timeout=timeout)
+        event = self._ready.wait(("handshake_ok",), timeout, alive=self.managed_proc.is_running)
+        if event is None:
+            return {"status": "timeout", "handshake_metrics": {}}
+        if event["event"] == "failed":
+            return {"status": "failed", "reason": event.get("reason"), "handshake_metrics": {}}
+        return {
+            "status": "handshake_ok",
+            "suite": event.get("suite"),
+            "handshake_metrics": event.get("handshake_metrics") or {},
+        }
     
     def stop(self):
         """Stop drone proxy."""
@@ -246,6 +287,9 @@ class DroneProxyManager:
             self.managed_proc.stop()
             self.managed_proc = None
             self.current_suite = None
+        if self._ready is not None:
+            self._ready.close()
+            self._ready = None
         # BUG-06 fix: close log file handle to prevent FD leak
         if self._log_handle is not None:
             try:
@@ -684,7 +728,7 @@ class BenchmarkScheduler:
         log(f"  Drone proxy started, waiting for handshake...")
         
         # Read handshake metrics (allow 45s for Classic McEliece)
-        status = read_handshake_status(timeout=45.0)
+        status = self.proxy.wait_handshake(timeout=45.0)
         if status.get("status") == "handshake_ok":
             metrics = status.get("handshake_metrics", {})
             self.policy.record_handshake_metrics(metrics)
@@ -808,19 +852,19 @@ class BenchmarkScheduler:
         except Exception:
             return False
 
-        status_file = LOGS_DIR / "drone_status.json"
-        if status_file.exists():
+        counters = _read_proxy_counters()
+        if counters is None:
+            status_file = LOGS_DIR / "drone_status.json"
+            if not status_file.exists():
+                return False
             try:
                 with open(status_file, "r") as f:
-                    status_data = json.load(f)
-                counters = status_data.get("counters", {})
-                ptx_in = counters.get("ptx_in", 0) or 0
-                enc_out = counters.get("enc_out", 0) or 0
-                if int(ptx_in) <= 0 and int(enc_out) <= 0:
-                    return False
+                    counters = json.load(f).get("counters", {})
             except Exception:
                 return False
-        else:
+        ptx_in = counters.get("ptx_in", 0) or 0
+        enc_out = counters.get("enc_out", 0) or 0
+        if int(ptx_in) <= 0 and int(enc_out) <= 0:
             return False
         return True
 
@@ -1034,6 +1078,12 @@ class BenchmarkScheduler:
                     fh.close()
                 except Exception:
                     pass
+        # Stop the power sampler process (it polls the sensor until closed)
+        if self.metrics_aggregator:
+            try:
+                self.metrics_aggregator.close()
+            except Exception as e:
+                log(f"Metrics aggregator close failed: {e}", "WARN")
         # Stop robust logger (flushes all buffered data)
         if self.robust_logger:
             self.robust_logger.log_event("benchmark_cleanup", {"reason": self._shutdown_reason})
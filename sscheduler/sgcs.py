@@ -11,7 +11,8 @@ Data flow (bidirectional MAVLink):
 
 GCS responsibilities:
   1. Listen for TCP control commands from the drone scheduler.
-  2. Start / stop PQC proxy for each suite on command.
+  2. Start / stop the PQC proxy on command.  The proxy stays up across
+     suite changes; the drone proxy rekeys it in band.
   3. Run a persistent MAVProxy (--map --console) for QGC.
   4. Collect receiver-side MAVLink metrics via GcsMetricsCollector.
   5. Batch and forward telemetry snapshots to the drone over UDP.
@@ -42,9 +43,12 @@ from typing import Optional, List, Dict, Any
 # Ensure parent on sys.path for core imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core import control_wire
 from core.config import CONFIG
+from core.control_tcp import send_control_command
 from core.suites import get_suite, list_suites
 from core.process import ManagedProcess
+from core.readiness import ReadyPipe
 from core.clock_sync import ClockSync
 from sscheduler.gcs_metrics import GcsMetricsCollector
 
@@ -67,10 +71,16 @@ GCS_TELEMETRY_SNIFF_PORT = 14552
 # Control plane
 GCS_CONTROL_HOST = str(CONFIG.get("GCS_CONTROL_HOST", "0.0.0.0"))
 GCS_CONTROL_PORT = int(CONFIG.get("GCS_CONTROL_PORT", 48080))
+# Loopback control listener of the GCS proxy (core.control_tcp), used to
+# forward KEM pool prewarm hints; must differ from our own control port.
+PROXY_CONTROL_PORT = GCS_CONTROL_PORT + 1
 
 # Telemetry plane  (GCS → Drone, UDP)
 GCS_TELEMETRY_PORT = int(CONFIG.get("GCS_TELEMETRY_PORT", 52080))
 
+# Upper bound for proxy start-up (imports, key loading, binding the listener)
+PROXY_READY_TIMEOUT_S = 15.0
+
 SECRETS_DIR = Path(__file__).parent.parent / "secrets" / "matrix"
 ROOT = Path(__file__).resolve().parents[1]
 LOGS_DIR = ROOT / "logs" / "sscheduler" / "gcs"
@@ -111,11 +121,17 @@ def wait_for_tcp_port(port: int, timeout: float = 5.0) -> bool:
 # ---------------------------------------------------------------------------
 
 class GcsProxyManager:
-    """Manages the GCS-side PQC proxy subprocess (core.run_proxy gcs)."""
+    """Manages the GCS-side PQC proxy subprocess (core.run_proxy gcs).
+
+    The proxy follows rekeys coordinated by the drone proxy
+    (CONTROL_COORDINATOR_ROLE=drone), so it is only restarted when the drone
+    falls back to a full restart.
+    """
 
     def __init__(self):
         self.managed_proc: Optional[ManagedProcess] = None
         self.current_suite: Optional[str] = None
+        self._ready: Optional[ReadyPipe] = None
 
     def start(self, suite_name: str) -> bool:
         if self.managed_proc and self.managed_proc.is_running():
@@ -138,6 +154,17 @@ class GcsProxyManager:
             "--gcs-secret-file", str(gcs_key),
             "--quiet",
         ]
+        # Rekey keys are looked up under secrets/matrix relative to the cwd.
+        env = dict(os.environ)
+        env.update({
+            "CONTROL_COORDINATOR_ROLE": "drone",
+            "ENABLE_TCP_CONTROL": "1",
+            "GCS_CONTROL_HOST": "127.0.0.1",
+            "GCS_CONTROL_PORT": str(PROXY_CONTROL_PORT),
+        })
+        ready = ReadyPipe() if ReadyPipe.supported() else None
+        if ready is not None:
+            cmd += ["--ready-fd", str(ready.child_fd)]
 
         ts = time.strftime("%Y%m%d-%H%M%S")
         log_path = LOGS_DIR / f"proxy_{suite_name}_{ts}.log"
@@ -151,18 +178,34 @@ class GcsProxyManager:
         self.managed_proc = ManagedProcess(
             cmd=cmd,
             name=f"proxy-{suite_name}",
+            cwd=str(ROOT),
+            env=env,
             stdout=fh,
             stderr=subprocess.STDOUT,
+            pass_fds=(ready.child_fd,) if ready is not None else (),
         )
         if not self.managed_proc.start():
+            if ready is not None:
+                ready.close()
             return False
 
         self.current_suite = suite_name
 
-        # Let the proxy bind its TCP listener and become ready
-        time.sleep(2.0)
-        if not self.managed_proc.is_running():
-            log(f"GCS proxy exited early for {suite_name}")
+        if ready is None:
+            # Let the proxy bind its TCP listener and become ready
+            time.sleep(2.0)
+            if not self.managed_proc.is_running():
+                log(f"GCS proxy exited early for {suite_name}")
+                return False
+            return True
+
+        self._ready = ready
+        ready.child_started()
+        event = ready.wait(("listening",), PROXY_READY_TIMEOUT_S, alive=self.managed_proc.is_running)
+        if event is None or event["event"] == "failed":
+            reason = event.get("reason") if event else "timeout"
+            log(f"GCS proxy not listening for {suite_name}: {reason}")
+            self.stop()
             return False
         return True
 
@@ -171,10 +214,19 @@ class GcsProxyManager:
             self.managed_proc.stop()
             self.managed_proc = None
             self.current_suite = None
+        if self._ready is not None:
+            self._ready.close()
+            self._ready = None
 
     def is_running(self) -> bool:
         return self.managed_proc is not None and self.managed_proc.is_running()
 
+    def prewarm(self, suites: List[str]) -> dict:
+        """Ask the running proxy to pool KEM keypairs for `suites`."""
+        return send_control_command(
+            "127.0.0.1", PROXY_CONTROL_PORT, {"cmd": "prewarm", "suites": suites}, timeout=2.0
+        )
+
 
 # ---------------------------------------------------------------------------
 # Batched Telemetry Sender  (GCS → Drone, UDP)
@@ -279,10 +331,14 @@ class ControlServer:
     status         – proxy and MAVProxy health
     configure      – accept scheduling parameters from drone
     start_proxy    – start GCS PQC proxy for a given suite
-    prepare_rekey  – tear down current proxy (drone about to switch suite)
+    suite_active   – drone rekeyed the running proxy to a new suite
+    prepare_rekey  – tear down current proxy (drone falls back to a restart)
     stop           – full shutdown
     get_suites     – return available suite names
     chronos_sync   – serve an NTP-lite clock synchronisation round
+
+    Requests arrive as one newline-JSON object per connection or, from
+    core.control_wire.ControlChannel, as frames on a persistent connection.
     """
 
     def __init__(self, proxy: GcsProxyManager):
@@ -491,6 +547,18 @@ class ControlServer:
                 chunk = client.recv(4096)
                 if not chunk:
                     break
+                if not buf and chunk[0] == control_wire.MAGIC:
+                    # Persistent framed channel (core.control_wire.ControlChannel).
+                    client.settimeout(1.0)
+                    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    control_wire.serve_framed(
+                        client,
+                        chunk,
+                        self._handle_command,
+                        bad_message={"status": "error", "message": "invalid message"},
+                        should_stop=lambda: not self.running,
+                    )
+                    return
                 buf += chunk
                 if b"\n" in buf:
                     break
@@ -564,6 +632,29 @@ class ControlServer:
 
             return {"status": "ok", "message": "proxy_started"}
 
+        # ----- suite_active ----- #
+        if cmd == "suite_active":
+            suite = request.get("suite")
+            if not suite:
+                return {"status": "error", "message": "missing suite"}
+            if not self.proxy.is_running():
+                return {"status": "error", "message": "proxy_not_running"}
+            log(f"Suite switched in band: {self.proxy.current_suite} → {suite}")
+            self.proxy.current_suite = suite
+            return {"status": "ok", "message": "suite_recorded"}
+
+        # ----- prewarm ----- #
+        if cmd == "prewarm":
+            suites = request.get("suites")
+            if not isinstance(suites, list) or not suites:
+                return {"status": "error", "message": "missing suites"}
+            if not self.proxy.is_running():
+                return {"status": "error", "message": "proxy_not_running"}
+            resp = self.proxy.prewarm(suites)
+            if not resp.get("ok"):
+                return {"status": "error", "message": resp.get("error", "prewarm_failed")}
+            return {"status": "ok", "suites": resp.get("suites", suites)}
+
         # ----- prepare_rekey ----- #
         if cmd == "prepare_rekey":
             log("prepare_rekey: stopping GCS proxy …")
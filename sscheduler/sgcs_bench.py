@@ -45,6 +45,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.config import CONFIG
 from core.suites import get_suite, list_suites
 from core.process import ManagedProcess
+from core.readiness import ReadyPipe
 from core.clock_sync import ClockSync
 from core.mavlink_collector import MavLinkMetricsCollector, HAS_PYMAVLINK
 # GCS system metrics collection (runtime)
@@ -458,6 +459,7 @@ class GcsProxyManager:
         self.managed_proc: Optional[ManagedProcess] = None
         self.current_suite: Optional[str] = None
         self._log_handle = None
+        self._ready: Optional[ReadyPipe] = None
     
     def start(self, suite_name: str) -> bool:
         """Start proxy with given suite."""
@@ -483,6 +485,9 @@ class GcsProxyManager:
             "--quiet",
             "--status-file", str(self.logs_dir / "gcs_status.json")
         ]
+        ready = ReadyPipe() if ReadyPipe.supported() else None
+        if ready is not None:
+            cmd += ["--ready-fd", str(ready.child_fd)]
         
         timestamp = time.strftime("%Y%m%d-%H%M%S")
         log_path = self.logs_dir / f"gcs_proxy_{suite_name}_{timestamp}.log"
@@ -501,18 +506,38 @@ class GcsProxyManager:
             name=f"gcs-proxy-{suite_name}",
             stdout=self._log_handle,
             stderr=subprocess.STDOUT,
-            env=env
+            env=env,
+            pass_fds=(ready.child_fd,) if ready is not None else (),
         )
         
         if self.managed_proc.start():
             self.current_suite = suite_name
-            time.sleep(2.0)
-            if not self.managed_proc.is_running():
-                log(f"Proxy exited early for {suite_name}")
-                return False
+            if ready is not None:
+                self._ready = ready
+                ready.child_started()
+                event = ready.wait(("listening",), 15.0, alive=self.managed_proc.is_running)
+                if event is None or event["event"] == "failed":
+                    reason = event.get("reason") if event else "timeout"
+                    log(f"Proxy not listening for {suite_name}: {reason}")
+                    return False
+            else:
+                time.sleep(2.0)
+                if not self.managed_proc.is_running():
+                    log(f"Proxy exited early for {suite_name}")
+                    return False
             log(f"GCS proxy started for {suite_name}")
             return True
+        if ready is not None:
+            ready.close()
         return False
+
+    def wait_handshake_ok(self, timeout_s: float) -> Optional[bool]:
+        """Handshake result from the readiness pipe; None if there is no pipe."""
+        ready, proc = self._ready, self.managed_proc
+        if ready is None or proc is None:
+            return None
+        event = ready.wait(("handshake_ok",), timeout_s, alive=proc.is_running)
+        return event is not None and event["event"] == "handshake_ok"
     
     def stop(self):
         """Stop proxy."""
@@ -520,6 +545,9 @@ class GcsProxyManager:
             self.managed_proc.stop()
             self.managed_proc = None
             self.current_suite = None
+        if self._ready is not None:
+            self._ready.close()
+            self._ready = None
         if self._log_handle:
             self._log_handle.close()
             self._log_handle = None
@@ -630,6 +658,7 @@ class GcsBenchmarkServer:
         self.suite_log = self.logs_dir / "gcs_suite_metrics.jsonl"
         
         # Reinitialize metrics aggregator
+        self.metrics_aggregator.close()
         self.metrics_aggregator = MetricsAggregator(
             role="gcs",
             output_dir=str(LOGS_DIR / "comprehensive")
@@ -965,6 +994,7 @@ class GcsBenchmarkServer:
         
         self.proxy.stop()
         self.mavproxy.stop()
+        self.metrics_aggregator.close()
         
         # Stop robust logger (flushes all buffered data)
         if self.robust_logger:
@@ -997,6 +1027,9 @@ class GcsBenchmarkServer:
 
     def _wait_for_handshake_ok(self, timeout_s: float = 45.0) -> bool:
         """Wait for proxy status to show handshake completion."""
+        result = self.proxy.wait_handshake_ok(timeout_s)
+        if result is not None:
+            return result
         deadline = time.monotonic() + float(timeout_s)
         while time.monotonic() < deadline:
             status = self._read_proxy_status()
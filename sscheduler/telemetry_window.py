@@ -4,31 +4,67 @@ TelemetryWindow: bounded sliding-window of telemetry samples (monotonic-time bas
 Maintains O(1) amortized operations using collections.deque. Exposes add() and
 summarize(now_mono) which returns derived statistics required by DecisionContext.
 
+Gap, CPU and memory percentiles come from streaming sketches that are updated
+as samples enter and leave the window (core.quantile_sketch), and sequence
+counters are kept as running totals, so summarize() does no per-sample work.
+
 All computations are bounded and non-blocking.
 """
 from collections import deque
 from threading import Lock
-import statistics
-from typing import Deque, Dict, List, Tuple, Any, Optional
+from typing import Deque, Dict, Tuple, Any
+
+from core.quantile_sketch import QuantileSketch, WindowedQuantiles
+
+
+def _median_abs_deviation(sketch: QuantileSketch, center: float) -> float:
+    """Median of |x - center| over the sketch's buckets (statistics.median semantics)."""
+    deviations = sorted((abs(value - center), count) for value, count in sketch.items())
+    n = sketch.count
+    if not n:
+        return 0.0
+    lo_rank, hi_rank = (n - 1) // 2, n // 2
+    lo = hi = None
+    seen = 0
+    for deviation, count in deviations:
+        seen += count
+        if lo is None and seen > lo_rank:
+            lo = deviation
+        if seen > hi_rank:
+            hi = deviation
+            break
+    return (lo + hi) / 2.0
 
 
 class TelemetryWindow:
     """
     Bounded sliding window for telemetry analysis.
     
-    Thread-safe. All operations are O(1) amortized or O(n) where n is window size.
+    Thread-safe. add() is O(1) amortized; summarize() is bounded by the sketch
+    bucket count rather than the number of samples.
     Window size is bounded by time (window_s) not count, with implicit max ~500 samples.
     """
     
     # Expected telemetry rate for confidence calculation
     EXPECTED_HZ = 5.0
     MAX_SAMPLES = 500  # Hard cap to bound memory
+    # Sketch accuracy; with <= MAX_SAMPLES values a fine grid costs little
+    RELATIVE_ACCURACY = 0.001
     
     def __init__(self, window_s: float = 5.0):
         self.window_s = float(window_s)
-        # store tuples: (mono_s, seq, cpu_pct, mem_pct, raw_packet)
-        self._dq: Deque[Tuple[float, int, float, float, Dict[str, Any]]] = deque(maxlen=self.MAX_SAMPLES)
+        # store tuples: (mono_s, seq, cpu_pct, mem_pct, raw_packet, index,
+        #                missing, out_of_order) where the last two count the
+        #                sequence step from the previous sample
+        self._dq: Deque[Tuple[float, int, float, float, Dict[str, Any], int, int, int]] = deque()
         self.lock = Lock()
+        self._index = 0
+        # Sketches keyed by sample index; a gap is keyed by its earlier sample
+        self._gaps = WindowedQuantiles(relative_accuracy=self.RELATIVE_ACCURACY)
+        self._cpus = WindowedQuantiles(relative_accuracy=self.RELATIVE_ACCURACY)
+        self._mems = WindowedQuantiles(relative_accuracy=self.RELATIVE_ACCURACY)
+        self._missing_seq_count = 0
+        self._out_of_order_count = 0
         # Track last received heartbeat age from telemetry
         self._last_heartbeat_age_ms: float = 0.0
         self._last_failsafe: bool = False
@@ -56,14 +92,51 @@ class TelemetryWindow:
             pass
 
         with self.lock:
-            self._dq.append((mono_s, int(seq), cpu, mem, packet))
+            if len(self._dq) >= self.MAX_SAMPLES:
+                self._pop_locked()
+            index = self._index
+            self._index += 1
+            missing = out_of_order = 0
+            if self._dq:
+                prev = self._dq[-1]
+                self._gaps.append((mono_s - prev[0]) * 1000.0, prev[5])
+                diff = int(seq) - prev[1]
+                if diff > 1:
+                    missing = diff - 1
+                elif diff < 0:
+                    out_of_order = 1
+                self._missing_seq_count += missing
+                self._out_of_order_count += out_of_order
+            self._cpus.append(cpu, index)
+            self._mems.append(mem, index)
+            self._dq.append((mono_s, int(seq), cpu, mem, packet, index, missing, out_of_order))
             self._prune_locked(mono_s)
 
+    def _pop_locked(self) -> None:
+        """Drop the oldest sample and everything derived from it. Must hold lock."""
+        self._dq.popleft()
+        if not self._dq:
+            self._gaps.clear()
+            self._cpus.clear()
+            self._mems.clear()
+            self._missing_seq_count = 0
+            self._out_of_order_count = 0
+            return
+        head = self._dq[0]
+        # The step into the new head now starts outside the window
+        self._missing_seq_count -= head[6]
+        self._out_of_order_count -= head[7]
+        self._dq[0] = head[:6] + (0, 0)
+        first = head[5]
+        self._gaps.expire(first)
+        self._cpus.expire(first)
+        self._mems.expire(first)
+
     def _prune_locked(self, now_mono: float) -> None:
         """Remove samples older than window_s. Must hold lock."""
         cutoff = now_mono - self.window_s
         while self._dq and self._dq[0][0] < cutoff:
-            self._dq.popleft()
+            self._pop_locked()
 
     def get_confidence(self, now_mono: float) -> float:
         """Compute confidence as received_samples / expected_samples."""
@@ -86,7 +159,8 @@ class TelemetryWindow:
         """
         Return derived statistics for current window (best-effort).
         
-        All computations bounded by MAX_SAMPLES and non-blocking after lock acquisition.
+        Bounded by the sketch bucket count, not the sample count, and non-blocking
+        after lock acquisition. Percentiles are within RELATIVE_ACCURACY.
         """
         with self.lock:
             self._prune_locked(now_mono)
@@ -108,69 +182,46 @@ class TelemetryWindow:
                     "out_of_order_count": 0,
                 }
 
-            # Extract arrays (bounded by MAX_SAMPLES)
-            monos = [t[0] for t in self._dq]
-            seqs = [t[1] for t in self._dq]
-            cpus = [t[2] for t in self._dq]
-            mems = [t[3] for t in self._dq]
-
-        # Compute stats outside lock
-        last_mono = monos[-1]
-        telemetry_age_ms = max(0.0, (now_mono - last_mono) * 1000.0)
-
-        # Inter-arrival gaps in ms
-        gaps_ms: List[float] = []
-        for i in range(1, n):
-            g = (monos[i] - monos[i - 1]) * 1000.0
-            gaps_ms.append(g)
-
-        # Packets per second (median of instantaneous rates)
-        pps_list: List[float] = []
-        for g in gaps_ms:
-            if g > 0:
-                pps_list.append(1000.0 / g)
-
-        if pps_list:
-            rx_pps_median = float(statistics.median(pps_list))
-        elif n > 1 and monos[-1] > monos[0]:
-            rx_pps_median = (n - 1) / (monos[-1] - monos[0])
-        else:
-            rx_pps_median = 0.0
-
-        # Silence: max of current age and largest gap
-        silence_max_ms = telemetry_age_ms
-        if gaps_ms:
-            silence_max_ms = max(silence_max_ms, max(gaps_ms))
-
-        # Gap p95 and jitter
-        gap_p95_ms = 0.0
-        jitter_ms = 0.0
-        if gaps_ms:
-            gs_sorted = sorted(gaps_ms)
-            idx = min(int(len(gs_sorted) * 0.95), len(gs_sorted) - 1)
-            gap_p95_ms = gs_sorted[idx]
-            mean_gap = sum(gs_sorted) / len(gs_sorted)
-            jitter_ms = float(statistics.median([abs(g - mean_gap) for g in gs_sorted]))
-
-        # CPU stats
-        gcs_cpu_median = float(statistics.median(cpus)) if cpus else 0.0
-        cpu_sorted = sorted(cpus)
-        idx_cpu = min(int(len(cpu_sorted) * 0.95), len(cpu_sorted) - 1)
-        gcs_cpu_p95 = float(cpu_sorted[idx_cpu]) if cpu_sorted else 0.0
-
-        # Memory stats
-        gcs_mem_median = float(statistics.median(mems)) if mems else 0.0
-
-        # Sequence analysis (missing and out-of-order)
-        missing_seq_count = 0
-        out_of_order_count = 0
-        if len(seqs) > 1:
-            for i in range(1, len(seqs)):
-                diff = seqs[i] - seqs[i - 1]
-                if diff > 1:
-                    missing_seq_count += diff - 1
-                elif diff < 0:
-                    out_of_order_count += 1
+            gaps = self._gaps
+            first_mono = self._dq[0][0]
+            last_mono = self._dq[-1][0]
+            last_seq = self._dq[-1][1]
+
+            # Telemetry age uses the newest sample
+            telemetry_age_ms = max(0.0, (now_mono - last_mono) * 1000.0)
+
+            # Packets per second (median of instantaneous rates over positive gaps)
+            positive = gaps.count - gaps.sketch.zero_count
+            if positive > 0:
+                base = gaps.sketch.zero_count
+                lo = gaps.value_at_rank(base + (positive - 1) // 2)
+                hi = gaps.value_at_rank(base + positive // 2)
+                rx_pps_median = (1000.0 / lo + 1000.0 / hi) / 2.0
+            elif n > 1 and last_mono > first_mono:
+                rx_pps_median = (n - 1) / (last_mono - first_mono)
+            else:
+                rx_pps_median = 0.0
+
+            # Silence: max of current age and largest gap
+            silence_max_ms = telemetry_age_ms
+            if gaps.count:
+                silence_max_ms = max(silence_max_ms, gaps.max)
+
+            # Gap p95 and jitter
+            gap_p95_ms = 0.0
+            jitter_ms = 0.0
+            if gaps.count:
+                gap_p95_ms = gaps.quantile(0.95)
+                jitter_ms = _median_abs_deviation(gaps.sketch, gaps.mean)
+
+            # CPU and memory stats
+            gcs_cpu_median = self._cpus.median()
+            gcs_cpu_p95 = self._cpus.quantile(0.95)
+            gcs_mem_median = self._mems.median()
+
+            # Sequence analysis (missing and out-of-order), kept as running totals
+            missing_seq_count = self._missing_seq_count
+            out_of_order_count = self._out_of_order_count
 
         # Confidence
         expected = self.EXPECTED_HZ * self.window_s
@@ -186,7 +237,7 @@ class TelemetryWindow:
             "gcs_cpu_median": round(gcs_cpu_median, 1),
             "gcs_cpu_p95": round(gcs_cpu_p95, 1),
             "gcs_mem_median": round(gcs_mem_median, 1),
-            "last_seq": seqs[-1],
+            "last_seq": last_seq,
             "confidence": round(confidence, 3),
             "missing_seq_count": missing_seq_count,
             "out_of_order_count": out_of_order_count,
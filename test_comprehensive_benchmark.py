@@ -485,11 +485,14 @@ def main():
     # Create and run benchmark
     runner = ComprehensiveBenchmarkRunner(role=args.role, config=config)
     
-    summary = runner.run_all_suites(
-        suite_filter=args.filter,
-        gcs_sig_secret=gcs_sig_secret,
-        gcs_sig_public=gcs_sig_public,
-    )
+    try:
+        summary = runner.run_all_suites(
+            suite_filter=args.filter,
+            gcs_sig_secret=gcs_sig_secret,
+            gcs_sig_public=gcs_sig_public,
+        )
+    finally:
+        runner.aggregator.close()
     
     # Exit code based on success rate
     if summary["success_rate"] >= 90:
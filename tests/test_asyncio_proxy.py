@@ -0,0 +1,209 @@
+import asyncio
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import async_proxy, asyncio_proxy
+from core.async_proxy import _build_sender_receiver, _compute_aead_ids, run_proxy
+from core.asyncio_proxy import serve_proxy
+from core.config import CONFIG
+from core.suites import get_suite
+
+SUITE = get_suite("cs-mlkem768-aesgcm-mldsa65")
+SESSION_ID = b"loopsess"
+K_D2G = bytes(range(32))
+K_G2D = bytes(range(32, 64))
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _cfg() -> dict:
+    cfg = dict(CONFIG)
+    cfg.update(
+        DRONE_HOST="127.0.0.1",
+        GCS_HOST="127.0.0.1",
+        DRONE_PLAINTEXT_HOST="127.0.0.1",
+        GCS_PLAINTEXT_HOST="127.0.0.1",
+        UDP_DRONE_RX=_free_port(),
+        UDP_GCS_RX=_free_port(),
+        DRONE_PLAINTEXT_TX=_free_port(),
+        DRONE_PLAINTEXT_RX=_free_port(),
+        GCS_PLAINTEXT_TX=_free_port(),
+        GCS_PLAINTEXT_RX=_free_port(),
+        # Source IP only, so the test can inject packets from its own socket.
+        STRICT_UDP_PEER_MATCH=False,
+        ENABLE_TCP_CONTROL=False,
+        KEM_POOL_DEPTH=0,
+        HANDSHAKE_CRYPTO_OFFLOAD=False,
+        REKEY_RESUME_MAX=0,
+    )
+    return cfg
+
+
+@pytest.fixture
+def stub_handshake(monkeypatch):
+    def _handshake(role, suite, _secret, _public, cfg, **kwargs):
+        if kwargs.get("ready_event") is not None:
+            kwargs["ready_event"].set()
+        peer = ("127.0.0.1", cfg["UDP_GCS_RX"] if role == "drone" else cfg["UDP_DRONE_RX"])
+        return K_D2G, K_G2D, b"", b"", SESSION_ID, suite["kem_name"], suite["sig_name"], peer
+
+    monkeypatch.setattr(async_proxy, "_perform_handshake", _handshake)
+    monkeypatch.setattr(asyncio_proxy, "_perform_handshake", _handshake)
+
+
+class _AsyncioRunner:
+    """serve_proxy on its own loop in a thread, stopped through stop_event."""
+
+    def __init__(self, role: str, cfg: dict) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.stop_event = asyncio.Event()
+        self.result = None
+        self.thread = threading.Thread(target=self._run, args=(role, cfg), daemon=True)
+        self.thread.start()
+
+    def _run(self, role: str, cfg: dict) -> None:
+        self.result = self.loop.run_until_complete(
+            serve_proxy(role=role, suite=SUITE, cfg=cfg, gcs_sig_public=b"stub", quiet=True, stop_event=self.stop_event)
+        )
+
+    def stop(self) -> dict:
+        self.loop.call_soon_threadsafe(self.stop_event.set)
+        self.thread.join(timeout=5.0)
+        assert not self.thread.is_alive()
+        self.loop.close()
+        return self.result
+
+
+class _SelectorsRunner:
+    def __init__(self, role: str, cfg: dict, seconds: float) -> None:
+        self.result = None
+        self.thread = threading.Thread(
+            target=lambda: setattr(self, "result", run_proxy(
+                role=role, suite=SUITE, cfg=cfg, gcs_sig_public=b"stub", quiet=True, stop_after_seconds=seconds
+            )),
+            daemon=True,
+        )
+        self.thread.start()
+
+    def stop(self) -> dict:
+        self.thread.join(timeout=10.0)
+        assert not self.thread.is_alive()
+        return self.result
+
+
+def _app(port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", port))
+    sock.settimeout(0.05)
+    return sock
+
+
+def _recv_all(sock: socket.socket, expected: int, timeout: float = 3.0) -> list:
+    got = []
+    deadline = time.monotonic() + timeout
+    while len(got) < expected and time.monotonic() < deadline:
+        try:
+            got.append(sock.recvfrom(2048)[0])
+        except socket.timeout:
+            pass
+    return got
+
+
+def _exchange(cfg: dict, count: int = 20) -> None:
+    """Wait until both proxies forward, then check `count` packets each way."""
+
+    drone_app, gcs_app = _app(cfg["DRONE_PLAINTEXT_RX"]), _app(cfg["GCS_PLAINTEXT_RX"])
+    drone_in = ("127.0.0.1", cfg["DRONE_PLAINTEXT_TX"])
+    gcs_in = ("127.0.0.1", cfg["GCS_PLAINTEXT_TX"])
+    try:
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            drone_app.sendto(b"probe", drone_in)
+            gcs_app.sendto(b"probe", gcs_in)
+            if _recv_all(gcs_app, 1, 0.1) and _recv_all(drone_app, 1, 0.1):
+                break
+        else:
+            pytest.fail("proxies never started forwarding")
+        time.sleep(0.2)
+        for sock in (drone_app, gcs_app):
+            while _recv_all(sock, 1, 0.05):
+                pass
+
+        up = [b"up-%d" % k for k in range(count)]
+        down = [b"down-%d" % k for k in range(count)]
+        for a, b in zip(up, down):
+            drone_app.sendto(a, drone_in)
+            gcs_app.sendto(b, gcs_in)
+        assert sorted(_recv_all(gcs_app, count)) == sorted(up)
+        assert sorted(_recv_all(drone_app, count)) == sorted(down)
+    finally:
+        drone_app.close()
+        gcs_app.close()
+
+
+def _inject_replay_and_forgery(cfg: dict) -> None:
+    """Send the GCS one valid drone packet twice and one with a flipped tag."""
+
+    cfg = dict(cfg, SUITE_AEAD_TOKEN=SUITE["aead_token"])
+    aead_ids = _compute_aead_ids(SUITE, SUITE["kem_name"], SUITE["sig_name"])
+    sender, _receiver = _build_sender_receiver("drone", aead_ids, SESSION_ID, K_D2G, K_G2D, cfg)
+    sender._seq = 1_000_000  # far ahead of anything the drone proxy sent
+    frame = b"\x01injected" if cfg.get("ENABLE_PACKET_TYPE") else b"injected"
+    wire = sender.encrypt(frame)
+    forged = bytearray(sender.encrypt(frame))
+    forged[-1] ^= 0x01
+    gcs_enc = ("127.0.0.1", cfg["UDP_GCS_RX"])
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for payload in (wire, wire, bytes(forged)):
+            sock.sendto(payload, gcs_enc)
+    time.sleep(0.3)
+
+
+def test_asyncio_pair_forwards_counts_drops_and_stops(stub_handshake):
+    cfg = _cfg()
+    gcs = _AsyncioRunner("gcs", cfg)
+    drone = _AsyncioRunner("drone", cfg)
+    try:
+        _exchange(cfg)
+        _inject_replay_and_forgery(cfg)
+    finally:
+        drone_counters = drone.stop()
+        gcs_counters = gcs.stop()
+
+    assert gcs_counters["drop_replay"] == 1
+    assert gcs_counters["drop_auth"] == 1
+    assert gcs_counters["drops"] == 2
+    assert gcs_counters["ptx_out"] >= 21  # 20 forwarded, the probe and the injected packet
+    assert drone_counters["ptx_out"] >= 20 and drone_counters["drops"] == 0
+    # stop_event released every socket.
+    for port in (cfg["UDP_GCS_RX"], cfg["UDP_DRONE_RX"], cfg["GCS_PLAINTEXT_TX"], cfg["DRONE_PLAINTEXT_TX"]):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.bind(("127.0.0.1", port))
+
+
+def test_asyncio_gcs_interoperates_with_selectors_drone(stub_handshake):
+    cfg = _cfg()
+    gcs = _AsyncioRunner("gcs", cfg)
+    drone = _SelectorsRunner("drone", cfg, seconds=4.0)
+    try:
+        _exchange(cfg)
+        _inject_replay_and_forgery(cfg)
+    finally:
+        drone_counters = drone.stop()
+        gcs_counters = gcs.stop()
+
+    assert gcs_counters["drop_replay"] == 1 and gcs_counters["drop_auth"] == 1
+    assert gcs_counters["ptx_out"] >= 21
+    assert drone_counters["ptx_out"] >= 20 and drone_counters["drops"] == 0
@@ -0,0 +1,78 @@
+import socket
+import sys
+import threading
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import control_wire
+from core.control_tcp import ControlTcpConfig, ControlTcpServer, send_control_command
+from core.policy_engine import create_control_state
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_decoders_reassemble_split_input():
+    stream = b"".join(control_wire.encode_frame(control_wire.CODEC_JSON, rid, {"n": rid}) for rid in (1, 2, 3))
+    decoder = control_wire.FrameDecoder()
+    frames = []
+    for i in range(len(stream)):
+        frames += decoder.feed(stream[i : i + 1])
+    assert [(rid, control_wire.decode_body(codec, body)) for codec, rid, body in frames] == [
+        (1, {"n": 1}),
+        (2, {"n": 2}),
+        (3, {"n": 3}),
+    ]
+
+    lines = control_wire.LineDecoder()
+    assert lines.feed(b'{"a":1}\n{"b"') == [b'{"a":1}']
+    assert lines.feed(b':2}\n\n') == [b'{"b":2}', b""]
+
+
+def test_framed_and_legacy_clients_share_control_listener():
+    port = _free_port()
+    server = ControlTcpServer(
+        ControlTcpConfig(
+            host="127.0.0.1",
+            port=port,
+            allowed_peers=(),
+            rekey_allowed_peers=(),
+            role="gcs",
+            coordinator_role="gcs",
+        ),
+        create_control_state("gcs", "cs-mlkem768-aesgcm-mldsa65"),
+        quiet=True,
+    )
+    assert server.start()
+    channel = control_wire.ControlChannel("127.0.0.1", port, timeout=2.0)
+    try:
+        replies = []
+
+        def worker():
+            for _ in range(20):
+                replies.append(channel.request({"cmd": "status"}))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5.0)
+        assert len(replies) == 80
+        assert all(r["ok"] and r["suite"] == "cs-mlkem768-aesgcm-mldsa65" for r in replies)
+        assert channel.request({"cmd": "nope"}) == {"ok": False, "error": "unknown_cmd"}
+
+        stats = channel.stats()
+        assert stats["connects"] == 1
+        assert stats["rtt"]["status"]["count"] == 80
+
+        assert send_control_command("127.0.0.1", port, {"cmd": "ping"}, timeout=2.0)["ok"] is True
+    finally:
+        channel.close()
+        server.stop()
+
+    assert channel.request({"cmd": "ping"})["error"].startswith("connect_failed")
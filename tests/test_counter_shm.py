@@ -0,0 +1,59 @@
+import struct
+import sys
+import threading
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import async_proxy
+from core.counter_shm import _HEADER, _SEQ_OFFSET, CounterReader, CounterWriter
+
+
+def test_reader_sees_only_whole_publishes(tmp_path):
+    path = str(tmp_path / "counters")
+    writer = CounterWriter(path, ("enc_in", "enc_out", "drops"))
+    writer.publish((0, 0, 0))
+    stop = threading.Event()
+
+    def publish():
+        n = 0
+        while not stop.is_set():
+            n += 1
+            writer.publish((n, 2 * n, 3 * n))
+
+    thread = threading.Thread(target=publish)
+    thread.start()
+    try:
+        with CounterReader(path) as reader:
+            assert reader.fields == ("enc_in", "enc_out", "drops")
+            for _ in range(2000):
+                row = reader.read()
+                assert row["enc_out"] == 2 * row["enc_in"] and row["drops"] == 3 * row["enc_in"]
+                assert row["seq"] % 2 == 0
+    finally:
+        stop.set()
+        thread.join()
+    # seq/ts_ns and the values are naturally aligned u64s.
+    assert _SEQ_OFFSET == 16 and _HEADER.size % 8 == 0
+    raw = Path(path).read_bytes()
+    assert struct.unpack_from("<Q", raw, 16)[0] == writer._seq
+    writer.close()
+    assert not Path(path).exists()
+
+
+def test_proxy_counter_export_publishes_datapath_and_rekey_counters(tmp_path):
+    counters = async_proxy.ProxyCounters()
+    counters.datapath.enc_in = 7
+    counters.datapath.drop_auth = 2
+    counters.rekeys_ok = 3
+    counters.shards[1] = {"fields": {"enc_in": 5}}
+    path = str(tmp_path / "proxy-counters")
+
+    stop_export = async_proxy._start_counter_export(counters, path, {"STATUS_SHM_HZ": 200.0}, "drone")
+    with CounterReader(path) as reader:
+        counters.datapath.enc_out = 11
+        stop_export()  # publishes a final row before removing the segment
+        row = reader.read()
+    assert (row["enc_in"], row["enc_out"], row["drop_auth"], row["rekeys_ok"]) == (12, 11, 2, 3)
+    assert reader.fields == async_proxy._EXPORT_FIELDS
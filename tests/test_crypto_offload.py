@@ -0,0 +1,94 @@
+import multiprocessing
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import crypto_offload, handshake
+
+
+class _FakeKem:
+    def __init__(self, name):
+        self.name = name
+
+    def generate_keypair(self):
+        return b"pub-" + self.name.encode()
+
+    def decap_secret(self, ciphertext):
+        return b"ss-" + ciphertext
+
+
+class _FakeSig:
+    def __init__(self, name, secret_key=None):
+        self.name = name
+        self.secret_key = secret_key
+
+    def export_secret_key(self):
+        return self.secret_key
+
+    def sign(self, message):
+        return self.secret_key + b"|" + message
+
+
+@pytest.fixture
+def offload(monkeypatch):
+    monkeypatch.setattr(handshake, "KeyEncapsulation", _FakeKem)
+    monkeypatch.setattr(handshake, "Signature", _FakeSig)
+    parent, child = multiprocessing.Pipe()
+    # Run the worker loop on a thread so the fakes above apply to it.
+    worker = threading.Thread(target=crypto_offload._worker_main, args=(child,), daemon=True)
+    worker.start()
+    parent.recv_bytes()
+    off = crypto_offload.CryptoOffload()
+    off._proc, off._conn, off.generation = worker, parent, 1
+    yield off
+    parent.close()
+    worker.join(1.0)
+
+
+def test_kem_and_sign_round_trip_through_worker(offload):
+    kem = offload.kem("ML-KEM-768")
+    assert kem.generate_keypair() == b"pub-ML-KEM-768"
+    assert kem.decap_secret(b"ct") == b"ss-ct"
+    with pytest.raises(RuntimeError):
+        kem.decap_secret(b"ct")  # single use: the keypair is gone
+
+    signer = offload.signer(_FakeSig("ML-DSA-65", b"sk"), "ML-DSA-65")
+    assert signer.sign(b"transcript") == b"sk|transcript"
+    assert signer.sign(b"again") == b"sk|again"
+    assert offload.stats()["calls"] == 5  # keygen, decap, one key load, two signs
+
+
+def test_worker_rejects_malformed_requests(offload):
+    with pytest.raises(RuntimeError, match="unsupported request"):
+        offload.call(99, b"x")
+    with pytest.raises(RuntimeError, match="bad handle"):
+        offload.call(crypto_offload._OP_SIGN, b"\x01", b"msg")
+
+
+def test_handles_are_tagged_with_the_generation_that_made_them(offload, monkeypatch):
+    call = offload.call
+
+    def call_then_restart(*args, **kwargs):
+        # A restart between call() releasing the lock and the caller's next step.
+        result = call(*args, **kwargs)
+        offload.generation += 1
+        return result
+
+    kem = offload.kem("ML-KEM-768")
+    monkeypatch.setattr(offload, "call", call_then_restart)
+    assert kem.generate_keypair() == b"pub-ML-KEM-768"
+    monkeypatch.setattr(offload, "call", call)
+    assert kem._handle[0] == 1
+    with pytest.raises(RuntimeError, match="not available"):
+        kem.decap_secret(b"ct")
+
+    generation, (handle, _public) = offload.call(crypto_offload._OP_KEM_KEYGEN, b"ML-KEM-768")
+    assert generation == offload.generation == 2
+    with pytest.raises(RuntimeError, match="restarted"):
+        offload.call(crypto_offload._OP_KEM_DECAP, handle, b"ct", generation=1)
+    assert offload.call(crypto_offload._OP_KEM_DECAP, handle, b"ct", generation=2) == (2, [b"ss-ct"])
@@ -0,0 +1,91 @@
+import sys
+import threading
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.async_proxy import _DATAPATH_FIELDS, ProxyCounters
+
+# ProxyCounters.to_dict keys before the datapath counters moved to DatapathCounters.
+BASELINE_KEYS = {
+    "ptx_out", "ptx_in", "enc_out", "enc_in",
+    "ptx_bytes_out", "ptx_bytes_in", "enc_bytes_out", "enc_bytes_in", "bytes_out", "bytes_in",
+    "drops", "drop_replay", "drop_auth", "drop_header", "drop_session_epoch", "drop_other", "drop_src_addr",
+    "rekeys_ok", "rekeys_fail", "last_rekey_ms", "last_rekey_suite",
+    "rekey_interval_ms", "rekey_duration_ms", "rekey_blackout_duration_ms", "rekey_trigger_reason",
+    "handshake_metrics", "primitive_metrics",
+}
+ADDED_KEYS = {"rekeys_resumed", "rekey_prev_session_rx", "rekey_switch_ms", "rekey_switch_reason"}
+
+
+def _consistent(fields: dict) -> bool:
+    n = fields["enc_in"]
+    return (
+        fields["ptx_out"] == n
+        and fields["enc_bytes_in"] == 40 * n
+        and fields["ptx_bytes_out"] == 12 * n
+        and fields["drops"] == fields["drop_auth"] + fields["drop_replay"]
+    )
+
+
+def test_snapshots_never_see_a_half_written_packet():
+    dp = ProxyCounters().datapath
+    stop = threading.Event()
+
+    def _writer() -> None:
+        n = 0
+        while not stop.is_set():
+            n += 1
+            dp.seq += 1
+            dp.enc_in += 1
+            dp.enc_bytes_in += 40
+            dp.add_primitive("aead_decrypt_ok", 100, 40, 12)
+            dp.ptx_out += 1
+            dp.ptx_bytes_out += 12
+            if n % 3 == 0:
+                dp.drops += 1
+                dp.drop_auth += 1
+            if n % 5 == 0:
+                dp.drops += 1
+                dp.drop_replay += 1
+            dp.seq += 1
+
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    writer = threading.Thread(target=_writer, daemon=True)
+    writer.start()
+    try:
+        snaps = 0
+        while snaps < 2000:
+            fields, primitives, _batches = dp.snapshot()
+            assert _consistent(fields), fields
+            assert primitives["aead_decrypt_ok"][0] == fields["enc_in"]
+            values = dict(zip(_DATAPATH_FIELDS, dp.snapshot_fields()))
+            assert _consistent(values), values
+            snaps += 1
+    finally:
+        stop.set()
+        writer.join(timeout=5.0)
+        sys.setswitchinterval(old_interval)
+    assert dp.seq % 2 == 0 and dp.enc_in > 0
+
+
+def test_to_dict_keeps_the_baseline_counter_names():
+    counters = ProxyCounters()
+    dp = counters.datapath
+    dp.add_primitive("aead_encrypt", 1000, 10, 38)
+    dp.add_primitive("aead_decrypt_ok", 900, 38, 10)
+    dp.add_primitive("aead_decrypt_fail", 500, 38, 0)
+    for name in _DATAPATH_FIELDS:
+        setattr(dp, name, 7)
+
+    result = counters.to_dict()
+    assert set(result) == BASELINE_KEYS | ADDED_KEYS
+    for name in _DATAPATH_FIELDS:
+        assert result[name] == 7
+    assert result["bytes_out"] == result["enc_bytes_out"] and result["bytes_in"] == result["enc_bytes_in"]
+    assert set(result["primitive_metrics"]) == {"aead_encrypt", "aead_decrypt_ok", "aead_decrypt_fail"}
+    assert set(result["primitive_metrics"]["aead_encrypt"]) == {
+        "count", "total_ns", "min_ns", "max_ns", "total_in_bytes", "total_out_bytes",
+    }
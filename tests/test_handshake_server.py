@@ -0,0 +1,75 @@
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import handshake_server
+from core.handshake import ServerEphemeral, ServerHandshake
+
+SUITE = {"suite_id": "cs-mlkem768-aesgcm-mldsa65"}
+TAG = b"t" * 32
+
+
+class _FakeKem:
+    def __init__(self):
+        self.freed = False
+
+    def free(self):
+        self.freed = True
+
+
+def _fake_begin(suite, gcs_sig_secret, *, kem_pool=None, offload=None):
+    ephemeral = ServerEphemeral("kem", "sig", b"\x01" * 8, _FakeKem(), b"\x02" * 8)
+    return ServerHandshake(b"hello", ephemeral, {}, time.perf_counter_ns())
+
+
+def _fake_complete(state, kem_ct, tag, *, peer_ip="unknown"):
+    state.abort()
+    return (b"k" * 32, b"K" * 32, b"", b"", state.ephemeral.session_id, "kem", "sig", {"ct": kem_ct})
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_stalled_client_does_not_block_drone(monkeypatch):
+    monkeypatch.setattr(handshake_server, "server_begin_handshake", _fake_begin)
+    monkeypatch.setattr(handshake_server, "server_complete_handshake", _fake_complete)
+    cfg = {
+        "TCP_HANDSHAKE_PORT": _free_port(),
+        "DRONE_HOST": "127.0.0.1",
+        "HANDSHAKE_RL_BURST": 10,
+    }
+    ready = threading.Event()
+    out = {}
+
+    def serve():
+        out["result"] = handshake_server.serve_gcs_handshake(
+            cfg, SUITE, object(), io_timeout=10.0, accept_deadline_s=5.0, ready_event=ready
+        )
+
+    server = threading.Thread(target=serve, daemon=True)
+    server.start()
+    assert ready.wait(2.0)
+
+    stalled = [socket.create_connection(("127.0.0.1", cfg["TCP_HANDSHAKE_PORT"])) for _ in range(3)]
+    start = time.monotonic()
+    with socket.create_connection(("127.0.0.1", cfg["TCP_HANDSHAKE_PORT"])) as drone:
+        (hello_len,) = struct.unpack("!I", drone.recv(4))
+        assert drone.recv(hello_len) == b"hello"
+        drone.sendall(struct.pack("!I", 3) + b"ct!" + TAG)
+        server.join(2.0)
+    assert time.monotonic() - start < 2.0
+    for sock in stalled:
+        sock.close()
+
+    result, ip = out["result"]
+    assert ip == "127.0.0.1"
+    assert result[4] == b"\x01" * 8 and result[7] == {"ct": b"ct!"}
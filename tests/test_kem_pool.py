@@ -0,0 +1,105 @@
+import functools
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.async_proxy import _prewarm_suites
+from core.config import CONFIG
+from core.control_tcp import send_control_command, start_control_server_if_enabled
+from core.kem_pool import KemKeypairPool
+from core.policy_engine import create_control_state
+from core.suites import get_suite
+from sscheduler.benchmark_policy import BenchmarkPolicy
+
+
+class _FakeKem:
+    created = 0
+
+    def __init__(self, name: str):
+        _FakeKem.created += 1
+        self.name = name
+        self.freed = False
+
+    def generate_keypair(self) -> bytes:
+        return f"{self.name}-{_FakeKem.created}".encode()
+
+    def free(self) -> None:
+        self.freed = True
+
+
+def _wait_ready(pool: KemKeypairPool, name: str, count: int, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pool.stats()["ready"].get(name, 0) >= count:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"pool never filled {name}")
+
+
+def test_keypairs_are_single_use_and_counted():
+    pool = KemKeypairPool(_FakeKem, depth=2, ttl_s=60.0)
+    pool.prefill(["ML-KEM-768"])
+    pool.start()
+    try:
+        _wait_ready(pool, "ML-KEM-768", 2)
+        first = pool.take("ML-KEM-768")
+        second = pool.take("ML-KEM-768")
+        assert first is not None and second is not None
+        assert first.public_key != second.public_key
+        assert pool.take("HQC-128") is None
+
+        stats = pool.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == round(2 / 3, 4)
+        # The miss retargets the pool at the requested algorithm.
+        _wait_ready(pool, "HQC-128", 1)
+    finally:
+        pool.stop()
+
+
+def test_expired_keypairs_are_freed_not_served():
+    pool = KemKeypairPool(_FakeKem, depth=1, ttl_s=0.2)
+    pool.prefill(["ML-KEM-512"])
+    pool.start()
+    try:
+        _wait_ready(pool, "ML-KEM-512", 1)
+        stale = pool._entries["ML-KEM-512"][0]
+        time.sleep(0.3)
+        taken = pool.take("ML-KEM-512")
+        assert taken is None or taken.kem_obj is not stale.kem_obj
+        assert stale.kem_obj.freed
+        assert pool.stats()["expired"] >= 1
+    finally:
+        pool.stop()
+
+
+def test_policy_hint_prewarms_pool_over_control(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # BenchmarkPolicy creates logs/benchmarks
+    suites = ["cs-mlkem512-aesgcm-mldsa44", "cs-mlkem1024-aesgcm-mldsa87"]
+    policy = BenchmarkPolicy(suite_list=suites)
+    policy.current_index = 0
+    hint = policy.likely_next()
+    assert hint == [suites[1]]
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    cfg = dict(CONFIG, GCS_CONTROL_HOST="127.0.0.1", GCS_CONTROL_PORT=port)
+    pool = KemKeypairPool(_FakeKem, depth=1, ttl_s=60.0)
+    state = create_control_state("gcs", suites[0])
+    state.prewarm = functools.partial(_prewarm_suites, pool)
+    server = start_control_server_if_enabled(role="gcs", cfg=cfg, control_state=state, quiet=True, enabled=True)
+    assert server is not None
+    pool.start()
+    try:
+        reply = send_control_command("127.0.0.1", port, {"cmd": "prewarm", "suites": hint}, timeout=2.0)
+        assert reply["ok"] is True and reply["suites"] == hint
+        _wait_ready(pool, get_suite(suites[1])["kem_name"], 1)
+    finally:
+        server.stop()
+        pool.stop()
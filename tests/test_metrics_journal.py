@@ -0,0 +1,53 @@
+import json
+import sys
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.metrics_aggregator import MetricsAggregator
+from core.metrics_journal import SuiteJournal, journal_path, replay_journal
+from core.metrics_schema import ComprehensiveSuiteMetrics
+
+
+def test_journal_writes_changed_fields_and_survives_torn_tail(tmp_path):
+    path = tmp_path / "suite.journal.jsonl"
+    m = ComprehensiveSuiteMetrics()
+    journal = SuiteJournal(path, suite_id="cs-x", run_id="r", role="drone")
+    m.handshake.handshake_success = True
+    m.handshake.handshake_total_duration_ms = 12.5
+    journal.sections(m, ("handshake", "data_plane"))
+    journal.sections(m, ("handshake",))  # unchanged: nothing written
+    m.handshake.handshake_total_duration_ms = 13.0
+    journal.sections(m, ("handshake",))
+    journal.sample("sys", {"cpu_percent": 40.0})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write('{"k":"sys","t":1.0,"d":{"cpu_')  # crash mid-write
+
+    records = [json.loads(line) for line in path.read_text().splitlines()[:-1]]
+    assert [r["k"] for r in records] == ["open", "s", "s", "sys"]
+    assert records[1]["d"] == {"handshake_success": True, "handshake_total_duration_ms": 12.5}
+    assert records[2]["d"] == {"handshake_total_duration_ms": 13.0}
+
+    replay = replay_journal(path)
+    assert replay["complete"] is False
+    assert replay["system_samples"] == [{"cpu_percent": 40.0}]
+    assert replay["metrics"].handshake.handshake_total_duration_ms == 13.0
+    assert replay["metrics"].handshake.handshake_success is True
+
+
+def test_streaming_aggregator_journal_replays_to_final_metrics(tmp_path):
+    agg = MetricsAggregator(role="gcs", output_dir=str(tmp_path), streaming=True)
+    agg.set_run_id("run1")
+    agg.start_suite("cs-mlkem768-aesgcm-falcon512", {"kem_name": "ML-KEM-768", "sig_name": "Falcon-512"})
+    agg.record_handshake_start()
+    agg.record_handshake_end(success=True)
+    metrics = agg.finalize_suite()
+
+    assert agg._system_samples == []
+    replay = replay_journal(journal_path(tmp_path, "run1", "cs-mlkem768-aesgcm-falcon512", "gcs"))
+    assert replay["complete"] is True
+    assert len(replay["system_samples"]) == metrics.observability.log_sample_count >= 1
+    expected = json.loads(json.dumps(metrics.to_dict(), default=str))
+    assert ComprehensiveSuiteMetrics.from_dict(expected).to_dict() == replay["metrics"].to_dict()
@@ -0,0 +1,88 @@
+import math
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.config import CONFIG
+from core.metrics_aggregator import MetricsAggregator
+from core.metrics_collectors import PowerCollector
+from core.power_sampler import ROOT, SampleRingReader, SampleRingWriter, resolve_path
+
+
+def test_ring_read_since_counts_overruns(tmp_path):
+    writer = SampleRingWriter(str(tmp_path / "ring"), capacity=8, sample_hz=100.0)
+    reader = SampleRingReader(str(tmp_path / "ring"))
+
+    for k in range(5):
+        writer.publish(k * 0.01, 5.0, 0.5, 2.5, 0, 0, 0, k * 10_000_000)
+    rows, position = reader.read_since(0)
+    assert position == 5
+    assert [row[0] for row in rows] == [k * 0.01 for k in range(5)]
+
+    # 12 more rows overflow the 8-slot ring: the 4 oldest unread are lost.
+    for k in range(5, 17):
+        writer.publish(k * 0.01, 5.0, 0.5, float("nan"), 1, 2500, 0, k * 10_000_000)
+    rows, position = reader.read_since(position)
+    assert position == 17
+    assert [round(row[0] * 100) for row in rows] == list(range(9, 17))
+    assert all(math.isnan(row[3]) for row in rows)
+
+    stats = reader.stats()
+    assert stats["samples"] == 17 and stats["overruns"] == 4
+    assert stats["missed_deadlines"] == 1 and stats["max_late_us"] == 2.5
+    assert math.isclose(stats["achieved_hz"], 100.0)
+    assert stats["running"] is True and stats["policy"] == "default"
+
+    reader.close()
+    writer.close()
+
+
+def test_isolated_sampling_fills_buffer():
+    collector = PowerCollector(backend="none")
+    collector.backend = "mock"  # synthetic source in the sampler process
+    try:
+        collector.start_sampling(rate_hz=500.0, isolated=True)
+        time.sleep(0.6)
+        buffer = collector.stop_sampling()
+        report = collector.sampler_report()
+    finally:
+        collector.close()
+
+    assert report["requested_hz"] == 500.0
+    assert report["samples"] == len(buffer) > 100
+    assert report["achieved_hz"] > 250.0
+    stamps = [buffer[k]["mono_time"] for k in range(len(buffer))]
+    assert stamps == sorted(stamps)
+    assert collector.get_energy_stats(buffer)["power_avg_w"] > 0
+
+
+def test_aggregator_close_stops_sampler_process(monkeypatch, tmp_path):
+    monkeypatch.setitem(CONFIG, "POWER_SAMPLER_PROCESS", True)
+    agg = MetricsAggregator(role="drone", output_dir=str(tmp_path))
+    agg.mavlink_collector = None
+    agg.power_collector.backend = "mock"
+    agg.start_suite("cs-mlkem768-aesgcm-mldsa65", {})
+    sampler = agg.power_collector._sampler
+    assert sampler is not None and sampler.running
+    ring = resolve_path(sampler.ring)
+
+    agg.close()
+    assert not sampler.running and not agg.power_collector.sampling
+    assert agg.power_collector._sampler is None and not ring.exists()
+    agg.close()
+
+
+def test_orphaned_sampler_removes_ring(tmp_path):
+    ring = tmp_path / "ring"
+    # A parent pid that is not ours: the sampler sees itself orphaned on its first check.
+    proc = subprocess.run(
+        [sys.executable, "-m", "core.power_sampler", "--ring", str(ring), "--rate", "200",
+         "--backend", "mock", "--parent-pid", "1"],
+        cwd=str(ROOT), timeout=10,
+    )
+    assert proc.returncode == 0
+    assert not ring.exists()
@@ -0,0 +1,57 @@
+import math
+import sys
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import metrics_collectors
+from core.metrics_collectors import PowerCollector, PowerSampleBuffer
+
+
+def _rows(count):
+    rows = []
+    for k in range(count):
+        power = None if k % 37 == 5 else 4.0 + math.sin(k / 50.0)
+        rows.append({"mono_time": k * 0.001, "voltage_v": 5.0, "current_a": 0.8, "power_w": power})
+    return rows
+
+
+def _fill(buffer, rows):
+    for row in rows:
+        buffer.append(row["mono_time"], row["voltage_v"], row["current_a"], row["power_w"])
+    return buffer
+
+
+def _close(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        assert math.isclose(a[key], b[key], rel_tol=1e-6, abs_tol=1e-9), key
+
+
+def test_buffer_stats_match_dict_samples(monkeypatch):
+    rows = _rows(5000)
+    collector = PowerCollector.__new__(PowerCollector)
+    expected = collector.get_energy_stats(rows)
+    assert expected["sample_count"] == 5000 and expected["duration_s"] > 4.9
+
+    running = _fill(PowerSampleBuffer(initial=16), rows)
+    assert running.energy_stats() == collector.get_energy_stats(running)
+    _close(running.energy_stats(), expected)
+    _close(_fill(PowerSampleBuffer(initial=16, running_sums=False), rows).energy_stats(), expected)
+    monkeypatch.setattr(metrics_collectors, "HAS_NUMPY", False)
+    _close(collector.get_energy_stats(rows), expected)
+    assert collector.get_energy_stats(rows[:1])["energy_total_j"] is None
+
+
+def test_buffer_ring_keeps_latest_rows_and_whole_run_sums():
+    rows = _rows(2500)
+    ring = _fill(PowerSampleBuffer(max_samples=1000, initial=10), rows)
+    assert len(ring) == 1000 and ring.nbytes == 1000 * 20
+    assert [s["mono_time"] for s in ring[:2]] == [rows[1500]["mono_time"], rows[1501]["mono_time"]]
+    assert ring[-1]["mono_time"] == rows[-1]["mono_time"]
+    assert ring[1522 - 1500]["power_w"] is None  # failed read
+    assert ring.energy_stats()["sample_count"] == 2500
+    assert math.isclose(ring.energy_stats()["duration_s"], rows[-1]["mono_time"] - rows[0]["mono_time"])
+    mono, _volt, _curr, power = ring.columns()
+    assert len(mono) == len(power) == 1000 and mono[0] == rows[1500]["mono_time"]
@@ -0,0 +1,65 @@
+import csv
+import sys
+import types
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import power_monitor, power_trace
+from tools.power_utils import load_power_trace
+
+
+class _FakeBus:
+    def __init__(self, _bus):
+        pass
+
+    def write_i2c_block_data(self, *_args):
+        pass
+
+    def read_i2c_block_data(self, _address, register, _length):
+        return [0x01, 0x90] if register == 0x01 else [0x4E, 0x20]
+
+
+def test_trace_writer_roundtrip_and_converters(tmp_path):
+    path = tmp_path / "trace.pqpt"
+    writer = power_trace.PowerTraceWriter(path, sample_hz=1000, sign_factor=-1, start_ns=123, chunk_records=8)
+    rows = [(1_000_000 * k, 0.5 + k * 1e-3, 5.0, (0.5 + k * 1e-3) * 5.0) for k in range(20)]
+    for row in rows[:10]:
+        writer.append(*row)
+    # Readable while the capture is still running
+    assert power_trace.read_header(path)["count"] == 10
+    for row in rows[10:]:
+        writer.append(*row)
+    writer.close()
+
+    assert path.stat().st_size == power_trace.HEADER_SIZE + 20 * power_trace.RECORD.size
+    header = power_trace.read_header(path)
+    assert header == {"sign_factor": -1, "sample_hz": 1000.0, "start_ns": 123, "count": 20}
+    assert list(power_trace.iter_records(path)) == rows
+    _header, records = power_trace.read_trace(path)
+    assert records["timestamp_ns"].tolist() == [row[0] for row in rows]
+
+    out = power_trace.trace_to_csv(path)
+    with open(out, newline="", encoding="utf-8") as handle:
+        table = list(csv.reader(handle))
+    assert tuple(table[0]) == power_trace.CSV_COLUMNS
+    assert table[1] == ["0", "0.500000", "5.000000", "2.500000", "-1"]
+    loaded = load_power_trace(path)
+    assert [s.power_w for s in loaded] == [-row[3] for row in rows]
+    assert [s.power_w for s in load_power_trace(out)] == [round(-row[3], 6) for row in rows]
+
+
+def test_capture_writes_binary_or_csv_trace(tmp_path, monkeypatch):
+    monkeypatch.setattr(power_monitor, "smbus", types.SimpleNamespace(SMBus=_FakeBus))
+    for trace_format in ("binary", "csv"):
+        monitor = power_monitor.Ina219PowerMonitor(
+            tmp_path / trace_format, sample_hz=500, sign_mode="positive", trace_format=trace_format
+        )
+        summary = monitor.capture(label="suite", duration_s=0.1)
+        assert summary.trace_format == trace_format and summary.samples > 10
+        trace = Path(summary.csv_path)
+        if trace_format == "binary":
+            assert trace.suffix == power_trace.SUFFIX
+            assert power_trace.read_header(trace)["count"] == summary.samples
+        assert len(load_power_trace(trace)) == summary.samples
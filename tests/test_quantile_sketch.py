@@ -0,0 +1,54 @@
+import random
+import sys
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.metrics_collectors import LatencyTracker
+from core.quantile_sketch import QuantileSketch, WindowedQuantiles
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def test_sketch_quantiles_merge_and_remove_within_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(2.0, 1.5) for _ in range(20000)] + [0.0] * 50
+    left, right = QuantileSketch(0.01), QuantileSketch(0.01)
+    for i, value in enumerate(values):
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+    assert left.count == len(values)
+    for q in (0.0, 0.5, 0.9, 0.95, 0.99, 1.0):
+        exact = _exact(values, q)
+        assert abs(left.quantile(q) - exact) <= 0.01 * exact + 1e-12
+    assert left.max == max(values) and left.min == 0.0
+
+    window = WindowedQuantiles(max_samples=1000)
+    for value in values:
+        window.append(value)
+    tail = values[-1000:]
+    assert len(window) == 1000 and list(window) == tail
+    assert window.max == max(tail) and window.min == min(tail)
+    assert abs(window.mean - sum(tail) / len(tail)) < 1e-6
+    for q in (0.5, 0.95, 0.99):
+        exact = _exact(tail, q)
+        assert abs(window.quantile(q) - exact) <= 0.01 * exact + 1e-12
+
+
+def test_latency_tracker_keeps_its_stats_contract():
+    tracker = LatencyTracker(max_samples=500)
+    assert tracker.get_stats()["count"] == 0
+    for i in range(2000):
+        tracker.record(1.0 + (i % 250) * 0.1)
+    stats = tracker.get_stats()
+    samples = tracker.get_samples()
+    assert stats["count"] == len(samples) == 500
+    assert stats["min_ms"] == min(samples) and stats["max_ms"] == max(samples)
+    for key, q in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+        assert abs(stats[key] - _exact(samples, q)) <= 0.01 * _exact(samples, q)
+    tracker.clear()
+    assert tracker.get_samples() == [] and tracker.get_stats()["p99_ms"] == 0.0
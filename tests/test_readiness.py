@@ -0,0 +1,76 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add root to path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from core.readiness import ReadyPipe
+
+# Child: report each step after the parent writes a line to its stdin.
+_CHILD = """
+import sys
+from core.readiness import ReadySignal
+ready = ReadySignal(int(sys.argv[1]))
+ready.set()
+sys.stdin.readline()
+ready.status({"status": "running"})
+ready.status({"status": "handshake_ok", "suite": "cs-x", "handshake_metrics": {"total_ms": 1.5}})
+sys.stdin.readline()
+ready.failed("boom")
+sys.stdin.readline()
+"""
+
+
+def _spawn(pipe: ReadyPipe, code: str) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-c", code, str(pipe.child_fd)],
+        cwd=str(ROOT), stdin=subprocess.PIPE, pass_fds=(pipe.child_fd,),
+    )
+    pipe.child_started()
+    return proc
+
+
+def _step(proc: subprocess.Popen) -> None:
+    proc.stdin.write(b"\n")
+    proc.stdin.flush()
+
+
+def test_events_are_delivered_in_order():
+    pipe = ReadyPipe()
+    proc = _spawn(pipe, _CHILD)
+    try:
+        assert pipe.wait(["listening"], timeout=10.0) == {"event": "listening"}
+        assert pipe.wait(["handshake_ok"], timeout=0.2) is None
+        _step(proc)
+        msg = pipe.wait(["handshake_ok"], timeout=10.0)
+        assert msg == {"event": "handshake_ok", "suite": "cs-x", "handshake_metrics": {"total_ms": 1.5}}
+        # Already-seen events return at once.
+        assert pipe.wait(["listening"], timeout=0.0) == {"event": "listening"}
+        _step(proc)
+        # failed() answers any wait, including one for an event never sent.
+        assert pipe.wait(["stopped"], timeout=10.0) == {"event": "failed", "reason": "boom"}
+        _step(proc)
+        assert proc.wait(timeout=10.0) == 0
+    finally:
+        proc.kill()
+        proc.wait()
+        pipe.close()
+
+
+def test_silent_exit_is_reported_and_silence_times_out():
+    pipe = ReadyPipe()
+    proc = _spawn(pipe, "import sys; sys.stdin.readline()")
+    try:
+        start = time.monotonic()
+        assert pipe.wait(["listening"], timeout=0.3, alive=lambda: proc.poll() is None) is None
+        assert time.monotonic() - start >= 0.3
+        _step(proc)
+        proc.wait(timeout=10.0)
+        assert pipe.wait(["listening"], timeout=10.0) == {"event": "failed", "reason": "exited"}
+    finally:
+        proc.kill()
+        proc.wait()
+        pipe.close()
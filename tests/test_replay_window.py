@@ -0,0 +1,58 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.aead import SEQ_LANE_SHIFT, AeadIds, Receiver, ReplayError
+from core.config import CONFIG
+
+
+def _receiver(window: int) -> Receiver:
+    return Receiver(CONFIG["WIRE_VERSION"], AeadIds(1, 1, 1, 1), b"12345678", 0, bytes(32), window)
+
+
+def _reference_accepts(state: dict, seq: int, window: int) -> bool:
+    """Sliding-window semantics the ring must reproduce exactly."""
+    high = state.get("high", -1)
+    seen = state.setdefault("seen", set())
+    if seq > high:
+        state["high"] = seq
+    elif seq <= high - window or seq in seen:
+        return False
+    seen.add(seq)
+    return True
+
+
+@pytest.mark.parametrize("window", [64, 100, 1024, 8192])
+def test_ring_matches_reference_window(window):
+    rng = random.Random(window)
+    receiver = _receiver(window)
+    states = {}
+    seq_by_lane = {0: 0, 3: 3 << SEQ_LANE_SHIFT}
+    for _ in range(20000):
+        lane = rng.choice((0, 0, 0, 3))
+        # Mostly forward with jitter, occasional jumps past the ring and replays.
+        step = rng.choice(
+            (1, 1, 1, 2, 5, -3, window // 2, -(window // 3), -window + 1, -window - 1, 0, 3 * window)
+        )
+        seq = max(lane << SEQ_LANE_SHIFT, seq_by_lane[lane] + step)
+        seq_by_lane[lane] = max(seq_by_lane[lane], seq)
+        expected = _reference_accepts(states.setdefault(lane, {}), seq, window)
+        assert (receiver._accept_seq(seq) is not None) == expected, (lane, seq)
+
+
+def test_reset_replay_forgets_seen_sequences():
+    receiver = _receiver(64)
+    for seq in range(10):
+        receiver._check_replay(seq)
+    receiver._accept_seq((1 << SEQ_LANE_SHIFT) + 5)
+    with pytest.raises(ReplayError):
+        receiver._check_replay(5)
+
+    receiver.reset_replay()
+    receiver._check_replay(5)
+    assert receiver._accept_seq((1 << SEQ_LANE_SHIFT) + 5) is not None
@@ -0,0 +1,71 @@
+import os
+import sys
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.policy_engine import (
+    create_control_state,
+    handle_control,
+    request_prepare,
+    set_coordinator_role,
+    take_resume_nonces,
+)
+from core.resumption import ResumptionState
+
+SUITE = "cs-mlkem768-aesgcm-mldsa65"
+
+
+def _pair(max_resumes: int = 8):
+    states, resumptions = {}, {}
+    keys = (os.urandom(32), os.urandom(32))
+    for role in ("gcs", "drone"):
+        state = create_control_state(role, SUITE)
+        set_coordinator_role(state, "gcs")
+        resumption = ResumptionState(max_resumes)
+        resumption.install(SUITE, b"\x01" * 8, *keys)
+        state.can_resume = resumption.can_resume
+        states[role], resumptions[role] = state, resumption
+    return states, resumptions
+
+
+def _negotiate(states, suite: str) -> str:
+    gcs, drone = states["gcs"], states["drone"]
+    rid = request_prepare(gcs, suite)
+    prepare = gcs.outbox.get_nowait()
+    prepare_ok = handle_control(prepare, "drone", drone).send[0]
+    commit = handle_control(prepare_ok, "gcs", gcs).send[0]
+    handle_control(commit, "drone", drone)
+    return rid
+
+
+def test_resumed_rekey_derives_matching_fresh_keys():
+    states, resumptions = _pair()
+    rid = _negotiate(states, SUITE)
+
+    derived = {}
+    for role in ("gcs", "drone"):
+        nonces = take_resume_nonces(states[role], rid)
+        assert nonces is not None
+        derived[role] = resumptions[role].derive(SUITE, *nonces)[:3]
+    assert derived["gcs"] == derived["drone"]
+    k_d2g, k_g2d, session_id = derived["gcs"]
+    assert len(session_id) == 8 and session_id != b"\x01" * 8
+    assert k_d2g != k_g2d
+
+
+def test_suite_change_and_chain_limit_fall_back_to_full_handshake():
+    states, resumptions = _pair(max_resumes=1)
+    other = "cs-mlkem1024-aesgcm-mldsa87"
+    rid = _negotiate(states, other)
+    assert take_resume_nonces(states["gcs"], rid) is None
+    assert take_resume_nonces(states["drone"], rid) is None
+
+    for resumption in resumptions.values():
+        resumption.install(SUITE, b"\x02" * 8, os.urandom(32), os.urandom(32), resumed=True)
+        assert not resumption.can_resume(SUITE)
+    for state in states.values():
+        state.state = "RUNNING"
+    rid = _negotiate(states, SUITE)
+    assert take_resume_nonces(states["drone"], rid) is None
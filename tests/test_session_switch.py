@@ -0,0 +1,95 @@
+import sys
+import time
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.aead import AeadIds, Receiver, Sender
+from core.config import CONFIG
+from core.session_switch import SessionSwitch
+
+IDS = AeadIds(1, 1, 1, 1)
+
+
+def _pair(session_id: bytes, key: bytes):
+    version = CONFIG["WIRE_VERSION"]
+    return Sender(version, IDS, session_id, 0, key), Receiver(version, IDS, session_id, 0, key, 64)
+
+
+def test_previous_session_stays_readable_until_peer_switches():
+    old_tx, old_rx = _pair(b"oldsess1", bytes(32))
+    new_tx, new_rx = _pair(b"newsess1", bytes(range(32)))
+    switch = SessionSwitch(old_tx, old_rx)
+    in_flight = [old_tx.encrypt(b"old-%d" % i) for i in range(3)]
+
+    switch.install(new_tx, new_rx, grace_s=5.0, rid="r1")
+    # Still sending on the old session: the peer has not confirmed yet.
+    assert switch.current_sender() is old_tx
+    for wire in in_flight:
+        receiver = switch.receiver_for(wire)
+        assert receiver is old_rx
+        assert receiver.decrypt(wire) is not None
+        switch.delivered(receiver)
+
+    wire = new_tx.encrypt(b"new")
+    receiver = switch.receiver_for(wire)
+    assert receiver is new_rx and receiver.decrypt(wire) == b"new"
+    switch.delivered(receiver)
+
+    assert switch.current_sender() is new_tx
+    stats = switch.stats()
+    assert stats["generation"] == 1
+    assert stats["prev_rx"] == 3
+    assert stats["switch_reason"] == "peer_traffic"
+    assert stats["blackout_ms"] is not None
+
+
+def test_peer_confirmation_switches_sender():
+    old_tx, old_rx = _pair(b"oldsess2", bytes(32))
+    new_tx, new_rx = _pair(b"newsess2", bytes(range(32)))
+    switch = SessionSwitch(old_tx, old_rx)
+
+    # The peer's confirmation can arrive before our own handshake returns.
+    switch.confirm("r2")
+    switch.install(new_tx, new_rx, grace_s=5.0, rid="r2")
+    assert switch.current_sender() is new_tx
+    assert switch.switch_reason == "peer_ack"
+
+    switch.install(old_tx, old_rx, grace_s=5.0, rid="r3")
+    switch.confirm("other")
+    assert switch.current_sender() is new_tx
+    switch.confirm("r3")
+    assert switch.current_sender() is old_tx
+
+
+def test_grace_period_bounds_both_directions():
+    old_tx, old_rx = _pair(b"oldsess3", bytes(32))
+    new_tx, new_rx = _pair(b"newsess3", bytes(range(32)))
+    switch = SessionSwitch(old_tx, old_rx)
+    late = old_tx.encrypt(b"late")
+
+    switch.install(new_tx, new_rx, grace_s=0.05, rid="r4")
+    time.sleep(0.06)
+    assert switch.current_sender() is new_tx
+    assert switch.switch_reason == "timeout"
+    receiver = switch.receiver_for(late)
+    assert receiver is new_rx
+    assert receiver.decrypt(late) is None
+    assert receiver.last_error_reason() == "session"
+
+
+def test_back_to_back_install_promotes_pending_sender():
+    a_tx, a_rx = _pair(b"sessionA", bytes(32))
+    b_tx, b_rx = _pair(b"sessionB", bytes(range(32)))
+    c_tx, c_rx = _pair(b"sessionC", bytes(range(32, 64)))
+    switch = SessionSwitch(a_tx, a_rx)
+
+    switch.install(b_tx, b_rx, grace_s=5.0, rid="r5")
+    assert switch.current_sender() is a_tx
+    switch.install(c_tx, c_rx, grace_s=5.0, rid="r6")
+    # The peer installed B then C and keeps only B: A must not be used any more.
+    assert switch.current_sender() is b_tx
+    assert switch.prev_receiver is b_rx and switch.receiver is c_rx
+    switch.confirm("r6")
+    assert switch.current_sender() is c_tx
@@ -0,0 +1,108 @@
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.aead import AeadIds
+from core.async_proxy import _setup_sockets
+from core.config import CONFIG
+from core import sharded_proxy
+from core.sharded_proxy import ShardContext, ShardPool, ShardWorkerLost
+
+pytestmark = pytest.mark.skipif(not sharded_proxy.sharding_available(), reason="needs Linux SO_REUSEPORT")
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _setup():
+    cfg = dict(CONFIG)
+    cfg.update(
+        UDP_GCS_RX=_free_port(),
+        GCS_PLAINTEXT_HOST="127.0.0.1",
+        GCS_PLAINTEXT_TX=_free_port(),
+        GCS_PLAINTEXT_RX=_free_port(),
+        SUITE_AEAD_TOKEN="aesgcm",
+        ENABLE_PACKET_TYPE=False,
+    )
+    context = ShardContext(AeadIds(1, 1, 1, 1), b"shardsid", bytes(32), bytes(range(32)), "aesgcm",
+                           ("127.0.0.1", _free_port()))
+    return cfg, context
+
+
+def test_dead_worker_stops_pool_and_detaches_steering():
+    cfg, context = _setup()
+    with _setup_sockets("gcs", cfg, encrypted_peer=context.peer_addr, reuseport=True) as sockets:
+        pool = ShardPool("gcs", cfg, context, workers=2, app_peer_addr=("127.0.0.1", cfg["GCS_PLAINTEXT_RX"]))
+        pool.start(sockets["encrypted"])
+        try:
+            conn = pool.connections[0]
+            pool._procs[1].kill()
+            assert conn.poll(5.0)
+            with pytest.raises(ShardWorkerLost):
+                pool.receive(conn)
+            assert pool.connections == [] and not pool.steering
+        finally:
+            pool.stop()
+
+
+def test_pool_refuses_to_run_without_lane_steering(monkeypatch):
+    cfg, context = _setup()
+    pool = ShardPool("gcs", cfg, context, workers=2, app_peer_addr=("127.0.0.1", cfg["GCS_PLAINTEXT_RX"]))
+    procs = []
+
+    def _no_steering(sock, workers):
+        procs.extend(pool._procs.values())
+        raise OSError("SO_ATTACH_REUSEPORT_CBPF not permitted")
+
+    monkeypatch.setattr(sharded_proxy, "attach_lane_steering", _no_steering)
+    with _setup_sockets("gcs", cfg, encrypted_peer=context.peer_addr, reuseport=True) as sockets:
+        with pytest.raises(RuntimeError, match="steering"):
+            pool.start(sockets["encrypted"])
+    assert pool.connections == [] and not pool.steering
+    assert procs and not any(proc.is_alive() for proc in procs)
+
+
+def test_worker_requests_rekey_once_on_lane_exhaustion(monkeypatch):
+    cfg, context = _setup()
+    monkeypatch.setitem(CONFIG, "REKEY_SEQ_THRESHOLD", 2)  # lane 1 may send seq 0 and 1
+    parent, child = multiprocessing.Pipe()
+    peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    peer.bind(context.peer_addr)
+    peer.settimeout(2.0)
+    app = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    app.bind(("127.0.0.1", cfg["GCS_PLAINTEXT_RX"]))
+    try:
+        with _setup_sockets("gcs", cfg, encrypted_peer=context.peer_addr, reuseport=True) as sockets:
+            worker = threading.Thread(
+                target=sharded_proxy._worker_loop,
+                args=(1, child, "gcs", cfg, context, sockets, app.getsockname()),
+            )
+            worker.start()
+            try:
+                for k in range(5):
+                    app.sendto(b"pkt-%d" % k, ("127.0.0.1", cfg["GCS_PLAINTEXT_TX"]))
+                peer.recvfrom(2048)
+                peer.recvfrom(2048)
+                messages = []
+                deadline = time.monotonic() + 1.0
+                while time.monotonic() < deadline:
+                    if parent.poll(0.1):
+                        messages.append(parent.recv())
+                assert [m for m in messages if m[0] == "seq_exhausted"] == [("seq_exhausted", 1)]
+            finally:
+                parent.send(("stop",))
+                worker.join(timeout=5.0)
+    finally:
+        peer.close()
+        app.close()
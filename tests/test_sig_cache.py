@@ -0,0 +1,62 @@
+import os
+import sys
+from pathlib import Path
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.sig_cache import PublicKeyCache, VerifierCache
+
+
+class _FakeVerifier:
+    created = []
+
+    def __init__(self, sig_name: str):
+        self.sig_name = sig_name
+        self.calls = 0
+        _FakeVerifier.created.append(self)
+
+    def verify(self, message: bytes, signature: bytes, public_key: bytes) -> bool:
+        self.calls += 1
+        return signature == b"ok"
+
+
+def test_verifier_is_created_once_per_algorithm():
+    _FakeVerifier.created = []
+    cache = VerifierCache(factory=_FakeVerifier)
+    cache.prewarm(["ML-DSA-65"])
+
+    metrics = {}
+    assert cache.verify("ML-DSA-65", b"m", b"ok", b"pk", metrics=metrics) is True
+    assert metrics == {"verifier_cached": True}
+    assert cache.verify("ML-DSA-65", b"m", b"bad", b"pk") is False
+
+    metrics = {}
+    assert cache.verify("Falcon-512", b"m", b"ok", b"pk", metrics=metrics) is True
+    assert metrics["verifier_cached"] is False and metrics["verifier_setup_ns"] >= 0
+    cache.verify("Falcon-512", b"m", b"ok", b"pk")
+
+    assert [v.sig_name for v in _FakeVerifier.created] == ["ML-DSA-65", "Falcon-512"]
+    assert [v.calls for v in _FakeVerifier.created] == [2, 2]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+    assert stats["algorithms"] == ["Falcon-512", "ML-DSA-65"]
+
+
+def test_public_key_is_reread_when_mtime_or_size_changes(tmp_path):
+    path = tmp_path / "gcs_signing.pub"
+    path.write_bytes(b"key-one")
+    cache = PublicKeyCache()
+
+    assert cache.read(path) == b"key-one"
+    assert cache.read(path) == b"key-one"
+    assert cache.stats() == {"hits": 1, "reads": 1}
+
+    path.write_bytes(b"key-two-longer")  # size changes
+    assert cache.read(path) == b"key-two-longer"
+
+    st = os.stat(path)
+    path.write_bytes(b"key-3-same-len")  # same size, only the mtime differs
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.read(path) == b"key-3-same-len"
+    assert cache.stats() == {"hits": 1, "reads": 3}
@@ -0,0 +1,19 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Add root to path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Loaded on demand only (ENABLE_MDNS, ENABLE_TCP_CONTROL, HANDSHAKE_CRYPTO_OFFLOAD).
+DEFERRED = ("core.mdns", "zeroconf", "core.control_tcp", "core.crypto_offload", "multiprocessing")
+
+
+def test_proxy_startup_does_not_import_on_demand_modules():
+    code = (
+        "import sys, core.run_proxy, core.async_proxy, core.asyncio_proxy; "
+        f"print(','.join(m for m in {DEFERRED!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
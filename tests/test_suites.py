@@ -0,0 +1,37 @@
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import suites
+
+
+def test_get_suite_returns_shared_immutable_record():
+    suite = suites.get_suite("cs-kyber768-aesgcm-dilithium3")
+    assert suite is suites.get_suite("cs-mlkem768-aesgcm-mldsa65")
+    assert suite.header_ids == suites.header_ids_for_suite(dict(suite)) == (1, 2, 1, 2)
+    assert suite.hkdf_info == suites.suite_bytes_for_hkdf(dict(suite))
+    with pytest.raises(TypeError):
+        suite["aead"] = "x"
+    copy = dict(suite)
+    copy["aead"] = "x"
+    assert suite["aead"] == "AES-256-GCM"
+    assert pickle.loads(pickle.dumps(suite)) == suite
+
+
+def test_indexes_match_a_scan_of_all_suites():
+    everything = suites.list_suites().values()
+    assert suites.suites_for_kem("kyber768") == tuple(s for s in everything if s["kem_name"] == "ML-KEM-768")
+    assert suites.suites_for_sig("Falcon-512") == tuple(s for s in everything if s["sig_name"] == "Falcon-512")
+    assert suites.suites_for_aead("chacha20") == tuple(
+        s for s in everything if s["aead_token"] == "chacha20poly1305"
+    )
+    level = suites.list_suites_for_level("L5")
+    assert set(level) == {sid for sid, s in suites.list_suites().items() if s["nist_level"] == "L5"}
+    assert set(suites.filter_suites_by_levels(["L1", "L5"])) == {
+        sid for sid, s in suites.list_suites().items() if s["nist_level"] in {"L1", "L5"}
+    }
@@ -0,0 +1,72 @@
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.async_proxy import DatapathCounters
+from core.udp_batch import BatchSocket, batch_bucket, mmsg_available
+
+
+def _udp() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.setblocking(False)
+    return sock
+
+
+@pytest.mark.parametrize("use_mmsg", [True, False])
+def test_batches_round_trip_on_loopback(use_mmsg):
+    if use_mmsg and not mmsg_available():
+        pytest.skip("recvmmsg/sendmmsg not available")
+    tx_sock, rx_sock = _udp(), _udp()
+    try:
+        tx = BatchSocket(tx_sock, max_batch=8, bufsize=2048, use_mmsg=use_mmsg)
+        rx = BatchSocket(rx_sock, max_batch=8, bufsize=2048, use_mmsg=use_mmsg)
+        assert tx.uses_mmsg is use_mmsg and rx.uses_mmsg is use_mmsg
+
+        dest = rx_sock.getsockname()
+        payloads = [b"pkt-%02d" % k * (k + 1) for k in range(20)]
+        assert tx.send_batch([(p, dest) for p in payloads]) == (20, sum(map(len, payloads)))
+        assert tx.send_batch([]) == (0, 0)
+
+        counters = DatapathCounters()
+        received = []
+        while True:
+            batch = rx.recv_batch()
+            if not batch:
+                break
+            counters.add_batch("encrypted", len(batch))
+            received.extend(batch)
+
+        assert [payload for payload, _ in received] == payloads
+        assert {addr for _, addr in received} == {tx_sock.getsockname()}
+        stats = counters.batches["encrypted"]
+        assert (stats["wakeups"], stats["packets"], stats["max"]) == (3, 20, 8)
+        assert stats["hist"] == {"8-15": 2, "4-7": 1}
+    finally:
+        tx_sock.close()
+        rx_sock.close()
+
+
+@pytest.mark.skipif(not mmsg_available(), reason="recvmmsg/sendmmsg not available")
+def test_oversized_datagrams_are_dropped_and_counted():
+    tx_sock, rx_sock = _udp(), _udp()
+    try:
+        rx = BatchSocket(rx_sock, max_batch=8, bufsize=64)
+        dest = rx_sock.getsockname()
+        for payload in (b"a" * 10, b"b" * 65, b"c" * 64):
+            tx_sock.sendto(payload, dest)
+        assert [payload for payload, _ in rx.recv_batch()] == [b"a" * 10, b"c" * 64]
+        assert rx.take_truncated() == 1
+        assert rx.take_truncated() == 0
+    finally:
+        tx_sock.close()
+        rx_sock.close()
+
+
+def test_batch_bucket_labels():
+    assert [batch_bucket(n) for n in (0, 1, 2, 3, 4, 7, 8, 64)] == ["1", "1", "2-3", "2-3", "4-7", "4-7", "8-15", "64-127"]
@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from core import power_trace
+
 
 _TS_FIELDS = ("timestamp_ns", "ts_ns", "time_ns", "timestamp", "ts")
 _POWER_FIELDS = ("power_w", "power", "power_watts", "watts")
@@ -110,13 +112,21 @@ def load_power_trace(csv_path: str | Path) -> List[PowerSample]:
     """Load a power CSV and return chronologically sorted samples.
 
     The loader is tolerant to optional headers and derives ``power_w`` from
-    voltage/current columns when an explicit power column is absent.
+    voltage/current columns when an explicit power column is absent. Binary
+    traces written by core.power_trace are read directly.
     """
 
     path = Path(csv_path)
     if not path.exists():
         raise FileNotFoundError(path)
 
+    if power_trace.is_trace(path):
+        sign = float(power_trace.read_header(path)["sign_factor"])
+        return sorted(
+            (PowerSample(ts_ns=ts_ns, power_w=power_w * sign) for ts_ns, _i, _v, power_w in power_trace.iter_records(path)),
+            key=lambda item: item.ts_ns,
+        )
+
     samples: List[PowerSample] = []
     with path.open("r", encoding="utf-8", newline="") as handle:
         reader = csv.reader(handle)